@@ -0,0 +1,34 @@
+"""ベンチマークスイートの pytest 設定。
+
+コマンド:
+    uv run pytest benchmarks/                     # ベースラインと比較
+    uv run pytest benchmarks/ --update-baseline   # ベースラインを更新
+"""
+
+import pytest
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("speakdrop-benchmarks")
+    group.addoption(
+        "--update-baseline",
+        action="store_true",
+        help="計測結果で benchmarks/baseline.json を更新する",
+    )
+    group.addoption(
+        "--regression-tolerance",
+        type=float,
+        default=0.2,
+        help="p95 の許容悪化率（デフォルト: 0.2 = 20%%）",
+    )
+    group.addoption(
+        "--whisper-model",
+        default=None,
+        help="スタブの代わりに使う実 Whisper モデル（例: tiny）",
+    )
+    group.addoption(
+        "--iterations",
+        type=int,
+        default=5,
+        help="音声サンプルごとの計測回数",
+    )
@@ -0,0 +1,202 @@
+"""Ollama のフェイク HTTP サーバー。
+
+TextProcessor を実際のネットワーク経路（ollama.Client → HTTP）で計測するため、
+/api/chat（と /api/tags のモデル一覧）を実装したローカルサーバーをスレッドで起動する。
+応答は ScriptedReply で台本化でき、初回トークンまでの遅延・生成速度・途中の停止・
+HTTP エラー・接続断を再現できる。ストリーミング（NDJSON）と非ストリーミングの両方に対応する。
+
+使い方:
+    script = [ScriptedReply(status=500), ScriptedReply(stall=10.0)]
+    with FakeOllamaServer(script, default=ScriptedReply(tokens_per_second=40)) as server:
+        TextProcessor.OLLAMA_HOST = server.url
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import deque
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+
+@dataclass(frozen=True)
+class ScriptedReply:
+    """1リクエスト分の応答の台本。"""
+
+    content: str | None = None  # 応答テキスト（None = 入力テキスト + 「。」）
+    first_token_delay: float = 0.0  # 初回トークンまでの遅延（秒）
+    tokens_per_second: float = 0.0  # 生成速度（0 = 一度に生成）
+    stall: float = 0.0  # 初回トークンの後に停止する時間（秒）。タイムアウトの再現用
+    status: int = 200  # 200 以外の場合はエラー応答を返す
+    error: str = "fake ollama error"  # エラー応答のメッセージ
+    disconnect: bool = False  # 初回トークンの後に接続を切断する
+
+    def tokens(self, user_text: str) -> list[str]:
+        """応答テキストをトークン（1文字 = 1トークン）に分割する。"""
+        content = self.content if self.content is not None else f"{user_text}。"
+        return list(content)
+
+    def token_interval(self) -> float:
+        """トークン間の待ち時間（秒）を返す。"""
+        return 1.0 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+
+@dataclass
+class ReceivedRequest:
+    """サーバーが受信したリクエストの記録。"""
+
+    body: dict[str, Any]
+    received_at: float  # time.perf_counter()
+
+
+class FakeOllamaServer:
+    """/api/chat に応答するフェイク Ollama サーバー。
+
+    script の応答を先頭から順に使い、使い切った後は default を使う。
+    """
+
+    def __init__(
+        self,
+        script: Iterable[ScriptedReply] = (),
+        default: ScriptedReply | None = None,
+        response_delay: float = 0.0,
+        models: Mapping[str, ScriptedReply] | None = None,
+    ) -> None:
+        """FakeOllamaServer を初期化する。
+
+        Args:
+            script: リクエスト順の応答の台本
+            default: 台本を使い切った後の応答（None の場合は response_delay 秒後に一括応答）
+            response_delay: default 未指定時の応答までの待ち時間（秒）
+            models: インストール済みのモデル名 → そのモデルへのリクエストの応答
+                （/api/tags で返すモデル一覧。台本より優先する）
+        """
+        self._script = deque(script)
+        self.default = default or ScriptedReply(first_token_delay=response_delay)
+        self.models = dict(models or {})
+        self.requests: list[ReceivedRequest] = []
+        self._lock = threading.Lock()
+        self._httpd = _HTTPServer(self)
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        """サーバーのベース URL を返す。"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    @property
+    def request_count(self) -> int:
+        """受信したリクエスト数を返す。"""
+        return len(self.requests)
+
+    def __enter__(self) -> FakeOllamaServer:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _next_reply(self, body: dict[str, Any]) -> ScriptedReply:
+        with self._lock:
+            self.requests.append(ReceivedRequest(body, time.perf_counter()))
+            if body.get("model") in self.models:
+                return self.models[body["model"]]
+            return self._script.popleft() if self._script else self.default
+
+
+class _ChatHandler(BaseHTTPRequestHandler):
+    """/api/chat のリクエストを FakeOllamaServer の台本に従って処理する。"""
+
+    server: _HTTPServer
+
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path != "/api/tags":
+            self.send_error(404)
+            return
+        models = [{"name": name, "model": name} for name in self.server.fake.models]
+        self._send_json(200, {"models": models})
+
+    def do_POST(self) -> None:  # noqa: N802
+        if self.path != "/api/chat":
+            self.send_error(404)
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length))
+        reply = self.server.fake._next_reply(body)
+        time.sleep(reply.first_token_delay)
+        if reply.status != 200:
+            self._send_json(reply.status, {"error": reply.error})
+        elif body.get("stream", True):
+            self._stream(body, reply)
+        else:
+            self._complete(body, reply)
+
+    def _complete(self, body: dict[str, Any], reply: ScriptedReply) -> None:
+        tokens = reply.tokens(body["messages"][-1]["content"])
+        time.sleep(reply.stall + reply.token_interval() * len(tokens))
+        if reply.disconnect:
+            self.close_connection = True
+            return
+        message = {"role": "assistant", "content": "".join(tokens)}
+        self._send_json(200, _chunk(body, message, done=True, eval_count=len(tokens)))
+
+    def _stream(self, body: dict[str, Any], reply: ScriptedReply) -> None:
+        tokens = reply.tokens(body["messages"][-1]["content"])
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        for i, token in enumerate(tokens):
+            if i > 0:
+                time.sleep(reply.token_interval())
+            self._write_line(_chunk(body, {"role": "assistant", "content": token}, done=False))
+            if i == 0:
+                time.sleep(reply.stall)
+                if reply.disconnect:
+                    return
+        message = {"role": "assistant", "content": ""}
+        self._write_line(_chunk(body, message, done=True, eval_count=len(tokens)))
+
+    def _write_line(self, data: dict[str, Any]) -> None:
+        self.wfile.write(json.dumps(data).encode() + b"\n")
+        self.wfile.flush()
+
+    def _send_json(self, status: int, data: dict[str, Any]) -> None:
+        payload = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        pass  # 計測中のログ出力を抑制
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, fake: FakeOllamaServer) -> None:
+        super().__init__(("127.0.0.1", 0), _ChatHandler)
+        self.fake = fake
+
+
+def _chunk(
+    body: dict[str, Any], message: dict[str, str], done: bool, eval_count: int = 0
+) -> dict[str, Any]:
+    """/api/chat の応答（ストリーミングの1行、または非ストリーミングの全体）を作る。"""
+    chunk: dict[str, Any] = {
+        "model": body.get("model", ""),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "message": message,
+        "done": done,
+    }
+    if done:
+        chunk.update(done_reason="stop", eval_count=eval_count)
+    return chunk
@@ -0,0 +1,308 @@
+"""エンドツーエンドのレイテンシ計測ハーネス。
+
+SpeakDropApp を実際のコールバック経路（on_hotkey_press → on_hotkey_release →
+process_audio → _finish_processing）で動かし、段階ごとの処理時間を計測する。
+
+- 録音: 生成済みの音声を返すスタブ（マイク不要）
+- 音声認識: 発話長 × 実時間係数だけ待つスタブ、または小さな実モデル
+- テキスト後処理: 実際の TextProcessor をフェイク Ollama サーバーに接続
+- 挿入: 何もしないスタブ（クリップボード・キーイベントを使わない）
+- メインスレッド: AppHelper.callAfter を単一スレッドのキューで模擬
+- rumps・PyObjC: tests/fake_macos.py のフェイク（macOS 以外でも実行できる）
+"""
+
+from __future__ import annotations
+
+import json
+import queue
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from benchmarks.fake_ollama import FakeOllamaServer
+from speakdrop.audio_recorder import AudioRecorder
+from speakdrop.benchmark import AudioSample, percentile
+from speakdrop.config import Config
+from speakdrop.text_processor import TextProcessor
+from speakdrop.transcriber import Transcriber
+from tests.fake_macos import install_macos_fakes
+
+# macOS 以外でも SpeakDropApp を組み立てられるよう、tests/test_app.py と同じフェイクを使う
+install_macos_fakes()
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+# 要件上の上限（秒）。ベースラインとは別に常に検査する
+STAGE_BUDGETS: dict[str, float] = {
+    "ui_recording": 0.2,  # NFR-007
+    "ui_processing": 0.2,  # NFR-007
+    "transcribe": 5.0,  # NFR-001（10秒音声）
+    "postprocess": 3.0,  # NFR-002
+}
+
+# ベースラインとの比較で無視する絶対誤差（秒）。スケジューリングの揺らぎ対策
+ABSOLUTE_SLACK = 0.01
+
+
+class StubRecorder:
+    """start/stop で生成済みの音声を返す AudioRecorder のスタブ。"""
+
+    def __init__(self) -> None:
+        self.next_audio = np.array([], dtype=np.int16)
+        self.level = (0.0, 0.0)
+
+    def add_block_listener(self, listener: Callable[[np.ndarray], None]) -> None:
+        pass  # 録音ブロックは発生しない
+
+    def start_recording(self) -> None:
+        pass
+
+    def stop_recording(self) -> np.ndarray:
+        return self.next_audio
+
+    @property
+    def voiced_duration(self) -> float:
+        return len(self.next_audio) / AudioRecorder.SAMPLE_RATE
+
+
+class StubTranscriber:
+    """発話長 × rtf 秒だけ待ってから固定テキストを返す Transcriber のスタブ。"""
+
+    SAMPLE_RATE = Transcriber.SAMPLE_RATE
+
+    def __init__(self, rtf: float) -> None:
+        self.rtf = rtf
+
+    def transcribe(
+        self,
+        audio: np.ndarray,
+        model_id: str | None = None,
+        on_segment: Callable[[str], None] | None = None,
+        prompt: str = "",
+    ) -> str:
+        time.sleep(len(audio) / self.SAMPLE_RATE * self.rtf)
+        return "今日は天気がいいので散歩に行きます"
+
+    def warm_up(self) -> None:
+        pass
+
+    def set_profile(self, profile: str) -> None:
+        pass
+
+    def reload_model(self, model_id: str) -> None:
+        pass
+
+
+class NoOpInserter:
+    """何も挿入しない ClipboardInserter のスタブ。"""
+
+    def __init__(self, *_: Any, **__: Any) -> None:
+        pass
+
+    def restore(self) -> None:
+        pass
+
+    def insert(self, text: str) -> None:
+        pass
+
+    def replace(self, old: str, new: str) -> None:
+        pass
+
+
+class MainThread:
+    """AppHelper.callAfter を単一スレッドのキューで模擬する（メインスレッドの代わり）。"""
+
+    def __init__(self) -> None:
+        self._queue: queue.Queue[tuple[Callable[..., Any], tuple[Any, ...], dict[str, Any]]]
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def callAfter(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> None:  # noqa: N802
+        self._queue.put((func, args, kwargs))
+
+    def _run(self) -> None:
+        while True:
+            func, args, kwargs = self._queue.get()
+            func(*args, **kwargs)
+
+
+@dataclass
+class StageTimings:
+    """段階ごとの計測値（秒）。"""
+
+    samples: defaultdict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.samples[stage].append(seconds)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """段階ごとの p50 / p95 を返す。"""
+        return {
+            stage: {"p50": percentile(values, 50), "p95": percentile(values, 95)}
+            for stage, values in sorted(self.samples.items())
+        }
+
+
+def _timed(func: Callable[..., Any], stage: str, timings: StageTimings) -> Callable[..., Any]:
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timings.add(stage, time.perf_counter() - start)
+
+    return wrapper
+
+
+class E2EHarness:
+    """SpeakDropApp を組み立て、1発話ずつ実行して段階ごとの時間を記録する。"""
+
+    SESSION_TIMEOUT = 30.0
+
+    def __init__(self, app: Any, recorder: StubRecorder, errors: list[dict[str, Any]]) -> None:
+        self.app = app
+        self.recorder = recorder
+        self.timings = StageTimings()
+        self.errors = errors  # rumps.notification で通知されたエラー
+        self._ui_applied: dict[str, threading.Event] = {}
+        self._ui_times: dict[str, float] = {}
+        apply_state_ui = app._apply_state_ui
+
+        def record_ui(state: Any) -> None:
+            apply_state_ui(state)
+            self._ui_times[state.name] = time.perf_counter()
+            self._ui_applied.setdefault(state.name, threading.Event()).set()
+
+        app._apply_state_ui = record_ui
+        app.transcriber.transcribe = _timed(app.transcriber.transcribe, "transcribe", self.timings)
+        app.text_processor.process = _timed(app.text_processor.process, "postprocess", self.timings)
+        app.text_processor.process_batch = _timed(
+            app.text_processor.process_batch, "postprocess", self.timings
+        )
+        for inserter in (app.clipboard_inserter, app.keystroke_inserter):
+            inserter.insert = _timed(inserter.insert, "insert", self.timings)
+
+    def _wait_ui(self, state: str) -> float:
+        event = self._ui_applied.setdefault(state, threading.Event())
+        if not event.wait(self.SESSION_TIMEOUT):
+            raise TimeoutError(f"{state} への遷移が {self.SESSION_TIMEOUT} 秒以内に反映されません")
+        return self._ui_times[state]
+
+    def run_session(self, sample: AudioSample) -> None:
+        """ホットキー押下 → 離放 → 挿入完了（IDLE）までの1発話を実行する。"""
+        self._ui_applied.clear()
+        self.recorder.next_audio = sample.audio
+
+        start = time.perf_counter()
+        self.app.on_hotkey_press()
+        self.timings.add("ui_recording", self._wait_ui("RECORDING") - start)
+
+        start = time.perf_counter()
+        self.app.on_hotkey_release()
+        self.timings.add("ui_processing", self._wait_ui("PROCESSING") - start)
+        self.timings.add("end_to_end", self._wait_ui("IDLE") - start)
+
+
+@contextmanager
+def build_harness(
+    whisper_model: str | None = None, stub_rtf: float = 0.1, llm_delay: float = 0.3
+) -> Iterator[E2EHarness]:
+    """計測用に依存をスタブ化した SpeakDropApp とハーネスを組み立てる。
+
+    Args:
+        whisper_model: 実モデルで計測する場合のモデルID（None の場合はスタブ）
+        stub_rtf: スタブの実時間係数（処理時間 / 発話長）
+        llm_delay: フェイク Ollama サーバーの応答時間（秒）
+    """
+    recorder = StubRecorder()
+    main_thread = MainThread()
+    errors: list[dict[str, Any]] = []
+    transcriber: Any = (
+        Transcriber(model_id=whisper_model) if whisper_model else StubTranscriber(stub_rtf)
+    )
+    checker = MagicMock()
+    checker.check_microphone.return_value = True
+    checker.check_accessibility.return_value = True
+
+    with ExitStack() as stack:
+        server = stack.enter_context(FakeOllamaServer(response_delay=llm_delay))
+        stack.enter_context(patch.object(TextProcessor, "OLLAMA_HOST", server.url))
+        for target, value in {
+            "AudioRecorder": MagicMock(
+                return_value=recorder, SAMPLE_RATE=AudioRecorder.SAMPLE_RATE
+            ),
+            "Transcriber": lambda **_: transcriber,
+            "create_inserter": NoOpInserter,
+            "HotkeyListener": MagicMock,
+            "PermissionChecker": lambda: checker,
+            "load_profile_stats": lambda: {},
+            "AppHelper": main_thread,
+        }.items():
+            stack.enter_context(patch(f"speakdrop.app.{target}", value))
+        # ユーザーの設定ファイルを読まず、既定値で計測する
+        stack.enter_context(patch.object(Config, "load", lambda self, *_: self))
+        stack.enter_context(
+            patch("speakdrop.app.rumps.notification", lambda **kw: errors.append(kw))
+        )
+
+        from speakdrop.app import SpeakDropApp
+
+        app = SpeakDropApp()
+        # 起動直後ではなく、起動時の読み込みが済んでから最初の発話を始める場合を計測する
+        if not app.warmed_up.wait(E2EHarness.SESSION_TIMEOUT):
+            raise TimeoutError("起動時の依存の読み込みが終わりません")
+        yield E2EHarness(app, recorder, errors)
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> dict[str, dict[str, float]]:
+    """ベースライン（段階ごとの p50 / p95）を読み込む。無い場合は空。"""
+    try:
+        data: dict[str, dict[str, float]] = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return data
+
+
+def save_baseline(summary: dict[str, dict[str, float]], path: Path = BASELINE_PATH) -> None:
+    """計測結果をベースラインとして保存する。"""
+    rounded = {
+        stage: {k: round(v, 4) for k, v in values.items()} for stage, values in summary.items()
+    }
+    path.write_text(json.dumps(rounded, indent=2) + "\n", encoding="utf-8")
+
+
+def find_regressions(
+    summary: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    tolerance: float,
+) -> list[str]:
+    """ベースラインから p95 が tolerance（比率）を超えて悪化した段階を返す。"""
+    regressions = []
+    for stage, values in summary.items():
+        if stage not in baseline:
+            continue
+        limit = baseline[stage]["p95"] * (1 + tolerance) + ABSOLUTE_SLACK
+        if values["p95"] > limit:
+            regressions.append(
+                f"{stage}: p95 {values['p95']:.3f}s > {limit:.3f}s "
+                f"(baseline {baseline[stage]['p95']:.3f}s)"
+            )
+    return regressions
+
+
+def find_budget_violations(summary: dict[str, dict[str, float]]) -> list[str]:
+    """要件上の上限（STAGE_BUDGETS）を p95 が超えた段階を返す。"""
+    return [
+        f"{stage}: p95 {summary[stage]['p95']:.3f}s > {budget:.1f}s"
+        for stage, budget in STAGE_BUDGETS.items()
+        if stage in summary and summary[stage]["p95"] > budget
+    ]
@@ -0,0 +1,50 @@
+"""speakdrop bench-llm のフェイク Ollama サーバーを使ったテスト。
+
+モデルごとに速度・出力を変えたフェイクサーバーで bench-llm を実際の HTTP 経路で実行し、
+TTFT・生成速度の計測値と推奨モデルの選択を確認する。
+"""
+
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from benchmarks.fake_ollama import FakeOllamaServer, ScriptedReply
+from speakdrop.bench_llm import BENCH_TRANSCRIPTS, main, measure_model
+from speakdrop.text_processor import TextProcessor
+
+CORPUS = BENCH_TRANSCRIPTS[:2]
+
+
+def test_measures_ttft_and_token_rate() -> None:
+    """初回トークンまでの遅延と生成速度を計測できること。"""
+    reply = ScriptedReply(content="今日は晴れです。", first_token_delay=0.1, tokens_per_second=50)
+    with (
+        FakeOllamaServer(models={"m": reply}) as server,
+        patch.object(TextProcessor, "OLLAMA_HOST", server.url),
+    ):
+        result = measure_model("m", corpus=CORPUS)
+
+    assert result.errors == 0
+    assert result.median_ttft == pytest.approx(0.1, abs=0.05)
+    assert result.median_tokens_per_second == pytest.approx(50, rel=0.3)
+
+
+def test_recommends_fastest_faithful_model(tmp_path: Path) -> None:
+    """忠実度の条件を満たすモデルのうち最速のものを保存すること。"""
+    models = {
+        "accurate:7b": ScriptedReply(first_token_delay=0.2),  # 入力 + 「。」
+        "fast:3b": ScriptedReply(first_token_delay=0.05),
+        "sloppy:1b": ScriptedReply(content="はい", first_token_delay=0.0),
+    }
+    config_file = tmp_path / "config.json"
+    with (
+        FakeOllamaServer(models=models) as server,
+        patch.object(TextProcessor, "OLLAMA_HOST", server.url),
+        patch("speakdrop.bench_llm.BENCH_TRANSCRIPTS", CORPUS),
+    ):
+        exit_code = main([], config_file)
+
+    assert exit_code == 0
+    assert json.loads(config_file.read_text())["ollama_model"] == "fast:3b"
@@ -0,0 +1,43 @@
+"""エンドツーエンドのレイテンシ回帰テスト（NFR-001, NFR-002, NFR-007）。
+
+生成した音声（2秒・5秒・10秒）で発話を繰り返し、段階ごとの p95 を
+benchmarks/baseline.json と比較する。p95 が許容率を超えて悪化した場合、
+または要件上の上限を超えた場合に失敗する。
+"""
+
+import json
+
+import pytest
+
+from benchmarks.harness import (
+    build_harness,
+    find_budget_violations,
+    find_regressions,
+    load_baseline,
+    save_baseline,
+)
+from speakdrop.benchmark import synthetic_samples
+
+
+def test_e2e_latency(request: pytest.FixtureRequest) -> None:
+    """段階ごとの p95 がベースラインと要件上の上限を超えないこと。"""
+    option = request.config.getoption
+    samples = synthetic_samples((2.0, 5.0, 10.0))
+
+    with build_harness(whisper_model=option("--whisper-model")) as harness:
+        for _ in range(option("--iterations")):
+            for sample in samples:
+                harness.run_session(sample)
+
+    summary = harness.timings.summary()
+    print(json.dumps(summary, indent=2))
+    assert not harness.errors, harness.errors
+    assert not find_budget_violations(summary)
+
+    if option("--update-baseline"):
+        save_baseline(summary)
+        return
+    baseline = load_baseline()
+    if not baseline:
+        pytest.skip("ベースラインがありません（--update-baseline で作成してください）")
+    assert not find_regressions(summary, baseline, option("--regression-tolerance"))
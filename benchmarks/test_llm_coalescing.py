@@ -0,0 +1,51 @@
+"""LLM 整形リクエストの合流のベンチマーク。
+
+短い発話を続けて整形に投入し（連続した口述）、LlmCoalescer で待ちの単位をまとめた場合と
+1件ずつ整形した場合のリクエスト数と1単位あたりの処理時間を比較する。
+フェイク Ollama サーバーの初回トークン遅延をリクエストごとのオーバーヘッドとみなす。
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fake_ollama import ScriptedReply
+from benchmarks.text_processor_load import fake_text_processor
+from speakdrop.benchmark import BENCH_SENTENCES
+from speakdrop.coalescer import LlmCoalescer
+
+UTTERANCES = list(BENCH_SENTENCES) * 2
+REQUEST_OVERHEAD = 0.15  # 1リクエストあたりの固定費（秒）
+UTTERANCE_INTERVAL = 0.02  # 発話の投入間隔（秒）
+
+
+def _burst(max_items: int) -> tuple[float, int, list[str]]:
+    """UTTERANCES を続けて投入し、(1単位あたりの時間, リクエスト数, 結果) を返す。"""
+    reply = ScriptedReply(first_token_delay=REQUEST_OVERHEAD, tokens_per_second=2000.0)
+    with (
+        fake_text_processor(default=reply) as (processor, server),
+        ThreadPoolExecutor(max_workers=1) as executor,
+    ):
+        coalescer = LlmCoalescer(executor, max_items=max_items)
+        start = time.perf_counter()
+        futures = []
+        for text in UTTERANCES:
+            futures.append(coalescer.submit(text, processor))
+            time.sleep(UTTERANCE_INTERVAL)
+        outputs = [future.result() for future in futures]
+        elapsed = time.perf_counter() - start
+        return elapsed / len(UTTERANCES), server.request_count, outputs
+
+
+def test_coalescing_cuts_cost_per_utterance() -> None:
+    """まとめた場合にリクエスト数と1単位あたりの処理時間が減ること。"""
+    single_cost, single_requests, _ = _burst(max_items=1)
+    batched_cost, batched_requests, outputs = _burst(max_items=8)
+
+    print(
+        f"per-utterance {single_cost:.3f}s ({single_requests} requests) -> "
+        f"{batched_cost:.3f}s ({batched_requests} requests)"
+    )
+    assert single_requests == len(UTTERANCES)
+    assert batched_requests < len(UTTERANCES) / 2
+    assert batched_cost < single_cost * 0.6
+    assert all(output.strip() for output in outputs)
@@ -0,0 +1,71 @@
+"""ネイティブのサンプルレートでの録音の 16kHz 変換のベンチマーク。
+
+30秒の録音を 10ms ブロックで StreamingResampler に逐次投入した場合と、単純な実装
+（離放時に録音全体を np.interp で線形補間する）を比較する。離放から認識を始められる
+までの変換時間、録音中の変換の実時間比、16kHz のナイキスト周波数を超える音の折り返しを計測する。
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from speakdrop.resampler import StreamingResampler
+
+SECONDS = 30.0  # 録音の長さ
+BLOCK = 0.01  # 録音ブロックの長さ（秒）
+OUT_RATE = 16000
+
+
+def _recording(rate: int) -> np.ndarray:
+    """発話帯域の音と 12kHz の高域雑音を重ねた録音を返す。"""
+    t = np.arange(int(rate * SECONDS)) / rate
+    speech = 6000 * np.sin(2 * np.pi * 300 * t) + 2000 * np.sin(2 * np.pi * 2500 * t)
+    audio: np.ndarray = (speech + 3000 * np.sin(2 * np.pi * 12000 * t)).astype(np.int16)
+    return audio
+
+
+def _interp(audio: np.ndarray, rate: int) -> np.ndarray:
+    """単純な実装: 録音全体を np.interp で線形補間する（アンチエイリアスフィルタなし）。"""
+    n_out = len(audio) * OUT_RATE // rate
+    positions = np.arange(n_out) * (rate / OUT_RATE)
+    resampled: np.ndarray = np.interp(positions, np.arange(len(audio)), audio).astype(np.int16)
+    return resampled
+
+
+def _alias_level(audio: np.ndarray) -> float:
+    """12kHz の音が 16kHz への変換で折り返す 4kHz 成分の振幅を返す。"""
+    t = np.arange(len(audio)) / OUT_RATE
+    probe = np.exp(-2j * np.pi * 4000 * t)
+    return float(2 * np.abs(np.dot(audio.astype(np.float64), probe)) / len(audio))
+
+
+@pytest.mark.parametrize("rate", [48000, 44100])
+def test_streaming_resampler_vs_interp(rate: int) -> None:
+    """逐次変換で離放時の変換待ちがなくなり、録音中の負荷が小さく、折り返しを抑えること。"""
+    audio = _recording(rate)
+    blocks = np.array_split(audio, int(SECONDS / BLOCK))
+
+    resampler = StreamingResampler(rate, OUT_RATE)
+    start = time.perf_counter()
+    streamed = [resampler.process(block) for block in blocks]
+    streaming_time = time.perf_counter() - start
+    start = time.perf_counter()
+    streamed.append(resampler.flush())
+    release_time = time.perf_counter() - start
+    resampled = np.concatenate(streamed)
+
+    start = time.perf_counter()
+    naive = _interp(np.concatenate(blocks), rate)
+    naive_release_time = time.perf_counter() - start
+
+    print(
+        f"{rate}Hz: release {naive_release_time * 1000:.2f}ms (interp) -> "
+        f"{release_time * 1000:.3f}ms (streaming), "
+        f"streaming RTF {streaming_time / SECONDS:.4f}, "
+        f"alias {_alias_level(naive):.0f} -> {_alias_level(resampled):.1f}"
+    )
+    assert abs(len(resampled) - len(naive)) <= 1
+    assert release_time < naive_release_time
+    assert streaming_time / SECONDS < 0.05  # 録音ブロックの変換は実時間の 5% 未満
+    assert _alias_level(resampled) < _alias_level(naive) / 100  # 折り返しを -40 dB 以上抑える
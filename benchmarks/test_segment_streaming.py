@@ -0,0 +1,47 @@
+"""認識と LLM 整形の重ね合わせのベンチマーク。
+
+セグメントを一定間隔で確定させる認識のスタブと、フェイク Ollama サーバーに接続した
+実際の TextProcessor で長い発話を処理し、ストリーミング（SegmentPipeline）により
+処理時間が 認識 + 整形 の合計ではなく max(認識, 整形) に近づくことを確認する。
+"""
+
+import time
+
+from benchmarks.fake_ollama import ScriptedReply
+from benchmarks.text_processor_load import fake_text_processor
+from speakdrop.segment_pipeline import SegmentPipeline
+
+SEGMENTS = ["今日は天気がいいので", "午後から散歩に行きます。", "夕方には戻る予定です。"] * 3
+SEGMENT_DECODE = 0.1  # 1セグメントのデコード時間（秒）
+LLM_DELAY = 0.1  # 1単位の整形時間（秒）
+UNIT_CHARS = 20
+
+
+def _dictate(pipeline: SegmentPipeline) -> str:
+    for segment in SEGMENTS:
+        time.sleep(SEGMENT_DECODE)
+        pipeline.feed(segment)
+    return pipeline.finish("".join(SEGMENTS))
+
+
+def test_streaming_overlaps_whisper_and_llm() -> None:
+    """ストリーミング時の処理時間が 認識 + 整形 の合計より十分短いこと。"""
+    reply = ScriptedReply(first_token_delay=LLM_DELAY)
+    with fake_text_processor(default=reply) as (processor, _):
+        start = time.perf_counter()
+        streamed = _dictate(SegmentPipeline(processor.process, UNIT_CHARS))
+        elapsed = time.perf_counter() - start
+
+        units = SegmentPipeline(processor.process, UNIT_CHARS)
+        for segment in SEGMENTS:
+            units.feed(segment)
+        unit_count = units.submitted
+        units.finish("".join(SEGMENTS))
+
+    whisper = SEGMENT_DECODE * len(SEGMENTS)
+    sequential = whisper + LLM_DELAY * unit_count
+    print(f"streamed {elapsed:.3f}s / sequential {sequential:.3f}s ({unit_count} units)")
+    assert unit_count > 1
+    assert streamed.count("。") >= unit_count
+    assert elapsed < whisper + 2 * LLM_DELAY + 0.1
+    assert elapsed < sequential * 0.8
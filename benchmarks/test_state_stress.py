@@ -0,0 +1,86 @@
+"""ホットキーの連打に対する状態遷移のストレステスト。
+
+複数のスレッドから on_hotkey_press / on_hotkey_release を kHz の頻度で呼び、
+録音の開始・停止が交互に呼ばれること（二重に開始・録音していないのに停止しない）、
+すべての遷移が遷移表に従い連続していること、十分な頻度で処理できることを確認する。
+処理スレッドの認識・整形は即座に完了するものとし、状態遷移だけを計測する。
+"""
+
+import threading
+import time
+from itertools import pairwise
+from typing import Any
+
+import numpy as np
+
+from benchmarks.harness import StubRecorder, build_harness
+from speakdrop.state_machine import TRANSITIONS, AppState
+
+THREADS = 4
+DURATION = 1.0  # 秒
+
+
+class CheckingRecorder(StubRecorder):
+    """録音の開始・停止が交互に呼ばれることを確認する StubRecorder。"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.next_audio = np.zeros(8000, dtype=np.int16)  # 0.5秒（最短の録音の条件を満たす）
+        self.recording = False
+        self.starts = 0
+        self.violations: list[str] = []
+
+    def start_recording(self) -> None:
+        if self.recording:
+            self.violations.append("二重に録音を開始")
+        self.recording = True
+        self.starts += 1
+
+    def stop_recording(self) -> np.ndarray:
+        if not self.recording:
+            self.violations.append("録音していないのに停止")
+        self.recording = False
+        return self.next_audio
+
+
+def _hammer(app: Any) -> int:
+    """THREADS 個のスレッドから DURATION 秒間、押下・離放を繰り返し、呼び出し回数を返す。"""
+    deadline = time.perf_counter() + DURATION
+    calls = [0] * THREADS
+
+    def press_release(index: int) -> None:
+        while time.perf_counter() < deadline:
+            app.on_hotkey_press()
+            app.on_hotkey_release()
+            calls[index] += 2
+
+    threads = [threading.Thread(target=press_release, args=(i,)) for i in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(calls)
+
+
+def test_hotkey_hammering_keeps_invariants() -> None:
+    """連打しても録音の開始・停止と状態遷移の整合性が保たれ、1kHz 以上で処理できること。"""
+    with build_harness() as harness:
+        app = harness.app
+        recorder = CheckingRecorder()
+        app.audio_recorder = recorder
+        # 認識・整形は即座に完了させ、処理スレッドから IDLE に戻す
+        app.process_audio = lambda audio: app.set_state(AppState.IDLE)
+
+        calls = _hammer(app)
+        events = app.state_machine.events
+
+    rate = calls / DURATION
+    print(
+        f"{rate:.0f} calls/s, {recorder.starts} utterances, "
+        f"{app.state_machine.transitions} transitions, {app.state_machine.rejected} rejected"
+    )
+    assert recorder.violations == []
+    assert all(e.target in TRANSITIONS[e.source] for e in events)
+    assert all(a.target is b.source for a, b in pairwise(events))
+    assert recorder.starts > 0
+    assert rate >= 1000
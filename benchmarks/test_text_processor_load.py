@@ -0,0 +1,102 @@
+"""TextProcessor の負荷・障害シナリオのテスト（NFR-002, REQ-009）。
+
+フェイク Ollama サーバーで遅延・停止・エラー・接続断を再現し、
+TextProcessor のレイテンシとフォールバック動作を検証する。
+"""
+
+import time
+
+import ollama
+
+from benchmarks.fake_ollama import FakeOllamaServer, ScriptedReply
+from benchmarks.text_processor_load import fake_text_processor, run_load
+from speakdrop.benchmark import BENCH_SENTENCES
+
+TEXTS = list(BENCH_SENTENCES)
+
+
+class TestFakeOllamaServer:
+    """フェイクサーバー自体の動作確認（実際の ollama.Client で接続）。"""
+
+    def test_streaming_chat(self) -> None:
+        """ストリーミング応答がトークン単位で届き、最後に done が届くこと。"""
+        with FakeOllamaServer(default=ScriptedReply(content="はい。")) as server:
+            client = ollama.Client(host=server.url)
+            chunks = list(
+                client.chat(model="m", messages=[{"role": "user", "content": "x"}], stream=True)
+            )
+
+        assert [c.message.content for c in chunks] == ["は", "い", "。", ""]
+        assert chunks[-1].done is True
+
+    def test_token_rate(self) -> None:
+        """tokens_per_second に従って生成時間がかかること。"""
+        reply = ScriptedReply(content="あ" * 10, tokens_per_second=50.0)
+        with FakeOllamaServer(default=reply) as server:
+            client = ollama.Client(host=server.url)
+            start = time.perf_counter()
+            client.chat(model="m", messages=[{"role": "user", "content": "x"}])
+            elapsed = time.perf_counter() - start
+
+        assert elapsed >= 10 / 50.0
+
+    def test_script_is_consumed_in_order(self) -> None:
+        """台本の応答を順に使い、使い切った後は default を使うこと。"""
+        script = [ScriptedReply(content="1"), ScriptedReply(content="2")]
+        with FakeOllamaServer(script, default=ScriptedReply(content="d")) as server:
+            client = ollama.Client(host=server.url)
+            replies = [
+                client.chat(model="m", messages=[{"role": "user", "content": "x"}]).message.content
+                for _ in range(3)
+            ]
+
+        assert replies == ["1", "2", "d"]
+        assert server.request_count == 3
+
+
+class TestTextProcessorUnderLoad:
+    """TextProcessor の負荷試験。"""
+
+    def test_latency_within_budget(self) -> None:
+        """通常の生成速度で並列に処理しても p95 が NFR-002（3秒）以内であること。"""
+        reply = ScriptedReply(first_token_delay=0.1, tokens_per_second=100.0)
+        with fake_text_processor(default=reply) as (processor, server):
+            result = run_load(processor, TEXTS * 2, concurrency=4)
+
+        assert result.fallbacks == 0
+        assert result.p95 < 3.0
+        assert server.request_count == len(TEXTS) * 2
+
+    def test_stall_falls_back_after_timeout(self) -> None:
+        """応答が止まった場合はタイムアウト後に入力テキストを返すこと（REQ-009）。"""
+        reply = ScriptedReply(stall=2.0)
+        with fake_text_processor(default=reply, timeout=0.3) as (processor, _):
+            result = run_load(processor, TEXTS[:2])
+
+        assert result.fallbacks == 2
+        assert result.timeouts == 2
+        assert result.p95 < 1.0  # 停止時間（2秒）まで待たない
+
+    def test_error_falls_back_immediately(self) -> None:
+        """HTTP エラーの場合は待たずに入力テキストを返すこと。"""
+        with fake_text_processor(default=ScriptedReply(status=500)) as (processor, _):
+            result = run_load(processor, TEXTS[:3])
+
+        assert result.fallbacks == 3
+        assert result.timeouts == 0
+        assert result.p95 < 0.5
+
+    def test_disconnect_falls_back(self) -> None:
+        """応答途中で接続が切れた場合は入力テキストを返すこと。"""
+        with fake_text_processor(default=ScriptedReply(disconnect=True)) as (processor, _):
+            result = run_load(processor, TEXTS[:1])
+
+        assert result.fallbacks == 1
+
+    def test_recovers_after_failures(self) -> None:
+        """エラーの後に正常応答に戻れば整形結果を返すこと。"""
+        script = [ScriptedReply(status=500), ScriptedReply(status=503)]
+        with fake_text_processor(script) as (processor, _):
+            result = run_load(processor, TEXTS[:4])
+
+        assert result.fallbacks == 2
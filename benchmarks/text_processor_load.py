@@ -0,0 +1,109 @@
+"""TextProcessor の負荷試験ハーネス。
+
+フェイク Ollama サーバーに対して TextProcessor.process() を並列に呼び出し、
+レイテンシ・タイムアウト・フォールバック（REQ-009: 入力をそのまま返す）の件数を計測する。
+
+コマンド:
+    python -m benchmarks.text_processor_load --requests 40 --concurrency 4 --tokens-per-second 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from unittest.mock import patch
+
+from benchmarks.fake_ollama import FakeOllamaServer, ScriptedReply
+from speakdrop.benchmark import BENCH_SENTENCES, percentile
+from speakdrop.text_processor import TextProcessor
+
+
+@dataclass
+class LoadResult:
+    """負荷試験の結果。"""
+
+    latencies: list[float] = field(default_factory=list)  # 1リクエストあたりの処理時間（秒）
+    fallbacks: int = 0  # 入力テキストをそのまま返した件数
+    timeouts: int = 0  # タイムアウトまで待った件数
+
+    @property
+    def p50(self) -> float:
+        return percentile(self.latencies, 50)
+
+    @property
+    def p95(self) -> float:
+        return percentile(self.latencies, 95)
+
+
+@contextmanager
+def fake_text_processor(
+    script: list[ScriptedReply] | None = None,
+    default: ScriptedReply | None = None,
+    timeout: float = TextProcessor.TIMEOUT,
+) -> Iterator[tuple[TextProcessor, FakeOllamaServer]]:
+    """フェイク Ollama サーバーに接続した TextProcessor を返す。"""
+    with (
+        FakeOllamaServer(script or [], default=default) as server,
+        patch.object(TextProcessor, "OLLAMA_HOST", server.url),
+        patch.object(TextProcessor, "TIMEOUT", timeout),
+    ):
+        yield TextProcessor(), server
+
+
+def run_load(processor: TextProcessor, texts: list[str], concurrency: int = 1) -> LoadResult:
+    """texts を concurrency 並列で処理し、結果を集計する。"""
+
+    def timed(text: str) -> tuple[float, bool]:
+        start = time.perf_counter()
+        output = processor.process(text)
+        return time.perf_counter() - start, output == text
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes = list(executor.map(timed, texts))
+
+    result = LoadResult()
+    for latency, fell_back in outcomes:
+        result.latencies.append(latency)
+        result.fallbacks += fell_back
+        result.timeouts += fell_back and latency >= processor.TIMEOUT
+    return result
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="TextProcessor の負荷試験")
+    parser.add_argument("--requests", type=int, default=20, help="リクエスト数")
+    parser.add_argument("--concurrency", type=int, default=1, help="同時リクエスト数")
+    parser.add_argument("--first-token-delay", type=float, default=0.2, help="初回トークン遅延")
+    parser.add_argument("--tokens-per-second", type=float, default=30.0, help="生成速度")
+    parser.add_argument("--stall", type=float, default=0.0, help="生成途中の停止時間（秒）")
+    parser.add_argument("--error-status", type=int, default=200, help="返す HTTP ステータス")
+    parser.add_argument("--timeout", type=float, default=TextProcessor.TIMEOUT, help="タイムアウト")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """負荷試験を実行して結果を表示する。"""
+    args = _parse_args(argv)
+    reply = ScriptedReply(
+        first_token_delay=args.first_token_delay,
+        tokens_per_second=args.tokens_per_second,
+        stall=args.stall,
+        status=args.error_status,
+    )
+    texts = [BENCH_SENTENCES[i % len(BENCH_SENTENCES)] for i in range(args.requests)]
+    with fake_text_processor(default=reply, timeout=args.timeout) as (processor, _):
+        result = run_load(processor, texts, args.concurrency)
+    print(
+        f"requests={len(texts)} concurrency={args.concurrency} "
+        f"p50={result.p50:.3f}s p95={result.p95:.3f}s "
+        f"fallbacks={result.fallbacks} timeouts={result.timeouts}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
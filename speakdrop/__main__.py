@@ -3,18 +3,45 @@
 コマンド:
     uv run speakdrop
     python -m speakdrop
+    uv run speakdrop bench-whisper  # Whisper 推論設定の自動チューニング
+    uv run speakdrop bench-llm  # Ollama モデルの計測と推奨
+    uv run speakdrop transcription-server  # 音声認識サーバー（通常はアプリが自動起動）
 """
 
-from speakdrop.app import SpeakDropApp
+import importlib
+import sys
 
+from speakdrop.log import setup_logging
 
-def main() -> None:
+# サブコマンド名 → main(argv) -> int を持つモジュール
+_COMMANDS: dict[str, str] = {
+    "bench-whisper": "speakdrop.bench_whisper",
+    "bench-llm": "speakdrop.bench_llm",
+    "transcription-server": "speakdrop.transcription_server",
+}
+
+
+def main(argv: list[str] | None = None) -> None:
     """SpeakDrop アプリケーションを起動する。
 
+    第1引数がサブコマンド名の場合はそのコマンドを実行して終了する。
+
     起動シーケンス:
-    1. SpeakDropApp を初期化（権限チェックを含む）
-    2. rumps のイベントループを開始
+    1. ログ出力を設定（speakdrop.log.setup_logging）
+    2. SpeakDropApp を初期化（権限チェックを含む）
+    3. rumps のイベントループを開始
     """
+    args = sys.argv[1:] if argv is None else argv
+    if args and args[0] in _COMMANDS:
+        command = importlib.import_module(_COMMANDS[args[0]])
+        sys.exit(command.main(args[1:]))
+
+    # 品質段階の変更などのログを設定ディレクトリのファイルにも残す
+    setup_logging()
+
+    # サブコマンドでは rumps・PyObjC を読み込まないよう、ここで import する
+    from speakdrop.app import SpeakDropApp  # noqa: PLC0415
+
     app = SpeakDropApp()
     app.run()
 
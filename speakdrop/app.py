@@ -5,67 +5,161 @@ rumps.App を継承した SpeakDropApp クラスで全モジュールを統合
 
 from __future__ import annotations
 
+import logging
 import re
+import sys
 import threading
+from collections import Counter
 from collections.abc import Callable
-from enum import Enum, auto
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING, Any
 
-import numpy as np
 import rumps
 from PyObjCTools import AppHelper
 
 from speakdrop.audio_recorder import AudioRecorder
-from speakdrop.clipboard_inserter import ClipboardInserter
-from speakdrop.config import Config
+from speakdrop.clock import Clock, MainThreadClock
+from speakdrop.coalescer import LlmCoalescer
+from speakdrop.config import CONTINUOUS, HOLD, Config, load_profile_stats
+from speakdrop.context import TranscriptContext
+from speakdrop.endpoint import EndpointDetector
 from speakdrop.hotkey_listener import HotkeyListener
-from speakdrop.icons import get_icon_title
+from speakdrop.icons import get_icon_title, get_level_title
+from speakdrop.inserter import PASTE, TYPE, TextInserter, create_inserter
 from speakdrop.permissions import PermissionChecker
+from speakdrop.segment_pipeline import SegmentPipeline
+from speakdrop.session_replay import SessionRecorder, new_session_path
+from speakdrop.slo import SloController, Tier, available_tiers
+from speakdrop.state_machine import AppState, StateMachine
 from speakdrop.text_processor import TextProcessor
-from speakdrop.transcriber import Transcriber
+from speakdrop.transcriber import DECODE_PROFILES, Transcriber
+from speakdrop.transcription_server import RemoteTranscriber
+from speakdrop.ui_updater import UiUpdater
 
+if TYPE_CHECKING:
+    import numpy as np
 
-class AppState(Enum):
-    """アプリケーションの状態を表す列挙型。"""
-
-    IDLE = auto()  # 待機中（ホットキー監視中）
-    RECORDING = auto()  # 録音中（ホットキー押下中）
-    PROCESSING = auto()  # 処理中（認識・後処理・挿入中）
+_logger = logging.getLogger(__name__)
 
 
 class SpeakDropApp(rumps.App):  # type: ignore[misc]
     """SpeakDrop メニューバーアプリケーション。"""
 
-    def __init__(self) -> None:
-        """SpeakDropApp を初期化する。"""
+    # 自分で送信したキーイベントが HotkeyListener に届くまでの猶予（秒）
+    SYNTHETIC_INPUT_GRACE: float = 0.3
+
+    def __init__(self, clock: Clock | None = None) -> None:
+        """SpeakDropApp を初期化する。
+
+        Args:
+            clock: 時刻の取得・待機・遅延実行に使う時計（デフォルト: MainThreadClock）。
+                各コンポーネントにも同じ時計を渡す
+        """
         super().__init__("SpeakDrop", quit_button=None)
+        self.clock = clock or MainThreadClock()
 
         # 設定読み込み（REQ-017）
         self.config = Config().load()
 
         # コンポーネント初期化
-        self.audio_recorder = AudioRecorder()
-        self.transcriber = Transcriber(model_id=self.config.model)
+        self.audio_recorder = AudioRecorder(
+            clock=self.clock,
+            speech_threshold=self.config.speech_rms_threshold,
+            native_rate=self.config.native_rate_capture,
+        )
+        # 誤操作として認識せずに捨てた録音の件数（理由ごと）
+        self.skipped_utterances: Counter[str] = Counter()
+        # ハンズフリー入力（hotkey_mode が "toggle" / "continuous"）の発話終了検出
+        self.endpoint_detector = EndpointDetector(
+            speech_threshold=self.config.speech_rms_threshold,
+            trailing_silence=self.config.endpoint_silence,
+            max_duration=self.config.max_record_duration,
+            min_speech=self.config.min_speech_duration,
+        )
+        self.audio_recorder.add_block_listener(self._on_audio_block)
+        # continuous モードで次の発話の録音を自動で始めるか（ホットキーで開始・停止する）
+        self._continuous = False
+        self.transcriber: Transcriber | RemoteTranscriber
+        if self.config.transcription_server:
+            # モデルはサーバー側の設定（同じ config.json）でロードされる
+            self.transcriber = RemoteTranscriber()
+        else:
+            self.transcriber = Transcriber(
+                model_id=self.config.model,
+                compute_type=self.config.compute_type,
+                cpu_threads=self.config.cpu_threads,
+                num_workers=self.config.num_workers,
+                profile=self.config.decode_profile,
+                fast_model_id=self.config.fast_model,
+                route_min_duration=self.config.route_min_duration,
+                latency_budget=self.config.latency_budget,
+                hotwords=self.config.hotwords,
+            )
+        # 直近の認識結果を次の発話の文脈として引き継ぐ（context_chars = 0 の場合は無効）
+        self.transcript_context = TranscriptContext(
+            self.config.context_chars, self.config.context_idle_timeout, clock=self.clock
+        )
         self.text_processor = TextProcessor(model=self.config.ollama_model)
-        self.clipboard_inserter = ClipboardInserter()
+        # LLM 整形の実行スレッド（認識中に確定したセグメントを先行して整形する）
+        self._llm_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="speakdrop-llm")
+        # 整形待ちの単位をまとめて1回のリクエストで整形する
+        self.llm_coalescer = LlmCoalescer(
+            self._llm_executor, max_items=self.config.llm_batch_max_items
+        )
+        # 直近のレイテンシに応じて処理を軽くする（NFR-001, NFR-002）
+        self.slo = SloController(available_tiers(bool(self.config.fast_model)), clock=self.clock)
+        # 挿入バックエンド（macOS では NSPasteboard / CGEvent）
+        self.clipboard_inserter = create_inserter(
+            PASTE, self.clock, max_restore_bytes=self.config.clipboard_max_restore_bytes
+        )
+        self.keystroke_inserter = create_inserter(TYPE, self.clock)
         self.permission_checker = PermissionChecker()
 
-        # 状態管理
-        self.state = AppState.IDLE
+        # 状態管理（ホットキー・処理・メインスレッドから遷移するため compare-and-set で遷移する）
+        self.state_machine = StateMachine(AppState.IDLE, clock=self.clock)
+        self.state_machine.add_listener(self._on_state_change)
+        # 録音の開始・停止と RECORDING への出入りをまとめて行うためのロック
+        self._recording_lock = threading.RLock()
+        # メインスレッドでの UI 更新をまとめる（入力レベルの表示は level_meter_rate 回/秒まで）
+        self.ui_updater = UiUpdater(
+            self._call_on_main_later, self.clock, max_rate=self.config.level_meter_rate or 15.0
+        )
+        # 下書き（投機的挿入）を挿入した時刻と入力先アプリの ID。未挿入の場合は None
+        self._draft_inserted_at: float | None = None
+        self._draft_app_id = ""
+
+        # セッション記録（デバッグ用。録音音声を保存するため明示的に有効化した場合のみ）
+        self.session_recorder: SessionRecorder | None = None
+        if self.config.record_sessions:
+            self.session_recorder = SessionRecorder(new_session_path(), clock=self.clock)
+            self.audio_recorder.add_block_listener(self.session_recorder.record_audio)
 
         # メニュー構成（REQ-012）
         self.status_item = rumps.MenuItem("待機中", callback=None)
         self.status_item.set_callback(None)  # クリック不可
+        self.tier_item = rumps.MenuItem(self._tier_title(self.slo.tier), callback=None)
+        self.tier_item.set_callback(None)
 
         self.toggle_item = rumps.MenuItem(
             "音声入力 ON" if self.config.enabled else "音声入力 OFF",
             callback=self._toggle_enabled,
         )
 
+        # デコードプロファイル選択サブメニュー
+        self.profile_items = {
+            name: rumps.MenuItem(name, callback=self._select_decode_profile)
+            for name in DECODE_PROFILES
+        }
+        self._update_profile_items()
+
         self.menu = [
             self.status_item,
+            self.tier_item,
             None,  # セパレーター
             self.toggle_item,
             rumps.MenuItem("設定...", callback=self.open_settings),
+            (rumps.MenuItem("認識プロファイル"), list(self.profile_items.values())),
             None,  # セパレーター
             rumps.MenuItem("終了", callback=self._quit),
         ]
@@ -85,6 +179,22 @@ class SpeakDropApp(rumps.App):  # type: ignore[misc]
         if self.config.enabled:
             self._start_hotkey_listener()
 
+        # 重い依存の import と Ollama クライアントの生成は、最初の発話を待たせないよう
+        # アイコンの表示後（イベントループの開始後に callAfter が実行される）に済ませる
+        self.warmed_up = threading.Event()
+        self._call_on_main(self._run_in_background, self._warm_up)
+
+    def _warm_up(self) -> None:
+        """音声認識・テキスト後処理の依存を読み込む（バックグラウンドスレッドで実行される）。"""
+        try:
+            self.text_processor.warm_up()
+            self.transcriber.warm_up()
+        except Exception:
+            # 読み込めない場合は最初の処理時に改めて失敗し、通常のエラー処理に任せる
+            _logger.warning("起動時の依存の読み込みに失敗しました", exc_info=True)
+        finally:
+            self.warmed_up.set()
+
     def check_permissions(self) -> bool:
         """マイク・アクセシビリティ権限を確認する（REQ-021, REQ-022）。
 
@@ -101,6 +211,7 @@ class SpeakDropApp(rumps.App):  # type: ignore[misc]
             hotkey_key=self.config.hotkey,
             on_press=self.on_hotkey_press,
             on_release=self.on_hotkey_release,
+            clock=self.clock,
         )
         self.hotkey_listener.start()
 
@@ -114,32 +225,139 @@ class SpeakDropApp(rumps.App):  # type: ignore[misc]
         }
         self.status_item.title = state_labels[state]
 
+    def _apply_level_ui(self, rms: float, peak: float) -> None:
+        """録音中の入力レベルをメニューバーに表示する（メインスレッドで実行される）。"""
+        if self.state == AppState.RECORDING:
+            self.title = get_level_title(rms, peak)
+
+    @property
+    def state(self) -> AppState:
+        """現在の状態を返す。"""
+        return self.state_machine.state
+
     def set_state(self, state: AppState) -> None:
-        """状態を遷移し、UIをメインスレッドで更新する（NFR-007: 200ms以内）。"""
-        self.state = state
-        AppHelper.callAfter(self._apply_state_ui, state)
+        """現在の状態から state へ遷移する（遷移表に無い遷移は InvalidTransitionError）。"""
+        self.state_machine.set(state)
+
+    def _on_state_change(self, source: AppState, target: AppState) -> None:
+        """遷移ごとに記録し、UIをメインスレッドで更新する（NFR-007: 200ms以内）。"""
+        if self.session_recorder is not None:
+            self.session_recorder.record_state(target.name)
+        # 状態の表示は遅らせない（NFR-007）。反映前の状態遷移は最後の状態だけを表示する
+        self.ui_updater.publish("state", self._apply_state_ui, target, immediate=True)
+        if target == AppState.IDLE and self._continuous:
+            self._call_on_main(self._rearm)
+
+    def _call_on_main(self, func: Callable[..., Any], *args: Any) -> None:
+        """func(*args) をメインスレッドで実行するよう登録する。"""
+        AppHelper.callAfter(func, *args)
+
+    def _call_on_main_later(self, delay: float, func: Callable[[], None]) -> None:
+        """func() を delay 秒後にメインスレッドで実行するよう登録する（任意のスレッドから呼べる）。
+
+        MainThreadClock.call_later() は呼び出したスレッドの run loop にタイマーを登録するため、
+        run loop の無いスレッド（録音コールバックなど）から直接呼ぶとタイマーが実行されない。
+        先にメインスレッドへ移ってからタイマーを登録する。
+        """
+        if delay <= 0:
+            self._call_on_main(func)
+        else:
+            self._call_on_main(self.clock.call_later, delay, func)
+
+    def _run_in_background(self, target: Callable[..., Any], *args: Any) -> None:
+        """target(*args) をバックグラウンドスレッドで実行する。"""
+        threading.Thread(target=target, args=args, daemon=True).start()
 
     def on_hotkey_press(self) -> None:
         """ホットキー押下コールバック（REQ-001）。"""
+        if self.session_recorder is not None:
+            self.session_recorder.record_press()
         if not self.config.enabled:
             return
-        if self.state != AppState.IDLE:
+        if self.config.hotkey_mode != HOLD:
+            self._toggle_hands_free()
             return
-        self.set_state(AppState.RECORDING)
-        self.audio_recorder.start_recording()
+        self._start_recording()
 
     def on_hotkey_release(self) -> None:
         """ホットキー離放コールバック（REQ-002）。"""
+        if self.session_recorder is not None:
+            self.session_recorder.record_release()
+        if self.config.hotkey_mode != HOLD:
+            return  # ハンズフリー入力では発話の終了を EndpointDetector が判定する
+        self._end_utterance()
+
+    def _start_recording(self) -> bool:
+        """待機中であれば録音を開始する。
+
+        Returns:
+            録音を開始した場合は True（待機中でなかった場合は False）
+        """
+        with self._recording_lock:
+            if not self.state_machine.transition(AppState.IDLE, AppState.RECORDING):
+                return False
+            self.endpoint_detector.reset()
+            self.audio_recorder.start_recording()
+        return True
+
+    def _toggle_hands_free(self) -> None:
+        """ハンズフリー入力のホットキー押下: 待機中なら録音を始め、録音中なら発話を終える。
+
+        continuous モードでは録音の開始で自動再開を有効にし、録音中・処理中の押下で無効にする。
+        """
+        continuous = self.config.hotkey_mode == CONTINUOUS
+        if self._start_recording():
+            self._continuous = continuous
+            return
+        self._continuous = False
+        self._end_utterance()
+
+    def _rearm(self) -> None:
+        """continuous モードで、処理を終えて待機中に戻ったら次の発話の録音を始める。"""
+        if self._continuous and self.config.enabled:
+            self._start_recording()
+
+    def _on_audio_block(self, block: np.ndarray) -> None:
+        """録音ブロックごとに入力レベルを表示し、発話の終了を判定する（録音スレッドで呼ばれる）。"""
         if self.state != AppState.RECORDING:
             return
-        audio = self.audio_recorder.stop_recording()
-        self.set_state(AppState.PROCESSING)
-        thread = threading.Thread(
-            target=self.process_audio,
-            args=(audio,),
-            daemon=True,
-        )
-        thread.start()
+        rms, peak = self.audio_recorder.level
+        if self.config.level_meter_rate > 0:
+            self.ui_updater.publish("level", self._apply_level_ui, rms, peak)
+        if self.config.hotkey_mode != HOLD and self.endpoint_detector.feed(block, rms):
+            # 録音スレッドの中では録音を停止できないため、メインスレッドで停止する
+            self._call_on_main(self._end_utterance)
+
+    def _end_utterance(self) -> None:
+        """録音中であれば録音を停止し、録音した音声を認識に回す。"""
+        with self._recording_lock:
+            if self.state != AppState.RECORDING:
+                return
+            audio = self.audio_recorder.stop_recording()
+            reason = self._skip_reason(audio)
+            if reason:
+                # 誤操作による短い押下・無音の録音は Whisper / LLM に渡さない
+                self.skipped_utterances[reason] += 1
+                self.state_machine.transition(AppState.RECORDING, AppState.IDLE)
+                return
+            self.state_machine.transition(AppState.RECORDING, AppState.PROCESSING)
+        self._run_in_background(self.process_audio, audio)
+
+    def _skip_reason(self, audio: np.ndarray) -> str:
+        """録音を認識せずに捨てる理由を返す（認識する場合は空文字）。
+
+        Args:
+            audio: 録音音声データ
+        """
+        if self.config.min_record_duration > 0 and (
+            len(audio) / AudioRecorder.SAMPLE_RATE < self.config.min_record_duration
+        ):
+            return "too_short"
+        if self.config.min_speech_duration > 0 and (
+            self.audio_recorder.voiced_duration < self.config.min_speech_duration
+        ):
+            return "no_speech"
+        return ""
 
     def process_audio(self, audio: np.ndarray) -> None:
         """音声認識→テキスト後処理を実行する（別スレッドで動作）。
@@ -148,23 +366,245 @@ class SpeakDropApp(rumps.App):  # type: ignore[misc]
             audio: 録音音声データ
         """
         try:
-            text = self.transcriber.transcribe(audio)
-            if not text.strip():
+            if self.config.speculative_draft and self.config.fast_model:
+                try:
+                    self._process_speculative(audio)
+                finally:
+                    # 失敗して _upgrade_draft() が呼ばれない場合も下書きの記録を残さない
+                    # （メインスレッドで、登録済みの下書きの挿入・置き換えの後に実行する）
+                    self._call_on_main(self._clear_draft)
+                return
+            processed = self._transcribe_and_process(audio)
+            if not processed:
                 self.set_state(AppState.IDLE)
                 return
+            self._call_on_main(self._finish_processing, processed)
+        except Exception as e:
+            self._call_on_main(self._notify_error, e)
+            self.set_state(AppState.IDLE)
+
+    def _transcribe_and_process(self, audio: np.ndarray, **kwargs: Any) -> str:
+        """音声認識と LLM 整形を文単位で重ねて実行し、整形済みテキストを返す。
+
+        現在の品質段階（self.slo.tier）に従って認識モデル・LLM の出力長・整形の有無を選び、
+        段階別のレイテンシを SloController に記録する。
+
+        Args:
+            audio: 録音音声データ
+            **kwargs: Transcriber.transcribe() に渡す引数（model_id, prompt）
 
-            processor = self.text_processor  # ローカル参照でスレッド安全性を確保
-            processed = processor.process(text)
-            AppHelper.callAfter(self._finish_processing, processed)
+        Returns:
+            整形済みテキスト。認識結果が空の場合は空文字（LLM を呼ばない）
+        """
+        tier = self.slo.tier
+        if tier.fast_whisper and self.config.fast_model:
+            kwargs.setdefault("model_id", self.config.fast_model)
+        app_id = self._context_app_id()
+        if "prompt" not in kwargs:
+            self._add_context_prompt(kwargs, app_id)
+        pipeline = SegmentPipeline(
+            self._postprocessor(tier),
+            self.config.stream_unit_chars,
+            self._llm_executor,
+            submit=self._coalesced_postprocessor(tier),
+        )
+        start = self.clock.monotonic()
+        try:
+            text = self.transcriber.transcribe(audio, on_segment=pipeline.feed, **kwargs)
+        except Exception:
+            pipeline.cancel()
+            raise
+        if not text.strip():
+            pipeline.cancel()
+            return ""
+        self.transcript_context.add(text, app_id)
+        transcribed = self.clock.monotonic()
+        processed = pipeline.finish(text)
+        latencies = {"transcribe": transcribed - start}
+        if tier.use_llm:
+            # 認識と重なった分を除いた、認識完了後に待たされた時間
+            latencies["postprocess"] = self.clock.monotonic() - transcribed
+        self._observe_latencies(latencies)
+        return processed
+
+    def _observe_latencies(self, latencies: dict[str, float]) -> None:
+        """段階別のレイテンシを SloController に記録し、品質段階が変わればメニューに反映する。"""
+        if self.config.latency_slo and self.slo.observe(latencies) is not None:
+            self._call_on_main(self._apply_tier_ui)
+
+    def _context_app_id(self) -> str:
+        """文脈の破棄の判定に使う入力先（最前面）アプリの ID を返す。
+
+        文脈を引き継がない設定、または macOS 以外では空文字（アプリの変更を判定しない）。
+        """
+        if self.config.context_chars <= 0:
+            return ""
+        return self._frontmost_app_id()
+
+    def _frontmost_app_id(self) -> str:
+        """最前面のアプリの ID を返す（macOS 以外では空文字）。"""
+        if sys.platform != "darwin":
+            return ""
+        from speakdrop.clipboard_inserter import frontmost_app_id  # noqa: PLC0415
+
+        return frontmost_app_id()
+
+    def _add_context_prompt(self, kwargs: dict[str, Any], app_id: str) -> None:
+        """引き継ぐ文脈があれば Transcriber.transcribe() の引数 prompt に設定する。"""
+        prompt = self.transcript_context.prompt(app_id)
+        if prompt:
+            kwargs["prompt"] = prompt
+
+    def _postprocessor(self, tier: Tier) -> Callable[[str], str]:
+        """品質段階に応じた LLM 整形の関数を返す（整形を省略する段階では恒等関数）。"""
+        if not tier.use_llm:
+            return lambda text: text
+        processor = self.text_processor  # ローカル参照でスレッド安全性を確保
+        if tier.num_predict is None:
+            return processor.process
+        return partial(processor.process, num_predict=tier.num_predict)
+
+    def _coalesced_postprocessor(self, tier: Tier) -> Callable[[str], Future[str]] | None:
+        """整形待ちの単位をまとめて整形する投入関数を返す（まとめない場合は None）。"""
+        if not tier.use_llm or self.config.llm_batch_max_items <= 1:
+            return None
+        return partial(
+            self.llm_coalescer.submit,
+            processor=self.text_processor,
+            num_predict=tier.num_predict or TextProcessor.NUM_PREDICT,
+        )
+
+    def _tier_title(self, tier: Tier) -> str:
+        """品質段階のメニュー表示を返す。"""
+        return f"品質: {tier.label}"
+
+    def _apply_tier_ui(self) -> None:
+        """品質段階の表示を更新する（メインスレッドで実行される）。"""
+        self.tier_item.title = self._tier_title(self.slo.tier)
+
+    def _notify_error(self, error: Exception) -> None:
+        """音声処理の失敗を通知する（メインスレッドで実行される）。"""
+        rumps.notification(
+            title="SpeakDrop エラー",
+            subtitle="音声処理に失敗しました",
+            message=str(error),
+        )
+
+    def _process_speculative(self, audio: np.ndarray) -> None:
+        """高速モデルの下書きを先に挿入し、精度優先モデル + LLM の結果で置き換える。
+
+        Args:
+            audio: 録音音声データ
+        """
+        tier = self.slo.tier
+        app_id = self._context_app_id()
+        kwargs: dict[str, Any] = {}
+        self._add_context_prompt(kwargs, app_id)
+        start = self.clock.monotonic()
+        draft = self.transcriber.transcribe(audio, model_id=self.config.fast_model, **kwargs)
+        if draft.strip():
+            self._call_on_main(self._insert_draft, draft)
+
+        if tier.fast_whisper:
+            # 高速認識の段階では下書きを認識結果とし、精度優先モデルで認識し直さない
+            processed = self._process_draft(draft, tier, app_id, self.clock.monotonic() - start)
+        else:
+            processed = self._transcribe_and_process(audio, model_id=self.config.model, **kwargs)
+        self._call_on_main(self._upgrade_draft, draft, processed)
+
+    def _process_draft(self, draft: str, tier: Tier, app_id: str, transcribe_time: float) -> str:
+        """高速モデルの下書きを品質段階に従って整形し、レイテンシを記録する。
+
+        Args:
+            draft: 高速モデルの認識結果
+            tier: 現在の品質段階
+            app_id: 入力先アプリの ID（文脈の引き継ぎ用）
+            transcribe_time: 下書きの認識にかかった時間（秒）
+
+        Returns:
+            整形済みテキスト。下書きが空の場合は空文字
+        """
+        if not draft.strip():
+            return ""
+        self.transcript_context.add(draft, app_id)
+        start = self.clock.monotonic()
+        processed = self._postprocessor(tier)(draft)
+        latencies = {"transcribe": transcribe_time}
+        if tier.use_llm:
+            latencies["postprocess"] = self.clock.monotonic() - start
+        self._observe_latencies(latencies)
+        return processed
+
+    def _insert_draft(self, draft: str) -> None:
+        """下書きをメインスレッドで挿入する。"""
+        self._ignore_synthetic_input()
+        try:
+            self._inserter_for(draft).insert(draft)
         except Exception as e:
-            AppHelper.callAfter(
-                rumps.notification,
-                title="SpeakDrop エラー",
-                subtitle="音声処理に失敗しました",
-                message=str(e),
-            )
+            self._notify_error(e)
+            return
+        self._ignore_synthetic_input()
+        self._draft_inserted_at = self.clock.monotonic()
+        self._draft_app_id = self._frontmost_app_id()
+
+    def _clear_draft(self) -> None:
+        """下書きの記録を消す（メインスレッドで実行される）。"""
+        self._draft_inserted_at = None
+        self._draft_app_id = ""
+
+    def _upgrade_draft(self, draft: str, text: str) -> None:
+        """挿入済みの下書きを最終結果に置き換える（メインスレッドで実行される）。
+
+        下書きの挿入後にユーザーが入力した・入力先が変わった場合は、編集を壊さないよう置き換えを中止する。
+
+        Args:
+            draft: 挿入済みの下書き
+            text: 置き換え後のテキスト
+        """
+        inserted_at = self._draft_inserted_at
+        self._draft_inserted_at = None
+        if inserted_at is None:
+            if text.strip():
+                self._finish_processing(text)
+            else:
+                self.set_state(AppState.IDLE)
+            return
+        try:
+            final = text if text.strip() else ""
+            inserter = self._inserter_for(final)
+            if self._draft_intact(inserter, draft, inserted_at):
+                self._ignore_synthetic_input()
+                inserter.replace(draft, final)
+        except Exception as e:
+            self._notify_error(e)
+        finally:
             self.set_state(AppState.IDLE)
 
+    def _ignore_synthetic_input(self) -> None:
+        """自分で送信するキーイベントをユーザー入力として数えないようにする。"""
+        if hasattr(self, "hotkey_listener"):
+            self.hotkey_listener.ignore_input_for(self.SYNTHETIC_INPUT_GRACE)
+
+    def _draft_intact(self, inserter: TextInserter, draft: str, inserted_at: float) -> bool:
+        """挿入した下書きが入力先のカーソルの直前にそのまま残っているか判定する。
+
+        下書きの挿入直後の SYNTHETIC_INPUT_GRACE 秒はキー入力の監視が自分のキーイベントと
+        区別できずユーザー入力も数えないため、入力先のテキストを読み取れる場合はそれで確かめる。
+        読み取れない場合は、入力先のアプリが変わっていないことを条件にする。
+        """
+        if self._user_typed_since(inserted_at):
+            return False
+        if self._frontmost_app_id() != self._draft_app_id:
+            return False
+        before_cursor = inserter.focused_text()
+        return before_cursor is None or before_cursor.endswith(draft)
+
+    def _user_typed_since(self, timestamp: float) -> bool:
+        """timestamp 以降にユーザーがキー入力したか判定する。"""
+        if not hasattr(self, "hotkey_listener"):
+            return False
+        return bool(self.hotkey_listener.last_user_input > timestamp)
+
     def _finish_processing(self, text: str) -> None:
         """クリップボード挿入と状態リセットをメインスレッドで実行する。
 
@@ -172,16 +612,22 @@ class SpeakDropApp(rumps.App):  # type: ignore[misc]
             text: 挿入するテキスト
         """
         try:
-            self.clipboard_inserter.insert(text)
+            self._inserter_for(text).insert(text)
         except Exception as e:
-            rumps.notification(
-                title="SpeakDrop エラー",
-                subtitle="音声処理に失敗しました",
-                message=str(e),
-            )
+            self._notify_error(e)
         finally:
             self.set_state(AppState.IDLE)
 
+    def _inserter_for(self, text: str) -> TextInserter:
+        """テキストの長さに応じて挿入方法を選ぶ。
+
+        type_max_chars 文字以下の1行のテキストはキー入力（クリップボードの退避・復元が不要）、
+        それ以外はクリップボード経由の貼り付けで挿入する。
+        """
+        if len(text) <= self.config.type_max_chars and "\n" not in text:
+            return self.keystroke_inserter
+        return self.clipboard_inserter
+
     def _toggle_enabled(self, sender: rumps.MenuItem) -> None:
         """音声入力の有効/無効を切り替える（REQ-012）。"""
         if not self.config.enabled and not self.check_permissions():
@@ -194,6 +640,7 @@ class SpeakDropApp(rumps.App):  # type: ignore[misc]
 
         self.config.enabled = not self.config.enabled
         self.config.save()
+        self._continuous = False
 
         if self.config.enabled:
             self._start_hotkey_listener()
@@ -203,6 +650,28 @@ class SpeakDropApp(rumps.App):  # type: ignore[misc]
                 self.hotkey_listener.stop()
             self.toggle_item.title = "音声入力 OFF"
 
+    def _update_profile_items(self) -> None:
+        """プロファイル項目のチェック状態と実測値（bench-whisper の結果）を更新する。"""
+        stats = load_profile_stats()
+        for name, item in self.profile_items.items():
+            measured = stats.get(name)
+            if measured and "median_latency" in measured and "cer" in measured:
+                item.title = (
+                    f"{name}（{measured['median_latency']:.2f}秒 / CER {measured['cer']:.1%}）"
+                )
+            else:
+                item.title = f"{name}（未計測）"
+            item.state = name == self.config.decode_profile
+
+    def _select_decode_profile(self, sender: rumps.MenuItem) -> None:
+        """デコードプロファイルを切り替える。"""
+        name = next(n for n, item in self.profile_items.items() if item is sender)
+        if name != self.config.decode_profile:
+            self.config.decode_profile = name
+            self.config.save()
+            self.transcriber.set_profile(name)
+        self._update_profile_items()
+
     def _show_setting_dialog(
         self,
         *,
@@ -362,4 +831,10 @@ class SpeakDropApp(rumps.App):  # type: ignore[misc]
         """アプリケーションを終了する。"""
         if hasattr(self, "hotkey_listener"):
             self.hotkey_listener.stop()
+        self._llm_executor.shutdown(wait=False, cancel_futures=True)
+        self.clipboard_inserter.restore()  # 復元待ちのクリップボードを戻してから終了
+        if self.session_recorder is not None:
+            self.session_recorder.close()
+        if isinstance(self.transcriber, RemoteTranscriber):
+            self.transcriber.close()  # サーバーはモデルを保持したまま残す
         rumps.quit_application()
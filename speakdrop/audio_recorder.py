@@ -1,14 +1,31 @@
 """音声録音モジュール。
 
 sounddevice を使って16kHz/Mono/16bit PCM形式でマイク録音を行う。
+native_rate を指定した場合はマイクのネイティブのサンプルレートで録音し、
+録音ブロックごとに StreamingResampler で 16kHz へ変換する。
 録音データはメモリ上にのみ保持し、stop_recording() 後に破棄する（NFR-006）。
+録音ブロックごとに RMS とピークを計算し、発話とみなせる音量のブロックの長さを数える
+（誤って短く押しただけの録音を認識前に除外するため）。直近のブロックの音量は
+メニューバーの入力レベル表示に使う。
 """
 
+from __future__ import annotations
+
 import threading
-from typing import Any
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from speakdrop.clock import Clock, SystemClock
+from speakdrop.lazy import lazy_module
+from speakdrop.resampler import StreamingResampler
 
-import numpy as np
-import sounddevice as sd
+if TYPE_CHECKING:
+    import numpy as np
+    import sounddevice as sd
+else:
+    # PortAudio の初期化を伴うため、最初の録音開始まで import を遅らせる
+    np = lazy_module("numpy")
+    sd = lazy_module("sounddevice")
 
 
 class AudioRecorder:
@@ -17,12 +34,43 @@ class AudioRecorder:
     SAMPLE_RATE: int = 16000
     CHANNELS: int = 1
     DTYPE: str = "int16"
+    SPEECH_THRESHOLD: float = 200.0  # 発話とみなすブロックの RMS（int16 の振幅。約 -44 dBFS）
+
+    def __init__(
+        self,
+        clock: Clock | None = None,
+        speech_threshold: float = SPEECH_THRESHOLD,
+        native_rate: bool = False,
+    ) -> None:
+        """AudioRecorder を初期化する。
 
-    def __init__(self) -> None:
-        """AudioRecorder を初期化する。"""
+        Args:
+            clock: 録音時間の計測に使う時計（デフォルト: SystemClock）
+            speech_threshold: 発話とみなす録音ブロックの RMS（int16 の振幅）
+            native_rate: True の場合は入力デバイスのネイティブのサンプルレートで録音し、
+                録音ブロックごとに SAMPLE_RATE へ変換する
+        """
+        self._clock = clock or SystemClock()
+        self.speech_threshold = speech_threshold
+        self.native_rate = native_rate
+        self.capture_rate = self.SAMPLE_RATE  # 現在（または直前）の録音のサンプルレート
+        self._resampler: StreamingResampler | None = None
+        self._started_at: float | None = None
         self._frames: list[np.ndarray] = []
+        self._voiced_samples = 0  # RMS が speech_threshold 以上のブロックのサンプル数
+        # 直近の録音ブロックの (RMS, ピーク)（int16 の振幅）
+        self.level: tuple[float, float] = (0.0, 0.0)
         self._lock = threading.Lock()
         self._stream: sd.InputStream | None = None
+        # 録音ブロックごとに呼ばれるリスナー（セッション記録など）
+        self._block_listeners: list[Callable[[np.ndarray], None]] = []
+
+    def add_block_listener(self, listener: Callable[[np.ndarray], None]) -> None:
+        """録音ブロック（1次元 int16）を受け取るリスナーを登録する。
+
+        リスナーは sounddevice のコールバックスレッドから呼ばれるため、重い処理は行わないこと。
+        """
+        self._block_listeners.append(listener)
 
     def _audio_callback(
         self,
@@ -33,10 +81,21 @@ class AudioRecorder:
     ) -> None:
         """sounddevice コールバック関数。
 
-        録音データをバッファに追加する。
+        録音データを（必要なら 16kHz へ変換して）バッファに追加する。
         """
+        block = indata.copy().flatten()
+        if self._resampler is not None:
+            block = self._resampler.process(block)
+            if not len(block):
+                return
+        self.level = block_level(block)
+        voiced = self.level[0] >= self.speech_threshold
         with self._lock:
-            self._frames.append(indata.copy().flatten())
+            self._frames.append(block)
+            if voiced:
+                self._voiced_samples += len(block)
+        for listener in self._block_listeners:
+            listener(block)
 
     def start_recording(self) -> None:
         """録音を開始する。
@@ -47,15 +106,19 @@ class AudioRecorder:
             self._stream.stop()
             self._stream.close()
             self._stream = None
-        with self._lock:
-            self._frames = []
+        self._clear()
+        self.capture_rate = self._input_rate() if self.native_rate else self.SAMPLE_RATE
+        self._resampler = None
+        if self.capture_rate != self.SAMPLE_RATE:
+            self._resampler = StreamingResampler(self.capture_rate, self.SAMPLE_RATE)
         self._stream = sd.InputStream(
-            samplerate=self.SAMPLE_RATE,
+            samplerate=self.capture_rate,
             channels=self.CHANNELS,
             dtype=self.DTYPE,
             callback=self._audio_callback,
         )
         self._stream.start()
+        self._started_at = self._clock.monotonic()
 
     def stop_recording(self) -> np.ndarray:
         """録音を停止し、録音データを返す。
@@ -70,7 +133,46 @@ class AudioRecorder:
             self._stream.stop()
             self._stream.close()
             self._stream = None
+        self._started_at = None
+        if self._resampler is not None:
+            # フィルタの遅延分として残っている末尾を取り出す（コールバックは停止済み）
+            tail = self._resampler.flush()
+            self._resampler = None
+            if len(tail):
+                with self._lock:
+                    self._frames.append(tail)
+        return self._drain()
+
+    def _input_rate(self) -> int:
+        """入力デバイスのネイティブのサンプルレートを返す（取得できなければ SAMPLE_RATE）。"""
+        try:
+            rate = int(sd.query_devices(kind="input")["default_samplerate"])
+        except (sd.PortAudioError, KeyError, TypeError, ValueError):
+            return self.SAMPLE_RATE
+        return rate if rate > 0 else self.SAMPLE_RATE
+
+    @property
+    def voiced_duration(self) -> float:
+        """現在（または直前）の録音のうち、発話とみなせる音量のブロックの長さ（秒）を返す。"""
+        with self._lock:
+            return self._voiced_samples / self.SAMPLE_RATE
+
+    @property
+    def elapsed(self) -> float:
+        """録音開始からの経過時間（秒）を返す。録音中でない場合は 0.0。"""
+        if self._started_at is None:
+            return 0.0
+        return self._clock.monotonic() - self._started_at
+
+    def _clear(self) -> None:
+        """録音バッファと発話の計測値をクリアする。"""
+        with self._lock:
+            self._frames = []
+            self._voiced_samples = 0
+        self.level = (0.0, 0.0)
 
+    def _drain(self) -> np.ndarray:
+        """バッファの録音データを連結して返し、バッファをクリアする（NFR-006）。"""
         with self._lock:
             if not self._frames:
                 return np.array([], dtype=np.int16)
@@ -78,3 +180,20 @@ class AudioRecorder:
             self._frames = []  # NFR-006: メモリから破棄
 
         return result
+
+
+def block_rms(block: np.ndarray) -> float:
+    """録音ブロック（int16）の RMS を返す。空の場合は 0.0。"""
+    return block_level(block)[0]
+
+
+def block_level(block: np.ndarray) -> tuple[float, float]:
+    """録音ブロック（int16）の RMS とピーク（振幅の絶対値の最大）を返す。空の場合は 0.0。
+
+    float32 に変換してから計算する（int16 のままでは二乗和や abs(-32768) が桁あふれする）。
+    """
+    if not len(block):
+        return 0.0, 0.0
+    samples = block.astype(np.float32)
+    rms = float(np.sqrt(np.dot(samples, samples) / len(samples)))
+    return rms, float(max(samples.max(), -samples.min()))
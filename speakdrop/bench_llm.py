@@ -0,0 +1,248 @@
+"""Ollama モデルの計測・推奨モジュール。
+
+コマンド:
+    uv run speakdrop bench-llm
+
+同梱の日本語書き起こしコーパスをローカルにインストール済みの各モデルで TextProcessor に
+通し、初回トークンまでの時間（TTFT）・生成速度（tokens/s）・全体のレイテンシと、
+正解の整形結果に対する忠実度を計測する。忠実度の条件を満たし NFR-002（3秒）以内に
+収まるモデルのうち最速のものを推奨し、Config の ollama_model に保存する。
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+import unicodedata
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from speakdrop.benchmark import edit_distance, percentile
+from speakdrop.config import CONFIG_PATH, Config
+from speakdrop.lazy import lazy_module
+from speakdrop.slo import STAGE_BUDGETS
+from speakdrop.text_processor import TextProcessor
+
+if TYPE_CHECKING:
+    import ollama
+else:
+    ollama = lazy_module("ollama")
+
+# 評価用コーパス（Whisper の書き起こし風の入力, 整形の正解）
+BENCH_TRANSCRIPTS: tuple[tuple[str, str], ...] = (
+    ("今日は天気がいいので散歩に行きます", "今日は天気がいいので散歩に行きます。"),
+    ("明日の会議は午後三時から始まります", "明日の会議は午後三時から始まります。"),
+    (
+        "この資料なんだけど来週までに確認してもらえるかな",
+        "この資料ですが、来週までに確認していただけますか。",
+    ),
+    (
+        "えっと新しいプロジェクトの計画について相談したいことがあるんだけど",
+        "新しいプロジェクトの計画について相談したいことがあるのですが。",
+    ),
+    (
+        "音声入力を使うと文章を速く書けるからすごく便利だよね",
+        "音声入力を使うと文章を速く書けるので、とても便利です。",
+    ),
+    (
+        "それでさ昨日の打ち合わせの件だけどやっぱり予算が足りないみたい",
+        "昨日の打ち合わせの件ですが、やはり予算が足りないようです。",
+    ),
+    ("駅に着いたら連絡してください", "駅に着いたら連絡してください。"),
+    (
+        "レビューのコメントは全部直したのでもう一回見てもらえますか",
+        "レビューのコメントはすべて修正したので、もう一度見ていただけますか。",
+    ),
+)
+
+# 推奨するモデルのレイテンシ上限（p95, 秒）
+LATENCY_BUDGET = STAGE_BUDGETS["postprocess"]  # NFR-002
+
+
+@dataclass(frozen=True)
+class LlmRun:
+    """1リクエストの計測値。"""
+
+    ttft: float  # 初回トークンまでの時間（秒）
+    latency: float  # 全体の時間（秒）
+    tokens: int  # 生成されたトークン（断片）数
+    output: str
+
+    @property
+    def tokens_per_second(self) -> float:
+        """初回トークン以降の生成速度（tokens/s）。"""
+        generation = self.latency - self.ttft
+        if self.tokens <= 1 or generation <= 0:
+            return 0.0
+        return (self.tokens - 1) / generation
+
+
+@dataclass
+class LlmBenchResult:
+    """1モデルの計測結果。"""
+
+    model: str
+    median_ttft: float  # 秒
+    median_tokens_per_second: float
+    median_latency: float  # 秒
+    p95_latency: float  # 秒
+    fidelity: float  # 正解に対する平均の忠実度（1.0 = 完全一致）
+    errors: int = 0  # 失敗したリクエスト数
+
+
+def text_fidelity(reference: str, output: str) -> float:
+    """output の reference に対する忠実度（1 - 句読点を含めた文字誤り率、0.0〜1.0）を返す。
+
+    CER と異なり句読点を評価に含める（句読点の挿入も整形の目的のため）。空白は無視する。
+    """
+    ref = "".join(unicodedata.normalize("NFKC", reference).split())
+    out = "".join(unicodedata.normalize("NFKC", output).split())
+    if not ref:
+        return 1.0 if not out else 0.0
+    return max(0.0, 1.0 - edit_distance(ref, out) / len(ref))
+
+
+def measure_request(
+    processor: TextProcessor, text: str, timer: Callable[[], float] = time.perf_counter
+) -> LlmRun:
+    """1件の書き起こしを整形し、TTFT・全体の時間・トークン数を計測する。"""
+    start = timer()
+    ttft: float | None = None
+    pieces: list[str] = []
+    for piece in processor.stream(text):
+        if ttft is None:
+            ttft = timer() - start
+        pieces.append(piece)
+    latency = timer() - start
+    return LlmRun(ttft if ttft is not None else latency, latency, len(pieces), "".join(pieces))
+
+
+def measure_model(
+    model: str, corpus: tuple[tuple[str, str], ...] | None = None, repeats: int = 1
+) -> LlmBenchResult:
+    """1モデルでコーパスを整形して計測する（最初の1件はモデルのロードを除くためのウォームアップ）。
+
+    corpus を省略した場合は BENCH_TRANSCRIPTS を使う。
+    失敗したリクエストは errors に数え、忠実度 0 として扱う。
+    """
+    corpus = corpus or BENCH_TRANSCRIPTS
+    processor = TextProcessor(model=model)
+    try:
+        measure_request(processor, corpus[0][0])
+    except Exception:
+        pass  # 失敗は本計測で数える
+    runs: list[LlmRun] = []
+    scores: list[float] = []
+    errors = 0
+    for _ in range(repeats):
+        for text, reference in corpus:
+            try:
+                run = measure_request(processor, text)
+            except Exception:
+                errors += 1
+                scores.append(0.0)
+                continue
+            runs.append(run)
+            scores.append(text_fidelity(reference, run.output))
+    latencies = [run.latency for run in runs]
+    return LlmBenchResult(
+        model=model,
+        median_ttft=statistics.median(run.ttft for run in runs) if runs else 0.0,
+        median_tokens_per_second=(
+            statistics.median(run.tokens_per_second for run in runs) if runs else 0.0
+        ),
+        median_latency=statistics.median(latencies) if latencies else 0.0,
+        p95_latency=percentile(latencies, 95),
+        fidelity=statistics.fmean(scores) if scores else 0.0,
+        errors=errors,
+    )
+
+
+def installed_models() -> list[str]:
+    """ローカルの Ollama にインストール済みのモデル名を返す。"""
+    client = ollama.Client(host=TextProcessor.OLLAMA_HOST, timeout=TextProcessor.TIMEOUT)
+    return sorted(str(model.model) for model in client.list().models if model.model)
+
+
+def select_best(
+    results: list[LlmBenchResult],
+    max_fidelity_drop: float,
+    latency_budget: float = LATENCY_BUDGET,
+) -> LlmBenchResult | None:
+    """最も忠実度の高いモデルから max_fidelity_drop 以内、かつ p95 が latency_budget 以内の
+    モデルのうち最速のものを返す。条件を満たすモデルが無い場合は None。
+    """
+    usable = [r for r in results if r.errors == 0]
+    if not usable:
+        return None
+    bound = max(r.fidelity for r in usable) - max_fidelity_drop
+    candidates = [r for r in usable if r.fidelity >= bound and r.p95_latency <= latency_budget]
+    if not candidates:
+        return None
+    return min(candidates, key=lambda r: r.median_latency)
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="speakdrop bench-llm",
+        description="Ollama モデルの速度と整形の忠実度を計測し、推奨モデルを保存する",
+    )
+    parser.add_argument(
+        "--models", help="計測するモデル（カンマ区切り。デフォルト: インストール済みの全モデル）"
+    )
+    parser.add_argument("--repeats", type=int, default=1, help="コーパスの繰り返し回数")
+    parser.add_argument(
+        "--max-fidelity-drop",
+        type=float,
+        default=0.05,
+        help="最良の忠実度からの許容低下幅（デフォルト: 0.05）",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="結果を表示のみ行い保存しない")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str], config_path: Path = CONFIG_PATH) -> int:
+    """bench-llm コマンドを実行する。
+
+    Returns:
+        終了コード（計測するモデルが無い、または条件を満たすモデルが無い場合は 1）
+    """
+    args = _parse_args(argv)
+    config = Config().load(config_path)
+    if args.models:
+        models = [m.strip() for m in args.models.split(",") if m.strip()]
+    else:
+        try:
+            models = installed_models()
+        except Exception as e:
+            print(f"Ollama からモデル一覧を取得できません: {e}")
+            return 1
+    if not models:
+        print("計測するモデルがありません（ollama pull でモデルを取得してください）")
+        return 1
+
+    print(f"{len(models)} モデルを {len(BENCH_TRANSCRIPTS)} 件の書き起こしで計測します")
+    results = []
+    for model in models:
+        result = measure_model(model, repeats=args.repeats)
+        results.append(result)
+        print(
+            f"  {model:<24} TTFT={result.median_ttft:.2f}s "
+            f"{result.median_tokens_per_second:.1f} tok/s  median={result.median_latency:.2f}s "
+            f"p95={result.p95_latency:.2f}s 忠実度={result.fidelity:.3f}"
+            + (f" エラー={result.errors}" if result.errors else "")
+        )
+
+    best = select_best(results, args.max_fidelity_drop)
+    if best is None:
+        print(f"忠実度と p95 {LATENCY_BUDGET:.0f} 秒以内の条件を満たすモデルがありません")
+        return 1
+    print(f"推奨モデル: {best.model}")
+    if not args.dry_run:
+        config.ollama_model = best.model
+        config.save(config_path)
+        print(f"{config_path} に保存しました")
+    return 0
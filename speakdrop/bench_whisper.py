@@ -0,0 +1,368 @@
+"""Whisper 推論設定の自動チューニングモジュール。
+
+コマンド:
+    uv run speakdrop bench-whisper
+
+compute_type / cpu_threads / num_workers の組み合わせごとに評価用音声セットの
+認識時間を計測し、精度条件を満たす最速の設定を Config に保存する。
+続けて各デコードプロファイルのレイテンシと CER を計測し、PROFILE_STATS_PATH に記録する。
+最後に発話をまたぐ文脈（initial_prompt・hotwords）の有無による CER とレイテンシの差を表示する。
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import product
+from pathlib import Path
+
+from speakdrop.benchmark import (
+    AudioSample,
+    character_error_rate,
+    load_benchmark_audio,
+    percentile,
+)
+from speakdrop.config import CONFIG_PATH, PROFILE_STATS_PATH, Config, save_profile_stats
+from speakdrop.context import TranscriptContext
+from speakdrop.transcriber import DECODE_PROFILES, DEFAULT_PROFILE, Transcriber
+
+COMPUTE_TYPES: tuple[str, ...] = ("int8", "int8_float32", "float32")
+# 精度の基準とする compute_type（量子化なし）とデコードプロファイル
+REFERENCE_COMPUTE_TYPE = "float32"
+REFERENCE_PROFILE = "accurate"
+
+
+@dataclass(frozen=True)
+class WhisperSettings:
+    """Whisper の推論設定の組み合わせ。"""
+
+    compute_type: str
+    cpu_threads: int
+    num_workers: int
+
+
+@dataclass
+class WhisperBenchResult:
+    """1つの推論設定の計測結果。"""
+
+    settings: WhisperSettings
+    median_latency: float  # 1発話あたりの認識時間の中央値（秒）
+    p95_latency: float  # 同 95 パーセンタイル（秒）
+    cer: float = 0.0  # 正解テキスト（または基準設定の出力）に対する平均 CER
+
+
+def default_thread_options() -> list[int]:
+    """計測する cpu_threads の候補（0 = 既定値, 半分, 全コア）を返す。"""
+    cpu_count = os.cpu_count() or 1
+    return sorted({0, max(1, cpu_count // 2), cpu_count})
+
+
+def measure_settings(
+    model_id: str,
+    settings: WhisperSettings,
+    samples: list[AudioSample],
+    profile: str = DEFAULT_PROFILE,
+) -> tuple[list[float], list[str]]:
+    """1つの推論設定で音声セットを認識し、発話ごとの時間と認識結果を返す。
+
+    num_workers > 1 の場合は num_workers 本のスレッドから同時に認識する。
+    """
+    transcriber = Transcriber(
+        model_id=model_id,
+        compute_type=settings.compute_type,
+        cpu_threads=settings.cpu_threads,
+        num_workers=settings.num_workers,
+        profile=profile,
+    )
+    transcriber.transcribe(samples[0].audio)  # ウォームアップ（モデルロードを計測から除外）
+
+    def timed(sample: AudioSample) -> tuple[float, str]:
+        start = time.perf_counter()
+        text = transcriber.transcribe(sample.audio)
+        return time.perf_counter() - start, text
+
+    with ThreadPoolExecutor(max_workers=settings.num_workers) as executor:
+        results = list(executor.map(timed, samples))
+    return [latency for latency, _ in results], [text for _, text in results]
+
+
+def _references(samples: list[AudioSample], baseline_texts: list[str]) -> list[str]:
+    """正解テキストの無いサンプルは基準設定の認識結果を正解とみなす。"""
+    return [
+        sample.reference if sample.reference is not None else baseline
+        for sample, baseline in zip(samples, baseline_texts, strict=True)
+    ]
+
+
+def _mean_cer(references: list[str], texts: list[str]) -> float:
+    return statistics.fmean(
+        character_error_rate(ref, hyp) for ref, hyp in zip(references, texts, strict=True)
+    )
+
+
+def run_benchmark(
+    model_id: str,
+    samples: list[AudioSample],
+    compute_types: list[str],
+    thread_options: list[int],
+    worker_options: list[int],
+    profile: str = DEFAULT_PROFILE,
+) -> list[WhisperBenchResult]:
+    """全組み合わせを計測して結果を返す。
+
+    正解テキストの無いサンプルは、基準設定（REFERENCE_COMPUTE_TYPE、無ければ先頭の設定）の
+    認識結果を正解とみなして CER を計算する。
+    """
+    grid = [
+        WhisperSettings(compute_type, threads, workers)
+        for compute_type, threads, workers in product(compute_types, thread_options, worker_options)
+    ]
+    measured: dict[WhisperSettings, tuple[list[float], list[str]]] = {}
+    for settings in grid:
+        measured[settings] = measure_settings(model_id, settings, samples, profile)
+        latencies = measured[settings][0]
+        print(
+            f"  {settings.compute_type:<13} threads={settings.cpu_threads:<3} "
+            f"workers={settings.num_workers}  median={statistics.median(latencies):.2f}s"
+        )
+
+    reference_settings = next(
+        (s for s in grid if s.compute_type == REFERENCE_COMPUTE_TYPE), grid[0]
+    )
+    references = _references(samples, measured[reference_settings][1])
+    return [
+        WhisperBenchResult(
+            settings=settings,
+            median_latency=statistics.median(latencies),
+            p95_latency=percentile(latencies, 95),
+            cer=_mean_cer(references, texts),
+        )
+        for settings, (latencies, texts) in measured.items()
+    ]
+
+
+def measure_profiles(
+    model_id: str, settings: WhisperSettings, samples: list[AudioSample]
+) -> dict[str, dict[str, float]]:
+    """各デコードプロファイルのレイテンシと CER を計測する。
+
+    正解テキストの無いサンプルは REFERENCE_PROFILE の認識結果を正解とみなす。
+
+    Returns:
+        プロファイル名 → {"median_latency", "p95_latency", "cer"}
+    """
+    measured = {
+        profile: measure_settings(model_id, settings, samples, profile)
+        for profile in DECODE_PROFILES
+    }
+    references = _references(samples, measured[REFERENCE_PROFILE][1])
+    return {
+        profile: {
+            "median_latency": statistics.median(latencies),
+            "p95_latency": percentile(latencies, 95),
+            "cer": _mean_cer(references, texts),
+        }
+        for profile, (latencies, texts) in measured.items()
+    }
+
+
+def measure_context(
+    model_id: str,
+    settings: WhisperSettings,
+    samples: list[AudioSample],
+    context_chars: int,
+    hotwords: str = "",
+    profile: str = DEFAULT_PROFILE,
+) -> dict[str, dict[str, float]]:
+    """文脈の引き継ぎの有無で音声セットを順に認識し、レイテンシと CER を計測する。
+
+    "with" では直前までの認識結果の末尾 context_chars 文字と hotwords を渡す。
+    正解テキストの無いサンプルは文脈なしの認識結果を正解とみなす。
+
+    Returns:
+        "without" / "with" → {"median_latency", "p95_latency", "cer"}
+    """
+    measured: dict[str, tuple[list[float], list[str]]] = {}
+    for mode, chars, words in (("without", 0, ""), ("with", context_chars, hotwords)):
+        transcriber = Transcriber(
+            model_id=model_id,
+            compute_type=settings.compute_type,
+            cpu_threads=settings.cpu_threads,
+            num_workers=settings.num_workers,
+            profile=profile,
+            hotwords=words,
+        )
+        transcriber.transcribe(samples[0].audio)  # ウォームアップ
+        context = TranscriptContext(chars, idle_timeout=0)
+        latencies: list[float] = []
+        texts: list[str] = []
+        for sample in samples:
+            start = time.perf_counter()
+            text = transcriber.transcribe(sample.audio, prompt=context.prompt())
+            latencies.append(time.perf_counter() - start)
+            context.add(text)
+            texts.append(text)
+        measured[mode] = (latencies, texts)
+    references = _references(samples, measured["without"][1])
+    return {
+        mode: {
+            "median_latency": statistics.median(latencies),
+            "p95_latency": percentile(latencies, 95),
+            "cer": _mean_cer(references, texts),
+        }
+        for mode, (latencies, texts) in measured.items()
+    }
+
+
+def select_best(
+    results: list[WhisperBenchResult], max_cer_increase: float
+) -> WhisperBenchResult | None:
+    """最も精度の高い設定から CER の悪化が max_cer_increase 以内の設定のうち最速のものを返す。"""
+    if not results:
+        return None
+    bound = min(r.cer for r in results) + max_cer_increase
+    candidates = [r for r in results if r.cer <= bound]
+    return min(candidates, key=lambda r: r.median_latency)
+
+
+def _parse_int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="speakdrop bench-whisper",
+        description="Whisper の推論設定を計測し、最速の設定を保存する",
+    )
+    parser.add_argument("--model", help="計測するモデルID（デフォルト: 設定中のモデル）")
+    parser.add_argument("--audio-dir", type=Path, help="評価用 WAV（16kHz/Mono/16bit）と正解 txt")
+    parser.add_argument(
+        "--compute-types", default=",".join(COMPUTE_TYPES), help="計測する compute_type"
+    )
+    parser.add_argument("--threads", type=_parse_int_list, help="計測する cpu_threads（例: 0,4,8）")
+    parser.add_argument(
+        "--workers", type=_parse_int_list, default=[1, 2], help="計測する num_workers"
+    )
+    parser.add_argument(
+        "--max-cer-increase",
+        type=float,
+        default=0.02,
+        help="最良 CER からの許容悪化幅（デフォルト: 0.02）",
+    )
+    parser.add_argument(
+        "--profiles-only",
+        action="store_true",
+        help="推論設定の計測を省略し、現在の設定でデコードプロファイルのみ計測する",
+    )
+    parser.add_argument(
+        "--context-chars",
+        type=int,
+        help="文脈の有無の比較で引き継ぐ文字数（デフォルト: 設定値または 100。0 = 比較しない）",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="結果を表示のみ行い保存しない")
+    return parser.parse_args(argv)
+
+
+def _tune_settings(
+    args: argparse.Namespace, model_id: str, samples: list[AudioSample], config: Config
+) -> WhisperSettings | None:
+    """推論設定の全組み合わせを計測し、最速の設定を返す。"""
+    results = run_benchmark(
+        model_id,
+        samples,
+        compute_types=[c for c in args.compute_types.split(",") if c],
+        thread_options=args.threads or default_thread_options(),
+        worker_options=args.workers,
+        profile=config.decode_profile,
+    )
+    for r in sorted(results, key=lambda r: r.median_latency):
+        s = r.settings
+        print(
+            f"{s.compute_type:<13} threads={s.cpu_threads:<3} workers={s.num_workers}  "
+            f"median={r.median_latency:.2f}s p95={r.p95_latency:.2f}s CER={r.cer:.3f}"
+        )
+    best = select_best(results, args.max_cer_increase)
+    if best is None:
+        return None
+    print(
+        f"最速設定: compute_type={best.settings.compute_type} "
+        f"cpu_threads={best.settings.cpu_threads} num_workers={best.settings.num_workers}"
+    )
+    return best.settings
+
+
+def _compare_context(
+    model_id: str,
+    settings: WhisperSettings,
+    samples: list[AudioSample],
+    context_chars: int,
+    config: Config,
+) -> None:
+    """文脈の引き継ぎによる CER の改善とレイテンシの増加を表示する。"""
+    stats = measure_context(
+        model_id, settings, samples, context_chars, config.hotwords, config.decode_profile
+    )
+    without, with_context = stats["without"], stats["with"]
+    for mode, label in (("without", "文脈なし"), ("with", f"文脈あり（{context_chars}文字）")):
+        print(
+            f"{label} median={stats[mode]['median_latency']:.2f}s "
+            f"p95={stats[mode]['p95_latency']:.2f}s CER={stats[mode]['cer']:.3f}"
+        )
+    print(
+        f"文脈の効果: CER {with_context['cer'] - without['cer']:+.3f} / "
+        f"median {with_context['median_latency'] - without['median_latency']:+.2f}s"
+    )
+
+
+def main(
+    argv: list[str],
+    config_path: Path = CONFIG_PATH,
+    profile_stats_path: Path = PROFILE_STATS_PATH,
+) -> int:
+    """bench-whisper コマンドを実行する。
+
+    Returns:
+        終了コード（評価用音声または計測結果が無い場合は 1）
+    """
+    args = _parse_args(argv)
+    config = Config().load(config_path)
+    model_id = args.model or config.model
+    samples = load_benchmark_audio(args.audio_dir)
+    if not samples:
+        print("評価用音声がありません")
+        return 1
+
+    print(f"モデル {model_id} を {len(samples)} 件の音声で計測します")
+    if args.profiles_only:
+        best = WhisperSettings(config.compute_type, config.cpu_threads, config.num_workers)
+    else:
+        tuned = _tune_settings(args, model_id, samples, config)
+        if tuned is None:
+            return 1
+        best = tuned
+
+    profile_stats = measure_profiles(model_id, best, samples)
+    for profile, stats in profile_stats.items():
+        print(
+            f"{profile:<9} median={stats['median_latency']:.2f}s "
+            f"p95={stats['p95_latency']:.2f}s CER={stats['cer']:.3f}"
+        )
+
+    context_chars = args.context_chars
+    if context_chars is None:
+        context_chars = config.context_chars or 100
+    if context_chars > 0:
+        _compare_context(model_id, best, samples, context_chars, config)
+
+    if not args.dry_run:
+        config.compute_type = best.compute_type
+        config.cpu_threads = best.cpu_threads
+        config.num_workers = best.num_workers
+        config.save(config_path)
+        save_profile_stats(profile_stats, profile_stats_path)
+        print(f"{config_path} と {profile_stats_path} に保存しました")
+    return 0
@@ -0,0 +1,184 @@
+"""ベンチマーク共通モジュール。
+
+speakdrop bench-* コマンドで共有する評価用音声セット・文字誤り率（CER）・
+パーセンタイル計算を提供する。
+"""
+
+from __future__ import annotations
+
+import shutil
+import subprocess
+import sys
+import tempfile
+import unicodedata
+import wave
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+# 評価用の日本語文（macOS の say コマンドで音声合成して使用する）
+BENCH_SENTENCES: tuple[str, ...] = (
+    "今日は天気がいいので散歩に行きます。",
+    "明日の会議は午後三時から始まります。",
+    "この資料を来週までに確認してください。",
+    "音声入力を使うと文章を速く書くことができます。",
+    "新しいプロジェクトの計画について相談したいことがあります。",
+)
+
+# 合成音声の話者（macOS 標準の日本語音声）
+_SAY_VOICE = "Kyoko"
+
+# 合成音声で使う母音フォルマント（F1, F2）[Hz]: あ・い・う・え・お
+_VOWEL_FORMANTS = np.array(
+    [[800.0, 1200.0], [300.0, 2300.0], [350.0, 1300.0], [500.0, 1900.0], [450.0, 900.0]]
+)
+
+
+@dataclass
+class AudioSample:
+    """ベンチマーク用音声サンプル。"""
+
+    name: str
+    audio: np.ndarray  # int16, 16kHz, mono
+    reference: str | None = None  # 正解テキスト（無い場合は基準設定の出力を正解とみなす）
+
+    @property
+    def duration(self) -> float:
+        """音声の長さ（秒）を返す。"""
+        return len(self.audio) / SAMPLE_RATE
+
+
+def normalize_text(text: str) -> str:
+    """CER 計算用にテキストを正規化する（空白・句読点・記号を除去）。"""
+    normalized = unicodedata.normalize("NFKC", text)
+    return "".join(ch for ch in normalized if unicodedata.category(ch)[0] not in "PZS")
+
+
+def character_error_rate(reference: str, hypothesis: str) -> float:
+    """文字誤り率（CER）を計算する。
+
+    Args:
+        reference: 正解テキスト
+        hypothesis: 認識結果テキスト
+
+    Returns:
+        編集距離 / 正解文字数。正解が空の場合は認識結果が空なら 0.0、そうでなければ 1.0。
+    """
+    ref = normalize_text(reference)
+    hyp = normalize_text(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    return edit_distance(ref, hyp) / len(ref)
+
+
+def edit_distance(a: str, b: str) -> int:
+    """a と b の文字単位の編集距離（レーベンシュタイン距離）を返す。"""
+    previous = list(range(len(b) + 1))
+    for i, a_char in enumerate(a, start=1):
+        current = [i]
+        for j, b_char in enumerate(b, start=1):
+            cost = 0 if a_char == b_char else 1
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost))
+        previous = current
+    return previous[-1]
+
+
+def percentile(values: list[float], q: float) -> float:
+    """values の q パーセンタイル（0〜100）を返す。空の場合は 0.0。"""
+    if not values:
+        return 0.0
+    return float(np.percentile(np.asarray(values, dtype=np.float64), q))
+
+
+def load_wav(path: Path) -> np.ndarray:
+    """16kHz / Mono / 16bit PCM の WAV ファイルを読み込む。
+
+    Raises:
+        ValueError: フォーマットが NFR-004 の録音形式と異なる場合
+    """
+    with wave.open(str(path), "rb") as wav:
+        if (wav.getframerate(), wav.getnchannels(), wav.getsampwidth()) != (SAMPLE_RATE, 1, 2):
+            raise ValueError(f"{path.name}: 16kHz/Mono/16bit の WAV のみ対応しています")
+        return np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16).copy()
+
+
+def load_audio_dir(audio_dir: Path) -> list[AudioSample]:
+    """ディレクトリ内の *.wav を読み込む。同名の *.txt があれば正解テキストとして使う。"""
+    samples = []
+    for wav_path in sorted(audio_dir.glob("*.wav")):
+        txt_path = wav_path.with_suffix(".txt")
+        reference = txt_path.read_text(encoding="utf-8").strip() if txt_path.exists() else None
+        samples.append(AudioSample(wav_path.stem, load_wav(wav_path), reference))
+    return samples
+
+
+def synthesize_speech_samples() -> list[AudioSample]:
+    """BENCH_SENTENCES を macOS の say コマンドで音声合成する。
+
+    say が利用できない環境（Linux 等）や日本語音声が無い場合は空リストを返す。
+    """
+    if sys.platform != "darwin" or shutil.which("say") is None:
+        return []
+    samples = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for i, sentence in enumerate(BENCH_SENTENCES):
+            path = Path(tmp) / f"sentence{i}.wav"
+            try:
+                subprocess.run(
+                    [
+                        "say",
+                        "-v",
+                        _SAY_VOICE,
+                        "--file-format=WAVE",
+                        f"--data-format=LEI16@{SAMPLE_RATE}",
+                        "-o",
+                        str(path),
+                        sentence,
+                    ],
+                    check=True,
+                    capture_output=True,
+                )
+            except (OSError, subprocess.CalledProcessError):
+                return []
+            samples.append(AudioSample(f"say-{i}", load_wav(path), sentence))
+    return samples
+
+
+def synthetic_samples(durations: tuple[float, ...] = (2.0, 5.0, 10.0)) -> list[AudioSample]:
+    """音声に似た合成信号（母音フォルマント＋音節エンベロープ）を生成する。
+
+    正解テキストを持たないため、速度計測と基準設定との出力比較にのみ使う。
+    """
+    rng = np.random.default_rng(0)
+    samples = []
+    for duration in durations:
+        t = np.arange(int(duration * SAMPLE_RATE)) / SAMPLE_RATE
+        syllable = (t * 6).astype(np.int64)  # 1秒あたり6音節
+        formants = _VOWEL_FORMANTS[rng.integers(0, len(_VOWEL_FORMANTS), syllable[-1] + 1)]
+        f1, f2 = formants[syllable, 0], formants[syllable, 1]
+        f0 = 150.0 + 30.0 * np.sin(2 * np.pi * 0.5 * t)
+        phase = 2 * np.pi * np.cumsum(f0) / SAMPLE_RATE
+        signal = np.zeros_like(t)
+        for k in range(1, 21):
+            harmonic = k * f0
+            gain = np.exp(-(((harmonic - f1) / 150.0) ** 2))
+            gain += 0.5 * np.exp(-(((harmonic - f2) / 200.0) ** 2))
+            signal += gain * np.sin(k * phase)
+        signal *= 0.5 - 0.5 * np.cos(2 * np.pi * 6 * t)
+        peak = float(np.max(np.abs(signal))) or 1.0
+        audio = (signal / peak * 0.3 * 32767).astype(np.int16)
+        samples.append(AudioSample(f"synthetic-{duration:g}s", audio))
+    return samples
+
+
+def load_benchmark_audio(audio_dir: Path | None = None) -> list[AudioSample]:
+    """ベンチマーク用音声セットを用意する。
+
+    優先順位: 指定ディレクトリの WAV → say による合成音声 → 合成信号。
+    """
+    if audio_dir is not None:
+        return load_audio_dir(audio_dir)
+    return synthesize_speech_samples() or synthetic_samples()
@@ -1,92 +1,221 @@
-"""クリップボード・テキスト挿入モジュール。
+"""クリップボード・テキスト挿入モジュール（macOS バックエンド）。
 
 NSPasteboard でクリップボードを操作し、
 CGEvent で Cmd+V キーストロークを送信してテキストを挿入する。
 挿入前後にクリップボード内容を退避・復元する（REQ-006）。
+退避・貼り付け・遅延復元の手順は inserter.PasteboardInserter を参照。
 """
 
-import logging
+import functools
 import time
+from collections.abc import Callable
+from typing import Any
 
-from AppKit import NSPasteboardItem, NSPasteboardTypeString
-from Cocoa import NSPasteboard
-from Quartz.CoreGraphics import (
-    CGEventCreateKeyboardEvent,
-    CGEventPost,
-    CGEventSetFlags,
-    kCGEventFlagMaskCommand,
-    kCGHIDEventTap,
-)
+from AppKit import NSPasteboardItem, NSPasteboardTypeString, NSWorkspace
+from Cocoa import NSObject, NSPasteboard
+from Quartz.CoreGraphics import kCGEventFlagMaskCommand
+
+from speakdrop.clock import Clock, SystemClock
+from speakdrop.inserter import PasteboardInserter
+from speakdrop.key_events import KEY_V, post_backspaces, post_key
+from speakdrop.paste_sync import Pasteboard, SnapshotStats
+
+
+@functools.cache
+def _read_notifier_class() -> Any:
+    """NSPasteboardItemDataProvider の実装クラスを返す。
+
+    Objective-C クラスは初回呼び出し時に一度だけ定義する。ターゲットアプリがテキストを
+    要求した時点でテキストを渡し、読み取りを通知する。
+    """
 
-_logger = logging.getLogger(__name__)
+    class _ReadNotifier(NSObject):  # type: ignore[misc]
+        def pasteboard_item_provideDataForType_(
+            self, pasteboard: Any, item: Any, ptype: Any
+        ) -> None:
+            item.setString_forType_(self.text, ptype)
+            self.on_read()
 
-# 'v' キーのキーコード
-_KEY_V = 0x09
+    return _ReadNotifier
 
 
-class ClipboardInserter:
-    """クリップボード経由でテキストを挿入するクラス。"""
+# 読み取ると送信元アプリにファイルの書き出しを要求してしまうファイルプロミスの型
+_PROMISE_TYPES = frozenset(
+    {
+        "com.apple.pasteboard.promised-file-url",
+        "com.apple.pasteboard.promised-file-content-type",
+        "com.apple.NSFilePromiseItemMetaData",
+        "Apple files promise pasteboard type",
+    }
+)
+
+# 退避した1アイテム分の (型, データ or プロパティリスト, プロパティリストか)
+SnapshotEntry = tuple[Any, Any, bool]
 
-    PASTE_DELAY: float = 0.05  # Cmd+V 送信前の待機時間（秒）
-    RESTORE_DELAY: float = 0.1  # クリップボード復元前の待機時間（秒）
 
-    def insert(self, text: str) -> None:
-        """テキストをアクティブなアプリケーションに挿入する。
+class MacPasteboard:
+    """NSPasteboard.generalPasteboard() を操作する Pasteboard の実装。"""
 
-        手順:
-        1. 既存クリップボード内容を退避（REQ-006）
-        2. text をクリップボードにセット
-        3. Cmd+V キーストロークを送信（REQ-005）
-        4. 待機（RESTORE_DELAY）
-        5. クリップボード内容を復元（REQ-006）
+    def __init__(self, max_restore_bytes: int = 0) -> None:
+        """MacPasteboard を初期化する。
 
         Args:
-            text: 挿入するテキスト
+            max_restore_bytes: 退避・復元する1つの型のデータサイズの上限（バイト、0 = 無制限）。
+                超える型（大きな画像など）は退避せず、復元もしない
         """
-        pb = NSPasteboard.generalPasteboard()
+        self.max_restore_bytes = max_restore_bytes
+        self.stats = SnapshotStats()
+        # NSPasteboardItem はデータプロバイダを強参照しないため保持しておく
+        self._notifier: Any = None
+
+    def change_count(self) -> int:
+        """NSPasteboard.changeCount を返す。"""
+        return int(NSPasteboard.generalPasteboard().changeCount())
+
+    def snapshot(self) -> list[list[SnapshotEntry]]:
+        """全クリップボードアイテムの型とデータを退避する（REQ-006）。
 
-        # 1. 退避 - 全クリップボードアイテムの型とデータを保存（REQ-006）
-        original_items: list[NSPasteboardItem] = []
-        items = pb.pasteboardItems()
-        if items:
-            for item in items:
-                cloned = NSPasteboardItem.new()
-                for ptype in item.types():
-                    data = item.dataForType_(ptype)
-                    if data is not None:
-                        cloned.setData_forType_(data, ptype)
-                    else:
-                        plist = item.propertyListForType_(ptype)
-                        if plist is not None:
-                            cloned.setPropertyList_forType_(plist, ptype)
-                original_items.append(cloned)
-
-        # 2. テキストをクリップボードにセット
+        型の一覧を先に取得し、ファイルプロミスと max_restore_bytes を超える型は保持しない。
+        NSData は参照のまま保持し、NSPasteboardItem の組み立ては復元時まで遅らせる。
+        """
+        start = time.perf_counter()
+        pb = NSPasteboard.generalPasteboard()
+        typed = [(item, list(item.types())) for item in pb.pasteboardItems() or []]
+        snapshot: list[list[SnapshotEntry]] = []
+        nbytes = skipped = 0
+        for item, types in typed:
+            entries: list[SnapshotEntry] = []
+            for ptype in types:
+                if str(ptype) in _PROMISE_TYPES:
+                    skipped += 1
+                    continue
+                entry, size = self._read_entry(item, ptype)
+                if entry is None:
+                    continue
+                if self.max_restore_bytes and size > self.max_restore_bytes:
+                    skipped += 1  # 参照を保持せずに破棄する
+                    continue
+                nbytes += size
+                entries.append(entry)
+            snapshot.append(entries)
+        self.stats.record(nbytes, time.perf_counter() - start, skipped)
+        return snapshot
+
+    @staticmethod
+    def _read_entry(item: Any, ptype: Any) -> tuple[SnapshotEntry | None, int]:
+        """1つの型のデータ（無ければプロパティリスト）とそのバイト数を返す。"""
+        data = item.dataForType_(ptype)
+        if data is not None:
+            return (ptype, data, False), int(data.length())
+        plist = item.propertyListForType_(ptype)
+        return ((ptype, plist, True) if plist is not None else None), 0
+
+    def write_text(self, text: str, on_read: Callable[[], None]) -> int:
+        """text を遅延提供のアイテムとして書き込む（読み取り時に on_read() を呼ぶ）。"""
+        notifier = _read_notifier_class().alloc().init()
+        notifier.text = text
+        notifier.on_read = on_read
+        self._notifier = notifier
+        item = NSPasteboardItem.new()
+        item.setDataProvider_forTypes_(notifier, [NSPasteboardTypeString])
+        pb = NSPasteboard.generalPasteboard()
+        pb.clearContents()
+        pb.writeObjects_([item])
+        return int(pb.changeCount())
+
+    def restore(self, snapshot: list[list[SnapshotEntry]]) -> None:
+        """退避したアイテムを組み立てて書き戻す。空だった場合はクリアのみ行う。"""
+        restored: list[NSPasteboardItem] = []
+        for entries in snapshot:
+            if not entries:
+                continue
+            item = NSPasteboardItem.new()
+            for ptype, value, is_plist in entries:
+                if is_plist:
+                    item.setPropertyList_forType_(value, ptype)
+                else:
+                    item.setData_forType_(value, ptype)
+            restored.append(item)
+        pb = NSPasteboard.generalPasteboard()
         pb.clearContents()
-        pb.setString_forType_(text, NSPasteboardTypeString)
-
-        try:
-            # 3. Cmd+V を送信
-            time.sleep(self.PASTE_DELAY)
-            self._send_cmd_v()
-        except Exception as e:
-            _logger.warning("Cmd+V 送信に失敗しました: %s", e)
-        finally:
-            # 4. 待機してから復元
-            time.sleep(self.RESTORE_DELAY)
-            # 5. 復元（REQ-006）
-            pb.clearContents()
-            if original_items:
-                pb.writeObjects_(original_items)
+        if restored:
+            pb.writeObjects_(restored)
+        self._notifier = None
+
+
+def frontmost_app_id() -> str:
+    """最前面のアプリのバンドル ID を返す（取得できない場合は空文字列）。"""
+    app = NSWorkspace.sharedWorkspace().frontmostApplication()
+    bundle_id = app.bundleIdentifier() if app is not None else None
+    return str(bundle_id) if bundle_id else ""
+
+
+def focused_text() -> str | None:
+    """最前面のアプリでフォーカスされたテキストフィールドの、カーソルより前のテキストを返す。
+
+    アクセシビリティ API（AXValue・AXSelectedTextRange）で読み取る。テキストを公開しない
+    アプリや、範囲を選択中（入力で選択範囲が置き換わる）の場合は None を返す。
+    """
+    from ApplicationServices import (  # noqa: PLC0415  # macOS 専用
+        AXUIElementCopyAttributeValue,
+        AXUIElementCreateSystemWide,
+        AXValueGetValue,
+        kAXErrorSuccess,
+        kAXFocusedUIElementAttribute,
+        kAXSelectedTextRangeAttribute,
+        kAXValueAttribute,
+        kAXValueCFRangeType,
+    )
+
+    system = AXUIElementCreateSystemWide()
+    err, element = AXUIElementCopyAttributeValue(system, kAXFocusedUIElementAttribute, None)
+    if err != kAXErrorSuccess or element is None:
+        return None
+    err, value = AXUIElementCopyAttributeValue(element, kAXValueAttribute, None)
+    if err != kAXErrorSuccess or not isinstance(value, str):
+        return None
+    err, selection = AXUIElementCopyAttributeValue(element, kAXSelectedTextRangeAttribute, None)
+    if err != kAXErrorSuccess or selection is None:
+        return None
+    ok, (location, length) = AXValueGetValue(selection, kAXValueCFRangeType, None)
+    if not ok or length:
+        return None
+    # AX の範囲は UTF-16 のコード単位で数える
+    return str(value).encode("utf-16-le")[: location * 2].decode("utf-16-le", errors="ignore")
+
+
+class ClipboardInserter(PasteboardInserter):
+    """クリップボード経由でテキストを挿入するクラス（macOS バックエンド）。"""
+
+    def __init__(
+        self,
+        clock: Clock | None = None,
+        pasteboard: Pasteboard | None = None,
+        target_app: Callable[[], str] = frontmost_app_id,
+        max_restore_bytes: int = 0,
+    ) -> None:
+        """ClipboardInserter を初期化する。
+
+        Args:
+            clock: 待機と復元のポーリングに使う時計（デフォルト: SystemClock。
+                アプリではメインスレッドで復元する MainThreadClock、テストでは VirtualClock）
+            pasteboard: 操作するクリップボード（デフォルト: MacPasteboard）
+            target_app: 貼り付け先アプリの ID を返す関数（アプリごとの遅延の学習に使う）
+            max_restore_bytes: 退避・復元する1つの型のサイズ上限（バイト、0 = 無制限）。
+                pasteboard 未指定時の MacPasteboard に渡す
+        """
+        super().__init__(
+            clock or SystemClock(), pasteboard or MacPasteboard(max_restore_bytes), target_app
+        )
+
+    def send_backspaces(self, count: int) -> None:
+        """バックスペースを count 回送信する。"""
+        post_backspaces(count)
+
+    def focused_text(self) -> str | None:
+        """入力先のテキストフィールドのカーソルより前のテキストを返す（読み取れない場合は None）。"""
+        return focused_text()
 
     def _send_cmd_v(self) -> None:
         """Cmd+V キーストロークを送信する。"""
-        # Key down
-        event_down = CGEventCreateKeyboardEvent(None, _KEY_V, True)
-        CGEventSetFlags(event_down, kCGEventFlagMaskCommand)
-        CGEventPost(kCGHIDEventTap, event_down)
-
-        # Key up
-        event_up = CGEventCreateKeyboardEvent(None, _KEY_V, False)
-        CGEventSetFlags(event_up, kCGEventFlagMaskCommand)
-        CGEventPost(kCGHIDEventTap, event_up)
+        post_key(KEY_V, kCGEventFlagMaskCommand)
@@ -0,0 +1,127 @@
+"""時計モジュール。
+
+時刻の取得・待機・遅延実行を差し替え可能にする。本番は SystemClock（アプリ内では
+メインスレッドで遅延実行する MainThreadClock）、セッションの再生やテストでは
+VirtualClock（仮想時間）を使う。
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from collections.abc import Callable
+from typing import Any, Protocol
+
+
+class Clock(Protocol):
+    """時刻の取得・待機・遅延実行のインターフェース。"""
+
+    def monotonic(self) -> float:
+        """単調増加する現在時刻（秒）を返す。"""
+        ...
+
+    def sleep(self, seconds: float) -> None:
+        """seconds 秒待機する。"""
+        ...
+
+    def call_later(self, delay: float, callback: Callable[..., Any], *args: Any) -> None:
+        """delay 秒後に callback(*args) を実行する（呼び出し元はブロックしない）。"""
+        ...
+
+
+class SystemClock:
+    """実時間の時計。call_later() はタイマースレッドで実行する。"""
+
+    def monotonic(self) -> float:
+        """time.monotonic() を返す。"""
+        return time.monotonic()
+
+    def sleep(self, seconds: float) -> None:
+        """time.sleep() で待機する。"""
+        time.sleep(seconds)
+
+    def call_later(self, delay: float, callback: Callable[..., Any], *args: Any) -> None:
+        """delay 秒後に callback(*args) をタイマースレッドで実行する。"""
+        timer = threading.Timer(delay, callback, args)
+        timer.daemon = True
+        timer.start()
+
+
+class MainThreadClock(SystemClock):
+    """call_later() をメインスレッド（rumps の run loop）で実行する実時間の時計。
+
+    NSPasteboard や UI の操作を遅延実行する場合に使う。
+    """
+
+    def call_later(self, delay: float, callback: Callable[..., Any], *args: Any) -> None:
+        """delay 秒後に callback(*args) をメインスレッドで実行する。"""
+        from PyObjCTools import AppHelper  # noqa: PLC0415  # macOS 専用
+
+        AppHelper.callLater(delay, callback, *args)
+
+
+class VirtualClock:
+    """仮想時間の時計（シングルスレッドでの使用を前提とする）。
+
+    sleep() / advance() は実時間を待たずに時刻を進め、その間に期限を迎えた
+    タイマー（call_at / call_later）を時刻順に実行する。タイマーの中で sleep() を
+    呼ぶと、さらに先のタイマーも同じ呼び出しの中で実行される（離散事象シミュレーション）。
+    """
+
+    def __init__(self, start: float = 0.0, pace: float | None = None) -> None:
+        """VirtualClock を初期化する。
+
+        Args:
+            start: 開始時刻（秒）
+            pace: 実時間に対する再生速度（例: 1.0 = 実時間、10.0 = 10倍速）。
+                None の場合は実時間を待たない
+        """
+        self._now = start
+        self._pace = pace
+        self._timers: list[tuple[float, int, Callable[..., Any], tuple[Any, ...]]] = []
+        self._seq = itertools.count()
+
+    def monotonic(self) -> float:
+        """仮想の現在時刻を返す。"""
+        return self._now
+
+    def sleep(self, seconds: float) -> None:
+        """仮想時間を seconds 秒進める（advance() と同じ）。"""
+        self.advance(seconds)
+
+    def call_at(self, when: float, callback: Callable[..., Any], *args: Any) -> None:
+        """仮想時刻 when に callback(*args) を実行するタイマーを登録する。"""
+        heapq.heappush(self._timers, (when, next(self._seq), callback, args))
+
+    def call_later(self, delay: float, callback: Callable[..., Any], *args: Any) -> None:
+        """delay 秒後に callback(*args) を実行するタイマーを登録する。"""
+        self.call_at(self._now + delay, callback, *args)
+
+    def advance(self, seconds: float) -> None:
+        """仮想時間を seconds 秒進め、期限を迎えたタイマーを実行する。"""
+        target = self._now + max(seconds, 0.0)
+        while self._timers and self._timers[0][0] <= target:
+            when, _, callback, args = heapq.heappop(self._timers)
+            self._move_to(when)
+            callback(*args)
+        self._move_to(target)
+
+    def run_until_idle(self) -> None:
+        """登録済みのタイマーがなくなるまで時刻を進めて実行する。"""
+        while self._timers:
+            self.advance(self._timers[0][0] - self._now)
+
+    @property
+    def pending(self) -> int:
+        """未実行のタイマー数を返す。"""
+        return len(self._timers)
+
+    def _move_to(self, when: float) -> None:
+        """時刻を when まで進める（巻き戻さない）。pace 指定時は実時間も待つ。"""
+        if when <= self._now:
+            return
+        if self._pace is not None:
+            time.sleep((when - self._now) / self._pace)
+        self._now = when
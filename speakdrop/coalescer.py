@@ -0,0 +1,116 @@
+"""LLM 整形リクエストの合流モジュール。
+
+連続して話した短い発話（SegmentPipeline の単位）が整形待ちで溜まった場合、
+1件ずつ Ollama に送るとリクエストごとのオーバーヘッドと SYSTEM_PROMPT の
+プロンプト評価を毎回支払うことになる。LlmCoalescer は待っている単位をまとめて
+1回のリクエスト（TextProcessor.process_batch）で整形し、結果を単位ごとに分けて返す。
+"""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Executor, Future
+from dataclasses import dataclass
+
+from speakdrop.text_processor import TextProcessor
+
+
+@dataclass
+class _PendingUnit:
+    text: str
+    processor: TextProcessor
+    num_predict: int
+    future: Future[str]
+
+
+class LlmCoalescer:
+    """整形待ちの単位をまとめて1回の LLM リクエストで整形する。
+
+    submit() は単位を待ち行列に入れ、executor に取り出し処理を投入する。
+    executor のワーカーが1つであれば、前のリクエストの処理中に溜まった単位は
+    次の取り出しでまとめて整形される（待ち行列が空の取り出しは何もしない）。
+    """
+
+    def __init__(self, executor: Executor, max_items: int = 8, max_chars: int = 400) -> None:
+        """LlmCoalescer を初期化する。
+
+        Args:
+            executor: 整形を実行する executor（SpeakDropApp の LLM 用スレッド）
+            max_items: 1リクエストにまとめる単位数の上限（1 以下の場合はまとめない）
+            max_chars: 1リクエストにまとめる文字数の上限（1単位目は上限を超えても送る）
+        """
+        self._executor = executor
+        self.max_items = max_items
+        self.max_chars = max_chars
+        self._pending: list[_PendingUnit] = []
+        self._lock = threading.Lock()
+        self.requests = 0  # LLM に送ったリクエスト数（まとめた場合は1件）
+        self.units = 0  # 整形した単位数
+
+    def submit(
+        self,
+        text: str,
+        processor: TextProcessor,
+        num_predict: int = TextProcessor.NUM_PREDICT,
+    ) -> Future[str]:
+        """text を整形待ちに入れ、整形結果の Future を返す。
+
+        Args:
+            text: 整形する単位のテキスト
+            processor: 整形に使う TextProcessor（モデル変更後も投入時のものを使う）
+            num_predict: 1単位あたりの最大出力トークン数
+
+        Returns:
+            整形結果の Future（cancel() した単位は整形しない）
+        """
+        future: Future[str] = Future()
+        with self._lock:
+            self._pending.append(_PendingUnit(text, processor, num_predict, future))
+        self._executor.submit(self._drain)
+        return future
+
+    def _drain(self) -> None:
+        """待ち行列の先頭から1回分の単位を取り出して整形する。"""
+        batch = self._take_batch()
+        if not batch:
+            return
+        first = batch[0]
+        try:
+            if len(batch) == 1:
+                outputs = [first.processor.process(first.text, num_predict=first.num_predict)]
+            else:
+                outputs = first.processor.process_batch(
+                    [unit.text for unit in batch], num_predict=first.num_predict
+                )
+        except Exception as e:
+            for unit in batch:
+                unit.future.set_exception(e)
+            return
+        self.requests += 1
+        self.units += len(batch)
+        for unit, output in zip(batch, outputs, strict=True):
+            unit.future.set_result(output)
+
+    def _take_batch(self) -> list[_PendingUnit]:
+        """同じ TextProcessor・num_predict で連続する単位を上限まで取り出す。
+
+        取り消された単位は読み飛ばす。
+        """
+        batch: list[_PendingUnit] = []
+        chars = 0
+        with self._lock:
+            while self._pending:
+                unit = self._pending[0]
+                if batch and (
+                    len(batch) >= self.max_items
+                    or chars + len(unit.text) > self.max_chars
+                    or unit.processor is not batch[0].processor
+                    or unit.num_predict != batch[0].num_predict
+                ):
+                    break
+                self._pending.pop(0)
+                if not unit.future.set_running_or_notify_cancel():
+                    continue
+                batch.append(unit)
+                chars += len(unit.text)
+        return batch
@@ -5,9 +5,37 @@
 
 from dataclasses import asdict, dataclass, fields
 import json
+import logging
 from pathlib import Path
 
+_logger = logging.getLogger(__name__)
+
 CONFIG_PATH = Path.home() / ".config" / "speakdrop" / "config.json"
+# speakdrop bench-whisper が記録するデコードプロファイルの実測値
+PROFILE_STATS_PATH = CONFIG_PATH.parent / "profile_stats.json"
+
+# ホットキーの操作方法（Config.hotkey_mode）
+HOLD = "hold"  # 押している間だけ録音する（プッシュトゥトーク）
+TOGGLE = "toggle"  # 1回押すと録音を始め、発話の終了を検出したら認識する
+CONTINUOUS = "continuous"  # TOGGLE と同様に認識した後、次の発話の録音を自動で始める
+HOTKEY_MODES = (HOLD, TOGGLE, CONTINUOUS)
+
+
+def _matches_type(expected: object, value: object) -> bool:
+    """設定値が期待する型に一致するか判定する。
+
+    str / bool / int / float のみ対応（他の型を追加した場合はここも更新が必要）。
+    bool は int のサブクラスのため、int / float の判定では除外する。
+    """
+    if expected is str or expected is bool:
+        return isinstance(value, expected)
+    if isinstance(value, bool):
+        return False
+    if expected is int:
+        return isinstance(value, int)
+    if expected is float:
+        return isinstance(value, int | float)
+    return False
 
 
 @dataclass
@@ -18,6 +46,50 @@ class Config:
     model: str = "kotoba-tech/kotoba-whisper-v1.0"
     enabled: bool = True
     ollama_model: str = "qwen2.5:7b"
+    # faster-whisper の推論設定（speakdrop bench-whisper で自動チューニング）
+    compute_type: str = "int8"
+    cpu_threads: int = 0  # 0 = CTranslate2 の既定値
+    num_workers: int = 1
+    decode_profile: str = "balanced"  # "fastest" / "balanced" / "accurate"
+    # 長い発話用の高速モデル（空文字 = 振り分けなし）と振り分け条件
+    fast_model: str = ""
+    route_min_duration: float = 3.0  # これより短い発話は常に model で認識（秒）
+    latency_budget: float = 5.0  # NFR-001: model の予測処理時間の上限（秒）
+    # fast_model の下書きを先に挿入し、model + LLM の結果で置き換える
+    speculative_draft: bool = False
+    # Whisper の推論を別プロセスの音声認識サーバーで実行する
+    transcription_server: bool = False
+    # ホットキー・録音・状態遷移をセッションファイルに記録する（デバッグ用。録音音声を保存する）
+    record_sessions: bool = False
+    # この文字数以下の1行のテキストはクリップボードを使わずキー入力で挿入する（0 = 常に貼り付け）
+    type_max_chars: int = 30
+    # 挿入時に退避・復元するクリップボードの型ごとのサイズ上限（バイト、0 = 無制限）
+    clipboard_max_restore_bytes: int = 16 * 1024 * 1024
+    # 認識セグメントをこの文字数程度の単位で LLM 整形に先行投入する（0 = 全文の認識後に整形）
+    stream_unit_chars: int = 40
+    # 整形待ちの単位をこの件数までまとめて1回の LLM リクエストで整形する（1 = まとめない）
+    llm_batch_max_items: int = 8
+    # 直近の認識結果の末尾をこの文字数まで次の発話の文脈として Whisper に渡す（0 = 引き継がない）
+    context_chars: int = 0
+    context_idle_timeout: float = 120.0  # 最後の発話からこの秒数が経過したら文脈を破棄する
+    # Whisper に認識させたい固有名詞・専門用語（空白区切り）
+    hotwords: str = ""
+    # ホットキーの操作方法（"hold" = 押している間だけ録音 / "toggle" = 1回押すと発話の終了まで
+    # 録音 / "continuous" = toggle と同様に認識した後、次の発話の録音を自動で始める）
+    hotkey_mode: str = HOLD
+    endpoint_silence: float = 0.8  # toggle / continuous: 発話後にこの秒数の無音で終了とみなす
+    max_record_duration: float = 30.0  # toggle / continuous: 1回の録音の最大長（秒）
+    # 録音中にメニューバーへ入力レベルを表示する頻度（回/秒、0 = 表示しない）
+    level_meter_rate: float = 15.0
+    # 誤操作とみなして認識しない録音の条件（秒、0 = 判定しない）
+    min_record_duration: float = 0.3  # 録音時間がこれより短い
+    min_speech_duration: float = 0.1  # 発話らしい音量のブロックの合計がこれより短い
+    speech_rms_threshold: float = 200.0  # 発話とみなすブロックの RMS（int16 振幅）
+    # マイクのネイティブのサンプルレートで録音し、録音ブロックごとに 16kHz へ変換する
+    # （False = 16kHz での録音をデバイス・OS に任せる）
+    native_rate_capture: bool = True
+    # 直近のレイテンシが NFR-001/002 の予算に迫ったら処理を段階的に軽くする
+    latency_slo: bool = True
 
     def load(self, config_path: Path = CONFIG_PATH) -> "Config":
         """設定ファイルが存在すれば読み込む（REQ-017）。
@@ -35,19 +107,25 @@ class Config:
                 return self
             if not isinstance(data, dict):
                 return self
-            # str と bool のみ対応（他の型を追加した場合はここも更新が必要）
             # 注意: from __future__ import annotations を追加すると f.type が
             # 文字列になり is 比較が機能しなくなるため、追加する場合は
             # typing.get_type_hints() への移行が必要
             expected_types = {f.name: f.type for f in fields(self)}
             for key, value in data.items():
                 expected = expected_types.get(key)
-                if expected is str and isinstance(value, str):
-                    setattr(self, key, value)
-                elif expected is bool and isinstance(value, bool):
-                    setattr(self, key, value)
+                if _matches_type(expected, value):
+                    setattr(self, key, float(value) if expected is float else value)
+            self._validate()
         return self
 
+    def _validate(self) -> None:
+        """選択肢のある設定値を確認し、未知の値は既定値に戻す（警告をログに記録する）。"""
+        if self.hotkey_mode not in HOTKEY_MODES:
+            _logger.warning(
+                "未知の hotkey_mode です: %r（%s として扱います）", self.hotkey_mode, HOLD
+            )
+            self.hotkey_mode = HOLD
+
     def save(self, config_path: Path = CONFIG_PATH) -> None:
         """設定をJSONファイルへ永続化（REQ-016）。
 
@@ -59,3 +137,28 @@ class Config:
             json.dumps(asdict(self), ensure_ascii=False, indent=2),
             encoding="utf-8",
         )
+
+
+def load_profile_stats(path: Path = PROFILE_STATS_PATH) -> dict[str, dict[str, float]]:
+    """デコードプロファイルごとの実測値（レイテンシ・CER）を読み込む。
+
+    Returns:
+        プロファイル名 → {"median_latency", "p95_latency", "cer"}。未計測・破損時は空。
+    """
+    try:
+        data: object = json.loads(path.read_text(encoding="utf-8"))
+    except (json.JSONDecodeError, OSError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {
+        name: {k: float(v) for k, v in stats.items() if isinstance(v, int | float)}
+        for name, stats in data.items()
+        if isinstance(stats, dict)
+    }
+
+
+def save_profile_stats(stats: dict[str, dict[str, float]], path: Path = PROFILE_STATS_PATH) -> None:
+    """デコードプロファイルごとの実測値を保存する。"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(stats, ensure_ascii=False, indent=2), encoding="utf-8")
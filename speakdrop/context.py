@@ -0,0 +1,81 @@
+"""発話をまたぐ認識文脈モジュール。
+
+Transcriber.transcribe() は発話ごとに独立しているため、固有名詞や専門用語を毎回
+推測し直し、短い発話ほど精度が落ちる。TranscriptContext は直近の認識結果の末尾
+max_chars 文字を保持し、次の発話の initial_prompt として渡す。
+しばらく発話が無い場合や入力先のアプリが変わった場合は文脈を破棄する。
+"""
+
+from __future__ import annotations
+
+import threading
+
+from speakdrop.clock import Clock, SystemClock
+
+
+class TranscriptContext:
+    """直近の認識結果を次の発話の initial_prompt として引き継ぐ（スレッドセーフ）。"""
+
+    def __init__(
+        self,
+        max_chars: int = 100,
+        idle_timeout: float = 120.0,
+        clock: Clock | None = None,
+    ) -> None:
+        """TranscriptContext を初期化する。
+
+        Args:
+            max_chars: 保持する文脈の最大文字数（0 以下の場合は文脈を引き継がない）
+            idle_timeout: 最後の認識結果からこの秒数が経過したら文脈を破棄する（0 = 無期限）
+            clock: 経過時間の計測に使う時計（デフォルト: SystemClock）
+        """
+        self.max_chars = max_chars
+        self.idle_timeout = idle_timeout
+        self._clock = clock or SystemClock()
+        self._text = ""
+        self._app_id = ""
+        self._updated_at = 0.0
+        self._lock = threading.Lock()
+        self.resets = 0  # アイドル・アプリ変更で文脈を破棄した回数
+
+    def prompt(self, app_id: str = "") -> str:
+        """次の発話に渡す文脈を返す。
+
+        アイドル時間が idle_timeout を超えた場合、または app_id が前回の認識結果の
+        入力先と異なる場合は文脈を破棄して空文字を返す。
+
+        Args:
+            app_id: 入力先アプリの ID（空文字の場合はアプリの変更を判定しない）
+        """
+        with self._lock:
+            if not self._text:
+                return ""
+            idle = self._clock.monotonic() - self._updated_at
+            if (self.idle_timeout > 0 and idle > self.idle_timeout) or (
+                app_id and self._app_id and app_id != self._app_id
+            ):
+                self._text = ""
+                self.resets += 1
+            return self._text
+
+    def add(self, text: str, app_id: str = "") -> None:
+        """認識結果を文脈に追加する（末尾 max_chars 文字だけを残す）。
+
+        Args:
+            text: 認識結果
+            app_id: 入力先アプリの ID
+        """
+        text = text.strip()
+        if self.max_chars <= 0 or not text:
+            return
+        with self._lock:
+            if app_id and self._app_id and app_id != self._app_id:
+                self._text = ""
+            self._text = (self._text + text)[-self.max_chars :]
+            self._app_id = app_id
+            self._updated_at = self._clock.monotonic()
+
+    def reset(self) -> None:
+        """文脈を破棄する。"""
+        with self._lock:
+            self._text = ""
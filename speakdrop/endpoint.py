@@ -0,0 +1,83 @@
+"""発話の終了（エンドポイント）検出モジュール。
+
+ハンズフリー入力（hotkey_mode が "toggle" / "continuous"）ではホットキーを離す操作が無いため、
+AudioRecorder の録音ブロックを逐次 EndpointDetector に渡し、発話の後に一定時間の無音が
+続いた時点、または録音が最大長に達した時点で発話の終了とみなす。
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from speakdrop.audio_recorder import AudioRecorder, block_rms
+from speakdrop.lazy import lazy_module
+
+if TYPE_CHECKING:
+    import numpy as np
+else:
+    np = lazy_module("numpy")
+
+
+class EndpointDetector:
+    """録音ブロックの音量から発話の終了を逐次判定する。
+
+    音量（RMS）が speech_threshold 以上のブロックを発話とみなす。発話が min_speech 秒以上
+    含まれた後に trailing_silence 秒の無音が続くか、録音全体が max_duration 秒に達すると
+    終了とみなす。発話前の無音は終了の判定に数えない。
+    """
+
+    def __init__(
+        self,
+        speech_threshold: float = AudioRecorder.SPEECH_THRESHOLD,
+        trailing_silence: float = 0.8,
+        max_duration: float = 30.0,
+        min_speech: float = 0.1,
+        sample_rate: int = AudioRecorder.SAMPLE_RATE,
+    ) -> None:
+        """EndpointDetector を初期化する。
+
+        Args:
+            speech_threshold: 発話とみなす録音ブロックの RMS（int16 の振幅）
+            trailing_silence: 発話の後にこの秒数の無音が続いたら終了とみなす
+            max_duration: 録音がこの秒数に達したら発話の有無によらず終了とみなす（0 = 無制限）
+            min_speech: 無音による終了の判定に必要な発話の長さ（秒）
+            sample_rate: 録音のサンプルレート
+        """
+        self.speech_threshold = speech_threshold
+        self._silence_samples = int(trailing_silence * sample_rate)
+        self._max_samples = int(max_duration * sample_rate)
+        self._min_speech_samples = int(min_speech * sample_rate)
+        self.reset()
+
+    def reset(self) -> None:
+        """次の発話に向けて判定状態をクリアする。"""
+        self._total = 0
+        self._voiced = 0
+        self._silence = 0  # 最後の発話ブロック以降の無音のサンプル数
+        self._ended = False
+
+    def feed(self, block: np.ndarray, rms: float | None = None) -> bool:
+        """録音ブロックを1つ取り込み、このブロックで発話が終了した場合に True を返す。
+
+        終了を報告した後は reset() するまで False を返す。
+
+        Args:
+            block: 録音ブロック（int16, mono）
+            rms: 計算済みのブロックの RMS（None の場合はここで計算する）
+        """
+        if self._ended:
+            return False
+        if rms is None:
+            rms = block_rms(block)
+        self._total += len(block)
+        if rms >= self.speech_threshold:
+            self._voiced += len(block)
+            self._silence = 0
+        elif self._voiced:
+            self._silence += len(block)
+        self._ended = (
+            self._voiced >= self._min_speech_samples
+            and self._voiced > 0
+            and self._silence >= self._silence_samples
+        ) or (self._max_samples > 0 and self._total >= self._max_samples)
+        return self._ended
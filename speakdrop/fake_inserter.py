@@ -0,0 +1,175 @@
+"""フェイクのテキスト挿入バックエンド（macOS 以外でのテスト・計測用）。
+
+FakePasteboard（メモリ上のクリップボード）と FakeEventSink（送信したキーイベントの記録と
+入力先テキストフィールドの模擬）で、挿入処理を AppKit・Quartz なしで実行する。
+貼り付けの手順・同期は macOS バックエンドと同じ PasteboardInserter を使うため、
+挿入経路全体をヘッドレスで実行・プロファイルできる。各挿入の所要時間は records に記録する。
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from speakdrop.clock import Clock, SystemClock
+from speakdrop.inserter import (
+    MAX_UNICODE_CHUNK,
+    PASTE,
+    TYPE,
+    PasteboardInserter,
+    TailEditInserter,
+    graphemes,
+    split_utf16,
+)
+from speakdrop.paste_sync import FakePasteboard
+
+
+@dataclass(frozen=True)
+class KeyEvent:
+    """FakeEventSink が受け取ったキーイベント。"""
+
+    time: float  # 送信時刻（clock.monotonic()）
+    kind: str  # "paste"（Cmd+V）/ "text"（Unicode 文字列）/ "backspace"
+    text: str = ""  # "text" の場合の文字列
+
+
+@dataclass(frozen=True)
+class InsertRecord:
+    """1回の insert() / replace() の記録。"""
+
+    method: str  # PASTE / TYPE
+    text: str
+    started_at: float
+    returned_at: float  # 呼び出し元に戻った時刻（復元の完了は含まない）
+
+    @property
+    def duration(self) -> float:
+        """呼び出し元をブロックした時間（秒）。"""
+        return self.returned_at - self.started_at
+
+
+class FakeEventSink:
+    """送信したキーイベントを記録し、入力先のテキストフィールド（document）を模擬する。
+
+    Cmd+V を受け取ると read_delay 秒後にクリップボードを読み取って document に追記する
+    （読み取りの遅いアプリは read_delay を大きくして再現する）。
+    """
+
+    def __init__(
+        self, clock: Clock, pasteboard: FakePasteboard | None = None, read_delay: float = 0.0
+    ) -> None:
+        """FakeEventSink を初期化する。
+
+        Args:
+            clock: イベントの時刻の記録と読み取りの遅延実行に使う時計
+            pasteboard: Cmd+V で読み取るクリップボード
+            read_delay: Cmd+V からクリップボードを読み取るまでの時間（秒）
+        """
+        self._clock = clock
+        self.pasteboard = pasteboard
+        self.read_delay = read_delay
+        self.events: list[KeyEvent] = []
+        self.document = ""
+
+    def paste(self) -> None:
+        """Cmd+V を受け取る。"""
+        self.events.append(KeyEvent(self._clock.monotonic(), "paste"))
+        if self.pasteboard is not None:
+            self._clock.call_later(self.read_delay, self._read_pasteboard, self.pasteboard)
+
+    def type_text(self, text: str) -> None:
+        """Unicode 文字列付きのキーイベントを受け取る。"""
+        self.events.append(KeyEvent(self._clock.monotonic(), "text", text))
+        self.document += text
+
+    def backspace(self) -> None:
+        """バックスペースを受け取る（末尾の書記素クラスタを1つ削除する）。"""
+        self.events.append(KeyEvent(self._clock.monotonic(), "backspace"))
+        self.document = "".join(graphemes(self.document)[:-1])
+
+    def _read_pasteboard(self, pasteboard: FakePasteboard) -> None:
+        contents = pasteboard.read_text()
+        if isinstance(contents, str):
+            self.document += contents
+
+
+class FakeClipboardInserter(PasteboardInserter):
+    """FakePasteboard と FakeEventSink を使うクリップボード経由の挿入（PASTE のフェイク）。"""
+
+    def __init__(
+        self,
+        clock: Clock | None = None,
+        pasteboard: FakePasteboard | None = None,
+        sink: FakeEventSink | None = None,
+        app_id: str = "fake.app",
+    ) -> None:
+        """FakeClipboardInserter を初期化する。
+
+        Args:
+            clock: 待機・復元のポーリングに使う時計（デフォルト: SystemClock）
+            pasteboard: 操作するクリップボード（デフォルト: 空の FakePasteboard）
+            sink: キーイベントの送信先（デフォルト: pasteboard を読み取る FakeEventSink）
+            app_id: 貼り付け先アプリの ID
+        """
+        clock = clock or SystemClock()
+        pasteboard = pasteboard or FakePasteboard(clock)
+        super().__init__(clock, pasteboard, lambda: app_id)
+        self.pasteboard = pasteboard
+        self.sink = sink or FakeEventSink(clock, pasteboard)
+        self.records: list[InsertRecord] = []
+
+    def insert(self, text: str) -> None:
+        """テキストを貼り付け、所要時間を records に記録する。"""
+        start = self._clock.monotonic()
+        super().insert(text)
+        self.records.append(InsertRecord(PASTE, text, start, self._clock.monotonic()))
+
+    def send_backspaces(self, count: int) -> None:
+        """バックスペースを count 回送信する。"""
+        for _ in range(count):
+            self.sink.backspace()
+
+    def focused_text(self) -> str | None:
+        """入力先（sink.document）のテキストを返す（カーソルは常に末尾）。"""
+        return self.sink.document
+
+    def _send_cmd_v(self) -> None:
+        self.sink.paste()
+
+
+class FakeKeystrokeInserter(TailEditInserter):
+    """FakeEventSink にキー入力するテキスト挿入（TYPE のフェイク）。"""
+
+    MAX_CHUNK_UNITS: int = MAX_UNICODE_CHUNK
+    CHUNK_INTERVAL: float = 0.002
+
+    def __init__(self, clock: Clock | None = None, sink: FakeEventSink | None = None) -> None:
+        """FakeKeystrokeInserter を初期化する。
+
+        Args:
+            clock: チャンク間の待機に使う時計（デフォルト: SystemClock）
+            sink: キーイベントの送信先（デフォルト: 新しい FakeEventSink）
+        """
+        self._clock = clock or SystemClock()
+        self.sink = sink or FakeEventSink(self._clock)
+        self.records: list[InsertRecord] = []
+
+    def insert(self, text: str) -> None:
+        """テキストをチャンクごとのキーイベントとして送信し、所要時間を records に記録する。"""
+        start = self._clock.monotonic()
+        for i, chunk in enumerate(split_utf16(text, self.MAX_CHUNK_UNITS)):
+            if i > 0:
+                self._clock.sleep(self.CHUNK_INTERVAL)
+            self.sink.type_text(chunk)
+        self.records.append(InsertRecord(TYPE, text, start, self._clock.monotonic()))
+
+    def send_backspaces(self, count: int) -> None:
+        """バックスペースを count 回送信する。"""
+        for _ in range(count):
+            self.sink.backspace()
+
+    def restore(self) -> None:
+        """クリップボードを使わないため何もしない。"""
+
+    def focused_text(self) -> str | None:
+        """入力先（sink.document）のテキストを返す（カーソルは常に末尾）。"""
+        return self.sink.document
@@ -2,6 +2,7 @@
 
 pynput を使ってグローバルキーボードイベントを監視する。
 アクセシビリティ権限が必要（REQ-022）。
+押しっぱなしのキーリピートと、離した直後のチャタリングによる押下は無視する。
 """
 
 from collections.abc import Callable
@@ -9,17 +10,22 @@ from typing import Any
 
 from pynput import keyboard
 
+from speakdrop.clock import Clock, SystemClock
+
 
 class HotkeyListener:
     """グローバルホットキー監視クラス（pynput使用）。"""
 
     DEFAULT_HOTKEY: str = "alt_r"  # 右Option キー
+    DEBOUNCE: float = 0.05  # 離してからこの秒数以内の押下はチャタリングとして無視する
 
     def __init__(
         self,
         hotkey_key: str,
         on_press: Callable[[], None],
         on_release: Callable[[], None],
+        clock: Clock | None = None,
+        debounce: float = DEBOUNCE,
     ) -> None:
         """HotkeyListener を初期化する。
 
@@ -27,12 +33,26 @@ class HotkeyListener:
             hotkey_key: 監視するキー名（例: "alt_r"）
             on_press: ホットキー押下時のコールバック
             on_release: ホットキー離放時のコールバック
+            clock: キー入力時刻の取得に使う時計（デフォルト: SystemClock）
+            debounce: 離してから次の押下を受け付けるまでの時間（秒）
         """
         self._hotkey_key = hotkey_key
         self._on_press = on_press
         self._on_release = on_release
         self._listener: keyboard.Listener | None = None
         self._capture_callback: Callable[[str], None] | None = None
+        self._clock = clock or SystemClock()
+        # ホットキー以外のキー入力の最終時刻（clock.monotonic()）。
+        # 自分で送信したキーイベントは ignore_input_for() の期間中は数えない。
+        self.last_user_input: float = 0.0
+        self._ignore_until: float = 0.0
+        self._debounce = debounce
+        self._hotkey_down = False
+        self._suppressed = False  # チャタリングとして無視した押下の離放も無視する
+        self._released_at = float("-inf")
+        # 無視した押下の件数（キーリピート・チャタリング）
+        self.ignored_repeats = 0
+        self.ignored_chatter = 0
 
     def _get_key_name(self, key: Any) -> str:
         """pynput のキーオブジェクトからキー名を取得する。"""
@@ -54,7 +74,9 @@ class HotkeyListener:
             return
 
         if key_name == self._hotkey_key:
-            self._on_press()
+            self._handle_hotkey_press()
+        elif self._clock.monotonic() >= self._ignore_until:
+            self.last_user_input = self._clock.monotonic()
 
     def _handle_release(self, key: Any) -> None:
         """キー離放イベントハンドラ。"""
@@ -63,8 +85,25 @@ class HotkeyListener:
 
         key_name = self._get_key_name(key)
         if key_name == self._hotkey_key:
+            self._hotkey_down = False
+            self._released_at = self._clock.monotonic()
+            if self._suppressed:
+                self._suppressed = False
+                return
             self._on_release()
 
+    def _handle_hotkey_press(self) -> None:
+        """ホットキー押下を、キーリピート・チャタリングを除いて on_press に渡す。"""
+        if self._hotkey_down:
+            self.ignored_repeats += 1  # 押しっぱなしのキーリピート
+            return
+        self._hotkey_down = True
+        if self._clock.monotonic() - self._released_at < self._debounce:
+            self.ignored_chatter += 1
+            self._suppressed = True
+            return
+        self._on_press()
+
     def start(self) -> None:
         """非同期スレッドでキーボード監視を開始する。"""
         self._listener = keyboard.Listener(
@@ -80,6 +119,13 @@ class HotkeyListener:
             self._listener.stop()
             self._listener = None
 
+    def ignore_input_for(self, seconds: float) -> None:
+        """これから seconds 秒間のキー入力をユーザー入力として数えない。
+
+        アプリ自身が送信するキーイベント（Cmd+V・バックスペース）を除外するために使う。
+        """
+        self._ignore_until = self._clock.monotonic() + seconds
+
     def start_capture_mode(self, callback: Callable[[str], None]) -> None:
         """ホットキー変更用キャプチャモードを開始する（REQ-015）。
 
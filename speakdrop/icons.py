@@ -2,10 +2,12 @@
 
 AppState に対応するメニューバーアイコン（または文字列タイトル）を提供する。
 NFR-007: 状態変化を 200ms 以内に反映するため、シンプルな文字列定数を使用。
+録音中はアイコンの後ろに入力レベルを1文字のバーで表示する。
 """
 
 from __future__ import annotations
 
+import math
 from typing import Protocol, runtime_checkable
 
 
@@ -32,6 +34,12 @@ STATUS_RECORDING = "録音中..."
 STATUS_PROCESSING = "処理中..."
 STATUS_DISABLED = "無効"
 
+# 入力レベルのバー（小さい順）と表示範囲
+LEVEL_BARS = "▁▂▃▄▅▆▇█"
+LEVEL_FLOOR_DB = -60.0  # これ以下は最小のバー
+LEVEL_CLIP = "❗"  # ピークがフルスケールに達した（音割れ）
+_FULL_SCALE = 32768.0  # int16 のフルスケール
+
 
 def get_icon_title(state: _HasName) -> str:
     """AppState に対応するメニューバーアイコン文字列を返す。
@@ -43,3 +51,21 @@ def get_icon_title(state: _HasName) -> str:
         メニューバーに表示する文字列（絵文字）
     """
     return ICON_TEXTS.get(state.name, ICON_TEXTS["IDLE"])
+
+
+def get_level_title(rms: float, peak: float) -> str:
+    """録音中のメニューバー表示（アイコン + 入力レベルのバー）を返す。
+
+    Args:
+        rms: 直近の録音ブロックの RMS（int16 の振幅）
+        peak: 直近の録音ブロックのピーク（int16 の振幅）
+
+    Returns:
+        RMS を dBFS に換算し、LEVEL_FLOOR_DB〜0 dBFS を LEVEL_BARS に割り当てた文字列
+        （ピークがフルスケールに達した場合は LEVEL_CLIP を付ける）
+    """
+    db = 20.0 * math.log10(max(rms, 1.0) / _FULL_SCALE)
+    ratio = min(max(1.0 - db / LEVEL_FLOOR_DB, 0.0), 1.0)
+    bar = LEVEL_BARS[min(int(ratio * len(LEVEL_BARS)), len(LEVEL_BARS) - 1)]
+    clip = LEVEL_CLIP if peak >= _FULL_SCALE - 1 else ""
+    return ICON_TEXTS["RECORDING"] + bar + clip
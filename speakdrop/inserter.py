@@ -0,0 +1,378 @@
+"""テキスト挿入のインターフェースモジュール。
+
+挿入方法（貼り付け / キー入力）ごとのバックエンドが実装する TextInserter と、
+クリップボード経由の挿入の共通処理（退避・貼り付け・遅延復元）を持つ PasteboardInserter、
+バックエンドを選ぶ create_inserter() を定義する。
+
+バックエンド:
+    "macos": ClipboardInserter / KeystrokeInserter（NSPasteboard・CGEvent。macOS のみ）
+    "fake": FakeClipboardInserter / FakeKeystrokeInserter（メモリ上のクリップボードと
+        イベントの記録。macOS 以外でのテスト・計測用）
+
+macOS 用のモジュール（AppKit・Quartz）は "macos" バックエンドを作る時に初めてインポートする。
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+import threading
+import unicodedata
+from collections.abc import Callable
+from typing import Any, Protocol
+
+from speakdrop.clock import Clock
+from speakdrop.paste_sync import (
+    Pasteboard,
+    PasteSession,
+    PasteSync,
+    RestoreAction,
+    SnapshotStats,
+)
+
+_logger = logging.getLogger(__name__)
+
+# 挿入方法
+PASTE = "paste"  # クリップボード経由の貼り付け
+TYPE = "type"  # キー入力
+
+# Unicode 文字列付きキーボードイベント1つに載せられる UTF-16 コード単位数の上限
+MAX_UNICODE_CHUNK = 20
+
+
+_ZWJ = "\u200d"
+
+
+def _extends(char: str) -> bool:
+    """char が直前の文字と同じ書記素クラスタに含まれる（単独で表示されない）文字か判定する。"""
+    code = ord(char)
+    return (
+        unicodedata.category(char) in ("Mn", "Me", "Mc")  # 結合文字（濁点・アクセントなど）
+        or 0xFE00 <= code <= 0xFE0F  # 異体字セレクタ（絵文字表示の指定など）
+        or 0xE0100 <= code <= 0xE01EF  # 異体字セレクタ（IVS）
+        or 0x1F3FB <= code <= 0x1F3FF  # 絵文字の肌の色
+        or 0xE0020 <= code <= 0xE007F  # タグ文字（地域の旗）
+        or 0x1160 <= code <= 0x11FF  # ハングルの中声・終声字母
+        or 0xFF9E <= code <= 0xFF9F  # 半角の濁点・半濁点
+        or char in (_ZWJ, "\u200c")
+    )
+
+
+def _is_regional_indicator(char: str) -> bool:
+    return 0x1F1E6 <= ord(char) <= 0x1F1FF
+
+
+def graphemes(text: str) -> list[str]:
+    """text を書記素クラスタ（バックスペース1回で削除される単位）に分割する。
+
+    結合文字・異体字セレクタ・絵文字の修飾（肌の色・ZWJ 連結・国旗の2文字）と CRLF を
+    直前の文字とまとめる（Unicode の拡張書記素クラスタの主要な規則の近似）。
+
+    Args:
+        text: 分割するテキスト
+
+    Returns:
+        書記素クラスタのリスト
+    """
+    clusters: list[str] = []
+    for char in text:
+        if clusters:
+            last = clusters[-1]
+            if (
+                _extends(char)
+                or last[-1] == _ZWJ
+                or (last == "\r" and char == "\n")
+                or (
+                    _is_regional_indicator(char)
+                    and _is_regional_indicator(last[-1])
+                    and len(last) % 2 == 1
+                )
+            ):
+                clusters[-1] = last + char
+                continue
+        clusters.append(char)
+    return clusters
+
+
+def tail_edit(old: str, new: str) -> tuple[int, str]:
+    """old を new に書き換えるための末尾編集（バックスペース数と追記文字列）を返す。
+
+    カーソルが old の末尾にある前提で、共通接頭辞より後ろだけを打ち直す。
+    バックスペース1回は1つの書記素クラスタ（結合文字や絵文字の連結を含む1文字）を削除するため、
+    接頭辞の比較と削除数は書記素クラスタ単位で数える。
+
+    Args:
+        old: 挿入済みのテキスト
+        new: 置き換え後のテキスト
+
+    Returns:
+        (バックスペースの回数, 追記する文字列)
+    """
+    old_clusters = graphemes(old)
+    new_clusters = graphemes(new)
+    prefix = 0
+    for old_cluster, new_cluster in zip(old_clusters, new_clusters, strict=False):
+        if old_cluster != new_cluster:
+            break
+        prefix += 1
+    return len(old_clusters) - prefix, "".join(new_clusters[prefix:])
+
+
+def split_utf16(text: str, max_units: int) -> list[str]:
+    """text を UTF-16 のコード単位数が max_units 以下のチャンクに分割する。
+
+    サロゲートペア（絵文字など）は分割しない。
+
+    Args:
+        text: 分割するテキスト
+        max_units: 1チャンクの UTF-16 コード単位数の上限（2 以上）
+
+    Returns:
+        チャンクのリスト
+    """
+    chunks: list[str] = []
+    current: list[str] = []
+    units = 0
+    for char in text:
+        width = 2 if ord(char) > 0xFFFF else 1
+        if units + width > max_units:
+            chunks.append("".join(current))
+            current, units = [], 0
+        current.append(char)
+        units += width
+    if current:
+        chunks.append("".join(current))
+    return chunks
+
+
+def utf16_length(text: str) -> int:
+    """text の UTF-16 コード単位数を返す。"""
+    return len(text.encode("utf-16-le")) // 2
+
+
+class TextInserter(Protocol):
+    """テキスト挿入バックエンドのインターフェース。"""
+
+    def insert(self, text: str) -> None:
+        """テキストをアクティブなアプリケーションに挿入する（REQ-005）。"""
+        ...
+
+    def replace(self, old: str, new: str) -> None:
+        """直前に挿入した old を new に置き換える（最小の末尾編集）。"""
+        ...
+
+    def restore(self) -> None:
+        """復元待ちのクリップボードを直ちに復元する（クリップボードを使わない場合は何もしない）。"""
+        ...
+
+    def focused_text(self) -> str | None:
+        """入力先のテキストフィールドのカーソルより前のテキストを返す（読み取れない場合は None）。"""
+        ...
+
+
+class TailEditInserter:
+    """replace() を末尾編集（tail_edit() のバックスペースと追記）で行う挿入の基底クラス。
+
+    insert() とバックスペースの送信（send_backspaces）はサブクラスが実装する。
+    """
+
+    def insert(self, text: str) -> None:
+        """テキストをアクティブなアプリケーションに挿入する（REQ-005）。"""
+        raise NotImplementedError
+
+    def replace(self, old: str, new: str) -> None:
+        """直前に挿入した old を new に置き換える（最小の末尾編集）。
+
+        共通接頭辞より後ろをバックスペースで削除し、残りを insert() で挿入する。
+
+        Args:
+            old: 直前に挿入したテキスト（カーソルはその末尾にある前提）
+            new: 置き換え後のテキスト
+        """
+        deletes, suffix = tail_edit(old, new)
+        self.send_backspaces(deletes)
+        if suffix:
+            self.insert(suffix)
+
+    def send_backspaces(self, count: int) -> None:
+        """バックスペースを count 回送信する。"""
+        raise NotImplementedError
+
+
+class PasteboardInserter(TailEditInserter):
+    """クリップボード経由の挿入の共通処理（プラットフォーム非依存）。
+
+    キーイベントの送信（send_backspaces / _send_cmd_v）はサブクラスが実装する。
+    Cmd+V の送信と復元のタイミングは PasteSync で決め、復元は時計の call_later() で
+    ポーリングして呼び出し元をブロックしない。
+    """
+
+    def __init__(self, clock: Clock, pasteboard: Pasteboard, target_app: Callable[[], str]) -> None:
+        """PasteboardInserter を初期化する。
+
+        Args:
+            clock: 待機と復元のポーリングに使う時計
+            pasteboard: 操作するクリップボード
+            target_app: 貼り付け先アプリの ID を返す関数（アプリごとの遅延の学習に使う）
+        """
+        self._clock = clock
+        self._pasteboard = pasteboard
+        self._target_app = target_app
+        self.sync = PasteSync(self._clock)
+        # 読み取り通知は貼り付け処理の中から同期的に届くことがあるため再入可能にする
+        self._lock = threading.RLock()
+        # 復元待ちの退避内容（None = 復元待ちなし）と、最新の貼り付けの世代番号・同期状態
+        self._pending: Any = None
+        self._generation = 0
+        self._session: PasteSession | None = None
+
+    @property
+    def snapshot_stats(self) -> SnapshotStats:
+        """クリップボード退避の計測値（退避したバイト数・時間）を返す。"""
+        return self._pasteboard.stats
+
+    @property
+    def restore_pending(self) -> bool:
+        """クリップボードの復元待ちがあるかを返す。"""
+        return self._pending is not None
+
+    def insert(self, text: str) -> None:
+        """テキストをアクティブなアプリケーションに挿入する。
+
+        手順:
+        1. 既存クリップボード内容を退避（REQ-006）
+        2. text をクリップボードにセット
+        3. changeCount への反映を待って Cmd+V キーストロークを送信（REQ-005）
+        4. 復元のポーリングを予約して戻る（待機しない）
+        5. ターゲットアプリの読み取り後（または上限時間後）にクリップボード内容を復元（REQ-006）
+
+        復元前に次の insert() が来た場合は、最初に退避した内容を引き継ぎ、
+        最後の貼り付けの後に一度だけ復元する。
+
+        Args:
+            text: 挿入するテキスト
+        """
+        generation = self.paste(text)
+        self._clock.call_later(self.sync.POLL_INTERVAL, self._poll_restore, generation)
+
+    def paste(self, text: str) -> int:
+        """クリップボードを退避して text を貼り付ける（復元は行わない）。
+
+        Args:
+            text: 挿入するテキスト
+
+        Returns:
+            この貼り付けの世代番号
+        """
+        app_id = self._target_app()
+        with self._lock:
+            # 1. 退避（REQ-006）。復元待ちの間はクリップボードに前回の挿入テキストが
+            # 入っているため、退避済みの元の内容を引き継ぐ
+            if self._pending is None:
+                self._pending = self._pasteboard.snapshot()
+            self._generation += 1
+            generation = self._generation
+
+            # 2. テキストをクリップボードにセット
+            change_count = self._pasteboard.write_text(text, lambda: self._mark_read(generation))
+            session = PasteSession(app_id, change_count)
+            self._session = session
+
+        try:
+            # 3. 書き込みの反映を待って Cmd+V を送信
+            if not self.sync.wait_for_write(self._pasteboard, change_count):
+                _logger.warning("クリップボードへの書き込みの反映を確認できませんでした")
+            self._send_cmd_v()
+        except Exception as e:
+            _logger.warning("Cmd+V 送信に失敗しました: %s", e)
+        session.pasted_at = self._clock.monotonic()
+        return generation
+
+    def restore(self) -> None:
+        """復元待ちのクリップボード内容を直ちに復元する（REQ-006）。
+
+        復元待ちがなければ何もしない。終了時など、予約した復元を待てない場合に使う。
+        """
+        with self._lock:
+            self._restore_locked()
+
+    def _mark_read(self, generation: int) -> None:
+        """ターゲットアプリが generation の貼り付けを読み取った時刻を記録する。"""
+        session = self._session
+        if generation == self._generation and session is not None and session.read_at is None:
+            session.read_at = self._clock.monotonic()
+
+    def _poll_restore(self, generation: int) -> None:
+        """復元の判定を行い、まだ復元しない場合は次のポーリングを予約する。
+
+        generation が最新の貼り付けでない場合は、より新しい貼り付けの復元に任せる。
+        """
+        with self._lock:
+            if generation != self._generation or self._session is None:
+                return
+            if self._pending is None:
+                return
+            action = self.sync.poll(self._session, self._pasteboard.change_count())
+            if action is RestoreAction.RESTORE:
+                self._restore_locked()
+                return
+            if action is RestoreAction.ABANDON:
+                _logger.info("クリップボードが他のアプリで更新されたため復元しません")
+                self._pending = None
+                self._session = None
+                return
+        self._clock.call_later(self.sync.POLL_INTERVAL, self._poll_restore, generation)
+
+    def _restore_locked(self) -> None:
+        """退避内容をクリップボードに書き戻す（_lock を保持して呼ぶ）。"""
+        original = self._pending
+        self._pending = None
+        self._session = None
+        if original is not None:
+            self._pasteboard.restore(original)
+
+    def focused_text(self) -> str | None:
+        """入力先のテキストフィールドのカーソルより前のテキストを返す（読み取れない場合は None）。"""
+        raise NotImplementedError
+
+    def _send_cmd_v(self) -> None:
+        """Cmd+V キーストロークを送信する。"""
+        raise NotImplementedError
+
+
+def create_inserter(
+    method: str, clock: Clock, backend: str = "auto", max_restore_bytes: int = 0
+) -> TextInserter:
+    """挿入方法 method のバックエンドを作る。
+
+    Args:
+        method: PASTE（クリップボード経由）または TYPE（キー入力）
+        clock: 待機・遅延実行に使う時計
+        backend: "macos" / "fake" / "auto"（macOS では "macos"、それ以外では "fake"）
+        max_restore_bytes: 退避・復元するクリップボードの型ごとのサイズ上限（PASTE のみ）
+
+    Raises:
+        ValueError: method または backend が不明な場合
+    """
+    if method not in (PASTE, TYPE):
+        raise ValueError(f"不明な挿入方法です: {method}")
+    if backend == "auto":
+        backend = "macos" if sys.platform == "darwin" else "fake"
+    if backend == "macos":
+        if method == PASTE:
+            from speakdrop.clipboard_inserter import ClipboardInserter  # noqa: PLC0415
+
+            return ClipboardInserter(clock=clock, max_restore_bytes=max_restore_bytes)
+        from speakdrop.keystroke_inserter import KeystrokeInserter  # noqa: PLC0415
+
+        return KeystrokeInserter(clock=clock)
+    if backend == "fake":
+        from speakdrop.fake_inserter import (  # noqa: PLC0415
+            FakeClipboardInserter,
+            FakeKeystrokeInserter,
+        )
+
+        if method == PASTE:
+            return FakeClipboardInserter(clock=clock)
+        return FakeKeystrokeInserter(clock=clock)
+    raise ValueError(f"不明な挿入バックエンドです: {backend}")
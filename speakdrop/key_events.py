@@ -0,0 +1,37 @@
+"""キーイベント送信モジュール（macOS 専用）。
+
+ClipboardInserter（Cmd+V・バックスペース）と KeystrokeInserter（バックスペース）が
+共有する、CGEvent によるキーのキーダウン・キーアップの送信を定義する。
+"""
+
+from Quartz.CoreGraphics import (
+    CGEventCreateKeyboardEvent,
+    CGEventPost,
+    CGEventSetFlags,
+    kCGHIDEventTap,
+)
+
+# 'v' キーのキーコード
+KEY_V = 0x09
+# Delete（バックスペース）キーのキーコード
+KEY_DELETE = 0x33
+
+
+def post_key(keycode: int, flags: int = 0) -> None:
+    """keycode のキーダウン・キーアップを送信する。
+
+    Args:
+        keycode: 仮想キーコード
+        flags: 修飾キーのフラグ（kCGEventFlagMaskCommand など。0 = 修飾なし）
+    """
+    for key_down in (True, False):
+        event = CGEventCreateKeyboardEvent(None, keycode, key_down)
+        if flags:
+            CGEventSetFlags(event, flags)
+        CGEventPost(kCGHIDEventTap, event)
+
+
+def post_backspaces(count: int) -> None:
+    """バックスペースを count 回送信する。"""
+    for _ in range(count):
+        post_key(KEY_DELETE)
@@ -0,0 +1,65 @@
+"""キーストローク・テキスト挿入モジュール。
+
+テキストを Unicode 文字列付きのキーボードイベント（CGEventKeyboardSetUnicodeString）として
+送信し、クリップボードを使わずに挿入する。クリップボードの退避・復元が不要なため、
+短いテキストでは ClipboardInserter より速い。1イベントに載せられる文字数には上限があるため、
+テキストは UTF-16 で MAX_CHUNK_UNITS 単位ずつに分割して送信する。
+"""
+
+from Quartz.CoreGraphics import (
+    CGEventCreateKeyboardEvent,
+    CGEventKeyboardSetUnicodeString,
+    CGEventPost,
+    kCGHIDEventTap,
+)
+
+from speakdrop.clock import Clock, SystemClock
+from speakdrop.inserter import MAX_UNICODE_CHUNK, TailEditInserter, split_utf16, utf16_length
+from speakdrop.key_events import post_backspaces
+
+
+class KeystrokeInserter(TailEditInserter):
+    """キーボードイベントで直接テキストを入力するクラス（クリップボード不使用）。"""
+
+    MAX_CHUNK_UNITS: int = MAX_UNICODE_CHUNK  # 1イベントあたりの UTF-16 コード単位数の上限
+    CHUNK_INTERVAL: float = 0.002  # チャンク間の待機時間（秒）。取りこぼし防止
+
+    def __init__(self, clock: Clock | None = None) -> None:
+        """KeystrokeInserter を初期化する。
+
+        Args:
+            clock: チャンク間の待機に使う時計（デフォルト: SystemClock）
+        """
+        self._clock = clock or SystemClock()
+
+    def insert(self, text: str) -> None:
+        """テキストをキーボードイベントとしてアクティブなアプリケーションに入力する（REQ-005）。
+
+        Args:
+            text: 挿入するテキスト
+        """
+        for i, chunk in enumerate(split_utf16(text, self.MAX_CHUNK_UNITS)):
+            if i > 0:
+                self._clock.sleep(self.CHUNK_INTERVAL)
+            self._post_unicode(chunk)
+
+    def restore(self) -> None:
+        """クリップボードを使わないため何もしない（TextInserter のインターフェース）。"""
+
+    def focused_text(self) -> str | None:
+        """入力先のテキストフィールドのカーソルより前のテキストを返す（読み取れない場合は None）。"""
+        from speakdrop.clipboard_inserter import focused_text  # noqa: PLC0415
+
+        return focused_text()
+
+    def send_backspaces(self, count: int) -> None:
+        """バックスペースを count 回送信する。"""
+        post_backspaces(count)
+
+    def _post_unicode(self, chunk: str) -> None:
+        """chunk を1組のキーダウン・キーアップイベントとして送信する。"""
+        length = utf16_length(chunk)
+        for key_down in (True, False):
+            event = CGEventCreateKeyboardEvent(None, 0, key_down)
+            CGEventKeyboardSetUnicodeString(event, length, chunk)
+            CGEventPost(kCGHIDEventTap, event)
@@ -0,0 +1,93 @@
+"""依存モジュールの遅延読み込み。
+
+numpy・faster-whisper・ollama・sounddevice などの重い依存は、import するだけで
+数百ミリ秒かかる（CTranslate2・tokenizers・httpx・pydantic・PortAudio の初期化）。
+起動時に読み込むとメニューバーのアイコン表示が遅れるため、lazy_module() で
+属性への初回アクセスまで読み込みを遅らせる。
+
+型チェッカーには通常の import を見せる:
+
+    if TYPE_CHECKING:
+        import numpy as np
+    else:
+        np = lazy_module("numpy")
+"""
+
+from __future__ import annotations
+
+import importlib
+import sys
+import threading
+from types import ModuleType
+from typing import Any
+
+
+class LazyModule(ModuleType):
+    """属性への初回アクセス時に実体のモジュールを import する代理モジュール。
+
+    属性の設定（unittest.mock.patch など）は代理モジュール側に保持され、
+    実体のモジュールより優先される。
+    """
+
+    def __init__(self, name: str) -> None:
+        """LazyModule を初期化する（この時点では import しない）。
+
+        Args:
+            name: 遅延読み込みするモジュールの完全名
+        """
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+        self.__dict__["_lazy_lock"] = threading.Lock()
+
+    def __getattr__(self, attr: str) -> Any:
+        """実体のモジュールの属性を返す（未読み込みならここで import する）。"""
+        return getattr(self._load(), attr)
+
+    def __dir__(self) -> list[str]:
+        """実体のモジュールの属性一覧を返す。"""
+        return dir(self._load())
+
+    @property
+    def loaded(self) -> bool:
+        """実体のモジュールを読み込み済みかどうか。"""
+        return self.__dict__["_lazy_module"] is not None
+
+    def _load(self) -> ModuleType:
+        module: ModuleType | None = self.__dict__["_lazy_module"]
+        if module is None:
+            with self.__dict__["_lazy_lock"]:
+                module = self.__dict__["_lazy_module"]
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__["_lazy_module"] = module
+        return module
+
+
+def lazy_module(name: str) -> ModuleType:
+    """name のモジュールを、属性への初回アクセス時に読み込む代理モジュールとして返す。
+
+    読み込み済みの場合は実体のモジュールをそのまま返す。モジュールが存在しない場合の
+    ImportError も初回アクセス時まで遅れる。
+
+    Args:
+        name: モジュールの完全名（例: "faster_whisper"）
+
+    Returns:
+        実体のモジュール、または LazyModule
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
+
+
+def preload(module: ModuleType) -> None:
+    """lazy_module() で得たモジュールの実体を今すぐ読み込む（読み込み済みなら何もしない）。
+
+    起動後のバックグラウンドスレッドから呼び、最初の利用時の import 待ちをなくす。
+
+    Args:
+        module: lazy_module() の戻り値
+    """
+    if isinstance(module, LazyModule):
+        module._load()
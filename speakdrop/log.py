@@ -0,0 +1,52 @@
+"""ログ出力の設定モジュール。
+
+メニューバーアプリとして起動した場合は標準エラー出力を見る手段が無いため、
+品質段階の変更（speakdrop.slo）や音声認識サーバーの再起動などのログを
+設定ディレクトリのファイルにも書き出す。
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+from speakdrop.config import CONFIG_PATH
+
+LOG_PATH = CONFIG_PATH.parent / "speakdrop.log"
+LOG_MAX_BYTES = 1_000_000  # ローテーションするファイルサイズ
+LOG_BACKUP_COUNT = 3  # 残す古いログファイルの数
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+
+def setup_logging(path: Path = LOG_PATH, level: int = logging.INFO) -> None:
+    """speakdrop のロガーにファイル（ローテーションあり）と標準エラー出力への出力を設定する。
+
+    2回目以降の呼び出しでは何もしない。
+
+    Args:
+        path: ログファイルのパス
+        level: 出力する最低レベル
+    """
+    logger = logging.getLogger("speakdrop")
+    if logger.handlers:
+        return
+    handlers: list[logging.Handler] = [logging.StreamHandler(sys.stderr)]
+    error: OSError | None = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handlers.append(
+            RotatingFileHandler(
+                path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8"
+            )
+        )
+    except OSError as e:
+        error = e
+    formatter = logging.Formatter(LOG_FORMAT)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+    logger.setLevel(level)
+    if error is not None:
+        logger.warning("ログファイルを開けないため標準エラー出力にのみ出力します: %s", error)
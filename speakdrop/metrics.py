@@ -0,0 +1,54 @@
+"""計測値集計モジュール。
+
+直近 N 件の計測値（レイテンシ・実時間係数など）を保持し、平均やパーセンタイルを返す。
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from collections import deque
+
+
+class RollingStats:
+    """直近 maxlen 件の計測値を保持するスレッドセーフな集計クラス。"""
+
+    def __init__(self, maxlen: int = 20) -> None:
+        """RollingStats を初期化する。
+
+        Args:
+            maxlen: 保持する計測値の最大件数
+        """
+        self._values: deque[float] = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """保持している計測値の件数を返す。"""
+        with self._lock:
+            return len(self._values)
+
+    def add(self, value: float) -> None:
+        """計測値を追加する（maxlen を超えた古い値は破棄される）。"""
+        with self._lock:
+            self._values.append(value)
+
+    def clear(self) -> None:
+        """全ての計測値を破棄する。"""
+        with self._lock:
+            self._values.clear()
+
+    def mean(self) -> float | None:
+        """平均値を返す。計測値が無い場合は None。"""
+        with self._lock:
+            if not self._values:
+                return None
+            return sum(self._values) / len(self._values)
+
+    def percentile(self, q: float) -> float | None:
+        """q パーセンタイル（0〜100、nearest-rank 法）を返す。計測値が無い場合は None。"""
+        with self._lock:
+            if not self._values:
+                return None
+            ordered = sorted(self._values)
+        rank = max(1, math.ceil(q / 100 * len(ordered)))
+        return ordered[rank - 1]
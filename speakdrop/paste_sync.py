@@ -0,0 +1,264 @@
+"""貼り付け同期モジュール。
+
+固定の待機時間（旧 PASTE_DELAY / RESTORE_DELAY）の代わりに、クリップボードの
+changeCount とターゲットアプリによる読み取りを観測して、Cmd+V の送信とクリップボードの
+復元のタイミングを決める。
+
+- 送信: 書き込んだテキストが changeCount に反映されたらすぐ Cmd+V を送る（上限 WRITE_TIMEOUT）
+- 復元: ターゲットアプリがテキストを読み取ったら READ_MARGIN 後に復元する。
+  読み取りを検出できない場合は、アプリごとに学習した読み取り遅延から求めた上限時間で復元する
+- 中止: 他のアプリ（ユーザーのコピー操作など）がクリップボードを書き換えた場合は復元しない
+
+FakePasteboard は NSPasteboard の代わりに使うメモリ上のクリップボードで、
+macOS 以外でも同期の動作を仮想時間で検証できる。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import Enum, auto
+from typing import Any, Protocol
+
+from speakdrop.clock import Clock
+from speakdrop.metrics import RollingStats
+
+
+class Pasteboard(Protocol):
+    """ClipboardInserter が使うクリップボード操作のインターフェース。"""
+
+    def change_count(self) -> int:
+        """クリップボードの変更回数（NSPasteboard.changeCount）を返す。"""
+        ...
+
+    def snapshot(self) -> Any:
+        """現在の内容を復元用に退避して返す。"""
+        ...
+
+    def write_text(self, text: str, on_read: Callable[[], None]) -> int:
+        """text を書き込み、書き込み後の changeCount を返す。
+
+        ターゲットアプリが text を読み取った時に on_read() を呼ぶ。
+        """
+        ...
+
+    def restore(self, snapshot: Any) -> None:
+        """snapshot() で退避した内容を書き戻す。"""
+        ...
+
+    @property
+    def stats(self) -> SnapshotStats:
+        """退避の計測値。"""
+        ...
+
+
+@dataclass
+class SnapshotStats:
+    """クリップボード退避の計測値（累計と直近の1回）。"""
+
+    snapshots: int = 0  # 退避した回数
+    total_bytes: int = 0  # 退避したデータの合計バイト数
+    total_seconds: float = 0.0  # 退避にかかった合計時間（秒）
+    skipped_types: int = 0  # サイズ上限・ファイルプロミスのため退避しなかった型の数
+    last_bytes: int = 0
+    last_seconds: float = 0.0
+
+    def record(self, nbytes: int, seconds: float, skipped: int = 0) -> None:
+        """1回の退避を記録する。"""
+        self.snapshots += 1
+        self.total_bytes += nbytes
+        self.total_seconds += seconds
+        self.skipped_types += skipped
+        self.last_bytes = nbytes
+        self.last_seconds = seconds
+
+
+class RestoreAction(Enum):
+    """復元待ちのポーリング結果。"""
+
+    WAIT = auto()  # まだ復元しない
+    RESTORE = auto()  # 復元する
+    ABANDON = auto()  # 他のアプリが書き換えたため復元しない
+
+
+@dataclass
+class PasteSession:
+    """1回の貼り付けの同期状態。"""
+
+    app_id: str  # 貼り付け先アプリ（バンドル ID）
+    change_count: int  # テキスト書き込み後の changeCount
+    pasted_at: float = 0.0  # Cmd+V を送信した時刻
+    read_at: float | None = None  # ターゲットアプリが読み取った時刻
+
+
+@dataclass(frozen=True)
+class AppPasteStats:
+    """アプリごとの貼り付け統計。"""
+
+    samples: int  # 読み取りを検出した回数
+    read_delay_p95: float | None  # Cmd+V から読み取りまでの p95（秒）
+    restore_timeout: float  # 読み取りを検出できない場合の復元までの上限（秒）
+    timeouts: int  # 上限時間で復元した回数
+
+
+class PasteSync:
+    """changeCount とターゲットアプリの読み取りに基づく貼り付け同期。
+
+    アプリごとに Cmd+V から読み取りまでの遅延を学習し、読み取りを検出できない場合の
+    復元の上限時間を p95 × TIMEOUT_FACTOR（MIN〜MAX_RESTORE_TIMEOUT の範囲）とする。
+    """
+
+    POLL_INTERVAL: float = 0.01  # changeCount・読み取りのポーリング間隔（秒）
+    WRITE_TIMEOUT: float = 0.05  # 書き込みが changeCount に反映されるまで待つ上限（秒）
+    READ_MARGIN: float = 0.02  # 読み取り検出から復元までの余裕（秒）
+    DEFAULT_RESTORE_TIMEOUT: float = 0.5  # 未学習のアプリの復元までの上限（秒）
+    MIN_RESTORE_TIMEOUT: float = 0.1
+    MAX_RESTORE_TIMEOUT: float = 2.0
+    TIMEOUT_FACTOR: float = 3.0
+
+    def __init__(self, clock: Clock, history: int = 20) -> None:
+        """PasteSync を初期化する。
+
+        Args:
+            clock: 時刻の取得・ポーリングの待機に使う時計
+            history: アプリごとに保持する読み取り遅延の件数
+        """
+        self._clock = clock
+        self._history = history
+        self._read_delays: dict[str, RollingStats] = {}
+        self._timeouts: dict[str, int] = {}
+
+    def wait_for_write(self, pasteboard: Pasteboard, change_count: int) -> bool:
+        """書き込みが changeCount に反映されるまで待つ（上限 WRITE_TIMEOUT）。
+
+        Returns:
+            反映された場合 True、上限に達した場合 False
+        """
+        deadline = self._clock.monotonic() + self.WRITE_TIMEOUT
+        while pasteboard.change_count() < change_count:
+            if self._clock.monotonic() >= deadline:
+                return False
+            self._clock.sleep(self.POLL_INTERVAL)
+        return True
+
+    def poll(self, session: PasteSession, change_count: int) -> RestoreAction:
+        """復元待ちの状態を判定し、読み取り遅延・タイムアウトを記録する。
+
+        Args:
+            session: 判定する貼り付け
+            change_count: 現在の changeCount
+        """
+        now = self._clock.monotonic()
+        if change_count != session.change_count:
+            return RestoreAction.ABANDON
+        if session.read_at is not None:
+            if now < session.read_at + self.READ_MARGIN:
+                return RestoreAction.WAIT
+            self._stats_for(session.app_id).add(max(session.read_at - session.pasted_at, 0.0))
+            return RestoreAction.RESTORE
+        if now - session.pasted_at < self.restore_timeout(session.app_id):
+            return RestoreAction.WAIT
+        self._timeouts[session.app_id] = self._timeouts.get(session.app_id, 0) + 1
+        return RestoreAction.RESTORE
+
+    def restore_timeout(self, app_id: str) -> float:
+        """読み取りを検出できない場合の復元までの上限時間（秒）を返す。"""
+        stats = self._read_delays.get(app_id)
+        p95 = stats.percentile(95) if stats is not None else None
+        if p95 is None:
+            return self.DEFAULT_RESTORE_TIMEOUT
+        return min(
+            max(p95 * self.TIMEOUT_FACTOR, self.MIN_RESTORE_TIMEOUT), self.MAX_RESTORE_TIMEOUT
+        )
+
+    def stats(self) -> dict[str, AppPasteStats]:
+        """アプリごとの貼り付け統計を返す。"""
+        apps = set(self._read_delays) | set(self._timeouts)
+        return {
+            app_id: AppPasteStats(
+                samples=len(self._read_delays.get(app_id, ())),
+                read_delay_p95=(
+                    self._read_delays[app_id].percentile(95)
+                    if app_id in self._read_delays
+                    else None
+                ),
+                restore_timeout=self.restore_timeout(app_id),
+                timeouts=self._timeouts.get(app_id, 0),
+            )
+            for app_id in sorted(apps)
+        }
+
+    def _stats_for(self, app_id: str) -> RollingStats:
+        if app_id not in self._read_delays:
+            self._read_delays[app_id] = RollingStats(maxlen=self._history)
+        return self._read_delays[app_id]
+
+
+class FakePasteboard:
+    """メモリ上のクリップボード（Pasteboard の実装。テスト・macOS 以外での検証用）。
+
+    ターゲットアプリの読み取りは read_text()、ユーザーのコピー操作は copy() で再現する。
+    write_latency を指定すると、書き込みが changeCount に反映されるまで遅延する。
+    """
+
+    def __init__(self, clock: Clock, contents: Any = None, write_latency: float = 0.0) -> None:
+        """FakePasteboard を初期化する。
+
+        Args:
+            clock: 書き込みの反映遅延の判定に使う時計
+            contents: 初期内容（任意の値。snapshot() / restore() でそのまま受け渡す）
+            write_latency: 書き込みが changeCount に反映されるまでの遅延（秒）
+        """
+        self._clock = clock
+        self.contents = contents
+        self.write_latency = write_latency
+        self.reads: list[tuple[float, Any]] = []  # (時刻, 読み取った内容)
+        self.stats = SnapshotStats()
+        self._count = 0
+        self._visible_at = 0.0
+        self._on_read: Callable[[], None] | None = None
+
+    def change_count(self) -> int:
+        """changeCount を返す（反映遅延中は書き込み前の値）。"""
+        if self._clock.monotonic() < self._visible_at:
+            return self._count - 1
+        return self._count
+
+    def snapshot(self) -> Any:
+        """現在の内容を返す（str / bytes の場合はそのサイズを stats に記録する）。"""
+        contents = self.contents
+        if isinstance(contents, str):
+            contents_bytes = len(contents.encode())
+        elif isinstance(contents, bytes):
+            contents_bytes = len(contents)
+        else:
+            contents_bytes = 0
+        self.stats.record(contents_bytes, 0.0)
+        return contents
+
+    def write_text(self, text: str, on_read: Callable[[], None]) -> int:
+        """text を書き込み、読み取り時に on_read() を呼ぶよう登録する。"""
+        self._write(text)
+        self._on_read = on_read
+        return self._count
+
+    def restore(self, snapshot: Any) -> None:
+        """snapshot を書き戻す。"""
+        self._write(snapshot)
+
+    def copy(self, contents: Any) -> None:
+        """ユーザーのコピー操作（他のアプリによる書き換え）を再現する。"""
+        self._write(contents)
+
+    def read_text(self) -> Any:
+        """ターゲットアプリによる貼り付け（読み取り）を再現し、読み取った内容を返す。"""
+        self.reads.append((self._clock.monotonic(), self.contents))
+        if self._on_read is not None:
+            self._on_read()
+        return self.contents
+
+    def _write(self, contents: Any) -> None:
+        self.contents = contents
+        self._count += 1
+        self._visible_at = self._clock.monotonic() + self.write_latency
+        self._on_read = None
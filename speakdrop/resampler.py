@@ -0,0 +1,129 @@
+"""ストリーミング・ポリフェーズリサンプラーモジュール。
+
+USB・Bluetooth のマイクには 16kHz での録音を受け付けない、または OS 側の変換の品質が
+低いものがある。AudioRecorder はデバイスのネイティブのサンプルレートで録音し、
+StreamingResampler で録音ブロックごとに 16kHz へ変換する（離放時にまとめて変換しない）。
+
+変換は up 倍のアップサンプル → ローパスフィルタ → 1/down のダウンサンプルを、
+フィルタを up 個の位相に分けたポリフェーズ形式で出力サンプルごとに必要な積和だけ計算する。
+フィルタ係数はレートの組み合わせごとにキャッシュする。
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from math import gcd
+from typing import TYPE_CHECKING
+
+from speakdrop.lazy import lazy_module
+
+if TYPE_CHECKING:
+    import numpy as np
+else:
+    np = lazy_module("numpy")
+
+TAPS_PER_SIDE = 10  # max(up, down) あたりのフィルタの片側の長さ
+KAISER_BETA = 5.0  # Kaiser 窓の形状（大きいほど阻止域の減衰が大きく遷移帯域が広い）
+
+
+@lru_cache(maxsize=8)
+def polyphase_taps(up: int, down: int) -> tuple[np.ndarray, int]:
+    """up/down 倍の変換に使うローパスフィルタを位相ごとに分けて返す。
+
+    Args:
+        up: アップサンプルの倍率
+        down: ダウンサンプルの倍率
+
+    Returns:
+        (位相ごとの係数 shape=(up, 位相あたりの長さ)、フィルタの群遅延（アップサンプル後のサンプル数）)。
+        係数は読み取り専用（キャッシュを共有するため）
+    """
+    half = TAPS_PER_SIDE * max(up, down)
+    n = np.arange(-half, half + 1, dtype=np.float64)
+    cutoff = 1.0 / max(up, down)  # ナイキスト周波数に対する遮断周波数
+    taps = cutoff * np.sinc(cutoff * n) * np.kaiser(len(n), KAISER_BETA)
+    taps *= up / taps.sum()  # アップサンプルで挿入した 0 の分を補い、直流の利得を 1 にする
+    width = -(-len(taps) // up)
+    padded = np.zeros(width * up, dtype=np.float32)
+    padded[: len(taps)] = taps
+    # phases[p][j] = taps[p + j * up]
+    phases = padded.reshape(width, up).T.copy()
+    phases.flags.writeable = False
+    return phases, half
+
+
+class StreamingResampler:
+    """int16 の録音ブロックを逐次 out_rate へ変換する（1本の録音につき1インスタンス）。
+
+    ブロックの区切り方によらず、まとめて変換した場合と同じ結果を返す。
+    """
+
+    def __init__(self, in_rate: int, out_rate: int = 16000) -> None:
+        """StreamingResampler を初期化する。
+
+        Args:
+            in_rate: 入力（録音デバイス）のサンプルレート
+            out_rate: 出力のサンプルレート
+        """
+        g = gcd(in_rate, out_rate)
+        self.in_rate = in_rate
+        self.out_rate = out_rate
+        self._up = out_rate // g
+        self._down = in_rate // g
+        self._phases, self._delay = polyphase_taps(self._up, self._down)
+        width = self._phases.shape[1]
+        self._offsets = np.arange(width)
+        # 入力の履歴（先頭は入力の通し番号 self._base のサンプル）。開始前は 0 とみなす
+        self._buffer = np.zeros(width - 1, dtype=np.float32)
+        self._base = -(width - 1)
+        self._in_total = 0  # これまでの入力サンプル数
+        self._out_total = 0  # これまでの出力サンプル数
+
+    @property
+    def passthrough(self) -> bool:
+        """入力と出力のサンプルレートが同じ（変換しない）場合は True。"""
+        return self._up == self._down
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """録音ブロックを変換し、このブロックまでで確定した出力サンプルを返す。
+
+        Args:
+            block: 入力の録音ブロック（int16, mono）
+
+        Returns:
+            変換後のサンプル（int16）。フィルタの遅延分は後続のブロックまたは flush() で返す
+        """
+        if self.passthrough:
+            return block
+        self._in_total += len(block)
+        self._buffer = np.concatenate((self._buffer, block.astype(np.float32)))
+        return self._emit(self._in_total * self._up // self._down)
+
+    def flush(self) -> np.ndarray:
+        """録音の終了時に、フィルタの遅延分として残っている末尾の出力を返す。"""
+        if self.passthrough:
+            return np.array([], dtype=np.int16)
+        total = -(-self._in_total * self._up // self._down)
+        padding = self._delay // self._up + 1
+        self._buffer = np.concatenate((self._buffer, np.zeros(padding, dtype=np.float32)))
+        return self._emit(total)
+
+    def _emit(self, limit: int) -> np.ndarray:
+        """出力の通し番号 limit 未満のうち、入力の揃ったサンプルを計算して返す。"""
+        last = self._base + len(self._buffer) - 1  # 入力の最後の通し番号
+        # 出力 m は入力の (m * down + delay) // up 番目までを使う
+        end = min(limit, ((last + 1) * self._up - self._delay - 1) // self._down + 1)
+        if end <= self._out_total:
+            return np.array([], dtype=np.int16)
+        t = np.arange(self._out_total, end, dtype=np.int64) * self._down + self._delay
+        newest = t // self._up - self._base
+        window = self._buffer[newest[:, None] - self._offsets[None, :]]
+        out = np.einsum("ij,ij->i", window, self._phases[t % self._up])
+        self._out_total = end
+        # 次の出力に必要な入力だけを残す
+        keep_from = (end * self._down + self._delay) // self._up - len(self._offsets) + 1
+        drop = max(keep_from - self._base, 0)
+        self._buffer = self._buffer[drop:]
+        self._base += drop
+        result: np.ndarray = np.clip(np.rint(out), -32768, 32767).astype(np.int16)
+        return result
@@ -0,0 +1,157 @@
+"""認識セグメントのストリーミング後処理モジュール。
+
+faster-whisper はセグメントを逐次デコードするため、確定したセグメントを文単位に
+まとめて LLM 整形に先行投入し、後続セグメントのデコードと並行して処理する。
+整形結果は投入順に連結するため、長い発話の処理時間は認識と整形の合計ではなく
+おおよそ max(認識, 整形) + 最後の1単位の整形時間になる。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import ParamSpec, TypeVar
+
+_P = ParamSpec("_P")
+_T = TypeVar("_T")
+
+# 文末とみなす文字（ここで区切ると LLM が文脈を失いにくい）
+SENTENCE_ENDINGS = frozenset("。．！？!?.")
+
+
+def is_unit_complete(text: str, unit_chars: int) -> bool:
+    """text を1単位として LLM に投入してよいか判定する。
+
+    unit_chars 文字以上、または unit_chars の半分以上で文末記号で終わる場合に投入する。
+
+    Args:
+        text: 未投入のセグメントを連結したテキスト
+        unit_chars: 1単位の目安の文字数（0 以下の場合は常に False = 最後にまとめて投入）
+    """
+    if unit_chars <= 0:
+        return False
+    stripped = text.strip()
+    if len(stripped) >= unit_chars:
+        return True
+    return len(stripped) >= unit_chars // 2 and stripped[-1:] in SENTENCE_ENDINGS
+
+
+class SegmentPipeline:
+    """認識セグメントを文単位にまとめて LLM 整形に先行投入し、結果を順番どおりに連結する。
+
+    feed() は認識スレッドから呼ばれ、ブロックしない。整形は executor で実行する
+    （ワーカーが1つの executor を共有すれば、発話をまたいでも投入順に処理される）。
+    """
+
+    def __init__(
+        self,
+        process: Callable[[str], str],
+        unit_chars: int,
+        executor: Executor | None = None,
+        submit: Callable[[str], Future[str]] | None = None,
+    ) -> None:
+        """SegmentPipeline を初期化する。
+
+        Args:
+            process: 1単位のテキストを整形する関数（TextProcessor.process）
+            unit_chars: 1単位の目安の文字数（0 以下の場合は全文をまとめて1回で整形する）
+            executor: 整形を実行する executor（None の場合は専用の1スレッドを作る）
+            submit: 1単位の整形を投入して Future を返す関数（LlmCoalescer.submit）。
+                指定した場合は process を executor で実行する代わりにこれを使う
+        """
+        self._process = process
+        self._submit_unit = submit
+        self._unit_chars = unit_chars
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="speakdrop-llm"
+        )
+        self._fed: list[str] = []  # feed() で受け取ったセグメント
+        self._pending = ""  # 未投入のテキスト
+        self._results: list[Future[str]] = []
+
+    @property
+    def submitted(self) -> int:
+        """LLM に投入した単位数。"""
+        return len(self._results)
+
+    def feed(self, segment: str) -> None:
+        """確定したセグメントを受け取り、1単位に達したら整形を投入する。
+
+        Args:
+            segment: 認識セグメントのテキスト
+        """
+        self._fed.append(segment)
+        self._pending += segment
+        if is_unit_complete(self._pending, self._unit_chars):
+            self._submit()
+
+    def finish(self, text: str) -> str:
+        """残りを投入し、全単位の整形結果を順番どおりに連結して返す。
+
+        feed() で受け取っていない部分（セグメントを通知しない Transcriber の場合は全文）も
+        ここで整形する。受け取ったセグメントが text と一致しない場合は投入済みの単位を
+        破棄して全文を整形し直す。
+
+        Args:
+            text: 認識結果の全文
+
+        Returns:
+            整形済みテキスト
+        """
+        fed = "".join(self._fed)
+        if text.startswith(fed):
+            self._pending += text[len(fed) :]
+        else:
+            self._discard()
+            self._pending = text
+        self._submit()
+        try:
+            return "".join(future.result() for future in self._results)
+        finally:
+            self._shutdown()
+
+    def cancel(self) -> None:
+        """未開始の整形を取り消し、投入済みの単位を破棄する（認識の失敗・無音の場合）。"""
+        self._discard()
+        self._shutdown()
+
+    def _submit(self) -> None:
+        unit, self._pending = self._pending, ""
+        if not unit:
+            return
+        if self._submit_unit is not None and unit.strip():
+            self._results.append(self._submit_unit(unit))
+        else:
+            self._results.append(self._executor.submit(self._process_unit, unit))
+
+    def _process_unit(self, unit: str) -> str:
+        # 空白だけの単位は整形しない（LLM の呼び出しを省く）
+        return self._process(unit) if unit.strip() else unit
+
+    def _discard(self) -> None:
+        for future in self._results:
+            future.cancel()
+        self._results = []
+        self._pending = ""
+        self._fed = []
+
+    def _shutdown(self) -> None:
+        if self._owns_executor:
+            self._executor.shutdown(wait=False)
+
+
+class InlineExecutor(Executor):
+    """submit() の呼び出し元スレッドで即座に実行する executor。
+
+    仮想時間でのセッション再生など、処理を1スレッドで決定的に進めたい場合に使う。
+    """
+
+    def submit(self, fn: Callable[_P, _T], /, *args: _P.args, **kwargs: _P.kwargs) -> Future[_T]:
+        """fn(*args, **kwargs) を実行し、結果を設定済みの Future を返す。"""
+        future: Future[_T] = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
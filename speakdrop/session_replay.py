@@ -0,0 +1,374 @@
+"""ホットキー・録音セッションの記録と再生モジュール。
+
+SessionRecorder はホットキーの押下/離放・録音ブロック・状態遷移をタイムスタンプ付きで
+セッションファイルに追記する。SessionReplayer は記録したイベントを VirtualClock 上で
+SpeakDropApp に再投入し、状態遷移の一致を検証しつつ発話ごとのレイテンシを集計する。
+音声認識・LLM は仮想時間で処理時間を消費するスタブに差し替えるため、macOS 以外でも
+同じ順序・同じタイミングで再現できる。
+
+セッションファイルの形式（リトルエンディアン）:
+    ヘッダー: SESSION_MAGIC + サンプルレート（uint32）
+    レコード: 種別（uint8）+ 時刻（float64, 記録開始からの秒）+ 長さ（uint32）+ ペイロード
+    ペイロード: AUDIO は int16 の PCM、STATE は状態名（UTF-8）、PRESS / RELEASE は空
+
+注意: セッションファイルには録音音声が含まれる（NFR-006 の例外）。
+記録はデバッグ用に record_sessions を明示的に有効化した場合のみ行う。
+"""
+
+from __future__ import annotations
+
+import struct
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import IntEnum
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from speakdrop.audio_recorder import AudioRecorder
+from speakdrop.clock import Clock, SystemClock, VirtualClock
+from speakdrop.coalescer import LlmCoalescer
+from speakdrop.config import CONFIG_PATH
+from speakdrop.lazy import lazy_module
+from speakdrop.segment_pipeline import InlineExecutor
+
+if TYPE_CHECKING:
+    import numpy as np
+else:
+    np = lazy_module("numpy")
+
+SESSIONS_DIR = CONFIG_PATH.parent / "sessions"
+SESSION_MAGIC = b"SDSESS1\n"
+_HEADER = struct.Struct("<I")
+_RECORD = struct.Struct("<BdI")
+
+
+class EventKind(IntEnum):
+    """セッションイベントの種別。"""
+
+    PRESS = 1  # ホットキー押下
+    RELEASE = 2  # ホットキー離放
+    AUDIO = 3  # 録音ブロック
+    STATE = 4  # AppState の遷移
+
+
+@dataclass(frozen=True)
+class SessionEvent:
+    """セッション中の1イベント。"""
+
+    kind: EventKind
+    time: float  # 記録開始からの経過時間（秒）
+    audio: np.ndarray | None = None  # AUDIO のみ（int16）
+    state: str | None = None  # STATE のみ（AppState の名前）
+
+
+def new_session_path(directory: Path = SESSIONS_DIR) -> Path:
+    """日時を含む新しいセッションファイルのパスを返す。"""
+    return directory / f"{datetime.now():%Y%m%d-%H%M%S}.sdsession"
+
+
+class SessionRecorder:
+    """イベントをセッションファイルに追記する（スレッドセーフ）。
+
+    録音ブロックは sounddevice のコールバックスレッド、ホットキーは pynput のスレッドから
+    記録されるため、書き込みはロックで直列化する。1レコードごとに flush するため、
+    アプリが異常終了してもそれまでのイベントは残る。
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        clock: Clock | None = None,
+        sample_rate: int = AudioRecorder.SAMPLE_RATE,
+    ) -> None:
+        """SessionRecorder を初期化し、セッションファイルを作成する。
+
+        Args:
+            path: 書き込み先のセッションファイル
+            clock: タイムスタンプの取得に使う時計（デフォルト: SystemClock）
+            sample_rate: 録音ブロックのサンプルレート
+        """
+        self.path = path
+        self._clock = clock or SystemClock()
+        self._start = self._clock.monotonic()
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = path.open("wb")
+        self._file.write(SESSION_MAGIC + _HEADER.pack(sample_rate))
+
+    def record_press(self) -> None:
+        """ホットキー押下を記録する。"""
+        self._write(EventKind.PRESS, b"")
+
+    def record_release(self) -> None:
+        """ホットキー離放を記録する。"""
+        self._write(EventKind.RELEASE, b"")
+
+    def record_audio(self, block: np.ndarray) -> None:
+        """録音ブロックを記録する。"""
+        self._write(EventKind.AUDIO, np.ascontiguousarray(block, dtype="<i2").tobytes())
+
+    def record_state(self, state: str) -> None:
+        """状態遷移を記録する。"""
+        self._write(EventKind.STATE, state.encode("utf-8"))
+
+    def close(self) -> None:
+        """セッションファイルを閉じる。"""
+        with self._lock:
+            self._file.close()
+
+    def _write(self, kind: EventKind, payload: bytes) -> None:
+        elapsed = self._clock.monotonic() - self._start
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(_RECORD.pack(kind, elapsed, len(payload)) + payload)
+            self._file.flush()
+
+
+def load_session(path: Path) -> tuple[int, list[SessionEvent]]:
+    """セッションファイルを読み込む。
+
+    Returns:
+        (サンプルレート, 時刻順のイベント)
+
+    Raises:
+        ValueError: セッションファイルの形式でない場合
+    """
+    data = path.read_bytes()
+    if not data.startswith(SESSION_MAGIC):
+        raise ValueError(f"{path.name}: セッションファイルではありません")
+    offset = len(SESSION_MAGIC)
+    (sample_rate,) = _HEADER.unpack_from(data, offset)
+    offset += _HEADER.size
+    events = []
+    while offset + _RECORD.size <= len(data):
+        kind, elapsed, length = _RECORD.unpack_from(data, offset)
+        offset += _RECORD.size
+        payload = data[offset : offset + length]
+        offset += length
+        if len(payload) < length:
+            break  # 書き込み途中で終了したレコードは無視する
+        event_kind = EventKind(kind)
+        if event_kind is EventKind.AUDIO:
+            audio = np.frombuffer(payload, dtype="<i2").astype(np.int16)
+            events.append(SessionEvent(event_kind, elapsed, audio=audio))
+        elif event_kind is EventKind.STATE:
+            events.append(SessionEvent(event_kind, elapsed, state=payload.decode("utf-8")))
+        else:
+            events.append(SessionEvent(event_kind, elapsed))
+    return sample_rate, events
+
+
+class ReplayMismatchError(AssertionError):
+    """再生時の状態遷移が記録と一致しない場合に送出される。"""
+
+
+class VirtualCostTranscriber:
+    """仮想時間で 発話長 × rtf 秒を消費して固定テキストを返す Transcriber のスタブ。"""
+
+    def __init__(self, clock: VirtualClock, rtf: float = 0.3, text: str = "テスト") -> None:
+        self._clock = clock
+        self.rtf = rtf
+        self.text = text
+
+    def transcribe(
+        self,
+        audio: np.ndarray,
+        model_id: str | None = None,
+        on_segment: Callable[[str], None] | None = None,
+        prompt: str = "",
+    ) -> str:
+        self._clock.sleep(len(audio) / AudioRecorder.SAMPLE_RATE * self.rtf)
+        return self.text if len(audio) else ""
+
+
+class VirtualCostTextProcessor:
+    """仮想時間で delay 秒を消費して句点を付ける TextProcessor のスタブ。"""
+
+    def __init__(self, clock: VirtualClock, delay: float = 0.5) -> None:
+        self._clock = clock
+        self.delay = delay
+
+    def process(self, text: str, num_predict: int | None = None) -> str:
+        self._clock.sleep(self.delay)
+        return f"{text}。"
+
+
+class _RecordingInserter:
+    """挿入されたテキストを記録するだけの ClipboardInserter のスタブ。"""
+
+    def __init__(self) -> None:
+        self.inserted: list[str] = []
+
+    def insert(self, text: str) -> None:
+        self.inserted.append(text)
+
+    def replace(self, old: str, new: str) -> None:
+        self.inserted.append(new)
+
+
+class _ReplayAudioRecorder(AudioRecorder):
+    """マイクを開かず、再生側から feed() された録音ブロックを蓄積する AudioRecorder。"""
+
+    def __init__(self, clock: VirtualClock) -> None:
+        super().__init__(clock=clock)
+        self._recording = False
+
+    def start_recording(self) -> None:
+        self._clear()
+        self._recording = True
+
+    def stop_recording(self) -> np.ndarray:
+        self._recording = False
+        return self._drain()
+
+    def feed(self, block: np.ndarray) -> None:
+        if self._recording:  # 実機と同じく録音中のブロックのみ受け取る
+            self._audio_callback(block.reshape(-1, 1), len(block), None, None)
+
+
+@dataclass
+class UtteranceTiming:
+    """1発話の再生結果。"""
+
+    released_at: float  # 録音を終えた時刻（ホットキー離放・発話終了の検出。仮想時間）
+    finished_at: float  # IDLE に戻った時刻（仮想時間）
+
+    @property
+    def latency(self) -> float:
+        """離放から IDLE に戻るまでの時間（秒）。"""
+        return self.finished_at - self.released_at
+
+
+@dataclass
+class ReplayResult:
+    """セッション再生の結果。"""
+
+    transitions: list[tuple[float, str]] = field(default_factory=list)  # (時刻, 状態名)
+    utterances: list[UtteranceTiming] = field(default_factory=list)
+    inserted: list[str] = field(default_factory=list)
+
+    @property
+    def states(self) -> list[str]:
+        """遷移した状態名の列を返す。"""
+        return [state for _, state in self.transitions]
+
+
+def _charge_real_time(clock: VirtualClock, func: Callable[..., Any]) -> Callable[..., Any]:
+    """func の実行にかかった実時間を仮想時間として消費させる。"""
+
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            clock.advance(time.perf_counter() - start)
+
+    return wrapper
+
+
+class SessionReplayer:
+    """記録したセッションを VirtualClock 上で SpeakDropApp に再投入する。
+
+    app の録音・挿入はスタブに差し替え、処理スレッドは同期実行、メインスレッドへの
+    呼び出しは仮想時間のタイマーに置き換える。音声認識・後処理が仮想時間を消費している間に
+    期限を迎えたホットキーイベントは、その処理の途中で（実機と同じく PROCESSING 中に）届く。
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        transcriber: Any = None,
+        text_processor: Any = None,
+        charge_real_time: bool = False,
+    ) -> None:
+        """SessionReplayer を初期化し、app をスタブに接続する。
+
+        Args:
+            app: 再生先の SpeakDropApp。状態機械・UI 更新・SLO・認識文脈などのコンポーネントが
+                同じ仮想時間で動くよう、SpeakDropApp(clock=VirtualClock(...)) で作成したもの
+                （pace で実時間・倍速再生を指定）
+            transcriber: 音声認識（None の場合は VirtualCostTranscriber）
+            text_processor: テキスト後処理（None の場合は VirtualCostTextProcessor）
+            charge_real_time: True の場合、認識・後処理の実処理時間を仮想時間として消費する
+                （実モデルを使う場合に指定）
+
+        Raises:
+            TypeError: app の時計が VirtualClock でない場合
+        """
+        if not isinstance(app.clock, VirtualClock):
+            raise TypeError(
+                "SessionReplayer には SpeakDropApp(clock=VirtualClock()) で作成したアプリを渡してください"
+            )
+        self.clock: VirtualClock = app.clock
+        self.app = app
+        self.result = ReplayResult()
+        self._recorder = _ReplayAudioRecorder(self.clock)
+        self._inserter = _RecordingInserter()
+        self._released_at: float | None = None
+
+        app.audio_recorder = self._recorder
+        self._recorder.add_block_listener(app._on_audio_block)  # ハンズフリー入力の終了検出
+        app.clipboard_inserter = self._inserter
+        app.keystroke_inserter = self._inserter
+        app.transcriber = transcriber or VirtualCostTranscriber(self.clock)
+        app.text_processor = text_processor or VirtualCostTextProcessor(self.clock)
+        if charge_real_time:
+            app.transcriber.transcribe = _charge_real_time(self.clock, app.transcriber.transcribe)
+            app.text_processor.process = _charge_real_time(self.clock, app.text_processor.process)
+        app._run_in_background = lambda target, *args: target(*args)
+        app._llm_executor = InlineExecutor()
+        app.llm_coalescer = LlmCoalescer(app._llm_executor, app.config.llm_batch_max_items)
+        app._call_on_main = lambda func, *args: self.clock.call_later(0.0, func, *args)
+        app.state_machine.add_listener(self._record_transition)
+
+    def replay(
+        self, events: Iterable[SessionEvent], check_transitions: bool = True
+    ) -> ReplayResult:
+        """イベントを記録時刻どおりに再投入し、全処理の完了まで仮想時間を進める。
+
+        Args:
+            events: load_session() で読み込んだイベント
+            check_transitions: 記録された状態遷移と再生時の状態遷移を比較する
+
+        Returns:
+            再生結果
+
+        Raises:
+            ReplayMismatchError: check_transitions が True で状態遷移が一致しない場合
+        """
+        start = self.clock.monotonic()
+        expected = []
+        for event in events:
+            if event.kind is EventKind.STATE:
+                expected.append(event.state)
+            else:
+                self.clock.call_at(start + event.time, self._dispatch, event)
+        self.clock.run_until_idle()
+        self.result.inserted = list(self._inserter.inserted)
+        if check_transitions and expected and self.result.states != expected:
+            raise ReplayMismatchError(
+                f"状態遷移が記録と一致しません: 記録 {expected} / 再生 {self.result.states}"
+            )
+        return self.result
+
+    def _record_transition(self, source: Any, target: Any) -> None:
+        self.result.transitions.append((self.clock.monotonic(), target.name))
+        if source.name == "RECORDING":
+            # 録音の終了（ホットキーの離放、またはハンズフリー入力の発話終了の検出）
+            self._released_at = self.clock.monotonic()
+        if target.name == "IDLE" and self._released_at is not None:
+            timing = UtteranceTiming(self._released_at, self.clock.monotonic())
+            self.result.utterances.append(timing)
+            self._released_at = None
+
+    def _dispatch(self, event: SessionEvent) -> None:
+        if event.kind is EventKind.PRESS:
+            self.app.on_hotkey_press()
+        elif event.kind is EventKind.RELEASE:
+            self.app.on_hotkey_release()
+        elif event.kind is EventKind.AUDIO and event.audio is not None:
+            self._recorder.feed(event.audio)
@@ -0,0 +1,174 @@
+"""レイテンシ SLO コントローラーモジュール。
+
+NFR-001（認識 5 秒以内）・NFR-002（後処理 3 秒以内）の予算に対する直近の段階別レイテンシから、
+処理の品質段階（Tier）を上下させるフィードバック制御を行う。発熱による性能低下・Ollama の
+混雑・長い発話などで予算を超えそうになったら1段階ずつ処理を軽くし（LLM の出力長を短縮 →
+高速モデルで認識 → LLM 整形を省略）、余裕が戻ったら1段階ずつ元に戻す。
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import deque
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+
+from speakdrop.clock import Clock, SystemClock
+from speakdrop.metrics import RollingStats
+
+_logger = logging.getLogger(__name__)
+
+# 段階ごとのレイテンシ予算（秒）
+STAGE_BUDGETS: dict[str, float] = {
+    "transcribe": 5.0,  # NFR-001
+    "postprocess": 3.0,  # NFR-002
+}
+
+
+@dataclass(frozen=True)
+class Tier:
+    """処理の品質段階。"""
+
+    name: str  # ログ用の識別子
+    label: str  # メニュー表示名
+    fast_whisper: bool = False  # 高速モデル（Config.fast_model）で認識する
+    num_predict: int | None = None  # LLM の最大出力トークン数（None = TextProcessor の既定値）
+    use_llm: bool = True  # False の場合は LLM 整形を省略して認識結果をそのまま挿入する
+
+
+# 品質の高い順
+TIERS: tuple[Tier, ...] = (
+    Tier("full", "通常"),
+    Tier("short_llm", "整形短縮", num_predict=128),
+    Tier("fast_whisper", "高速認識", fast_whisper=True, num_predict=128),
+    Tier("no_llm", "整形なし", fast_whisper=True, use_llm=False),
+)
+
+
+def available_tiers(has_fast_model: bool) -> tuple[Tier, ...]:
+    """使用できる品質段階を返す。
+
+    高速モデルが未設定の場合、高速認識の段階は1つ上の段階と同じ処理になるため除く。
+    """
+    if has_fast_model:
+        return TIERS
+    return tuple(tier for tier in TIERS if tier.name != "fast_whisper")
+
+
+@dataclass(frozen=True)
+class SloDecision:
+    """品質段階の変更の記録。"""
+
+    at: float  # 変更した時刻（clock.monotonic()）
+    from_tier: str
+    to_tier: str
+    reason: str
+
+
+class SloController:
+    """段階別レイテンシの直近の平均と予算の比（負荷率）で品質段階を上下させる。
+
+    - 負荷率が STEP_DOWN_RATIO を超えたら1段階下げる
+    - 段階を変えてから MIN_SAMPLES 件以上、全段階の負荷率が STEP_UP_RATIO 未満なら1段階上げる
+
+    段階を変えると処理内容が変わるため、計測値は段階の変更時に破棄する。
+    """
+
+    STEP_DOWN_RATIO: float = 0.9
+    STEP_UP_RATIO: float = 0.5
+    MIN_SAMPLES: int = 3
+
+    def __init__(
+        self,
+        tiers: Sequence[Tier] = TIERS,
+        budgets: Mapping[str, float] | None = None,
+        window: int = 5,
+        clock: Clock | None = None,
+        history: int = 50,
+    ) -> None:
+        """SloController を初期化する。
+
+        Args:
+            tiers: 品質の高い順の品質段階
+            budgets: 段階名 → レイテンシ予算（秒）（デフォルト: STAGE_BUDGETS）
+            window: 負荷率の計算に使う直近の計測値の件数
+            clock: 判定時刻の記録に使う時計（デフォルト: SystemClock）
+            history: 保持する判定記録の件数
+        """
+        if not tiers:
+            raise ValueError("品質段階が空です")
+        self._tiers = tuple(tiers)
+        self._budgets = dict(budgets or STAGE_BUDGETS)
+        self._window = window
+        self._clock = clock or SystemClock()
+        self._level = 0
+        self._stats: dict[str, RollingStats] = {}
+        self._samples_since_change = 0
+        self._lock = threading.Lock()
+        self.decisions: deque[SloDecision] = deque(maxlen=history)
+
+    @property
+    def tier(self) -> Tier:
+        """現在の品質段階。"""
+        return self._tiers[self._level]
+
+    def pressure(self) -> tuple[float, str | None]:
+        """最も予算に対する余裕の無い段階の負荷率と段階名を返す（計測値が無い場合は 0.0, None）。"""
+        with self._lock:
+            return self._pressure()
+
+    def observe(self, latencies: Mapping[str, float]) -> Tier | None:
+        """1発話の段階別レイテンシを記録し、必要なら品質段階を変更する。
+
+        Args:
+            latencies: 段階名 → レイテンシ（秒）。実行しなかった段階は含めない
+
+        Returns:
+            品質段階を変更した場合は変更後の段階、変更しない場合は None
+        """
+        with self._lock:
+            for name, seconds in latencies.items():
+                if name in self._budgets:
+                    self._stats_for(name).add(seconds)
+            self._samples_since_change += 1
+            ratio, stage = self._pressure()
+            if ratio > self.STEP_DOWN_RATIO and self._level < len(self._tiers) - 1:
+                reason = f"{stage} が予算の {ratio:.0%}"
+                return self._change(self._level + 1, reason)
+            if (
+                ratio < self.STEP_UP_RATIO
+                and self._level > 0
+                and self._samples_since_change >= self.MIN_SAMPLES
+            ):
+                reason = f"直近 {self._samples_since_change} 件の負荷率が {ratio:.0%}"
+                return self._change(self._level - 1, reason)
+            _logger.debug(
+                "負荷率 %.0f%%（%s）のため %s を維持します", ratio * 100, stage, self.tier.name
+            )
+            return None
+
+    def _pressure(self) -> tuple[float, str | None]:
+        worst, worst_stage = 0.0, None
+        for stage, stats in self._stats.items():
+            mean = stats.mean()
+            if mean is None:
+                continue
+            ratio = mean / self._budgets[stage]
+            if ratio > worst:
+                worst, worst_stage = ratio, stage
+        return worst, worst_stage
+
+    def _change(self, level: int, reason: str) -> Tier:
+        old, new = self._tiers[self._level], self._tiers[level]
+        self._level = level
+        self._stats.clear()
+        self._samples_since_change = 0
+        self.decisions.append(SloDecision(self._clock.monotonic(), old.name, new.name, reason))
+        _logger.info("品質段階を %s から %s に変更しました（%s）", old.name, new.name, reason)
+        return new
+
+    def _stats_for(self, stage: str) -> RollingStats:
+        if stage not in self._stats:
+            self._stats[stage] = RollingStats(maxlen=self._window)
+        return self._stats[stage]
@@ -0,0 +1,144 @@
+"""アプリケーションの状態機械モジュール。
+
+SpeakDropApp の状態は pynput のスレッド（ホットキー）・処理スレッド・メインスレッドから
+読み書きされる。StateMachine は遷移をロックの下での compare-and-set として行い、
+宣言した遷移表（TRANSITIONS）に無い遷移を拒否する。すばやい押下・離放・押下が
+交錯しても、同じ状態からの遷移はどちらか一方だけが成功する。
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import Enum, auto
+
+from speakdrop.clock import Clock, SystemClock
+
+
+class AppState(Enum):
+    """アプリケーションの状態を表す列挙型。"""
+
+    IDLE = auto()  # 待機中（ホットキー監視中）
+    RECORDING = auto()  # 録音中（ホットキー押下中）
+    PROCESSING = auto()  # 処理中（認識・後処理・挿入中）
+
+
+# 許可する遷移（遷移元 → 遷移先）
+TRANSITIONS: dict[AppState, frozenset[AppState]] = {
+    AppState.IDLE: frozenset({AppState.RECORDING}),
+    # IDLE: 誤操作とみなした録音（短すぎる・無音）は認識せずに待機へ戻る
+    AppState.RECORDING: frozenset({AppState.PROCESSING, AppState.IDLE}),
+    AppState.PROCESSING: frozenset({AppState.IDLE}),
+}
+
+
+class InvalidTransitionError(ValueError):
+    """遷移表に無い遷移を行おうとした。"""
+
+
+@dataclass(frozen=True)
+class StateEvent:
+    """状態遷移の記録。"""
+
+    time: float  # 遷移した時刻（clock.monotonic()）
+    source: AppState
+    target: AppState
+    thread: str  # 遷移を行ったスレッド名
+
+
+class StateMachine:
+    """遷移表に従って AppState を遷移させる（スレッドセーフ）。
+
+    遷移に成功するとロックを保持したままリスナーを登録順に呼ぶため、リスナーが受け取る
+    遷移の順序は実際の遷移の順序と一致する。リスナーの中から遷移してもよい（再入可能）。
+    """
+
+    def __init__(
+        self,
+        initial: AppState = AppState.IDLE,
+        transitions: dict[AppState, frozenset[AppState]] = TRANSITIONS,
+        clock: Clock | None = None,
+        log_size: int = 256,
+    ) -> None:
+        """StateMachine を初期化する。
+
+        Args:
+            initial: 初期状態
+            transitions: 遷移表（遷移元 → 許可する遷移先）
+            clock: 遷移時刻の記録に使う時計（デフォルト: SystemClock）
+            log_size: 保持する遷移の記録の件数（古いものから捨てる）
+        """
+        self._state = initial
+        self._transitions = transitions
+        self._clock = clock or SystemClock()
+        self._lock = threading.RLock()
+        self._listeners: list[Callable[[AppState, AppState], None]] = []
+        self._events: deque[StateEvent] = deque(maxlen=log_size)
+        self.transitions = 0  # 成功した遷移の回数
+        self.rejected = 0  # 現在の状態が期待と異なり行わなかった遷移の回数
+
+    @property
+    def state(self) -> AppState:
+        """現在の状態を返す。"""
+        return self._state
+
+    @property
+    def events(self) -> list[StateEvent]:
+        """直近の遷移の記録（古い順）を返す。"""
+        with self._lock:
+            return list(self._events)
+
+    def add_listener(self, listener: Callable[[AppState, AppState], None]) -> None:
+        """遷移ごとに listener(遷移元, 遷移先) を呼ぶよう登録する。"""
+        self._listeners.append(listener)
+
+    def transition(self, expected: AppState, target: AppState) -> bool:
+        """現在の状態が expected の場合に限り target へ遷移する（compare-and-set）。
+
+        Args:
+            expected: 遷移元として期待する状態
+            target: 遷移先
+
+        Returns:
+            遷移した場合は True、現在の状態が expected でなかった場合は False
+
+        Raises:
+            InvalidTransitionError: expected から target への遷移が遷移表に無い場合
+                （現在の状態によらず送出する）
+        """
+        self._check(expected, target)
+        with self._lock:
+            if self._state is not expected:
+                self.rejected += 1
+                return False
+            self._apply(target)
+            return True
+
+    def set(self, target: AppState) -> None:
+        """現在の状態から target へ遷移する（既に target の場合は何もしない）。
+
+        Raises:
+            InvalidTransitionError: 現在の状態から target への遷移が遷移表に無い場合
+        """
+        with self._lock:
+            if self._state is not target:
+                self._apply(target)
+
+    def _apply(self, target: AppState) -> None:
+        """ロックを保持した状態で target へ遷移し、記録してリスナーを呼ぶ。"""
+        source = self._state
+        self._check(source, target)
+        self._state = target
+        self.transitions += 1
+        self._events.append(
+            StateEvent(self._clock.monotonic(), source, target, threading.current_thread().name)
+        )
+        for listener in self._listeners:
+            listener(source, target)
+
+    def _check(self, source: AppState, target: AppState) -> None:
+        """source から target への遷移が遷移表に無い場合は InvalidTransitionError を送出する。"""
+        if target not in self._transitions.get(source, frozenset()):
+            raise InvalidTransitionError(f"{source.name} から {target.name} へは遷移できません")
@@ -4,7 +4,19 @@ Ollama LLM を使って句読点挿入・話し言葉整形を行う。
 Ollama が未起動の場合は元テキストをそのまま返す（REQ-009）。
 """
 
-import ollama
+from __future__ import annotations
+
+import re
+from collections.abc import Iterator
+from typing import TYPE_CHECKING
+
+from speakdrop.lazy import lazy_module
+
+if TYPE_CHECKING:
+    import ollama
+else:
+    # httpx・pydantic を読み込むため、最初の整形リクエストまで import を遅らせる
+    ollama = lazy_module("ollama")
 
 
 SYSTEM_PROMPT = """あなたは日本語テキストの校正を行うアシスタントです。
@@ -14,12 +26,21 @@ SYSTEM_PROMPT = """あなたは日本語テキストの校正を行うアシス
 3. テキストの意味や内容は変更しない
 4. 整形後のテキストのみを出力する（説明文は不要）"""
 
+# 複数のテキストを1回のリクエストで整形する場合の追加ルール
+BATCH_PROMPT_RULE = """
+5. 入力は [[番号]] で始まる複数のテキストからなる。テキストごとに個別に整形し、
+   同じ [[番号]] を先頭に付けて入力と同じ順番で出力する（テキスト同士を結合・分割しない）"""
+
+_BATCH_MARKER = re.compile(r"\[\[(\d+)\]\]")
+
 
 class TextProcessor:
     """Ollama LLM によるテキスト後処理クラス（NFR-005: ローカル処理）。"""
 
     OLLAMA_HOST: str = "http://localhost:11434"  # NFR-005: ローカル固定
     DEFAULT_MODEL: str = "qwen2.5:7b"
+    TIMEOUT: float = 5.0  # Ollama 応答待ちのタイムアウト（秒）。超過時はフォールバック
+    NUM_PREDICT: int = 512  # 最大出力トークン数
 
     def __init__(self, model: str = DEFAULT_MODEL) -> None:
         """TextProcessor を初期化する。
@@ -28,15 +49,30 @@ class TextProcessor:
             model: 使用する Ollama モデル名（デフォルト: DEFAULT_MODEL）
         """
         self._model = model
-        self._client = ollama.Client(host=self.OLLAMA_HOST, timeout=5.0)
+        self._ollama_client: ollama.Client | None = None
+
+    @property
+    def _client(self) -> ollama.Client:
+        """Ollama クライアント（ollama の import を避けるため初回の処理時に生成する）。"""
+        if self._ollama_client is None:
+            self._ollama_client = ollama.Client(host=self.OLLAMA_HOST, timeout=self.TIMEOUT)
+        return self._ollama_client
 
-    def process(self, text: str) -> str:
+    def warm_up(self) -> None:
+        """ollama の import と Ollama クライアントの生成を済ませる。
+
+        起動後にバックグラウンドで呼び、最初の発話の後処理で待たせないようにする。
+        """
+        _ = self._client
+
+    def process(self, text: str, num_predict: int = NUM_PREDICT) -> str:
         """テキストを後処理して返す。
 
         Ollama が起動していない場合は元のテキストをそのまま返す（REQ-009）。
 
         Args:
             text: 処理対象テキスト
+            num_predict: 最大出力トークン数（レイテンシ SLO で短縮する場合に指定）
 
         Returns:
             処理済みテキスト。Ollama 未起動時は入力テキストそのまま。
@@ -44,14 +80,97 @@ class TextProcessor:
         try:
             response = self._client.chat(
                 model=self._model,
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": text},
-                ],
-                options={"num_predict": 512},
+                messages=_messages(text),
+                options={"num_predict": num_predict},
             )
             content = response.message.content
             return str(content) if content else text
         except Exception:
             # REQ-009: Ollama 未起動・エラー時はフォールバック
             return text
+
+    def process_batch(self, texts: list[str], num_predict: int = NUM_PREDICT) -> list[str]:
+        """複数のテキストを1回のリクエストで後処理して、テキストごとの結果を返す。
+
+        応答をテキストごとに分割できない場合は1件ずつ process() で処理し直す。
+        Ollama が起動していない場合は元のテキストをそのまま返す（REQ-009）。
+
+        Args:
+            texts: 処理対象テキストのリスト
+            num_predict: 1テキストあたりの最大出力トークン数
+
+        Returns:
+            texts と同じ順番・件数の処理済みテキスト
+        """
+        if len(texts) <= 1:
+            return [self.process(text, num_predict) for text in texts]
+        try:
+            response = self._client.chat(
+                model=self._model,
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT + BATCH_PROMPT_RULE},
+                    {"role": "user", "content": format_batch(texts)},
+                ],
+                options={"num_predict": num_predict * len(texts)},
+            )
+            content = response.message.content
+        except Exception:
+            # REQ-009: Ollama 未起動・エラー時はフォールバック
+            return list(texts)
+        outputs = split_batch(str(content or ""), len(texts))
+        if outputs is None:
+            return [self.process(text, num_predict) for text in texts]
+        return outputs
+
+    def stream(self, text: str, num_predict: int = NUM_PREDICT) -> Iterator[str]:
+        """テキストを後処理し、生成されたトークンを順に返す（speakdrop bench-llm の計測用）。
+
+        process() と異なりフォールバックしない。
+
+        Args:
+            text: 処理対象テキスト
+            num_predict: 最大出力トークン数
+
+        Yields:
+            生成されたテキストの断片（空の断片は除く）
+
+        Raises:
+            Exception: Ollama 未起動・エラーの場合（ollama / httpx の例外）
+        """
+        for chunk in self._client.chat(
+            model=self._model,
+            messages=_messages(text),
+            options={"num_predict": num_predict},
+            stream=True,
+        ):
+            content = chunk.message.content
+            if content:
+                yield str(content)
+
+
+def _messages(text: str) -> list[dict[str, str]]:
+    """text を整形する chat リクエストのメッセージを返す。"""
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": text},
+    ]
+
+
+def format_batch(texts: list[str]) -> str:
+    """texts を [[番号]] で区切った1つの入力にまとめる（番号は 1 から）。"""
+    return "\n".join(f"[[{i}]] {text}" for i, text in enumerate(texts, start=1))
+
+
+def split_batch(content: str, count: int) -> list[str] | None:
+    """format_batch() の形式の応答をテキストごとに分割する。
+
+    番号が 1..count の順にちょうど1回ずつ現れ、各テキストが空でない場合のみ成功とする。
+
+    Returns:
+        テキストごとの結果（前後の空白は除く）。分割できない場合は None
+    """
+    parts = _BATCH_MARKER.split(content)
+    if parts[0].strip() or [int(n) for n in parts[1::2]] != list(range(1, count + 1)):
+        return None
+    outputs = [part.strip() for part in parts[2::2]]
+    return outputs if all(outputs) else None
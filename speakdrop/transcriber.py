@@ -2,58 +2,237 @@
 
 faster-whisper を使って日本語音声認識を行う。
 モデルは遅延ロード（初回transcribe()呼び出し時）。
+高速モデルを設定した場合は、発話長と直近の処理速度から発話ごとにモデルを振り分ける。
 """
 
-import numpy as np
-from faster_whisper import WhisperModel
+from __future__ import annotations
+
+import logging
+import time
+from collections import Counter, defaultdict
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from speakdrop.lazy import lazy_module, preload
+from speakdrop.metrics import RollingStats
+
+if TYPE_CHECKING:
+    import faster_whisper
+    import numpy as np
+else:
+    # CTranslate2・tokenizers を読み込むため、モデルのロード時まで import を遅らせる
+    faster_whisper = lazy_module("faster_whisper")
+    np = lazy_module("numpy")
+
+_logger = logging.getLogger(__name__)
+
+# デコードパラメータのプロファイル（速度と精度のトレードオフ）
+# 実測のレイテンシ・CER は speakdrop bench-whisper で記録する
+DECODE_PROFILES: dict[str, dict[str, Any]] = {
+    "fastest": {
+        "beam_size": 1,
+        "temperature": 0.0,  # フォールバックなし
+        "condition_on_previous_text": False,
+        "without_timestamps": True,
+        "vad_filter": True,  # 無音区間をデコード対象から除外
+        "max_new_tokens": 224,  # 繰り返し幻覚の最悪ケースを抑える
+    },
+    "balanced": {
+        "beam_size": 1,
+        "temperature": (0.0, 0.4, 0.8),
+        "condition_on_previous_text": False,
+        "without_timestamps": True,
+        "vad_filter": True,
+    },
+    "accurate": {
+        "beam_size": 5,
+        "temperature": (0.0, 0.2, 0.4, 0.6, 0.8, 1.0),
+        "condition_on_previous_text": True,
+        "without_timestamps": False,
+        "vad_filter": False,
+    },
+}
+DEFAULT_PROFILE = "balanced"
 
 
 class Transcriber:
     """faster-whisper による音声認識クラス。"""
 
     DEFAULT_MODEL_ID = "kotoba-tech/kotoba-whisper-v1.0"
+    DEFAULT_COMPUTE_TYPE = "int8"
+    SAMPLE_RATE: int = 16000
+    ROUTE_MIN_DURATION: float = 3.0  # これより短い発話は常に精度優先モデルで認識（秒）
+    LATENCY_BUDGET: float = 5.0  # NFR-001: 音声認識処理時間の上限（秒）
+    # initial_prompt（発話をまたぐ文脈）の最大トークン数。デコード時間を増やさないよう上限を設ける
+    MAX_PROMPT_TOKENS: int = 48
+    PROMPT_CACHE_SIZE: int = 32  # トークン化した initial_prompt のキャッシュ件数
 
-    def __init__(self, model_id: str = DEFAULT_MODEL_ID) -> None:
+    def __init__(
+        self,
+        model_id: str = DEFAULT_MODEL_ID,
+        compute_type: str = DEFAULT_COMPUTE_TYPE,
+        cpu_threads: int = 0,
+        num_workers: int = 1,
+        profile: str = DEFAULT_PROFILE,
+        fast_model_id: str = "",
+        route_min_duration: float = ROUTE_MIN_DURATION,
+        latency_budget: float = LATENCY_BUDGET,
+        hotwords: str = "",
+    ) -> None:
         """Transcriber を初期化する。
 
         Args:
             model_id: 使用するWhisperモデルのID
+            compute_type: CTranslate2 の量子化タイプ（例: "int8", "float32"）
+            cpu_threads: CPU スレッド数（0 = CTranslate2 の既定値）
+            num_workers: 並列推論ワーカー数
+            profile: デコードプロファイル名（DECODE_PROFILES のキー）
+            fast_model_id: 長い発話用の高速モデルID（空文字 = 振り分けなし）
+            route_min_duration: 振り分けを検討する最短の発話長（秒）
+            latency_budget: 精度優先モデルの予測処理時間の上限（秒）
+            hotwords: 認識させたい固有名詞・専門用語（空白区切り。空文字 = 指定なし）
         """
-        self._model: WhisperModel | None = None
+        self._model: faster_whisper.WhisperModel | None = None
         self._model_id: str = model_id
+        self._compute_type = compute_type
+        self._cpu_threads = cpu_threads
+        self._num_workers = num_workers
+        self._profile = profile
+        self._fast_model: faster_whisper.WhisperModel | None = None
+        self._fast_model_id = fast_model_id
+        self._route_min_duration = route_min_duration
+        self._latency_budget = latency_budget
+        self._hotwords = hotwords.strip()
+        # (モデルID, 文脈) → 上限で切り詰めた initial_prompt のトークン列
+        self._prompt_tokens: dict[tuple[str, str], list[int]] = {}
+        # モデルごとの直近の実時間係数（処理時間 / 発話長）
+        self._rtf: defaultdict[str, RollingStats] = defaultdict(RollingStats)
+        # モデルごとの処理件数と直近の処理モデル
+        self.model_usage: Counter[str] = Counter()
+        self.last_model_id: str | None = None
+
+    def _create_model(self, model_id: str) -> faster_whisper.WhisperModel:
+        """推論設定を適用して WhisperModel を生成する。"""
+        return faster_whisper.WhisperModel(
+            model_id,
+            device="auto",
+            compute_type=self._compute_type,
+            cpu_threads=self._cpu_threads,
+            num_workers=self._num_workers,
+        )
+
+    def warm_up(self) -> None:
+        """faster_whisper の import を済ませる（起動後にバックグラウンドで呼ぶ）。
+
+        モデルは使うまでロードしない（NFR-003）。
+        """
+        preload(faster_whisper)
 
     def _load_model(self) -> None:
         """モデルを遅延ロードする（NFR-003対応）。"""
-        self._model = WhisperModel(
-            self._model_id,
-            device="auto",
-            compute_type="int8",
+        self._model = self._create_model(self._model_id)
+
+    def _get_model(self, model_id: str) -> faster_whisper.WhisperModel:
+        """model_id のモデルを返す（未ロードならロードする）。"""
+        if model_id == self._fast_model_id and model_id != self._model_id:
+            if self._fast_model is None:
+                self._fast_model = self._create_model(model_id)
+            return self._fast_model
+        if self._model is None:
+            self._load_model()
+        assert self._model is not None
+        return self._model
+
+    def select_model_id(self, duration: float) -> str:
+        """発話長と直近の処理速度から認識に使うモデルIDを選ぶ。
+
+        高速モデルが未設定、発話が route_min_duration 未満、または精度優先モデルの
+        予測処理時間（直近の平均実時間係数 × 発話長）が latency_budget 以内の場合は
+        精度優先モデルを選ぶ。計測値が無い間は精度優先モデルを使う。
+
+        Args:
+            duration: 発話長（秒）
+
+        Returns:
+            認識に使うモデルID
+        """
+        if not self._fast_model_id or duration < self._route_min_duration:
+            return self._model_id
+        rtf = self._rtf[self._model_id].mean()
+        if rtf is None or rtf * duration <= self._latency_budget:
+            return self._model_id
+        _logger.info(
+            "発話長 %.1f 秒は予測 %.1f 秒のため %s で認識します",
+            duration,
+            rtf * duration,
+            self._fast_model_id,
         )
+        return self._fast_model_id
 
-    def transcribe(self, audio: np.ndarray) -> str:
+    def transcribe(
+        self,
+        audio: np.ndarray,
+        model_id: str | None = None,
+        on_segment: Callable[[str], None] | None = None,
+        prompt: str = "",
+    ) -> str:
         """音声データを認識してテキストを返す。
 
         初回呼び出し時にモデルをロード（遅延ロード）。
 
         Args:
             audio: 録音音声データ（np.ndarray, dtype=int16, 16kHz）
+            model_id: 使用するモデルID（None の場合は select_model_id() で振り分け）
+            on_segment: セグメントのデコードが確定するたびにそのテキストで呼ぶ関数
+                （後続のデコード中に後処理を始めるため。SegmentPipeline.feed）
+            prompt: 直前の発話の認識結果などの文脈（TranscriptContext.prompt()）。
+                末尾 MAX_PROMPT_TOKENS トークンを initial_prompt として渡す
 
         Returns:
             認識結果テキスト。認識できない場合は空文字。
         """
-        if self._model is None:
-            self._load_model()
+        duration = len(audio) / self.SAMPLE_RATE
+        model_id = model_id or self.select_model_id(duration)
+        model = self._get_model(model_id)
 
-        assert self._model is not None
         # int16 → float32 に正規化
         audio_float = audio.astype(np.float32) / 32768.0
 
-        segments, _ = self._model.transcribe(
-            audio_float,
-            language="ja",
-            beam_size=1,
-        )
-        return "".join(segment.text for segment in segments)
+        start = time.perf_counter()
+        options = dict(DECODE_PROFILES.get(self._profile, DECODE_PROFILES[DEFAULT_PROFILE]))
+        if prompt.strip():
+            options["initial_prompt"] = self._tokenize_prompt(model_id, model, prompt)
+        if self._hotwords:
+            options["hotwords"] = self._hotwords
+        segments, _ = model.transcribe(audio_float, language="ja", **options)
+        texts: list[str] = []
+        for segment in segments:  # segments は遅延評価で、反復のたびにデコードが進む
+            texts.append(segment.text)
+            if on_segment is not None:
+                on_segment(segment.text)
+        text = "".join(texts)
+        elapsed = time.perf_counter() - start
+
+        if duration > 0:
+            self._rtf[model_id].add(elapsed / duration)
+        self.model_usage[model_id] += 1
+        self.last_model_id = model_id
+        return text
+
+    def _tokenize_prompt(
+        self, model_id: str, model: faster_whisper.WhisperModel, prompt: str
+    ) -> list[int]:
+        """prompt をトークン化し、末尾 MAX_PROMPT_TOKENS トークンに切り詰めて返す（キャッシュする）。"""
+        key = (model_id, prompt)
+        tokens = self._prompt_tokens.get(key)
+        if tokens is None:
+            # faster-whisper が文字列の initial_prompt に行う変換と同じ（先頭に空白を付ける）
+            encoded = model.hf_tokenizer.encode(" " + prompt.strip(), add_special_tokens=False)
+            tokens = list(encoded.ids)[-self.MAX_PROMPT_TOKENS :]
+            if len(self._prompt_tokens) >= self.PROMPT_CACHE_SIZE:
+                self._prompt_tokens.clear()
+            self._prompt_tokens[key] = tokens
+        return tokens
 
     def reload_model(self, model_id: str) -> None:
         """モデルを変更して再読み込みする（REQ-019）。
@@ -63,3 +242,18 @@ class Transcriber:
         """
         self._model_id = model_id
         self._model = None  # 次回 transcribe() 時に遅延ロード
+        self._rtf.pop(model_id, None)
+        self._prompt_tokens.clear()
+
+    def set_profile(self, profile: str) -> None:
+        """デコードプロファイルを変更する（モデルの再ロードは不要）。
+
+        Args:
+            profile: DECODE_PROFILES のキー
+
+        Raises:
+            ValueError: 未知のプロファイル名の場合
+        """
+        if profile not in DECODE_PROFILES:
+            raise ValueError(f"未知のデコードプロファイルです: {profile}")
+        self._profile = profile
@@ -0,0 +1,412 @@
+"""音声認識サーバーモジュール。
+
+Whisper の推論をメニューバーアプリとは別プロセスで実行する。
+アプリ（RemoteTranscriber）とはローカルの Unix ドメインソケットで通信し、
+音声データは multiprocessing.shared_memory 経由で受け渡す（pickle によるコピーなし）。
+
+コマンド:
+    uv run speakdrop transcription-server
+
+サーバーはアプリとは別セッションで起動するため、アプリを再起動してもモデルはロード済みのまま残る。
+サーバーが落ちた場合は、RemoteTranscriber が次のリクエスト時に自動で再起動する。
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from multiprocessing import AuthenticationError, resource_tracker
+from multiprocessing.connection import Client, Connection, Listener
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from speakdrop.config import CONFIG_PATH, Config
+from speakdrop.lazy import lazy_module
+from speakdrop.transcriber import Transcriber
+
+if TYPE_CHECKING:
+    import numpy as np
+else:
+    np = lazy_module("numpy")
+
+_logger = logging.getLogger(__name__)
+
+SOCKET_PATH = CONFIG_PATH.parent / "transcriber.sock"
+# 接続認証用の鍵（所有者のみ読み書き可能なファイルに保存）
+AUTHKEY_PATH = CONFIG_PATH.parent / "transcriber.key"
+
+
+def load_authkey(path: Path = AUTHKEY_PATH) -> bytes:
+    """接続認証用の鍵を読み込む。存在しない場合は生成して保存する。"""
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    key = os.urandom(32)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    return key
+
+
+def _attach_shared_memory(name: str) -> SharedMemory:
+    """クライアントが作成した共有メモリに接続する。
+
+    Python 3.12 以前は接続側でも resource_tracker に登録され、サーバー終了時に
+    クライアントの共有メモリが解放されてしまうため登録を解除する。
+    """
+    shm = SharedMemory(name=name)
+    resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+    return shm
+
+
+class TranscriptionServer:
+    """Transcriber をソケット経由で提供するサーバー。
+
+    リクエスト（dict）:
+        {"op": "transcribe", "shm": 共有メモリ名, "length": サンプル数, "kwargs": {...}}
+        {"op": "reload_model", "model_id": ...}
+        {"op": "set_profile", "profile": ...}
+        {"op": "ping"}
+        {"op": "shutdown"}
+
+    レスポンス:
+        {"ok": True, ...} または {"ok": False, "error": エラーメッセージ}
+    """
+
+    def __init__(self, transcriber: Transcriber) -> None:
+        """TranscriptionServer を初期化する。
+
+        Args:
+            transcriber: 推論に使う Transcriber（モデルはサーバー内に常駐する）
+        """
+        self._transcriber = transcriber
+        self._shm: SharedMemory | None = None
+        self._running = True
+
+    def handle(self, request: dict[str, Any]) -> dict[str, Any]:
+        """1件のリクエストを処理してレスポンスを返す。"""
+        op = request.get("op")
+        try:
+            if op == "transcribe":
+                return self._transcribe(request)
+            if op == "reload_model":
+                self._transcriber.reload_model(request["model_id"])
+            elif op == "set_profile":
+                self._transcriber.set_profile(request["profile"])
+            elif op == "shutdown":
+                self._running = False
+            elif op != "ping":
+                return {"ok": False, "error": f"未知のリクエストです: {op}"}
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+        return {"ok": True}
+
+    def _transcribe(self, request: dict[str, Any]) -> dict[str, Any]:
+        """共有メモリ上の音声を認識する。"""
+        shm = self._attach(request["shm"])
+        audio = np.ndarray((request["length"],), dtype=np.int16, buffer=shm.buf)
+        try:
+            text = self._transcriber.transcribe(audio, **request.get("kwargs", {}))
+        finally:
+            del audio  # 共有メモリのバッファへの参照を解放
+        return {"ok": True, "text": text, "model_id": self._transcriber.last_model_id}
+
+    def _attach(self, name: str) -> SharedMemory:
+        """共有メモリに接続する（同じ名前なら前回の接続を再利用する）。"""
+        if self._shm is None or self._shm.name != name:
+            self._detach()
+            self._shm = _attach_shared_memory(name)
+        return self._shm
+
+    def _detach(self) -> None:
+        if self._shm is not None:
+            self._shm.close()
+            self._shm = None
+
+    def serve_connection(self, conn: Connection) -> None:
+        """1つの接続のリクエストを接続が閉じられるまで処理する。"""
+        with conn:
+            while self._running:
+                try:
+                    request = conn.recv()
+                except (EOFError, OSError):
+                    break
+                conn.send(self.handle(request))
+        self._detach()
+
+    def serve_forever(self, listener: Listener) -> None:
+        """shutdown リクエストを受けるか listener が閉じられるまで接続を1つずつ処理する。"""
+        with listener:
+            while self._running:
+                try:
+                    conn = listener.accept()
+                except (AuthenticationError, EOFError) as e:  # 認証失敗・接続直後の切断
+                    _logger.warning("接続を拒否しました: %s", e)
+                    continue
+                except OSError:  # listener が閉じられた
+                    break
+                self.serve_connection(conn)
+
+
+class RemoteTranscriber:
+    """別プロセスの TranscriptionServer に認識を依頼するクライアント。
+
+    Transcriber と同じインターフェース（transcribe / reload_model / set_profile）を持つ。
+    サーバーが起動していない・落ちた場合は起動し直してリクエストを1回だけ再送する
+    （起動を待ち切った場合は再送しない）。
+    """
+
+    CONNECT_TIMEOUT: float = 15.0  # サーバー起動を待つ最大時間（秒）
+
+    def __init__(
+        self,
+        socket_path: Path = SOCKET_PATH,
+        authkey_path: Path = AUTHKEY_PATH,
+        server_command: list[str] | None = None,
+    ) -> None:
+        """RemoteTranscriber を初期化する（サーバーへの接続は初回リクエスト時）。
+
+        Args:
+            socket_path: サーバーのソケットパス
+            authkey_path: 接続認証用の鍵ファイル
+            server_command: サーバーの起動コマンド（None の場合は transcription-server）
+        """
+        self._socket_path = socket_path
+        self._authkey_path = authkey_path
+        self._server_command = server_command or [
+            sys.executable,
+            "-m",
+            "speakdrop",
+            "transcription-server",
+            "--socket",
+            str(socket_path),
+        ]
+        self._conn: Connection | None = None
+        self._shm: SharedMemory | None = None
+        self._lock = threading.Lock()  # 接続・共有メモリを使うリクエストの排他（認識中は保持）
+        # 未送信の設定変更（op → リクエスト。同じ op は最新の値だけを送る）
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._pending_lock = threading.Lock()
+        self.model_usage: Counter[str] = Counter()
+        self.last_model_id: str | None = None
+        self.restart_count = 0
+
+    def transcribe(
+        self,
+        audio: np.ndarray,
+        model_id: str | None = None,
+        on_segment: Callable[[str], None] | None = None,
+        prompt: str = "",
+    ) -> str:
+        """音声データをサーバーで認識してテキストを返す。
+
+        Args:
+            audio: 録音音声データ（np.ndarray, dtype=int16, 16kHz）
+            model_id: 使用するモデルID（None の場合はサーバー側で振り分け）
+            on_segment: Transcriber とのインターフェース互換のため受け取るが呼ばない
+                （サーバーは全文をまとめて返すため、後処理は全文の受信後に始まる）
+            prompt: 直前の発話の認識結果などの文脈（Transcriber.transcribe() に渡す）
+
+        Returns:
+            認識結果テキスト。
+
+        Raises:
+            RuntimeError: サーバーで認識に失敗した場合
+        """
+        samples = np.ascontiguousarray(audio, dtype=np.int16)
+        with self._lock:
+            self._send_pending()
+            shm = self._buffer(max(samples.nbytes, 1))
+            np.ndarray(samples.shape, dtype=np.int16, buffer=shm.buf)[:] = samples
+            kwargs = {"model_id": model_id} if model_id else {}
+            if prompt:
+                kwargs["prompt"] = prompt
+            response = self._request(
+                {"op": "transcribe", "shm": shm.name, "length": len(samples), "kwargs": kwargs}
+            )
+            self._send_pending()  # 認識中に受け付けた設定変更
+        model = response.get("model_id")
+        if model:
+            self.model_usage[model] += 1
+            self.last_model_id = model
+        return str(response["text"])
+
+    def warm_up(self) -> None:
+        """Transcriber とのインターフェース互換のため（依存の読み込みはサーバー側で行う）。"""
+
+    def reload_model(self, model_id: str) -> None:
+        """サーバーのモデルを変更する（REQ-019）。
+
+        メニューの操作から呼ばれるため認識の完了を待たない（_queue_control() を参照）。
+        """
+        self._queue_control({"op": "reload_model", "model_id": model_id})
+
+    def set_profile(self, profile: str) -> None:
+        """サーバーのデコードプロファイルを変更する（認識の完了を待たない）。"""
+        self._queue_control({"op": "set_profile", "profile": profile})
+
+    def _queue_control(self, request: dict[str, Any]) -> None:
+        """設定変更のリクエストを登録し、接続済みで認識中でなければすぐに送る。
+
+        認識中・未接続の場合は認識の完了後（遅くとも次の認識の前）に transcribe() が送る
+        （呼び出し元を認識やサーバーの起動で待たせない）。送信の失敗はログに記録する。
+        """
+        with self._pending_lock:
+            self._pending[request["op"]] = request
+        if self._conn is not None and self._lock.acquire(blocking=False):
+            try:
+                self._send_pending()
+            finally:
+                self._lock.release()
+
+    def close(self) -> None:
+        """接続と共有メモリを解放する（サーバーは停止しない）。"""
+        with self._lock:
+            self._disconnect()
+            if self._shm is not None:
+                self._shm.close()
+                self._shm.unlink()
+                self._shm = None
+
+    def _buffer(self, nbytes: int) -> SharedMemory:
+        """nbytes 以上の共有メモリを返す（足りない場合のみ作り直す）。"""
+        if self._shm is None or self._shm.size < nbytes:
+            if self._shm is not None:
+                self._shm.close()
+                self._shm.unlink()
+            self._shm = SharedMemory(create=True, size=nbytes)
+        return self._shm
+
+    def _send_pending(self) -> None:
+        """未送信の設定変更を送る（self._lock を保持して呼ぶ）。"""
+        with self._pending_lock:
+            requests = list(self._pending.values())
+            self._pending.clear()
+        for request in requests:
+            try:
+                self._request(request)
+            except (RuntimeError, EOFError, OSError) as e:
+                _logger.warning("音声認識サーバーの設定変更に失敗しました（%s）: %s", request, e)
+
+    def _request(self, request: dict[str, Any]) -> dict[str, Any]:
+        """リクエストを送信する。通信に失敗した場合はサーバーを起動し直して1回再送する。"""
+        try:
+            response = self._send(request)
+        except (EOFError, OSError):
+            _logger.warning("音声認識サーバーとの通信に失敗したため再起動します")
+            self._disconnect()
+            self.restart_count += 1
+            response = self._send(request)
+        if not response.get("ok"):
+            raise RuntimeError(response.get("error", "音声認識サーバーでエラーが発生しました"))
+        return response
+
+    def _send(self, request: dict[str, Any]) -> dict[str, Any]:
+        conn = self._connect()
+        conn.send(request)
+        response: dict[str, Any] = conn.recv()
+        return response
+
+    def _connect(self) -> Connection:
+        """サーバーに接続する。接続できない場合はサーバーを起動して待つ。
+
+        Raises:
+            RuntimeError: CONNECT_TIMEOUT 秒待っても接続できない場合
+        """
+        if self._conn is not None:
+            return self._conn
+        authkey = load_authkey(self._authkey_path)
+        try:
+            self._conn = Client(str(self._socket_path), family="AF_UNIX", authkey=authkey)
+            return self._conn
+        except OSError:
+            pass
+        # アプリの終了・再起動に巻き込まれないよう別セッションで起動する
+        subprocess.Popen(
+            self._server_command,
+            start_new_session=True,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + self.CONNECT_TIMEOUT
+        while True:
+            try:
+                self._conn = Client(str(self._socket_path), family="AF_UNIX", authkey=authkey)
+                return self._conn
+            except OSError as e:
+                if time.monotonic() >= deadline:
+                    # 起動を待ち切った後に _request() が再起動・再送しないよう OSError にしない
+                    raise RuntimeError("音声認識サーバーを起動できませんでした") from e
+                time.sleep(0.1)
+
+    def _disconnect(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def create_listener(socket_path: Path, authkey: bytes) -> Listener | None:
+    """ソケットで待ち受ける Listener を作成する。
+
+    既に別のサーバーが応答する場合は None を返す。応答しない古いソケットファイルは削除する。
+    """
+    if socket_path.exists():
+        try:
+            Client(str(socket_path), family="AF_UNIX", authkey=authkey).close()
+            return None
+        except OSError:
+            socket_path.unlink()
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    return Listener(str(socket_path), family="AF_UNIX", authkey=authkey)
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="speakdrop transcription-server",
+        description="Whisper の音声認識を別プロセスで提供するサーバーを起動する",
+    )
+    parser.add_argument("--socket", type=Path, default=SOCKET_PATH, help="待ち受けるソケットパス")
+    return parser.parse_args(argv)
+
+
+def main(
+    argv: list[str], config_path: Path = CONFIG_PATH, authkey_path: Path = AUTHKEY_PATH
+) -> int:
+    """transcription-server コマンドを実行する。
+
+    Returns:
+        終了コード（既に別のサーバーが起動している場合も 0）
+    """
+    args = _parse_args(argv)
+    config = Config().load(config_path)
+    listener = create_listener(args.socket, load_authkey(authkey_path))
+    if listener is None:
+        print(f"{args.socket} で既にサーバーが起動しています")
+        return 0
+    transcriber = Transcriber(
+        model_id=config.model,
+        compute_type=config.compute_type,
+        cpu_threads=config.cpu_threads,
+        num_workers=config.num_workers,
+        profile=config.decode_profile,
+        fast_model_id=config.fast_model,
+        route_min_duration=config.route_min_duration,
+        latency_budget=config.latency_budget,
+        hotwords=config.hotwords,
+    )
+    try:
+        TranscriptionServer(transcriber).serve_forever(listener)
+    finally:
+        args.socket.unlink(missing_ok=True)
+    return 0
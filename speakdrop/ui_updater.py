@@ -0,0 +1,91 @@
+"""UI 更新の集約モジュール。
+
+録音ブロックのコールバックは1秒間に数十〜数百回呼ばれるため、入力レベルの表示を
+ブロックごとにメインスレッドへ投入すると UI の処理量がコールバックの頻度に比例して
+増える。UiUpdater は更新をキーごとに最新の1件へまとめ、メインスレッドでの反映を
+最大 max_rate 回/秒に抑える。状態遷移のように遅らせたくない更新は即時に反映する
+（NFR-007: 200ms 以内）。
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+from typing import Any
+
+from speakdrop.clock import Clock
+
+
+class UiUpdater:
+    """UI 更新をキーごとに最新の値へまとめ、メインスレッドでまとめて反映する（スレッドセーフ）。
+
+    頻度制限された反映は同時に1件しか予約しないため、publish() の頻度によらず
+    反映の回数は max_rate 回/秒（と即時反映の回数）を超えない。即時の反映は
+    予約の有無によらず常に予約する。
+    """
+
+    def __init__(
+        self,
+        call_later: Callable[[float, Callable[[], None]], None],
+        clock: Clock,
+        max_rate: float = 15.0,
+    ) -> None:
+        """UiUpdater を初期化する。
+
+        Args:
+            call_later: delay 秒後に関数をメインスレッドで実行する関数（delay が 0 なら即時に予約）
+            clock: 前回の反映からの経過時間の計測に使う時計
+            max_rate: 1秒あたりの反映回数の上限
+        """
+        self._call_later = call_later
+        self._clock = clock
+        self._interval = 1.0 / max_rate
+        self._pending: dict[str, tuple[Callable[..., Any], tuple[Any, ...]]] = {}
+        self._scheduled_at: float | None = None  # 予約済みの反映の時刻
+        self._last_flush = float("-inf")
+        self._lock = threading.Lock()
+        self.published = 0  # publish() の呼び出し回数
+        self.flushes = 0  # メインスレッドで反映した回数
+
+    def publish(
+        self, key: str, func: Callable[..., Any], *args: Any, immediate: bool = False
+    ) -> None:
+        """func(*args) による UI 更新を key の最新の更新として登録し、反映を予約する。
+
+        反映前に同じ key の更新が登録された場合は、最後の更新だけを反映する。
+
+        Args:
+            key: 更新の種類（同じ key の更新はまとめられる）
+            func: メインスレッドで実行する UI 更新
+            *args: func の引数
+            immediate: True の場合は前回の反映からの間隔によらず即時に反映する
+        """
+        now = self._clock.monotonic()
+        with self._lock:
+            self._pending[key] = (func, args)
+            self.published += 1
+            at = now if immediate else max(now, self._last_flush + self._interval)
+            scheduled = self._scheduled_at
+            # 予定時刻から間隔の分を過ぎても実行されていない予約は失われたものとみなして予約し直す
+            if (
+                not immediate
+                and scheduled is not None
+                and scheduled <= at
+                and now <= scheduled + self._interval
+            ):
+                return  # 予約済みの反映で一緒に反映される
+            self._scheduled_at = at
+        self._call_later(at - now, self._flush)
+
+    def _flush(self) -> None:
+        """登録済みの更新をメインスレッドで反映する。"""
+        with self._lock:
+            pending = self._pending
+            if not pending:
+                return  # 先に即時の反映でまとめて反映済み
+            self._pending = {}
+            self._scheduled_at = None
+            self._last_flush = self._clock.monotonic()
+            self.flushes += 1
+        for func, args in pending.values():
+            func(*args)
@@ -0,0 +1,96 @@
+"""macOS 専用モジュールのフェイク（tests と benchmarks で共有）。
+
+rumps・PyObjC・pynput は macOS 以外では import できないため、SpeakDropApp を組み立てる
+テスト・ベンチマークは install_macos_fakes() でフェイクを sys.modules に登録する。
+rumps は常にフェイクに差し替え（AppKit のイベントループを使わない）、それ以外は
+import できない場合だけ MagicMock で補う。
+"""
+
+from __future__ import annotations
+
+import importlib
+import sys
+from typing import Any
+from unittest.mock import MagicMock
+
+# import できなければ MagicMock で補うモジュール（親パッケージを先に並べる）
+MACOS_MODULES = (
+    "PyObjCTools",
+    "PyObjCTools.AppHelper",
+    "AVFoundation",
+    "ApplicationServices",
+    "AppKit",
+    "Cocoa",
+    "Quartz",
+    "Quartz.CoreGraphics",
+    "pynput",
+    "pynput.keyboard",
+)
+
+
+class FakeMenuItem:
+    """rumps.MenuItem のフェイク実装。"""
+
+    def __init__(self, title: str = "", callback: Any = None) -> None:
+        self.title = title
+        self._callback = callback
+
+    def set_callback(self, callback: Any) -> None:
+        self._callback = callback
+
+
+class FakeApp:
+    """rumps.App のフェイク実装。"""
+
+    def __init__(
+        self, name: str, title: str | None = None, quit_button: str | None = "Quit"
+    ) -> None:
+        self.name = name
+        self.title = title or name
+        self.menu: list[Any] = []
+
+
+class FakeWindow:
+    """rumps.Window のフェイク実装。"""
+
+    def __init__(self, **kwargs: Any) -> None:
+        self._kwargs = kwargs
+        self.run_result = MagicMock(clicked=0)
+
+    def run(self) -> MagicMock:
+        return self.run_result
+
+
+def _fake_quit_application() -> None:
+    pass
+
+
+def _fake_notification(**kwargs: Any) -> None:
+    pass
+
+
+def _fake_alert(**kwargs: Any) -> None:
+    pass
+
+
+fake_rumps = MagicMock()
+fake_rumps.App = FakeApp
+fake_rumps.MenuItem = FakeMenuItem
+fake_rumps.Window = FakeWindow
+fake_rumps.quit_application = _fake_quit_application
+fake_rumps.notification = _fake_notification
+fake_rumps.alert = _fake_alert
+
+
+def install_macos_fakes() -> None:
+    """rumps をフェイクに差し替え、import できない macOS 専用モジュールを補う。"""
+    sys.modules["rumps"] = fake_rumps
+    for name in MACOS_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:  # 未インストール、または macOS 以外で読み込めない（pynput など）
+            module = MagicMock()
+            sys.modules[name] = module
+            parent, _, child = name.rpartition(".")
+            if parent:
+                setattr(sys.modules[parent], child, module)
@@ -7,73 +7,23 @@ rumps をモック化して、AppState 状態管理・ホットキーコール
 from __future__ import annotations
 
 import sys
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
 from enum import Enum
 from typing import Any
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, patch
 
+import numpy as np
 import pytest
 
+from tests.fake_macos import install_macos_fakes
 
 # ---------------------------------------------------------------------------
-# rumps のモック（テスト環境では AppKit が利用できないため）
+# rumps・PyObjC のモック（テスト環境では AppKit が利用できないため）
 # ---------------------------------------------------------------------------
 
-
-class _FakeMenuItem:
-    """rumps.MenuItem のフェイク実装。"""
-
-    def __init__(self, title: str = "", callback: Any = None) -> None:
-        self.title = title
-        self._callback = callback
-
-    def set_callback(self, callback: Any) -> None:
-        self._callback = callback
-
-
-class _FakeApp:
-    """rumps.App のフェイク実装。"""
-
-    def __init__(
-        self, name: str, title: str | None = None, quit_button: str | None = "Quit"
-    ) -> None:
-        self.name = name
-        self.title = title or name
-        self.menu: list[Any] = []
-
-
-class _FakeWindow:
-    """rumps.Window のフェイク実装。"""
-
-    def __init__(self, **kwargs: Any) -> None:
-        self._kwargs = kwargs
-        self.run_result = MagicMock(clicked=0)
-
-    def run(self) -> MagicMock:
-        return self.run_result
-
-
-def _fake_quit_application() -> None:
-    pass
-
-
-def _fake_notification(**kwargs: Any) -> None:
-    pass
-
-
-def _fake_alert(**kwargs: Any) -> None:
-    pass
-
-
-# rumps モジュールをフェイクで差し替え
-_fake_rumps = MagicMock()
-_fake_rumps.App = _FakeApp
-_fake_rumps.MenuItem = _FakeMenuItem
-_fake_rumps.Window = _FakeWindow
-_fake_rumps.quit_application = _fake_quit_application
-_fake_rumps.notification = _fake_notification
-_fake_rumps.alert = _fake_alert
-
-sys.modules["rumps"] = _fake_rumps
+install_macos_fakes()
 
 # ---------------------------------------------------------------------------
 # 依存モジュールもモック化
@@ -94,12 +44,6 @@ sys.modules.setdefault("sounddevice", MagicMock())
 sys.modules.setdefault("numpy", MagicMock())
 sys.modules.setdefault("faster_whisper", MagicMock())
 sys.modules.setdefault("ollama", MagicMock())
-sys.modules.setdefault("pynput", MagicMock())
-sys.modules.setdefault("pynput.keyboard", MagicMock())
-sys.modules.setdefault("AppKit", MagicMock())
-sys.modules.setdefault("Cocoa", MagicMock())
-sys.modules.setdefault("Quartz", MagicMock())
-sys.modules.setdefault("Quartz.CoreGraphics", MagicMock())
 
 
 # ---------------------------------------------------------------------------
@@ -107,22 +51,23 @@ sys.modules.setdefault("Quartz.CoreGraphics", MagicMock())
 # ---------------------------------------------------------------------------
 
 
-@pytest.fixture
-def app() -> Any:
-    """SpeakDropApp インスタンスを返す（全依存をモック化）。"""
+@contextmanager
+def _mocked_app(clock: Any = None, **config: Any) -> Iterator[Any]:
+    """全依存をモック化した SpeakDropApp を作成する（config で設定値を上書きできる）。"""
 
     def _call_after(func: Any, *args: Any, **kwargs: Any) -> None:
         func(*args, **kwargs)
 
     with (
-        patch("speakdrop.app.AudioRecorder", return_value=MagicMock()),
+        patch("speakdrop.app.AudioRecorder", return_value=MagicMock(), SAMPLE_RATE=16000),
         patch("speakdrop.app.Transcriber", return_value=MagicMock()),
-        patch("speakdrop.app.TextProcessor", return_value=MagicMock()),
-        patch("speakdrop.app.ClipboardInserter", return_value=MagicMock()),
+        patch("speakdrop.app.TextProcessor", return_value=MagicMock(), NUM_PREDICT=512),
+        patch("speakdrop.app.create_inserter", side_effect=lambda *_, **__: MagicMock()),
         patch("speakdrop.app.HotkeyListener", return_value=MagicMock()),
         patch("speakdrop.app.PermissionChecker") as mock_pc,
         patch("speakdrop.app.Config") as mock_cfg,
         patch("speakdrop.app.AppHelper") as mock_app_helper,
+        patch("speakdrop.app.load_profile_stats", return_value={}),
     ):
         mock_app_helper.callAfter.side_effect = _call_after
         mock_cfg_instance = MagicMock()
@@ -130,6 +75,29 @@ def app() -> Any:
         mock_cfg_instance.hotkey = "alt_r"
         mock_cfg_instance.model = "kotoba-tech/kotoba-whisper-v1.0"
         mock_cfg_instance.ollama_model = "qwen2.5:7b"
+        mock_cfg_instance.decode_profile = "balanced"
+        mock_cfg_instance.fast_model = ""
+        mock_cfg_instance.speculative_draft = False
+        mock_cfg_instance.transcription_server = False
+        mock_cfg_instance.record_sessions = False
+        mock_cfg_instance.type_max_chars = 0
+        mock_cfg_instance.clipboard_max_restore_bytes = 0
+        mock_cfg_instance.stream_unit_chars = 0
+        mock_cfg_instance.llm_batch_max_items = 1
+        mock_cfg_instance.context_chars = 0
+        mock_cfg_instance.context_idle_timeout = 120.0
+        mock_cfg_instance.hotwords = ""
+        mock_cfg_instance.hotkey_mode = "hold"
+        mock_cfg_instance.endpoint_silence = 0.8
+        mock_cfg_instance.max_record_duration = 30.0
+        mock_cfg_instance.level_meter_rate = 15.0
+        mock_cfg_instance.min_record_duration = 0.0
+        mock_cfg_instance.min_speech_duration = 0.0
+        mock_cfg_instance.speech_rms_threshold = 200.0
+        mock_cfg_instance.native_rate_capture = True
+        mock_cfg_instance.latency_slo = True
+        for name, value in config.items():
+            setattr(mock_cfg_instance, name, value)
         mock_cfg.return_value.load.return_value = mock_cfg_instance
 
         mock_pc.return_value.check_microphone.return_value = True
@@ -137,7 +105,22 @@ def app() -> Any:
 
         from speakdrop.app import SpeakDropApp
 
-        instance = SpeakDropApp()
+        yield SpeakDropApp(clock=clock)
+
+
+@pytest.fixture
+def app() -> Any:
+    """SpeakDropApp インスタンスを返す（全依存をモック化）。"""
+    with _mocked_app() as instance:
+        yield instance
+
+
+@pytest.fixture
+def replay_app() -> Any:
+    """VirtualClock を注入した SpeakDropApp インスタンスを返す（セッションの再生用）。"""
+    from speakdrop.clock import VirtualClock
+
+    with _mocked_app(VirtualClock()) as instance:
         yield instance
 
 
@@ -146,6 +129,14 @@ def app() -> Any:
 # ---------------------------------------------------------------------------
 
 
+def _enter_processing(app: Any) -> None:
+    """app を録音を経て PROCESSING 状態にする。"""
+    from speakdrop.app import AppState
+
+    app.set_state(AppState.RECORDING)
+    app.set_state(AppState.PROCESSING)
+
+
 def _make_window_response(clicked: int, text: str) -> MagicMock:
     """Window.run() の戻り値を生成するヘルパー。"""
     r = MagicMock()
@@ -205,6 +196,50 @@ class TestInitialState:
 
         assert app.title == get_icon_title(AppState.IDLE)
 
+    def test_injected_clock_is_shared_with_components(self) -> None:
+        """注入した時計を録音・挿入・ホットキー監視に渡すこと。"""
+        from speakdrop.clock import VirtualClock
+
+        clock = VirtualClock()
+        with (
+            patch("speakdrop.app.AudioRecorder") as mock_recorder,
+            patch("speakdrop.app.Transcriber"),
+            patch("speakdrop.app.TextProcessor"),
+            patch("speakdrop.app.create_inserter") as mock_create_inserter,
+            patch("speakdrop.app.HotkeyListener") as mock_listener,
+            patch("speakdrop.app.PermissionChecker"),
+            patch("speakdrop.app.Config") as mock_cfg,
+            patch("speakdrop.app.load_profile_stats", return_value={}),
+        ):
+            mock_cfg.return_value.load.return_value = MagicMock(
+                transcription_server=False, record_sessions=False
+            )
+            from speakdrop.app import SpeakDropApp
+
+            instance = SpeakDropApp(clock=clock)
+            instance._start_hotkey_listener()
+
+        assert instance.clock is clock
+        assert mock_recorder.call_args.kwargs["clock"] is clock
+        assert [c.args[1] for c in mock_create_inserter.call_args_list] == [clock, clock]
+        assert mock_listener.call_args.kwargs["clock"] is clock
+
+    def test_warms_up_dependencies_in_background(self, app: Any) -> None:
+        """起動後に音声認識・後処理の依存をバックグラウンドで読み込むこと。"""
+        assert app.warmed_up.wait(1.0)
+        app.text_processor.warm_up.assert_called_once_with()
+        app.transcriber.warm_up.assert_called_once_with()
+
+    def test_warm_up_failure_is_not_fatal(self, app: Any) -> None:
+        """依存の読み込みに失敗しても起動を妨げないこと（最初の処理時に改めて失敗する）。"""
+        app.warmed_up.wait(1.0)
+        app.warmed_up.clear()
+        app.text_processor.warm_up.side_effect = ImportError("ollama")
+
+        app._warm_up()
+
+        assert app.warmed_up.is_set()
+
 
 class TestSetState:
     """set_state() のテスト。"""
@@ -236,12 +271,22 @@ class TestSetState:
         from speakdrop.app import AppState
         from speakdrop.icons import get_icon_title
 
-        app.set_state(AppState.PROCESSING)
+        _enter_processing(app)
 
         assert app.state == AppState.PROCESSING
         assert app.title == get_icon_title(AppState.PROCESSING)
         assert app.status_item.title == "処理中..."
 
+    def test_set_state_rejects_undeclared_transition(self, app: Any) -> None:
+        """遷移表に無い遷移（IDLE → PROCESSING）は InvalidTransitionError になること。"""
+        from speakdrop.app import AppState
+        from speakdrop.state_machine import InvalidTransitionError
+
+        with pytest.raises(InvalidTransitionError):
+            app.set_state(AppState.PROCESSING)
+
+        assert app.state == AppState.IDLE
+
 
 class TestHotkeyCallbacks:
     """ホットキーコールバックのテスト。"""
@@ -283,6 +328,54 @@ class TestHotkeyCallbacks:
             app.audio_recorder.stop_recording.assert_called_once()
             assert app.state == AppState.PROCESSING
 
+    def test_on_hotkey_release_skips_short_press(self, app: Any) -> None:
+        """min_record_duration より短い録音は認識せず IDLE に戻ること。"""
+        from speakdrop.app import AppState
+
+        app.config.min_record_duration = 0.3
+        app.set_state(AppState.RECORDING)
+        app.audio_recorder.stop_recording.return_value = np.zeros(1600, dtype=np.int16)
+
+        with patch.object(app, "process_audio") as mock_process:
+            app.on_hotkey_release()
+
+        mock_process.assert_not_called()
+        assert app.state == AppState.IDLE
+        assert app.skipped_utterances["too_short"] == 1
+
+    def test_on_hotkey_release_skips_silent_recording(self, app: Any) -> None:
+        """発話らしい音量のブロックが min_speech_duration に満たない録音は認識しないこと。"""
+        from speakdrop.app import AppState
+
+        app.config.min_record_duration = 0.3
+        app.config.min_speech_duration = 0.1
+        app.set_state(AppState.RECORDING)
+        app.audio_recorder.stop_recording.return_value = np.zeros(16000, dtype=np.int16)
+        app.audio_recorder.voiced_duration = 0.05
+
+        with patch.object(app, "process_audio") as mock_process:
+            app.on_hotkey_release()
+
+        mock_process.assert_not_called()
+        assert app.state == AppState.IDLE
+        assert app.skipped_utterances["no_speech"] == 1
+
+    def test_on_hotkey_release_processes_speech(self, app: Any) -> None:
+        """十分な長さと音量の録音は認識に回すこと。"""
+        from speakdrop.app import AppState
+
+        app.config.min_record_duration = 0.3
+        app.config.min_speech_duration = 0.1
+        app.set_state(AppState.RECORDING)
+        app.audio_recorder.stop_recording.return_value = np.zeros(16000, dtype=np.int16)
+        app.audio_recorder.voiced_duration = 0.5
+
+        with patch.object(app, "process_audio"):
+            app.on_hotkey_release()
+
+        assert app.state == AppState.PROCESSING
+        assert not app.skipped_utterances
+
     def test_on_hotkey_release_ignored_when_not_recording(self, app: Any) -> None:
         """RECORDING 以外の状態では on_hotkey_release() は何もしない。"""
         from speakdrop.app import AppState
@@ -363,21 +456,54 @@ class TestToggleEnabled:
         mock_listener.stop.assert_called_once()
 
 
+class TestDecodeProfileMenu:
+    """デコードプロファイル選択メニューのテスト。"""
+
+    def test_current_profile_is_checked(self, app: Any) -> None:
+        """設定中のプロファイルのみチェックされていること。"""
+        states = {name: item.state for name, item in app.profile_items.items()}
+        assert states == {"fastest": False, "balanced": True, "accurate": False}
+
+    def test_select_profile_saves_and_applies(self, app: Any) -> None:
+        """プロファイル選択時に設定を保存し Transcriber に反映すること。"""
+        app._select_decode_profile(app.profile_items["fastest"])
+
+        assert app.config.decode_profile == "fastest"
+        app.config.save.assert_called_once()
+        app.transcriber.set_profile.assert_called_once_with("fastest")
+        assert app.profile_items["fastest"].state is True
+        assert app.profile_items["balanced"].state is False
+
+    def test_select_same_profile_does_nothing(self, app: Any) -> None:
+        """選択中のプロファイルを再選択しても保存しないこと。"""
+        app._select_decode_profile(app.profile_items["balanced"])
+
+        app.config.save.assert_not_called()
+        app.transcriber.set_profile.assert_not_called()
+
+    def test_titles_show_measured_stats(self, app: Any) -> None:
+        """bench-whisper の実測値がある場合はメニュー項目に表示すること。"""
+        stats = {"fastest": {"median_latency": 0.5, "p95_latency": 0.7, "cer": 0.04}}
+        with patch("speakdrop.app.load_profile_stats", return_value=stats):
+            app._update_profile_items()
+
+        assert app.profile_items["fastest"].title == "fastest（0.50秒 / CER 4.0%）"
+        assert app.profile_items["accurate"].title == "accurate（未計測）"
+
+
 class TestProcessAudio:
     """process_audio() のテスト。"""
 
     def test_process_audio_calls_transcribe_and_insert(self, app: Any) -> None:
         """process_audio() が transcribe → text_processor.process → insert の順に呼ぶ。"""
-        from speakdrop.app import AppState
-
         mock_audio = MagicMock()
         app.transcriber.transcribe.return_value = "テストテキスト"
         app.text_processor.process.return_value = "処理済みテキスト"
-        app.state = AppState.PROCESSING
+        _enter_processing(app)
 
         app.process_audio(mock_audio)
 
-        app.transcriber.transcribe.assert_called_once_with(mock_audio)
+        app.transcriber.transcribe.assert_called_once_with(mock_audio, on_segment=ANY)
         app.text_processor.process.assert_called_once_with("テストテキスト")
         app.clipboard_inserter.insert.assert_called_once_with("処理済みテキスト")
 
@@ -387,7 +513,7 @@ class TestProcessAudio:
 
         app.transcriber.transcribe.return_value = "テキスト"
         app.text_processor.process.return_value = "テキスト"
-        app.state = AppState.PROCESSING
+        _enter_processing(app)
 
         app.process_audio(MagicMock())
 
@@ -398,7 +524,7 @@ class TestProcessAudio:
         from speakdrop.app import AppState
 
         app.transcriber.transcribe.side_effect = RuntimeError("エラー")
-        app.state = AppState.PROCESSING
+        _enter_processing(app)
 
         app.process_audio(MagicMock())
 
@@ -409,7 +535,7 @@ class TestProcessAudio:
         from speakdrop.app import AppState
 
         app.transcriber.transcribe.return_value = "   "
-        app.state = AppState.PROCESSING
+        _enter_processing(app)
 
         app.process_audio(MagicMock())
 
@@ -417,6 +543,592 @@ class TestProcessAudio:
         app.clipboard_inserter.insert.assert_not_called()
         assert app.state == AppState.IDLE
 
+    def test_process_audio_streams_segments_to_llm(self, app: Any) -> None:
+        """確定したセグメントを文単位で整形し、投入順に連結して挿入する。"""
+
+        def transcribe(audio: Any, on_segment: Any, **_: Any) -> str:
+            segments = ["今日は晴れ", "散歩に行く"]
+            for segment in segments:
+                on_segment(segment)
+            return "".join(segments)
+
+        app.config.stream_unit_chars = 4
+        app.transcriber.transcribe.side_effect = transcribe
+        app.text_processor.process.side_effect = lambda text: text + "。"
+        _enter_processing(app)
+
+        app.process_audio(MagicMock())
+
+        assert [c.args[0] for c in app.text_processor.process.call_args_list] == [
+            "今日は晴れ",
+            "散歩に行く",
+        ]
+        app.clipboard_inserter.insert.assert_called_once_with("今日は晴れ。散歩に行く。")
+
+    def test_process_audio_carries_context(self, app: Any) -> None:
+        """直前の発話の認識結果を次の発話の prompt として渡すこと。"""
+        from speakdrop.context import TranscriptContext
+
+        app.transcript_context = TranscriptContext(max_chars=100)
+        app.transcriber.transcribe.side_effect = ["今日は晴れ", "散歩に行く"]
+        app.text_processor.process.side_effect = lambda text: text
+        for _ in range(2):
+            _enter_processing(app)
+            app.process_audio(MagicMock())
+
+        first, second = app.transcriber.transcribe.call_args_list
+        assert "prompt" not in first.kwargs
+        assert second.kwargs["prompt"] == "今日は晴れ"
+
+    def test_process_audio_coalesces_llm_requests(self, app: Any) -> None:
+        """llm_batch_max_items が 2 以上の場合は LlmCoalescer 経由で整形すること。"""
+        from concurrent.futures import Future
+
+        def submit(text: str, **_: Any) -> Future[str]:
+            future: Future[str] = Future()
+            future.set_result(text + "。")
+            return future
+
+        app.config.llm_batch_max_items = 8
+        app.llm_coalescer = MagicMock()
+        app.llm_coalescer.submit.side_effect = submit
+        app.transcriber.transcribe.return_value = "テキスト"
+        _enter_processing(app)
+
+        app.process_audio(MagicMock())
+
+        app.llm_coalescer.submit.assert_called_once_with(
+            "テキスト", processor=app.text_processor, num_predict=512
+        )
+        app.clipboard_inserter.insert.assert_called_once_with("テキスト。")
+
+
+class TestLatencySlo:
+    """レイテンシ SLO による品質段階の切り替えのテスト。"""
+
+    def test_degraded_tier_shortens_llm_output(self, app: Any) -> None:
+        """整形短縮の段階では num_predict を指定して整形すること。"""
+        from speakdrop.slo import SloController, available_tiers
+
+        app.slo = SloController(available_tiers(False))
+        app.slo.observe({"postprocess": 10.0})
+        app.transcriber.transcribe.return_value = "テキスト"
+        app.text_processor.process.return_value = "テキスト。"
+
+        app.process_audio(MagicMock())
+
+        app.text_processor.process.assert_called_once_with("テキスト", num_predict=128)
+
+    def test_lowest_tier_skips_llm_and_uses_fast_model(self, app: Any) -> None:
+        """整形なしの段階では高速モデルで認識し、LLM を呼ばずに挿入すること。"""
+        from speakdrop.slo import TIERS, SloController
+
+        app.config.fast_model = "small"
+        app.slo = SloController(TIERS)
+        for _ in range(len(TIERS) - 1):
+            app.slo.observe({"transcribe": 10.0})
+        app.transcriber.transcribe.return_value = "テキスト"
+
+        app.process_audio(MagicMock())
+
+        assert app.transcriber.transcribe.call_args.kwargs["model_id"] == "small"
+        app.text_processor.process.assert_not_called()
+        app.clipboard_inserter.insert.assert_called_once_with("テキスト")
+
+    def test_tier_change_updates_menu(self, app: Any) -> None:
+        """段階が変わったらメニューの品質表示を更新すること。"""
+        from speakdrop.clock import VirtualClock
+        from speakdrop.slo import SloController
+
+        app.clock = VirtualClock()
+        app.slo = SloController(budgets={"transcribe": 5.0})
+
+        def transcribe(*_: Any, **__: Any) -> str:
+            app.clock.advance(5.0)
+            return "テキスト"
+
+        app.transcriber.transcribe.side_effect = transcribe
+        app.text_processor.process.return_value = "テキスト"
+        assert app.tier_item.title == "品質: 通常"
+
+        app.process_audio(MagicMock())
+
+        assert app.tier_item.title == "品質: 整形短縮"
+
+
+class TestInserterSelection:
+    """挿入方法（キー入力 / 貼り付け）の選択のテスト。"""
+
+    def test_short_text_is_typed(self, app: Any) -> None:
+        """type_max_chars 以下のテキストはキー入力で挿入すること。"""
+        app.config.type_max_chars = 10
+
+        app._finish_processing("短い文。")
+
+        app.keystroke_inserter.insert.assert_called_once_with("短い文。")
+        app.clipboard_inserter.insert.assert_not_called()
+
+    def test_long_text_is_pasted(self, app: Any) -> None:
+        """type_max_chars を超えるテキストはクリップボード経由で挿入すること。"""
+        app.config.type_max_chars = 3
+
+        app._finish_processing("長いテキストです。")
+
+        app.clipboard_inserter.insert.assert_called_once_with("長いテキストです。")
+        app.keystroke_inserter.insert.assert_not_called()
+
+    def test_multiline_text_is_pasted(self, app: Any) -> None:
+        """改行を含むテキストは短くても貼り付けで挿入すること。"""
+        app.config.type_max_chars = 30
+
+        app._finish_processing("1行目\n2行目")
+
+        app.clipboard_inserter.insert.assert_called_once_with("1行目\n2行目")
+
+
+class TestQuit:
+    """終了処理のテスト。"""
+
+    def test_quit_restores_pending_clipboard(self, app: Any) -> None:
+        """終了時に復元待ちのクリップボードを復元すること（REQ-006）。"""
+        app._quit(MagicMock())
+
+        app.clipboard_inserter.restore.assert_called_once()
+
+
+class TestSpeculativeDraft:
+    """投機的2パス挿入（下書き → 置き換え）のテスト。"""
+
+    def _enable(self, app: Any) -> None:
+        app.config.speculative_draft = True
+        app.config.fast_model = "small"
+        app.config.model = "large-v3"
+        app.hotkey_listener = MagicMock(last_user_input=0.0)
+
+    def test_inserts_draft_then_replaces(self, app: Any) -> None:
+        """下書きを挿入した後、最終結果で置き換えること。"""
+        from speakdrop.app import AppState
+
+        self._enable(app)
+        app.transcriber.transcribe.side_effect = ["きょうわはれ", "今日は晴れ"]
+        app.text_processor.process.return_value = "今日は晴れ。"
+
+        app.process_audio(MagicMock())
+
+        models = [c.kwargs["model_id"] for c in app.transcriber.transcribe.call_args_list]
+        assert models == ["small", "large-v3"]
+        app.clipboard_inserter.insert.assert_called_once_with("きょうわはれ")
+        app.clipboard_inserter.replace.assert_called_once_with("きょうわはれ", "今日は晴れ。")
+        assert app.state == AppState.IDLE
+
+    def test_abandons_upgrade_when_user_typed(self, app: Any) -> None:
+        """下書き挿入後にユーザーがキー入力した場合は置き換えないこと。"""
+        from speakdrop.app import AppState
+
+        self._enable(app)
+        app.transcriber.transcribe.side_effect = ["下書き", "最終"]
+        app.text_processor.process.return_value = "最終。"
+        # 下書き挿入時にユーザー入力が発生したことにする
+        app.clipboard_inserter.insert.side_effect = lambda _: setattr(
+            app.hotkey_listener, "last_user_input", float("inf")
+        )
+
+        app.process_audio(MagicMock())
+
+        app.clipboard_inserter.replace.assert_not_called()
+        assert app.state == AppState.IDLE
+
+    def _use_fake_field(self, app: Any) -> Any:
+        """入力先のテキストフィールドをフェイクにし、その FakeEventSink を返す。"""
+        from speakdrop.clock import VirtualClock
+        from speakdrop.fake_inserter import FakeKeystrokeInserter
+
+        inserter = FakeKeystrokeInserter(VirtualClock())
+        app.clipboard_inserter = app.keystroke_inserter = inserter
+        return inserter.sink
+
+    def test_replaces_draft_in_field(self, app: Any) -> None:
+        """入力先の下書き（絵文字を含む）を最終結果に置き換えること。"""
+        self._enable(app)
+        sink = self._use_fake_field(app)
+        sink.type_text("メモ: ")
+        app.transcriber.transcribe.side_effect = ["了解👍🏽", "了解"]
+        app.text_processor.process.return_value = "了解。"
+
+        app.process_audio(MagicMock())
+
+        assert sink.document == "メモ: 了解。"
+
+    def test_keeps_input_typed_during_grace_window(self, app: Any) -> None:
+        """自分のキーイベントを無視する猶予中にユーザーが入力した場合も置き換えないこと。"""
+        self._enable(app)
+        sink = self._use_fake_field(app)
+        app.transcriber.transcribe.side_effect = ["下書き", "最終"]
+
+        def process(text: str, **_: Any) -> str:
+            sink.type_text("abc")  # 猶予中のためキー入力の監視では数えられない
+            return "最終。"
+
+        app.text_processor.process.side_effect = process
+
+        app.process_audio(MagicMock())
+
+        assert sink.document == "下書きabc"
+
+    def test_abandons_upgrade_when_focus_changed(self, app: Any) -> None:
+        """入力先のテキストを読み取れず、最前面のアプリが変わった場合は置き換えないこと。"""
+        self._enable(app)
+        app.clipboard_inserter.focused_text.return_value = None
+        app.transcriber.transcribe.side_effect = ["下書き", "最終"]
+        app.text_processor.process.return_value = "最終。"
+
+        with patch.object(app, "_frontmost_app_id", side_effect=["com.example.a", "com.example.b"]):
+            app.process_audio(MagicMock())
+
+        app.clipboard_inserter.replace.assert_not_called()
+
+    def test_empty_draft_inserts_final_text(self, app: Any) -> None:
+        """下書きが空の場合は最終結果を通常どおり挿入すること。"""
+        self._enable(app)
+        app.transcriber.transcribe.side_effect = ["", "今日は晴れ"]
+        app.text_processor.process.return_value = "今日は晴れ。"
+
+        app.process_audio(MagicMock())
+
+        app.clipboard_inserter.insert.assert_called_once_with("今日は晴れ。")
+        app.clipboard_inserter.replace.assert_not_called()
+
+    def test_failure_after_draft_clears_draft_state(self, app: Any) -> None:
+        """下書きの挿入後に処理が失敗しても、下書きの記録を残さないこと。"""
+        from speakdrop.app import AppState
+
+        self._enable(app)
+        app.transcriber.transcribe.side_effect = ["下書き", RuntimeError("decode failed")]
+
+        app.process_audio(MagicMock())
+
+        app.clipboard_inserter.insert.assert_called_once_with("下書き")
+        assert app._draft_inserted_at is None
+        assert app.state == AppState.IDLE
+
+    def test_fast_whisper_tier_reuses_draft(self, app: Any) -> None:
+        """高速認識の段階では精度優先モデルで認識し直さず、下書きを整形して置き換えること。"""
+        from speakdrop.slo import TIERS, SloController
+
+        self._enable(app)
+        app.slo = SloController(TIERS)
+        while not app.slo.tier.fast_whisper:
+            app.slo.observe({"transcribe": 10.0})
+        app.transcriber.transcribe.return_value = "きょうわはれ"
+        app.text_processor.process.return_value = "今日は晴れ。"
+
+        app.process_audio(MagicMock())
+
+        app.transcriber.transcribe.assert_called_once()
+        assert app.transcriber.transcribe.call_args.kwargs["model_id"] == "small"
+        app.text_processor.process.assert_called_once_with("きょうわはれ", num_predict=128)
+        app.clipboard_inserter.replace.assert_called_once_with("きょうわはれ", "今日は晴れ。")
+
+    def test_disabled_without_fast_model(self, app: Any) -> None:
+        """fast_model が未設定なら通常の1パス処理を行うこと。"""
+        app.config.speculative_draft = True
+        app.transcriber.transcribe.return_value = "テキスト"
+        app.text_processor.process.return_value = "テキスト。"
+
+        app.process_audio(MagicMock())
+
+        app.transcriber.transcribe.assert_called_once()
+        app.clipboard_inserter.insert.assert_called_once_with("テキスト。")
+
+
+class TestLevelMeter:
+    """録音中の入力レベル表示のテスト。"""
+
+    def test_level_meter_updates_are_rate_limited(self, app: Any) -> None:
+        """録音中の入力レベルをメニューバーに表示し、反映は level_meter_rate 回/秒までであること。"""
+        from speakdrop.app import AppState
+        from speakdrop.clock import VirtualClock
+        from speakdrop.icons import get_icon_title, get_level_title
+        from speakdrop.ui_updater import UiUpdater
+
+        clock = VirtualClock()
+        app.clock = clock
+        app.ui_updater = UiUpdater(app._call_on_main_later, clock, max_rate=15.0)
+        app.set_state(AppState.RECORDING)
+        flushes = app.ui_updater.flushes
+
+        for i in range(100):  # 10ms ごとに1秒間
+            app.audio_recorder.level = (float(i * 100), float(i * 100))
+            app._on_audio_block(np.zeros(160, dtype=np.int16))
+            clock.advance(0.01)
+        clock.run_until_idle()
+
+        assert app.title == get_level_title(9900.0, 9900.0)
+        assert app.ui_updater.flushes - flushes <= 16
+        app.set_state(AppState.PROCESSING)
+        assert app.title == get_icon_title(AppState.PROCESSING)
+
+
+class _FakeRunLoop:
+    """メインスレッドの run loop を模した AppHelper。
+
+    callLater() は呼び出したスレッドの run loop に登録するため、メインスレッド以外から
+    呼ばれたタイマーは実行されない（PyObjCTools.AppHelper.callLater と同じ）。
+    """
+
+    def __init__(self) -> None:
+        self.main = threading.get_ident()
+        self.queue: list[tuple[Any, tuple[Any, ...]]] = []
+        self.lost: list[Any] = []
+        self._lock = threading.Lock()
+
+    def callAfter(self, func: Any, *args: Any) -> None:  # noqa: N802
+        with self._lock:
+            self.queue.append((func, args))
+
+    def callLater(self, delay: float, func: Any, *args: Any) -> None:  # noqa: N802
+        if threading.get_ident() != self.main:
+            self.lost.append(func)
+        else:
+            self.callAfter(func, *args)
+
+    def run(self) -> None:
+        """登録済みの処理をメインスレッドで実行する（遅延は待たない）。"""
+        while self.queue:
+            with self._lock:
+                func, args = self.queue.pop(0)
+            func(*args)
+
+
+class TestLevelMeterThreading:
+    """録音コールバックのスレッドからの入力レベル表示のテスト。"""
+
+    def test_rate_limited_update_from_audio_thread(self, app: Any) -> None:
+        """録音スレッドからの頻度制限された更新もメインスレッドで反映され、表示が止まらないこと。"""
+        from speakdrop.app import AppState
+        from speakdrop.clock import MainThreadClock
+        from speakdrop.icons import get_icon_title, get_level_title
+        from speakdrop.ui_updater import UiUpdater
+
+        loop = _FakeRunLoop()
+        with patch("speakdrop.app.AppHelper", loop), patch("PyObjCTools.AppHelper", loop):
+            app.clock = MainThreadClock()
+            app.ui_updater = UiUpdater(app._call_on_main_later, app.clock, max_rate=15.0)
+            app.set_state(AppState.RECORDING)
+            loop.run()
+
+            def audio_block(level: float) -> None:
+                app.audio_recorder.level = (level, level)
+                thread = threading.Thread(
+                    target=app._on_audio_block, args=(np.zeros(160, dtype=np.int16),)
+                )
+                thread.start()
+                thread.join()
+
+            audio_block(1000.0)
+            loop.run()
+            audio_block(2000.0)  # 前回の反映から間隔が空いていないため遅延して反映される
+            loop.run()
+
+            assert loop.lost == []
+            assert app.title == get_level_title(2000.0, 2000.0)
+            app.set_state(AppState.PROCESSING)
+            loop.run()
+            assert app.title == get_icon_title(AppState.PROCESSING)
+
+
+def _session(*events: tuple[float, str]) -> list[Any]:
+    """(時刻, 種別) の列からセッションイベントを作る。
+
+    AUDIO は 0.1 秒分の無音に近い音声、SPEECH は 0.1 秒分の発話の音量の音声。
+    """
+    from speakdrop.session_replay import EventKind, SessionEvent
+
+    audio = {
+        "AUDIO": np.ones(1600, dtype=np.int16),
+        "SPEECH": np.full(1600, 1000, dtype=np.int16),
+    }
+    return [
+        SessionEvent(
+            EventKind.AUDIO if kind == "SPEECH" else EventKind[kind],
+            t,
+            audio=audio.get(kind),
+        )
+        for t, kind in events
+    ]
+
+
+class TestSessionReplay:
+    """記録したセッションの再生テスト（仮想時間）。"""
+
+    def test_replay_collects_latency(self, replay_app: Any) -> None:
+        """1発話を再生し、状態遷移と離放から IDLE までの仮想時間を記録すること。"""
+        from speakdrop.session_replay import SessionReplayer
+
+        events = _session(
+            (0.0, "PRESS"), (0.1, "AUDIO"), (0.2, "AUDIO"), (0.3, "AUDIO"), (0.3, "RELEASE")
+        )
+
+        result = SessionReplayer(replay_app).replay(events)
+
+        assert result.states == ["RECORDING", "PROCESSING", "IDLE"]
+        assert result.inserted == ["テスト。"]
+        # 0.3秒分の音声 × rtf 0.3 + 後処理 0.5秒
+        assert result.utterances[0].latency == pytest.approx(0.3 * 0.3 + 0.5)
+
+    def test_press_during_processing_is_ignored(self, replay_app: Any) -> None:
+        """PROCESSING 中の押下は無視され、その後の離放も処理されないこと。"""
+        from speakdrop.session_replay import SessionReplayer
+
+        events = _session(
+            (0.0, "PRESS"), (0.1, "AUDIO"), (0.2, "RELEASE"), (0.4, "PRESS"), (0.5, "RELEASE")
+        )
+
+        result = SessionReplayer(replay_app).replay(events)
+
+        assert result.states == ["RECORDING", "PROCESSING", "IDLE"]
+        assert len(result.utterances) == 1
+
+    def test_toggle_mode_ends_utterance_on_trailing_silence(self, replay_app: Any) -> None:
+        """toggle モードでは発話後の無音で録音を終え、離放を待たずに認識すること。"""
+        from speakdrop.endpoint import EndpointDetector
+        from speakdrop.session_replay import SessionReplayer
+
+        replay_app.config.hotkey_mode = "toggle"
+        replay_app.endpoint_detector = EndpointDetector(trailing_silence=0.2)
+        events = _session(
+            (0.0, "PRESS"),
+            (0.05, "RELEASE"),
+            (0.1, "SPEECH"),
+            (0.2, "SPEECH"),
+            (0.3, "AUDIO"),
+            (0.4, "AUDIO"),
+            (0.5, "AUDIO"),  # 終了の検出後のブロックは録音しない
+        )
+
+        result = SessionReplayer(replay_app).replay(events)
+
+        assert result.states == ["RECORDING", "PROCESSING", "IDLE"]
+        assert result.inserted == ["テスト。"]
+        # 0.4秒分の音声 × rtf 0.3 + 後処理 0.5秒
+        assert result.utterances[0].latency == pytest.approx(0.4 * 0.3 + 0.5)
+
+    def test_continuous_mode_rearms_until_next_press(self, replay_app: Any) -> None:
+        """continuous モードでは認識後に次の録音を自動で始め、押下で終えること。"""
+        from speakdrop.endpoint import EndpointDetector
+        from speakdrop.session_replay import SessionReplayer
+
+        replay_app.config.hotkey_mode = "continuous"
+        replay_app.config.min_record_duration = 0.1
+        replay_app.endpoint_detector = EndpointDetector(trailing_silence=0.1)
+        events = _session(
+            (0.0, "PRESS"),
+            (0.1, "SPEECH"),
+            (0.2, "AUDIO"),
+            (2.0, "SPEECH"),
+            (2.1, "AUDIO"),
+            (4.0, "PRESS"),
+        )
+
+        result = SessionReplayer(replay_app).replay(events)
+
+        assert result.states == ["RECORDING", "PROCESSING", "IDLE"] * 2 + ["RECORDING", "IDLE"]
+        assert result.inserted == ["テスト。", "テスト。"]
+        # 3回目の録音は押下で終えた時点で音声が無いため認識しない
+        assert replay_app.skipped_utterances["too_short"] == 1
+
+    def test_components_share_virtual_time(self, replay_app: Any) -> None:
+        """状態機械・SLO・認識文脈など app のコンポーネントも再生の仮想時間で動くこと。"""
+        from speakdrop.session_replay import SessionReplayer
+
+        events = _session((0.0, "PRESS"), (0.1, "AUDIO"), (0.2, "RELEASE"))
+
+        result = SessionReplayer(replay_app).replay(events)
+
+        # 状態遷移の記録時刻が再生時の遷移時刻（仮想時間）と一致する
+        assert [e.time for e in replay_app.state_machine.events] == [
+            t for t, _ in result.transitions
+        ]
+
+    def test_session_recorder_uses_app_clock(self, tmp_path: Any) -> None:
+        """セッションの記録時刻にも app の時計を使うこと。"""
+        from speakdrop.clock import VirtualClock
+        from speakdrop.session_replay import EventKind, load_session
+
+        clock = VirtualClock()
+        path = tmp_path / "session.sdsession"
+        with (
+            patch("speakdrop.app.new_session_path", return_value=path),
+            _mocked_app(clock, record_sessions=True) as app,
+        ):
+            clock.advance(2.5)
+            app.on_hotkey_press()
+            app.session_recorder.close()
+
+        _, events = load_session(path)
+        press = next(e for e in events if e.kind is EventKind.PRESS)
+        assert press.time == 2.5
+
+    def test_context_timeout_uses_virtual_time(self) -> None:
+        """認識文脈の破棄（context_idle_timeout）を再生の仮想時間で判定すること。"""
+        from speakdrop.clock import VirtualClock
+        from speakdrop.session_replay import SessionReplayer, VirtualCostTranscriber
+
+        with _mocked_app(VirtualClock(), context_chars=100, context_idle_timeout=5.0) as app:
+            prompts: list[str] = []
+            transcriber = VirtualCostTranscriber(app.clock)
+            transcribe = transcriber.transcribe
+
+            def record_prompt(audio: Any, prompt: str = "", **kwargs: Any) -> str:
+                prompts.append(prompt)
+                return transcribe(audio, prompt=prompt, **kwargs)
+
+            transcriber.transcribe = record_prompt  # type: ignore[method-assign]
+            events = _session(
+                (0.0, "PRESS"), (0.1, "AUDIO"), (0.2, "RELEASE"),
+                (2.0, "PRESS"), (2.1, "AUDIO"), (2.2, "RELEASE"),
+                (60.0, "PRESS"), (60.1, "AUDIO"), (60.2, "RELEASE"),
+            )  # fmt: skip
+
+            SessionReplayer(app, transcriber=transcriber).replay(events)
+
+        # 2回目は直前の発話から 5 秒以内のため文脈を引き継ぎ、3回目は破棄されている
+        assert prompts == ["", "テスト", ""]
+
+    def test_requires_virtual_clock_app(self, app: Any) -> None:
+        """仮想時計で作成していないアプリは再生できないこと（実時間との混在を防ぐ）。"""
+        from speakdrop.session_replay import SessionReplayer
+
+        with pytest.raises(TypeError):
+            SessionReplayer(app)
+
+    def test_session_recorder_records_events(self, app: Any) -> None:
+        """セッション記録が有効な場合、ホットキーと状態遷移を記録すること。"""
+        app.session_recorder = MagicMock()
+
+        app.on_hotkey_press()
+        app.on_hotkey_release()
+
+        app.session_recorder.record_press.assert_called_once()
+        app.session_recorder.record_release.assert_called_once()
+        recorded = [c.args[0] for c in app.session_recorder.record_state.call_args_list]
+        assert recorded[:2] == ["RECORDING", "PROCESSING"]
+
+    def test_mismatched_transitions_raise(self, replay_app: Any) -> None:
+        """記録と異なる状態遷移になった場合は ReplayMismatchError を送出すること。"""
+        from speakdrop.session_replay import (
+            EventKind,
+            ReplayMismatchError,
+            SessionEvent,
+            SessionReplayer,
+        )
+
+        events = _session((0.0, "PRESS"), (0.1, "AUDIO"), (0.2, "RELEASE"))
+        events.append(SessionEvent(EventKind.STATE, 0.0, state="RECORDING"))
+
+        with pytest.raises(ReplayMismatchError):
+            SessionReplayer(replay_app).replay(events)
+
 
 class TestOpenSettings:
     """open_settings() ダイアログのテスト。"""
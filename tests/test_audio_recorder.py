@@ -3,8 +3,10 @@
 from unittest.mock import MagicMock, patch
 
 import numpy as np
+import pytest
 
-from speakdrop.audio_recorder import AudioRecorder
+from speakdrop.audio_recorder import AudioRecorder, block_level, block_rms
+from speakdrop.clock import VirtualClock
 
 
 class TestAudioRecorderConstants:
@@ -107,3 +109,145 @@ class TestAudioRecorderRecording:
 
         assert isinstance(result, np.ndarray)
         assert len(result) == 0
+
+    @patch("speakdrop.audio_recorder.sd")
+    def test_elapsed_uses_injected_clock(self, mock_sd: MagicMock) -> None:
+        """録音の経過時間を注入した時計で計測し、停止後は 0.0 に戻ること。"""
+        mock_sd.InputStream.return_value = MagicMock()
+        clock = VirtualClock()
+        recorder = AudioRecorder(clock=clock)
+
+        recorder.start_recording()
+        clock.advance(1.5)
+        assert recorder.elapsed == 1.5
+
+        recorder.stop_recording()
+        assert recorder.elapsed == 0.0
+
+    @patch("speakdrop.audio_recorder.sd")
+    def test_voiced_duration_counts_loud_blocks(self, mock_sd: MagicMock) -> None:
+        """RMS が speech_threshold 以上のブロックだけを発話の長さとして数えること。"""
+        mock_sd.InputStream.return_value = MagicMock()
+        recorder = AudioRecorder(speech_threshold=200.0)
+        recorder.start_recording()
+
+        silence = np.full((1600, 1), 10, dtype=np.int16)
+        speech = np.full((1600, 1), 1000, dtype=np.int16)
+        recorder._audio_callback(silence, 1600, None, None)
+        recorder._audio_callback(speech, 1600, None, None)
+        recorder._audio_callback(speech, 1600, None, None)
+
+        assert recorder.voiced_duration == 0.2
+
+    @patch("speakdrop.audio_recorder.sd")
+    def test_start_recording_resets_voiced_duration(self, mock_sd: MagicMock) -> None:
+        """録音を開始し直すと発話の長さが 0 に戻ること。"""
+        mock_sd.InputStream.return_value = MagicMock()
+        recorder = AudioRecorder()
+        recorder.start_recording()
+        recorder._audio_callback(np.full((1600, 1), 1000, dtype=np.int16), 1600, None, None)
+        recorder.stop_recording()
+
+        recorder.start_recording()
+
+        assert recorder.voiced_duration == 0.0
+
+    @patch("speakdrop.audio_recorder.sd")
+    def test_level_tracks_latest_block(self, mock_sd: MagicMock) -> None:
+        """level が直近の録音ブロックの (RMS, ピーク) であり、録音開始で 0 に戻ること。"""
+        mock_sd.InputStream.return_value = MagicMock()
+        recorder = AudioRecorder()
+        recorder.start_recording()
+
+        recorder._audio_callback(np.full((1600, 1), 1000, dtype=np.int16), 1600, None, None)
+        recorder._audio_callback(np.full((1600, 1), -50, dtype=np.int16), 1600, None, None)
+        assert recorder.level == (50.0, 50.0)
+
+        recorder.start_recording()
+        assert recorder.level == (0.0, 0.0)
+
+
+class TestBlockRms:
+    """block_rms() のテスト。"""
+
+    def test_constant_block(self) -> None:
+        """一定振幅のブロックの RMS はその振幅になること。"""
+        assert block_rms(np.full(1600, -300, dtype=np.int16)) == 300.0
+
+    def test_full_scale_does_not_overflow(self) -> None:
+        """int16 の最大振幅でも二乗和が桁あふれしないこと。"""
+        assert block_rms(np.full(1600, 32767, dtype=np.int16)) == pytest.approx(32767.0)
+
+    def test_empty_block(self) -> None:
+        """空のブロックの RMS は 0.0 であること。"""
+        assert block_rms(np.array([], dtype=np.int16)) == 0.0
+
+    def test_level_returns_rms_and_peak(self) -> None:
+        """block_level() が RMS と振幅の絶対値の最大を返すこと。"""
+        rms, peak = block_level(np.array([300, -400, 0, 0], dtype=np.int16))
+
+        assert rms == 250.0
+        assert peak == 400.0
+
+    def test_level_peak_of_negative_full_scale(self) -> None:
+        """-32768 のピークを桁あふれせずに返すこと。"""
+        assert block_level(np.array([0, -32768], dtype=np.int16))[1] == 32768.0
+
+
+class TestNativeRateCapture:
+    """ネイティブのサンプルレートでの録音のテスト。"""
+
+    @staticmethod
+    def _mock_device(mock_sd: MagicMock, rate: float) -> None:
+        mock_sd.InputStream.return_value = MagicMock()
+        mock_sd.PortAudioError = OSError
+        mock_sd.query_devices.return_value = {"default_samplerate": rate}
+
+    @patch("speakdrop.audio_recorder.sd")
+    def test_opens_stream_at_device_rate(self, mock_sd: MagicMock) -> None:
+        """native_rate=True の場合は入力デバイスのサンプルレートで録音すること。"""
+        self._mock_device(mock_sd, 48000.0)
+
+        recorder = AudioRecorder(native_rate=True)
+        recorder.start_recording()
+
+        assert mock_sd.InputStream.call_args.kwargs["samplerate"] == 48000
+        assert recorder.capture_rate == 48000
+
+    @patch("speakdrop.audio_recorder.sd")
+    def test_blocks_resampled_to_16k(self, mock_sd: MagicMock) -> None:
+        """録音ブロックを 16kHz へ変換してバッファ・リスナーに渡し、停止時に末尾まで返すこと。"""
+        self._mock_device(mock_sd, 44100.0)
+        recorder = AudioRecorder(native_rate=True)
+        received: list[np.ndarray] = []
+        recorder.add_block_listener(received.append)
+        recorder.start_recording()
+
+        block = np.full((441, 1), 1000, dtype=np.int16)
+        for _ in range(100):  # 1秒
+            recorder._audio_callback(block, 441, None, None)
+        result = recorder.stop_recording()
+
+        assert len(result) == 16000
+        assert all(len(b) < 441 for b in received)
+        assert np.abs(result[1000:15000].astype(int) - 1000).max() <= 1
+
+    @patch("speakdrop.audio_recorder.sd")
+    def test_device_query_failure_falls_back(self, mock_sd: MagicMock) -> None:
+        """デバイスのサンプルレートを取得できない場合は 16kHz で録音すること。"""
+        self._mock_device(mock_sd, 48000.0)
+        mock_sd.query_devices.side_effect = OSError("no input device")
+
+        recorder = AudioRecorder(native_rate=True)
+        recorder.start_recording()
+
+        assert mock_sd.InputStream.call_args.kwargs["samplerate"] == 16000
+
+    @patch("speakdrop.audio_recorder.sd")
+    def test_disabled_does_not_query_device(self, mock_sd: MagicMock) -> None:
+        """native_rate=False（デフォルト）の場合はデバイスに問い合わせないこと。"""
+        mock_sd.InputStream.return_value = MagicMock()
+
+        AudioRecorder().start_recording()
+
+        mock_sd.query_devices.assert_not_called()
@@ -0,0 +1,133 @@
+"""bench_llm モジュールのテスト。"""
+
+import json
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from speakdrop.bench_llm import (
+    LlmBenchResult,
+    LlmRun,
+    main,
+    measure_model,
+    measure_request,
+    select_best,
+    text_fidelity,
+)
+
+
+def _result(model: str, latency: float, fidelity: float, errors: int = 0) -> LlmBenchResult:
+    return LlmBenchResult(model, latency / 2, 30.0, latency, latency, fidelity, errors)
+
+
+class TestTextFidelity:
+    """text_fidelity() のテスト。"""
+
+    def test_exact_match(self) -> None:
+        """正解と一致する場合は 1.0 を返すこと（空白は無視する）。"""
+        assert text_fidelity("今日は晴れ。", " 今日は 晴れ。") == 1.0
+
+    def test_counts_punctuation(self) -> None:
+        """句読点の欠落も誤りとして数えること。"""
+        assert text_fidelity("今日は晴れ。", "今日は晴れ") == pytest.approx(5 / 6)
+
+    def test_clamped_to_zero(self) -> None:
+        """誤りが正解の文字数を超えても 0.0 を下回らないこと。"""
+        assert text_fidelity("あ", "いうえお") == 0.0
+
+
+class TestLlmRun:
+    """LlmRun のテスト。"""
+
+    def test_tokens_per_second(self) -> None:
+        """初回トークン以降の生成速度を返すこと。"""
+        assert LlmRun(ttft=0.5, latency=1.5, tokens=11, output="").tokens_per_second == 10.0
+
+    def test_single_token(self) -> None:
+        """トークンが1つ以下の場合は 0.0 を返すこと。"""
+        assert LlmRun(ttft=0.5, latency=0.5, tokens=1, output="").tokens_per_second == 0.0
+
+
+class TestMeasure:
+    """measure_request() / measure_model() のテスト。"""
+
+    def test_measure_request(self) -> None:
+        """初回トークンまでの時間・全体の時間・出力を計測すること。"""
+        processor = MagicMock()
+        processor.stream.return_value = iter(["今日", "は", "。"])
+        times = iter([0.0, 0.3, 1.0])
+
+        run = measure_request(processor, "今日は", timer=lambda: next(times))
+
+        assert run == LlmRun(ttft=0.3, latency=1.0, tokens=3, output="今日は。")
+
+    @patch("speakdrop.bench_llm.TextProcessor")
+    def test_measure_model_counts_errors(self, mock_processor_cls: MagicMock) -> None:
+        """失敗したリクエストを errors に数え、忠実度 0 として扱うこと。"""
+        mock_processor_cls.return_value.stream.side_effect = ConnectionError("未起動")
+
+        result = measure_model("m", corpus=(("あ", "あ。"),))
+
+        assert result.errors == 1
+        assert result.fidelity == 0.0
+
+
+class TestSelectBest:
+    """select_best() のテスト。"""
+
+    def test_selects_fastest_within_bounds(self) -> None:
+        """忠実度の条件と予算を満たすモデルのうち最速のものを選ぶこと。"""
+        results = [
+            _result("qwen2.5:7b", 2.0, 0.95),
+            _result("qwen2.5:3b", 1.0, 0.92),
+            _result("tiny", 0.3, 0.50),
+        ]
+
+        best = select_best(results, max_fidelity_drop=0.05)
+
+        assert best is not None
+        assert best.model == "qwen2.5:3b"
+
+    def test_excludes_over_budget(self) -> None:
+        """p95 が予算を超えるモデルは選ばないこと。"""
+        assert select_best([_result("slow", 4.0, 0.95)], max_fidelity_drop=0.05) is None
+
+    def test_excludes_failed_models(self) -> None:
+        """エラーのあったモデルは選ばないこと。"""
+        assert select_best([_result("m", 1.0, 0.9, errors=1)], max_fidelity_drop=0.05) is None
+
+
+class TestMain:
+    """main() のテスト。"""
+
+    @patch("speakdrop.bench_llm.installed_models", return_value=["a", "b"])
+    @patch("speakdrop.bench_llm.measure_model")
+    def test_saves_recommended_model(
+        self, mock_measure: MagicMock, _: MagicMock, tmp_path: Path
+    ) -> None:
+        """推奨モデルを Config の ollama_model に保存すること。"""
+        mock_measure.side_effect = lambda model, repeats: _result(
+            model, 1.0 if model == "b" else 2.0, 0.9
+        )
+        config_file = tmp_path / "config.json"
+
+        assert main([], config_file) == 0
+
+        assert json.loads(config_file.read_text())["ollama_model"] == "b"
+
+    @patch("speakdrop.bench_llm.measure_model")
+    def test_dry_run_does_not_save(self, mock_measure: MagicMock, tmp_path: Path) -> None:
+        """--dry-run では保存しないこと（--models で計測対象を指定できること）。"""
+        mock_measure.side_effect = lambda model, repeats: _result(model, 1.0, 0.9)
+        config_file = tmp_path / "config.json"
+
+        assert main(["--models", "x", "--dry-run"], config_file) == 0
+
+        assert not config_file.exists()
+        mock_measure.assert_called_once_with("x", repeats=1)
+
+    @patch("speakdrop.bench_llm.installed_models", side_effect=ConnectionError("未起動"))
+    def test_ollama_unavailable(self, _: MagicMock, tmp_path: Path) -> None:
+        """Ollama に接続できない場合は 1 を返すこと。"""
+        assert main([], tmp_path / "config.json") == 1
@@ -0,0 +1,228 @@
+"""bench_whisper モジュールのテスト。"""
+
+import json
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from speakdrop.bench_whisper import (
+    WhisperBenchResult,
+    WhisperSettings,
+    main,
+    measure_context,
+    measure_profiles,
+    run_benchmark,
+    select_best,
+)
+from speakdrop.benchmark import AudioSample
+
+
+def _result(compute_type: str, latency: float, cer: float) -> WhisperBenchResult:
+    return WhisperBenchResult(WhisperSettings(compute_type, 0, 1), latency, latency, cer)
+
+
+def _samples() -> list[AudioSample]:
+    return [AudioSample("a", np.zeros(1600, dtype=np.int16), "こんにちは")]
+
+
+class TestSelectBest:
+    """select_best() のテスト。"""
+
+    def test_selects_fastest_within_bound(self) -> None:
+        """精度条件を満たす設定のうち最速のものを選ぶこと。"""
+        results = [
+            _result("float32", 2.0, 0.05),
+            _result("int8_float32", 1.5, 0.06),
+            _result("int8", 1.0, 0.20),
+        ]
+
+        best = select_best(results, max_cer_increase=0.02)
+
+        assert best is not None
+        assert best.settings.compute_type == "int8_float32"
+
+    def test_empty_results(self) -> None:
+        """結果が無い場合は None を返すこと。"""
+        assert select_best([], max_cer_increase=0.02) is None
+
+
+class TestRunBenchmark:
+    """run_benchmark() のテスト。"""
+
+    @patch("speakdrop.bench_whisper.Transcriber")
+    def test_measures_all_combinations(self, mock_transcriber_cls: MagicMock) -> None:
+        """全ての組み合わせで Transcriber を生成して計測すること。"""
+        mock_transcriber_cls.return_value.transcribe.return_value = "こんにちは"
+
+        results = run_benchmark("small", _samples(), ["int8", "float32"], [0, 4], [1])
+
+        assert len(results) == 4
+        assert mock_transcriber_cls.call_count == 4
+        assert mock_transcriber_cls.call_args_list[0].kwargs == {
+            "model_id": "small",
+            "compute_type": "int8",
+            "cpu_threads": 0,
+            "num_workers": 1,
+            "profile": "balanced",
+        }
+        assert all(r.cer == 0.0 for r in results)
+
+    @patch("speakdrop.bench_whisper.Transcriber")
+    def test_uses_float32_output_as_reference_without_text(
+        self, mock_transcriber_cls: MagicMock
+    ) -> None:
+        """正解テキストが無い場合は float32 の出力を基準に CER を計算すること。"""
+        outputs = {"int8": "あいうお", "float32": "あいうえ"}
+        mock_transcriber_cls.side_effect = lambda **kw: MagicMock(
+            transcribe=MagicMock(return_value=outputs[kw["compute_type"]])
+        )
+        samples = [AudioSample("synthetic", np.zeros(1600, dtype=np.int16))]
+
+        results = run_benchmark("small", samples, ["int8", "float32"], [0], [1])
+
+        cers = {r.settings.compute_type: r.cer for r in results}
+        assert cers == {"int8": 0.25, "float32": 0.0}
+
+
+class TestMeasureProfiles:
+    """measure_profiles() のテスト。"""
+
+    @patch("speakdrop.bench_whisper.Transcriber")
+    def test_records_each_profile(self, mock_transcriber_cls: MagicMock) -> None:
+        """全プロファイルを計測し、accurate の出力を基準に CER を計算すること。"""
+        outputs = {"fastest": "あいうお", "balanced": "あいうえ", "accurate": "あいうえ"}
+        mock_transcriber_cls.side_effect = lambda **kw: MagicMock(
+            transcribe=MagicMock(return_value=outputs[kw["profile"]])
+        )
+        samples = [AudioSample("synthetic", np.zeros(1600, dtype=np.int16))]
+
+        stats = measure_profiles("small", WhisperSettings("int8", 0, 1), samples)
+
+        assert set(stats) == {"fastest", "balanced", "accurate"}
+        assert stats["fastest"]["cer"] == 0.25
+        assert stats["accurate"]["cer"] == 0.0
+        assert "median_latency" in stats["balanced"]
+
+
+class TestMeasureContext:
+    """measure_context() のテスト。"""
+
+    @patch("speakdrop.bench_whisper.Transcriber")
+    def test_passes_previous_output_as_prompt(self, mock_transcriber_cls: MagicMock) -> None:
+        """文脈ありでは直前までの認識結果を prompt に渡し、文脈なしの場合と比較すること。"""
+        transcribers = [MagicMock(), MagicMock()]
+        transcribers[0].transcribe.side_effect = ["", "こんにちは", "さようなら"]
+        transcribers[1].transcribe.side_effect = ["", "こんにちは", "さようなら"]
+        mock_transcriber_cls.side_effect = transcribers
+        samples = [
+            AudioSample("a", np.zeros(1600, dtype=np.int16), "こんにちは"),
+            AudioSample("b", np.zeros(1600, dtype=np.int16), "さようなら"),
+        ]
+
+        stats = measure_context("small", WhisperSettings("int8", 0, 1), samples, 3, "固有名詞")
+
+        prompts = [c.kwargs.get("prompt") for c in transcribers[1].transcribe.call_args_list]
+        assert prompts == [None, "", "こんにちは"[-3:]]
+        assert mock_transcriber_cls.call_args.kwargs["hotwords"] == "固有名詞"
+        assert stats["with"]["cer"] == stats["without"]["cer"] == 0.0
+
+
+_PROFILE_STATS = {"fastest": {"median_latency": 0.5, "p95_latency": 0.6, "cer": 0.1}}
+_CONTEXT_STATS = {
+    mode: {"median_latency": 0.5, "p95_latency": 0.6, "cer": 0.1} for mode in ("without", "with")
+}
+
+
+@patch("speakdrop.bench_whisper.measure_context", return_value=_CONTEXT_STATS)
+@patch("speakdrop.bench_whisper.measure_profiles", return_value=_PROFILE_STATS)
+class TestMain:
+    """main() のテスト。"""
+
+    @patch("speakdrop.bench_whisper.load_benchmark_audio")
+    @patch("speakdrop.bench_whisper.run_benchmark")
+    def test_saves_best_settings(
+        self,
+        mock_run: MagicMock,
+        mock_load: MagicMock,
+        mock_profiles: MagicMock,
+        mock_context: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        """最速設定を Config に保存すること。"""
+        mock_load.return_value = _samples()
+        mock_run.return_value = [
+            WhisperBenchResult(WhisperSettings("int8_float32", 4, 2), 0.8, 0.9, 0.0),
+            WhisperBenchResult(WhisperSettings("float32", 0, 1), 1.5, 1.6, 0.0),
+        ]
+        config_file = tmp_path / "config.json"
+
+        stats_file = tmp_path / "profile_stats.json"
+
+        exit_code = main(["--threads", "0,4"], config_file, stats_file)
+
+        assert exit_code == 0
+        saved = json.loads(config_file.read_text())
+        assert saved["compute_type"] == "int8_float32"
+        assert saved["cpu_threads"] == 4
+        assert saved["num_workers"] == 2
+        assert mock_run.call_args.kwargs["thread_options"] == [0, 4]
+        # プロファイル計測は選ばれた推論設定で行い、結果を記録する
+        assert mock_profiles.call_args.args[1] == WhisperSettings("int8_float32", 4, 2)
+        assert json.loads(stats_file.read_text()) == _PROFILE_STATS
+
+    @patch("speakdrop.bench_whisper.load_benchmark_audio")
+    @patch("speakdrop.bench_whisper.run_benchmark")
+    def test_dry_run_does_not_save(
+        self,
+        mock_run: MagicMock,
+        mock_load: MagicMock,
+        mock_profiles: MagicMock,
+        mock_context: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        """--dry-run の場合は設定を保存しないこと。"""
+        mock_load.return_value = _samples()
+        mock_run.return_value = [_result("int8", 1.0, 0.0)]
+        config_file = tmp_path / "config.json"
+        stats_file = tmp_path / "profile_stats.json"
+
+        assert main(["--dry-run"], config_file, stats_file) == 0
+        assert not config_file.exists()
+        assert not stats_file.exists()
+
+    @patch("speakdrop.bench_whisper.load_benchmark_audio")
+    @patch("speakdrop.bench_whisper.run_benchmark")
+    def test_profiles_only_skips_tuning(
+        self,
+        mock_run: MagicMock,
+        mock_load: MagicMock,
+        mock_profiles: MagicMock,
+        mock_context: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        """--profiles-only の場合は現在の推論設定でプロファイルのみ計測すること。"""
+        mock_load.return_value = _samples()
+        stats_file = tmp_path / "profile_stats.json"
+
+        assert main(["--profiles-only"], tmp_path / "config.json", stats_file) == 0
+        mock_run.assert_not_called()
+        assert mock_profiles.call_args.args[1] == WhisperSettings("int8", 0, 1)
+        assert stats_file.exists()
+        # 文脈の有無の比較は既定で 100 文字の文脈で行う
+        assert mock_context.call_args.args[3] == 100
+
+    @patch("speakdrop.bench_whisper.load_benchmark_audio")
+    def test_context_chars_zero_skips_comparison(
+        self,
+        mock_load: MagicMock,
+        mock_profiles: MagicMock,
+        mock_context: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        """--context-chars 0 の場合は文脈の有無の比較を行わないこと。"""
+        mock_load.return_value = _samples()
+
+        argv = ["--profiles-only", "--context-chars", "0", "--dry-run"]
+        assert main(argv, tmp_path / "config.json") == 0
+        mock_context.assert_not_called()
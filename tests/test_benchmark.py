@@ -0,0 +1,114 @@
+"""benchmark モジュールのテスト。"""
+
+import wave
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from speakdrop.benchmark import (
+    SAMPLE_RATE,
+    character_error_rate,
+    load_audio_dir,
+    load_benchmark_audio,
+    load_wav,
+    normalize_text,
+    percentile,
+    synthetic_samples,
+)
+
+
+def _write_wav(path: Path, audio: np.ndarray, rate: int = SAMPLE_RATE) -> None:
+    """テスト用 WAV ファイルを書き出す。"""
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(audio.astype(np.int16).tobytes())
+
+
+class TestCharacterErrorRate:
+    """character_error_rate() のテスト。"""
+
+    def test_identical_text_is_zero(self) -> None:
+        """同一テキストの CER は 0 であること。"""
+        assert character_error_rate("こんにちは", "こんにちは") == 0.0
+
+    def test_ignores_punctuation_and_spaces(self) -> None:
+        """句読点・空白の違いは誤りとして数えないこと。"""
+        assert character_error_rate("今日は、晴れです。", "今日は 晴れです") == 0.0
+
+    def test_substitution(self) -> None:
+        """1文字の置換で 1/文字数 になること。"""
+        assert character_error_rate("あいうえ", "あいうお") == pytest.approx(0.25)
+
+    def test_empty_reference(self) -> None:
+        """正解が空の場合、認識結果が空なら 0、そうでなければ 1 であること。"""
+        assert character_error_rate("", "") == 0.0
+        assert character_error_rate("", "あ") == 1.0
+
+    def test_normalize_text_nfkc(self) -> None:
+        """全角英数字は NFKC で半角に正規化されること。"""
+        assert normalize_text("ＡＢＣ　１２３。") == "ABC123"
+
+
+class TestPercentile:
+    """percentile() のテスト。"""
+
+    def test_empty_returns_zero(self) -> None:
+        """空リストは 0.0 を返すこと。"""
+        assert percentile([], 95) == 0.0
+
+    def test_median(self) -> None:
+        """50 パーセンタイルが中央値と一致すること。"""
+        assert percentile([1.0, 2.0, 3.0], 50) == 2.0
+
+
+class TestAudioLoading:
+    """評価用音声の読み込みテスト。"""
+
+    def test_load_wav(self, tmp_path: Path) -> None:
+        """16kHz/Mono/16bit の WAV を int16 配列として読み込むこと。"""
+        path = tmp_path / "a.wav"
+        _write_wav(path, np.arange(100))
+
+        audio = load_wav(path)
+
+        assert audio.dtype == np.int16
+        assert len(audio) == 100
+
+    def test_load_wav_rejects_other_rate(self, tmp_path: Path) -> None:
+        """16kHz 以外の WAV は ValueError になること。"""
+        path = tmp_path / "a.wav"
+        _write_wav(path, np.zeros(100), rate=44100)
+
+        with pytest.raises(ValueError):
+            load_wav(path)
+
+    def test_load_audio_dir_reads_reference(self, tmp_path: Path) -> None:
+        """同名の txt を正解テキストとして読み込むこと。"""
+        _write_wav(tmp_path / "a.wav", np.zeros(1600))
+        (tmp_path / "a.txt").write_text("正解\n", encoding="utf-8")
+        _write_wav(tmp_path / "b.wav", np.zeros(1600))
+
+        samples = load_audio_dir(tmp_path)
+
+        assert [s.name for s in samples] == ["a", "b"]
+        assert samples[0].reference == "正解"
+        assert samples[1].reference is None
+
+    def test_synthetic_samples_durations(self) -> None:
+        """合成信号が指定した長さの int16 音声であること。"""
+        samples = synthetic_samples((1.0, 2.5))
+
+        assert [s.duration for s in samples] == [1.0, 2.5]
+        assert all(s.audio.dtype == np.int16 for s in samples)
+        assert all(np.abs(s.audio).max() > 0 for s in samples)
+
+    def test_load_benchmark_audio_prefers_audio_dir(self, tmp_path: Path) -> None:
+        """ディレクトリ指定時はその WAV を使うこと。"""
+        _write_wav(tmp_path / "a.wav", np.zeros(1600))
+
+        samples = load_benchmark_audio(tmp_path)
+
+        assert [s.name for s in samples] == ["a"]
@@ -1,8 +1,11 @@
 """ClipboardInserter モジュールのテスト。"""
 
 import sys
+from typing import Any
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 
 # pyobjc は macOS 専用のため、テスト用にモジュールをモック化
 # 実際のビルドなしにインポートできるようにする
@@ -20,19 +23,16 @@ def _setup_pyobjc_mocks() -> None:
 
 _setup_pyobjc_mocks()
 
-from speakdrop.clipboard_inserter import ClipboardInserter  # noqa: E402
-
-
-class TestClipboardInserterConstants:
-    """ClipboardInserter の定数テスト。"""
+from speakdrop.clipboard_inserter import ClipboardInserter, MacPasteboard, focused_text  # noqa: E402
+from speakdrop.clock import VirtualClock  # noqa: E402
+from speakdrop.paste_sync import FakePasteboard, PasteSync  # noqa: E402
 
-    def test_paste_delay(self) -> None:
-        """PASTE_DELAY が 0.05 であること。"""
-        assert ClipboardInserter.PASTE_DELAY == 0.05
 
-    def test_restore_delay(self) -> None:
-        """RESTORE_DELAY が 0.1 であること。"""
-        assert ClipboardInserter.RESTORE_DELAY == 0.1
+@pytest.fixture(autouse=True)
+def notifier_cls() -> Any:
+    """読み取り通知の Objective-C クラスをモックに差し替える。"""
+    with patch("speakdrop.clipboard_inserter._read_notifier_class") as factory:
+        yield factory.return_value
 
 
 class TestClipboardInserterInsert:
@@ -50,132 +50,340 @@ class TestClipboardInserterInsert:
             mock_pb.pasteboardItems.return_value = []
         return mock_pb
 
-    @patch("speakdrop.clipboard_inserter.time.sleep")
     @patch("speakdrop.clipboard_inserter.NSPasteboard")
-    @patch("speakdrop.clipboard_inserter.CGEventCreateKeyboardEvent")
-    @patch("speakdrop.clipboard_inserter.CGEventPost")
+    @patch("speakdrop.key_events.CGEventCreateKeyboardEvent")
+    @patch("speakdrop.key_events.CGEventPost")
     def test_insert_saves_clipboard_before_insert(
         self,
         mock_post: MagicMock,
         mock_create_event: MagicMock,
         mock_pasteboard_cls: MagicMock,
-        mock_sleep: MagicMock,
     ) -> None:
         """insert() 前にクリップボード内容を退避すること（REQ-006）。"""
         mock_pb = self._make_mock_pb(has_items=True)
         mock_pasteboard_cls.generalPasteboard.return_value = mock_pb
 
-        inserter = ClipboardInserter()
+        inserter = ClipboardInserter(clock=VirtualClock())
         inserter.insert("新しいテキスト")
 
         # pasteboardItems() でアイテム一覧を取得したことを確認
         mock_pb.pasteboardItems.assert_called()
 
-    @patch("speakdrop.clipboard_inserter.time.sleep")
     @patch("speakdrop.clipboard_inserter.NSPasteboard")
-    @patch("speakdrop.clipboard_inserter.CGEventCreateKeyboardEvent")
-    @patch("speakdrop.clipboard_inserter.CGEventPost")
+    @patch("speakdrop.key_events.CGEventCreateKeyboardEvent")
+    @patch("speakdrop.key_events.CGEventPost")
     def test_insert_sets_text_to_clipboard(
         self,
         mock_post: MagicMock,
         mock_create_event: MagicMock,
         mock_pasteboard_cls: MagicMock,
-        mock_sleep: MagicMock,
+        notifier_cls: MagicMock,
     ) -> None:
         """insert() でテキストをクリップボードにセットすること（REQ-005）。"""
         mock_pb = self._make_mock_pb(has_items=False)
         mock_pasteboard_cls.generalPasteboard.return_value = mock_pb
 
-        inserter = ClipboardInserter()
+        inserter = ClipboardInserter(clock=VirtualClock())
         inserter.insert("挿入するテキスト")
 
-        mock_pb.setString_forType_.assert_called()
-        call_args = mock_pb.setString_forType_.call_args_list
-        texts = [str(c.args[0]) for c in call_args]
-        assert "挿入するテキスト" in texts
+        # テキストは読み取り時に渡す遅延提供アイテムとして書き込む
+        notifier = notifier_cls.alloc.return_value.init.return_value
+        assert notifier.text == "挿入するテキスト"
+        mock_pb.writeObjects_.assert_called_once()
 
-    @patch("speakdrop.clipboard_inserter.time.sleep")
     @patch("speakdrop.clipboard_inserter.NSPasteboard")
-    @patch("speakdrop.clipboard_inserter.CGEventCreateKeyboardEvent")
-    @patch("speakdrop.clipboard_inserter.CGEventPost")
+    @patch("speakdrop.key_events.CGEventCreateKeyboardEvent")
+    @patch("speakdrop.key_events.CGEventPost")
     def test_insert_sends_cmd_v(
         self,
         mock_post: MagicMock,
         mock_create_event: MagicMock,
         mock_pasteboard_cls: MagicMock,
-        mock_sleep: MagicMock,
     ) -> None:
         """insert() でCmd+Vキーストロークを送信すること（REQ-005）。"""
         mock_pb = self._make_mock_pb(has_items=False)
         mock_pasteboard_cls.generalPasteboard.return_value = mock_pb
 
-        inserter = ClipboardInserter()
+        inserter = ClipboardInserter(clock=VirtualClock())
         inserter.insert("テスト")
 
         assert mock_post.call_count >= 2  # key down + key up
 
-    @patch("speakdrop.clipboard_inserter.time.sleep")
     @patch("speakdrop.clipboard_inserter.NSPasteboard")
-    @patch("speakdrop.clipboard_inserter.CGEventCreateKeyboardEvent")
-    @patch("speakdrop.clipboard_inserter.CGEventPost")
+    @patch("speakdrop.key_events.CGEventCreateKeyboardEvent")
+    @patch("speakdrop.key_events.CGEventPost")
     def test_insert_restores_clipboard_after_insert(
         self,
         mock_post: MagicMock,
         mock_create_event: MagicMock,
         mock_pasteboard_cls: MagicMock,
-        mock_sleep: MagicMock,
     ) -> None:
         """insert() 後にクリップボード内容を復元すること（REQ-006）。"""
         mock_pb = self._make_mock_pb(has_items=True)
         mock_pasteboard_cls.generalPasteboard.return_value = mock_pb
 
-        inserter = ClipboardInserter()
+        clock = VirtualClock()
+        inserter = ClipboardInserter(clock=clock)
         inserter.insert("新しいテキスト")
+        clock.run_until_idle()
 
-        # 全アイテムを writeObjects_ で復元したことを確認
-        mock_pb.writeObjects_.assert_called_once()
+        # テキストの書き込みの後、退避した全アイテムを writeObjects_ で復元したことを確認
+        assert mock_pb.writeObjects_.call_count == 2
+        restored = mock_pb.writeObjects_.call_args.args[0]
+        assert len(restored) == 1
 
-    @patch("speakdrop.clipboard_inserter.time.sleep")
     @patch("speakdrop.clipboard_inserter.NSPasteboard")
-    @patch("speakdrop.clipboard_inserter.CGEventCreateKeyboardEvent")
-    @patch("speakdrop.clipboard_inserter.CGEventPost")
+    @patch("speakdrop.key_events.CGEventCreateKeyboardEvent")
+    @patch("speakdrop.key_events.CGEventPost")
     def test_insert_restores_clipboard_even_on_error(
         self,
         mock_post: MagicMock,
         mock_create_event: MagicMock,
         mock_pasteboard_cls: MagicMock,
-        mock_sleep: MagicMock,
     ) -> None:
         """Cmd+V送信がエラーになっても、クリップボードを復元すること。"""
         mock_pb = self._make_mock_pb(has_items=True)
         mock_pasteboard_cls.generalPasteboard.return_value = mock_pb
         mock_post.side_effect = Exception("CGEvent error")
 
-        inserter = ClipboardInserter()
+        clock = VirtualClock()
+        inserter = ClipboardInserter(clock=clock)
         inserter.insert("新しいテキスト")
+        clock.run_until_idle()
 
         # エラーが起きても writeObjects_ で復元される
-        mock_pb.writeObjects_.assert_called_once()
+        assert mock_pb.writeObjects_.call_count == 2
 
-    @patch("speakdrop.clipboard_inserter.time.sleep")
     @patch("speakdrop.clipboard_inserter.NSPasteboard")
-    @patch("speakdrop.clipboard_inserter.CGEventCreateKeyboardEvent")
-    @patch("speakdrop.clipboard_inserter.CGEventPost")
+    @patch("speakdrop.key_events.CGEventCreateKeyboardEvent")
+    @patch("speakdrop.key_events.CGEventPost")
     def test_insert_restores_empty_when_clipboard_was_empty(
         self,
         mock_post: MagicMock,
         mock_create_event: MagicMock,
         mock_pasteboard_cls: MagicMock,
-        mock_sleep: MagicMock,
     ) -> None:
         """クリップボードが空だった場合、clearContents のみで復元しないこと。"""
         mock_pb = self._make_mock_pb(has_items=False)
         mock_pasteboard_cls.generalPasteboard.return_value = mock_pb
 
-        inserter = ClipboardInserter()
+        clock = VirtualClock()
+        inserter = ClipboardInserter(clock=clock)
         inserter.insert("新しいテキスト")
+        clock.run_until_idle()
 
-        # アイテムがない場合は writeObjects_ を呼ばない
-        mock_pb.writeObjects_.assert_not_called()
+        # アイテムがない場合は復元時に writeObjects_ を呼ばない（テキストの書き込みのみ）
+        mock_pb.writeObjects_.assert_called_once()
         # clearContents は呼ばれる
         mock_pb.clearContents.assert_called()
+
+
+class TestClipboardInserterPasteSync:
+    """FakePasteboard を使った貼り付け同期のテスト（仮想時間）。"""
+
+    def _make(self, write_latency: float = 0.0) -> tuple[ClipboardInserter, Any, VirtualClock]:
+        clock = VirtualClock()
+        pasteboard = FakePasteboard(clock, contents="元の内容", write_latency=write_latency)
+        inserter = ClipboardInserter(
+            clock=clock, pasteboard=pasteboard, target_app=lambda: "com.example.editor"
+        )
+        return inserter, pasteboard, clock
+
+    @patch("speakdrop.key_events.CGEventPost")
+    def test_sends_cmd_v_after_write_is_visible(self, mock_post: MagicMock) -> None:
+        """書き込みが changeCount に反映されるまで Cmd+V の送信を待つこと。"""
+        inserter, _, clock = self._make(write_latency=0.03)
+
+        inserter.insert("テスト")
+
+        assert clock.monotonic() == pytest.approx(0.03)
+        assert mock_post.call_count == 2
+
+    @patch("speakdrop.key_events.CGEventPost")
+    def test_insert_returns_before_restore(self, mock_post: MagicMock) -> None:
+        """insert() は Cmd+V 送信直後に戻り、復元はターゲットアプリの読み取り後に行うこと。"""
+        inserter, pasteboard, clock = self._make()
+
+        inserter.insert("テスト")
+        clock.call_later(0.3, pasteboard.read_text)  # 遅いアプリが 0.3 秒後に読み取る
+        clock.advance(0.3)
+
+        assert inserter.restore_pending
+        assert pasteboard.reads == [(0.3, "テスト")]
+
+        clock.run_until_idle()
+
+        assert not inserter.restore_pending
+        assert pasteboard.contents == "元の内容"
+        assert inserter.sync.stats()["com.example.editor"].samples == 1
+
+    @patch("speakdrop.key_events.CGEventPost")
+    def test_restores_after_timeout_without_read(self, mock_post: MagicMock) -> None:
+        """読み取りを検出できない場合は上限時間で復元すること。"""
+        inserter, pasteboard, clock = self._make()
+
+        inserter.insert("テスト")
+        clock.run_until_idle()
+
+        assert pasteboard.contents == "元の内容"
+        assert clock.monotonic() >= PasteSync.DEFAULT_RESTORE_TIMEOUT
+        assert inserter.sync.stats()["com.example.editor"].timeouts == 1
+
+    @patch("speakdrop.key_events.CGEventPost")
+    def test_user_copy_cancels_restore(self, mock_post: MagicMock) -> None:
+        """復元前にユーザーがコピーした場合は、その内容を上書きしないこと。"""
+        inserter, pasteboard, clock = self._make()
+
+        inserter.insert("テスト")
+        pasteboard.copy("ユーザーがコピーした内容")
+        clock.run_until_idle()
+
+        assert pasteboard.contents == "ユーザーがコピーした内容"
+        assert not inserter.restore_pending
+
+    @patch("speakdrop.key_events.CGEventPost")
+    def test_overlapping_insert_keeps_original_clipboard(self, mock_post: MagicMock) -> None:
+        """復元前に次の挿入が来ても元の内容を退避し直さず、最後に一度だけ復元すること。"""
+        inserter, pasteboard, clock = self._make()
+
+        inserter.insert("1つ目")
+        inserter.insert("2つ目")
+        pasteboard.read_text()
+        clock.run_until_idle()
+
+        assert pasteboard.contents == "元の内容"
+        assert pasteboard.reads == [(0.0, "2つ目")]
+
+    @patch("speakdrop.key_events.CGEventPost")
+    def test_restore_now(self, mock_post: MagicMock) -> None:
+        """restore() で予約を待たずに復元し、予約済みの復元は何もしないこと。"""
+        inserter, pasteboard, clock = self._make()
+        inserter.insert("テスト")
+
+        inserter.restore()
+        pasteboard.copy("後でコピーした内容")
+        clock.run_until_idle()
+
+        assert pasteboard.contents == "後でコピーした内容"
+
+
+class TestMacPasteboardSnapshot:
+    """MacPasteboard のサイズ上限付き退避のテスト（REQ-006）。"""
+
+    def _data(self, size: int) -> MagicMock:
+        data = MagicMock()
+        data.length.return_value = size
+        return data
+
+    def _item(self, sizes: dict[str, int]) -> MagicMock:
+        item = MagicMock()
+        item.types.return_value = list(sizes)
+        item.dataForType_.side_effect = lambda ptype: self._data(sizes[ptype])
+        return item
+
+    @patch("speakdrop.clipboard_inserter.NSPasteboard")
+    def test_skips_types_over_limit(self, mock_pasteboard_cls: MagicMock) -> None:
+        """上限を超える型は退避せず、それ以外の型は退避してバイト数を記録すること。"""
+        item = self._item({"public.tiff": 50_000_000, "public.png": 2_000_000})
+        mock_pasteboard_cls.generalPasteboard.return_value.pasteboardItems.return_value = [item]
+        pasteboard = MacPasteboard(max_restore_bytes=10_000_000)
+
+        snapshot = pasteboard.snapshot()
+
+        assert [ptype for ptype, _, _ in snapshot[0]] == ["public.png"]
+        assert pasteboard.stats.last_bytes == 2_000_000
+        assert pasteboard.stats.skipped_types == 1
+        assert pasteboard.stats.snapshots == 1
+
+    @patch("speakdrop.clipboard_inserter.NSPasteboard")
+    def test_does_not_read_file_promises(self, mock_pasteboard_cls: MagicMock) -> None:
+        """ファイルプロミスの型はデータを読み出さないこと（送信元アプリに書き出させない）。"""
+        item = self._item(
+            {"com.apple.pasteboard.promised-file-url": 10, "public.utf8-plain-text": 5}
+        )
+        mock_pasteboard_cls.generalPasteboard.return_value.pasteboardItems.return_value = [item]
+
+        snapshot = MacPasteboard().snapshot()
+
+        item.dataForType_.assert_called_once_with("public.utf8-plain-text")
+        assert len(snapshot[0]) == 1
+
+    @patch("speakdrop.clipboard_inserter.NSPasteboardItem")
+    @patch("speakdrop.clipboard_inserter.NSPasteboard")
+    def test_restore_builds_items_from_entries(
+        self, mock_pasteboard_cls: MagicMock, mock_item_cls: MagicMock
+    ) -> None:
+        """退避したデータ・プロパティリストからアイテムを組み立てて書き戻すこと。"""
+        mock_pb = mock_pasteboard_cls.generalPasteboard.return_value
+        data = self._data(3)
+
+        MacPasteboard().restore([[("public.png", data, False), ("plist.type", ["a"], True)], []])
+
+        restored = mock_item_cls.new.return_value
+        restored.setData_forType_.assert_called_once_with(data, "public.png")
+        restored.setPropertyList_forType_.assert_called_once_with(["a"], "plist.type")
+        mock_pb.writeObjects_.assert_called_once_with([restored])
+
+
+class TestClipboardInserterReplace:
+    """ClipboardInserter.replace() のテスト。"""
+
+    @patch("speakdrop.key_events.CGEventCreateKeyboardEvent")
+    @patch("speakdrop.key_events.CGEventPost")
+    def test_replace_sends_backspaces_and_inserts_suffix(
+        self, mock_post: MagicMock, mock_create_event: MagicMock
+    ) -> None:
+        """共通接頭辞より後ろをバックスペースで削除し、残りを挿入すること。"""
+        inserter = ClipboardInserter()
+        with patch.object(inserter, "insert") as mock_insert:
+            inserter.replace("今日わ晴れ", "今日は晴れ。")
+
+        assert mock_post.call_count == 6  # 3文字 × (key down + key up)
+        mock_insert.assert_called_once_with("は晴れ。")
+
+    @patch("speakdrop.key_events.CGEventPost")
+    def test_replace_identical_does_nothing(self, mock_post: MagicMock) -> None:
+        """同一テキストの場合はキー送信も挿入もしないこと。"""
+        inserter = ClipboardInserter()
+        with patch.object(inserter, "insert") as mock_insert:
+            inserter.replace("同じ", "同じ")
+
+        mock_post.assert_not_called()
+        mock_insert.assert_not_called()
+
+
+class TestFocusedText:
+    """focused_text()（アクセシビリティ API での入力先の読み取り）のテスト。"""
+
+    def _ax(self, value: Any, selection: tuple[int, int], err: int = 0) -> MagicMock:
+        """フォーカス中の要素が value と選択範囲 selection を返す ApplicationServices のモック。"""
+        ax = MagicMock(kAXErrorSuccess=0)
+        attributes = {
+            ax.kAXFocusedUIElementAttribute: (err, MagicMock()),
+            ax.kAXValueAttribute: (0, value),
+            ax.kAXSelectedTextRangeAttribute: (0, MagicMock()),
+        }
+        ax.AXUIElementCopyAttributeValue.side_effect = lambda _, name, __: attributes[name]
+        ax.AXValueGetValue.return_value = (True, selection)
+        return ax
+
+    def test_returns_text_before_cursor(self) -> None:
+        """カーソル位置（UTF-16 のコード単位）より前のテキストを返すこと。"""
+        ax = self._ax("了解👍🏽です", (6, 0))  # 了・解・👍（2単位）・🏽（2単位）
+
+        with patch.dict(sys.modules, {"ApplicationServices": ax}):
+            assert focused_text() == "了解👍🏽"
+
+    def test_selection_is_unreadable(self) -> None:
+        """範囲を選択中の場合は None を返すこと。"""
+        ax = self._ax("了解", (0, 2))
+
+        with patch.dict(sys.modules, {"ApplicationServices": ax}):
+            assert focused_text() is None
+
+    def test_no_focused_element(self) -> None:
+        """フォーカス中の要素を取得できない場合は None を返すこと。"""
+        ax = self._ax("了解", (2, 0), err=-25212)
+
+        with patch.dict(sys.modules, {"ApplicationServices": ax}):
+            assert focused_text() is None
@@ -0,0 +1,79 @@
+"""clock モジュールのテスト。"""
+
+import threading
+
+from speakdrop.clock import SystemClock, VirtualClock
+
+
+class TestSystemClock:
+    """SystemClock のテスト。"""
+
+    def test_monotonic_increases(self) -> None:
+        """monotonic() が単調増加すること。"""
+        clock = SystemClock()
+        first = clock.monotonic()
+        clock.sleep(0.001)
+        assert clock.monotonic() > first
+
+    def test_call_later_runs_on_timer_thread(self) -> None:
+        """call_later() が呼び出し元をブロックせず、遅延後にコールバックを実行すること。"""
+        done = threading.Event()
+        received: list[str] = []
+
+        def callback(value: str) -> None:
+            received.append(value)
+            done.set()
+
+        SystemClock().call_later(0.01, callback, "ok")
+
+        assert done.wait(timeout=2.0)
+        assert received == ["ok"]
+
+
+class TestVirtualClock:
+    """VirtualClock のテスト。"""
+
+    def test_sleep_advances_without_waiting(self) -> None:
+        """sleep() は実時間を待たずに仮想時刻を進めること。"""
+        clock = VirtualClock()
+        clock.sleep(3600.0)
+        assert clock.monotonic() == 3600.0
+
+    def test_timers_fire_in_time_order(self) -> None:
+        """タイマーが時刻順（同時刻は登録順）に実行されること。"""
+        clock = VirtualClock()
+        fired: list[tuple[float, str]] = []
+        clock.call_at(2.0, lambda: fired.append((clock.monotonic(), "b")))
+        clock.call_at(1.0, lambda: fired.append((clock.monotonic(), "a")))
+        clock.call_at(2.0, lambda: fired.append((clock.monotonic(), "c")))
+
+        clock.advance(1.5)
+        assert fired == [(1.0, "a")]
+
+        clock.run_until_idle()
+        assert fired == [(1.0, "a"), (2.0, "b"), (2.0, "c")]
+        assert clock.pending == 0
+
+    def test_timer_fires_during_nested_sleep(self) -> None:
+        """タイマー内の sleep() 中に期限を迎えた別のタイマーも実行されること。"""
+        clock = VirtualClock()
+        fired: list[tuple[float, str]] = []
+
+        def long_task() -> None:
+            fired.append((clock.monotonic(), "start"))
+            clock.sleep(2.0)
+            fired.append((clock.monotonic(), "end"))
+
+        clock.call_at(0.0, long_task)
+        clock.call_at(1.0, lambda: fired.append((clock.monotonic(), "interrupt")))
+        clock.run_until_idle()
+
+        assert fired == [(0.0, "start"), (1.0, "interrupt"), (2.0, "end")]
+
+    def test_never_goes_backwards(self) -> None:
+        """過去の時刻のタイマーを登録しても時刻は巻き戻らないこと。"""
+        clock = VirtualClock(start=5.0)
+        times: list[float] = []
+        clock.call_at(1.0, lambda: times.append(clock.monotonic()))
+        clock.run_until_idle()
+        assert times == [5.0]
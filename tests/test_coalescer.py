@@ -0,0 +1,98 @@
+"""coalescer モジュールのテスト。"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pytest
+
+from speakdrop.coalescer import LlmCoalescer
+from speakdrop.segment_pipeline import InlineExecutor
+
+
+def _processor() -> MagicMock:
+    processor = MagicMock()
+    processor.process.side_effect = lambda text, num_predict: text + "。"
+    processor.process_batch.side_effect = lambda texts, num_predict: [t + "。" for t in texts]
+    return processor
+
+
+class TestLlmCoalescer:
+    """LlmCoalescer のテスト。"""
+
+    def test_single_unit_uses_process(self) -> None:
+        """待ちが1件だけの場合は process() で整形すること。"""
+        processor = _processor()
+        coalescer = LlmCoalescer(InlineExecutor())
+
+        assert coalescer.submit("あ", processor, num_predict=64).result() == "あ。"
+        processor.process.assert_called_once_with("あ", num_predict=64)
+        processor.process_batch.assert_not_called()
+
+    def test_coalesces_units_queued_while_busy(self) -> None:
+        """処理中に溜まった単位を1回のリクエストにまとめること。"""
+        processor = _processor()
+        started = threading.Event()
+        release = threading.Event()
+
+        def process(text: str, num_predict: int) -> str:
+            started.set()
+            release.wait(1.0)
+            return text
+
+        processor.process.side_effect = process
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            coalescer = LlmCoalescer(executor)
+            futures = [coalescer.submit("あ", processor)]
+            assert started.wait(1.0)
+            futures += [coalescer.submit(text, processor) for text in ("い", "う")]
+            release.set()
+            results = [future.result(1.0) for future in futures]
+
+        assert results == ["あ", "い。", "う。"]
+        processor.process_batch.assert_called_once_with(["い", "う"], num_predict=512)
+        assert (coalescer.requests, coalescer.units) == (2, 3)
+
+    def test_respects_limits_and_groups(self) -> None:
+        """上限件数・異なる num_predict の単位はまとめないこと。"""
+        processor = _processor()
+        coalescer = LlmCoalescer(MagicMock(), max_items=2)
+        futures = [
+            coalescer.submit("あ", processor),
+            coalescer.submit("い", processor),
+            coalescer.submit("う", processor),
+            coalescer.submit("え", processor, num_predict=128),
+        ]
+
+        for _ in range(3):
+            coalescer._drain()
+
+        assert [f.result(0) for f in futures] == ["あ。", "い。", "う。", "え。"]
+        processor.process_batch.assert_called_once_with(["あ", "い"], num_predict=512)
+        assert processor.process.call_count == 2
+
+    def test_skips_cancelled_units(self) -> None:
+        """取り消された単位は整形しないこと。"""
+        processor = _processor()
+        coalescer = LlmCoalescer(MagicMock())
+        cancelled = coalescer.submit("あ", processor)
+        kept = coalescer.submit("い", processor)
+        cancelled.cancel()
+
+        coalescer._drain()
+
+        assert kept.result(0) == "い。"
+        processor.process.assert_called_once_with("い", num_predict=512)
+
+    def test_propagates_errors(self) -> None:
+        """整形の例外をまとめた全単位の Future に設定すること。"""
+        processor = _processor()
+        processor.process_batch.side_effect = RuntimeError("失敗")
+        coalescer = LlmCoalescer(MagicMock())
+        futures = [coalescer.submit(text, processor) for text in ("あ", "い")]
+
+        coalescer._drain()
+
+        for future in futures:
+            with pytest.raises(RuntimeError):
+                future.result(0)
@@ -1,9 +1,19 @@
 """Config モジュールのテスト。"""
 
 import json
+import logging
 from pathlib import Path
 
-from speakdrop.config import CONFIG_PATH, Config
+import pytest
+
+from speakdrop.config import (
+    CONFIG_PATH,
+    HOLD,
+    HOTKEY_MODES,
+    Config,
+    load_profile_stats,
+    save_profile_stats,
+)
 
 
 class TestConfigDefaults:
@@ -94,6 +104,26 @@ class TestConfigLoad:
 
         assert config.ollama_model == "qwen2.5:7b"  # デフォルト維持
 
+    def test_load_unknown_hotkey_mode_falls_back_to_hold(
+        self, tmp_path: Path, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """未知の hotkey_mode は警告をログに記録して 'hold' として扱うこと。"""
+        config_file = tmp_path / "config.json"
+        config_file.write_text(json.dumps({"hotkey_mode": "hold_to_talk"}))
+
+        with caplog.at_level(logging.WARNING, logger="speakdrop.config"):
+            config = Config().load(config_path=config_file)
+
+        assert config.hotkey_mode == HOLD
+        assert "hold_to_talk" in caplog.text
+
+    def test_load_supported_hotkey_modes(self, tmp_path: Path) -> None:
+        """サポートしている hotkey_mode はそのまま読み込むこと。"""
+        config_file = tmp_path / "config.json"
+        for mode in HOTKEY_MODES:
+            config_file.write_text(json.dumps({"hotkey_mode": mode}))
+            assert Config().load(config_path=config_file).hotkey_mode == mode
+
 
 class TestConfigSave:
     """Config.save() のテスト。"""
@@ -139,3 +169,119 @@ class TestConfigSave:
         assert loaded.model == original.model
         assert loaded.enabled == original.enabled
         assert loaded.ollama_model == original.ollama_model
+
+
+class TestConfigWhisperSettings:
+    """Whisper 推論設定（bench-whisper の保存先）のテスト。"""
+
+    def test_default_whisper_settings(self) -> None:
+        """推論設定のデフォルト値が従来の固定値と一致すること。"""
+        config = Config()
+        assert config.compute_type == "int8"
+        assert config.cpu_threads == 0
+        assert config.num_workers == 1
+
+    def test_load_int_values(self, tmp_path: Path) -> None:
+        """int 型の設定値を読み込めること。"""
+        config_file = tmp_path / "config.json"
+        config_file.write_text(
+            json.dumps({"compute_type": "float32", "cpu_threads": 4, "num_workers": 2})
+        )
+
+        config = Config().load(config_path=config_file)
+
+        assert config.compute_type == "float32"
+        assert config.cpu_threads == 4
+        assert config.num_workers == 2
+
+    def test_load_bool_for_int_uses_default(self, tmp_path: Path) -> None:
+        """int 型の設定に bool が指定された場合はデフォルト値を維持すること。"""
+        config_file = tmp_path / "config.json"
+        config_file.write_text(json.dumps({"cpu_threads": True, "num_workers": "2"}))
+
+        config = Config().load(config_path=config_file)
+
+        assert config.cpu_threads == 0
+        assert config.num_workers == 1
+
+
+class TestProfileStats:
+    """デコードプロファイル実測値の保存・読み込みのテスト。"""
+
+    def test_default_decode_profile(self) -> None:
+        """デフォルトのデコードプロファイルは 'balanced' であること。"""
+        assert Config().decode_profile == "balanced"
+
+    def test_roundtrip(self, tmp_path: Path) -> None:
+        """保存した実測値を読み込めること。"""
+        path = tmp_path / "profile_stats.json"
+        stats = {"fastest": {"median_latency": 0.5, "p95_latency": 0.8, "cer": 0.05}}
+
+        save_profile_stats(stats, path)
+
+        assert load_profile_stats(path) == stats
+
+    def test_missing_file_returns_empty(self, tmp_path: Path) -> None:
+        """ファイルが無い場合は空の辞書を返すこと。"""
+        assert load_profile_stats(tmp_path / "missing.json") == {}
+
+    def test_invalid_content_is_ignored(self, tmp_path: Path) -> None:
+        """不正な内容は無視すること。"""
+        path = tmp_path / "profile_stats.json"
+        path.write_text(json.dumps({"fastest": {"cer": "x"}, "balanced": 1}))
+
+        assert load_profile_stats(path) == {"fastest": {}}
+
+
+class TestConfigRouting:
+    """モデル振り分け設定のテスト。"""
+
+    def test_default_routing_disabled(self) -> None:
+        """デフォルトでは高速モデルが未設定であること。"""
+        config = Config()
+        assert config.fast_model == ""
+        assert config.route_min_duration == 3.0
+        assert config.latency_budget == 5.0
+        assert config.speculative_draft is False
+
+    def test_load_float_accepts_int(self, tmp_path: Path) -> None:
+        """float 型の設定に int が指定された場合は float として読み込むこと。"""
+        config_file = tmp_path / "config.json"
+        config_file.write_text(json.dumps({"fast_model": "small", "latency_budget": 4}))
+
+        config = Config().load(config_path=config_file)
+
+        assert config.fast_model == "small"
+        assert config.latency_budget == 4.0
+        assert isinstance(config.latency_budget, float)
+
+
+class TestConfigInsertion:
+    """テキスト挿入設定のテスト。"""
+
+    def test_default_type_max_chars(self) -> None:
+        """デフォルトでは30文字以下のテキストをキー入力で挿入すること。"""
+        assert Config().type_max_chars == 30
+
+    def test_default_clipboard_max_restore_bytes(self) -> None:
+        """デフォルトでは 16MB を超える型をクリップボードの退避・復元から除外すること。"""
+        assert Config().clipboard_max_restore_bytes == 16 * 1024 * 1024
+
+    def test_load_type_max_chars(self, tmp_path: Path) -> None:
+        """type_max_chars に 0 を指定すると常に貼り付けになる設定を読み込めること。"""
+        config_file = tmp_path / "config.json"
+        config_file.write_text(json.dumps({"type_max_chars": 0}))
+
+        assert Config().load(config_path=config_file).type_max_chars == 0
+
+
+class TestConfigLatency:
+    """レイテンシ関連の設定のテスト。"""
+
+    def test_default_stream_unit_chars(self) -> None:
+        """デフォルトでは40文字程度の単位で LLM 整形に先行投入すること。"""
+        assert Config().stream_unit_chars == 40
+
+    def test_default_latency_slo(self) -> None:
+        """デフォルトでレイテンシ SLO による品質段階の制御が有効であること。"""
+        assert Config().latency_slo is True
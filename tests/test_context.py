@@ -0,0 +1,45 @@
+"""context モジュールのテスト。"""
+
+from speakdrop.clock import VirtualClock
+from speakdrop.context import TranscriptContext
+
+
+class TestTranscriptContext:
+    """TranscriptContext のテスト。"""
+
+    def test_keeps_last_max_chars(self) -> None:
+        """認識結果を連結し、末尾 max_chars 文字だけを残すこと。"""
+        context = TranscriptContext(max_chars=5, clock=VirtualClock())
+        context.add("今日は")
+        context.add(" 晴れです ")
+
+        assert context.prompt() == "は晴れです"
+
+    def test_disabled(self) -> None:
+        """max_chars が 0 の場合は文脈を引き継がないこと。"""
+        context = TranscriptContext(max_chars=0, clock=VirtualClock())
+        context.add("今日は")
+
+        assert context.prompt() == ""
+
+    def test_resets_after_idle_timeout(self) -> None:
+        """最後の認識結果から idle_timeout 秒を超えたら文脈を破棄すること。"""
+        clock = VirtualClock()
+        context = TranscriptContext(idle_timeout=60.0, clock=clock)
+        context.add("今日は")
+        clock.advance(60.0)
+        assert context.prompt() == "今日は"
+
+        clock.advance(1.0)
+        assert context.prompt() == ""
+        assert context.resets == 1
+
+    def test_resets_on_app_change(self) -> None:
+        """入力先のアプリが変わったら文脈を破棄すること。"""
+        context = TranscriptContext(clock=VirtualClock())
+        context.add("今日は", app_id="com.apple.mail")
+        assert context.prompt("com.apple.mail") == "今日は"
+
+        assert context.prompt("com.apple.Terminal") == ""
+        context.add("ls", app_id="com.apple.Terminal")
+        assert context.prompt("com.apple.Terminal") == "ls"
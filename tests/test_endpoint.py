@@ -0,0 +1,61 @@
+"""EndpointDetector モジュールのテスト。"""
+
+import numpy as np
+
+from speakdrop.endpoint import EndpointDetector
+
+SPEECH = np.full(1600, 1000, dtype=np.int16)  # 0.1 秒分の発話
+SILENCE = np.zeros(1600, dtype=np.int16)  # 0.1 秒分の無音
+
+
+def _feed(detector: EndpointDetector, *blocks: np.ndarray) -> list[bool]:
+    return [detector.feed(block) for block in blocks]
+
+
+class TestEndpointDetector:
+    """EndpointDetector の終了判定テスト。"""
+
+    def test_ends_after_trailing_silence(self) -> None:
+        """発話の後に trailing_silence 秒の無音が続いたブロックで終了とみなすこと。"""
+        detector = EndpointDetector(trailing_silence=0.3)
+
+        ended = _feed(detector, SPEECH, SPEECH, SILENCE, SILENCE, SILENCE)
+
+        assert ended == [False, False, False, False, True]
+
+    def test_speech_resets_trailing_silence(self) -> None:
+        """無音の途中で発話が再開したら無音の長さを数え直すこと。"""
+        detector = EndpointDetector(trailing_silence=0.2)
+
+        ended = _feed(detector, SPEECH, SILENCE, SPEECH, SILENCE, SILENCE)
+
+        assert ended == [False, False, False, False, True]
+
+    def test_leading_silence_does_not_end(self) -> None:
+        """発話前の無音では終了とみなさないこと。"""
+        detector = EndpointDetector(trailing_silence=0.2)
+
+        assert not any(_feed(detector, *[SILENCE] * 10))
+
+    def test_short_speech_does_not_end(self) -> None:
+        """min_speech に満たない発話の後の無音では終了とみなさないこと。"""
+        detector = EndpointDetector(trailing_silence=0.1, min_speech=0.2)
+
+        assert not any(_feed(detector, SPEECH, SILENCE, SILENCE))
+
+    def test_ends_at_max_duration(self) -> None:
+        """発話が続いていても max_duration に達したら終了とみなすこと。"""
+        detector = EndpointDetector(max_duration=0.5)
+
+        ended = _feed(detector, *[SPEECH] * 5)
+
+        assert ended == [False, False, False, False, True]
+
+    def test_reports_end_once_until_reset(self) -> None:
+        """終了を報告した後は reset() まで False を返すこと。"""
+        detector = EndpointDetector(trailing_silence=0.1)
+        _feed(detector, SPEECH, SILENCE)
+
+        assert detector.feed(SILENCE) is False
+        detector.reset()
+        assert _feed(detector, SPEECH, SILENCE) == [False, True]
@@ -0,0 +1,92 @@
+"""fake_inserter モジュールのテスト。"""
+
+import pytest
+
+from speakdrop.clock import VirtualClock
+from speakdrop.fake_inserter import FakeClipboardInserter, FakeEventSink, FakeKeystrokeInserter
+from speakdrop.paste_sync import FakePasteboard, PasteSync
+
+
+class TestFakeClipboardInserter:
+    """FakeClipboardInserter のテスト（仮想時間）。"""
+
+    def _make(self, read_delay: float = 0.0) -> tuple[FakeClipboardInserter, VirtualClock]:
+        clock = VirtualClock()
+        pasteboard = FakePasteboard(clock, contents="元の内容")
+        sink = FakeEventSink(clock, pasteboard, read_delay=read_delay)
+        return FakeClipboardInserter(clock, pasteboard, sink), clock
+
+    def test_paste_reaches_document_and_restores(self) -> None:
+        """貼り付けたテキストが入力先に届き、クリップボードが元に戻ること（REQ-005, REQ-006）。"""
+        inserter, clock = self._make()
+
+        inserter.insert("今日は晴れ。")
+        clock.run_until_idle()
+
+        assert inserter.sink.document == "今日は晴れ。"
+        assert inserter.pasteboard.contents == "元の内容"
+        assert [e.kind for e in inserter.sink.events] == ["paste"]
+
+    def test_slow_reader_is_waited_for(self) -> None:
+        """読み取りの遅いアプリでも元の内容ではなく挿入テキストが貼り付くこと。"""
+        inserter, clock = self._make(read_delay=0.4)
+
+        inserter.insert("テスト")
+        clock.run_until_idle()
+
+        assert inserter.sink.document == "テスト"
+        assert inserter.pasteboard.contents == "元の内容"
+        assert inserter.sync.stats()["fake.app"].read_delay_p95 == pytest.approx(0.4)
+
+    def test_records_blocking_time(self) -> None:
+        """insert() が呼び出し元をブロックした時間を記録すること（復元は含まない）。"""
+        inserter, clock = self._make()
+
+        inserter.insert("テスト")
+        clock.run_until_idle()
+
+        assert len(inserter.records) == 1
+        assert inserter.records[0].duration < PasteSync.DEFAULT_RESTORE_TIMEOUT
+
+    def test_replace_edits_document(self) -> None:
+        """replace() で入力先のテキストが置き換わること。"""
+        inserter, clock = self._make()
+        inserter.insert("今日わ")
+        clock.run_until_idle()
+
+        inserter.replace("今日わ", "今日は。")
+        clock.run_until_idle()
+
+        assert inserter.sink.document == "今日は。"
+
+
+class TestFakeKeystrokeInserter:
+    """FakeKeystrokeInserter のテスト。"""
+
+    def test_types_in_chunks(self) -> None:
+        """チャンクごとのキーイベントとして入力されること。"""
+        inserter = FakeKeystrokeInserter(VirtualClock())
+
+        inserter.insert("あ" * 25)
+
+        assert [len(e.text) for e in inserter.sink.events] == [20, 5]
+        assert inserter.sink.document == "あ" * 25
+
+    def test_replace(self) -> None:
+        """バックスペースと追記で置き換えること。"""
+        inserter = FakeKeystrokeInserter(VirtualClock())
+        inserter.insert("今日わ")
+
+        inserter.replace("今日わ", "今日は。")
+
+        assert inserter.sink.document == "今日は。"
+
+    def test_backspace_deletes_grapheme(self) -> None:
+        """バックスペース1回で絵文字の連結や結合文字を含む1文字を削除すること。"""
+        inserter = FakeKeystrokeInserter(VirtualClock())
+        inserter.insert("了解👍🏽")
+
+        inserter.replace("了解👍🏽", "了解。")
+
+        assert inserter.sink.document == "了解。"
+        assert inserter.focused_text() == "了解。"
@@ -3,6 +3,7 @@
 from unittest.mock import MagicMock, patch
 
 
+from speakdrop.clock import VirtualClock
 from speakdrop.hotkey_listener import HotkeyListener
 
 
@@ -199,3 +200,110 @@ class TestHotkeyListenerCaptureMode:
         listener._handle_press(mock_key)  # 2回目
 
         assert capture_callback.call_count == 1  # 1回のみ呼ばれる
+
+
+class TestHotkeyListenerUserInput:
+    """ホットキー以外のキー入力の検出テスト（投機的挿入のガード用）。"""
+
+    def _make_key(self, name: str) -> MagicMock:
+        key = MagicMock()
+        key.name = name
+        return key
+
+    def test_other_key_updates_last_user_input(self) -> None:
+        """ホットキー以外のキー押下で last_user_input が更新されること。"""
+        listener = HotkeyListener(hotkey_key="alt_r", on_press=MagicMock(), on_release=MagicMock())
+
+        listener._handle_press(self._make_key("a"))
+
+        assert listener.last_user_input > 0.0
+
+    def test_hotkey_does_not_update_last_user_input(self) -> None:
+        """ホットキーの押下はユーザー入力として数えないこと。"""
+        listener = HotkeyListener(hotkey_key="alt_r", on_press=MagicMock(), on_release=MagicMock())
+
+        listener._handle_press(self._make_key("alt_r"))
+
+        assert listener.last_user_input == 0.0
+
+    def test_ignored_period_does_not_update_last_user_input(self) -> None:
+        """ignore_input_for() の期間中のキー入力は数えないこと。"""
+        listener = HotkeyListener(hotkey_key="alt_r", on_press=MagicMock(), on_release=MagicMock())
+        listener.ignore_input_for(10.0)
+
+        listener._handle_press(self._make_key("backspace"))
+
+        assert listener.last_user_input == 0.0
+
+    def test_ignored_period_uses_injected_clock(self) -> None:
+        """無視期間は注入した時計で判定し、期間を過ぎた入力は数えること。"""
+        clock = VirtualClock(start=100.0)
+        listener = HotkeyListener(
+            hotkey_key="alt_r", on_press=MagicMock(), on_release=MagicMock(), clock=clock
+        )
+        listener.ignore_input_for(0.3)
+
+        clock.advance(0.5)
+        listener._handle_press(self._make_key("a"))
+
+        assert listener.last_user_input == 100.5
+
+
+class TestHotkeyListenerDebounce:
+    """キーリピート・チャタリングの除外テスト。"""
+
+    def _make_key(self, name: str) -> MagicMock:
+        key = MagicMock()
+        key.name = name
+        return key
+
+    def test_key_repeat_is_ignored(self) -> None:
+        """押しっぱなしのキーリピートでは on_press を繰り返さないこと。"""
+        on_press = MagicMock()
+        listener = HotkeyListener(hotkey_key="alt_r", on_press=on_press, on_release=MagicMock())
+        key = self._make_key("alt_r")
+
+        listener._handle_press(key)
+        listener._handle_press(key)
+        listener._handle_press(key)
+
+        on_press.assert_called_once()
+        assert listener.ignored_repeats == 2
+
+    def test_chatter_after_release_is_ignored(self) -> None:
+        """離した直後の押下とその離放を無視すること。"""
+        clock = VirtualClock()
+        on_press = MagicMock()
+        on_release = MagicMock()
+        listener = HotkeyListener(
+            hotkey_key="alt_r", on_press=on_press, on_release=on_release, clock=clock
+        )
+        key = self._make_key("alt_r")
+
+        listener._handle_press(key)
+        clock.advance(1.0)
+        listener._handle_release(key)
+        clock.advance(0.01)
+        listener._handle_press(key)
+        listener._handle_release(key)
+
+        assert on_press.call_count == 1
+        assert on_release.call_count == 1
+        assert listener.ignored_chatter == 1
+
+    def test_press_after_debounce_is_accepted(self) -> None:
+        """debounce を過ぎた押下は受け付けること。"""
+        clock = VirtualClock()
+        on_press = MagicMock()
+        listener = HotkeyListener(
+            hotkey_key="alt_r", on_press=on_press, on_release=MagicMock(), clock=clock
+        )
+        key = self._make_key("alt_r")
+
+        listener._handle_press(key)
+        listener._handle_release(key)
+        clock.advance(HotkeyListener.DEBOUNCE)
+        listener._handle_press(key)
+
+        assert on_press.call_count == 2
+        assert listener.ignored_chatter == 0
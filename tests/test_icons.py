@@ -62,3 +62,23 @@ def test_get_icon_title_returns_correct_icon_for_each_state() -> None:
     for state_name, expected_icon in icons.ICON_TEXTS.items():
         result = icons.get_icon_title(FakeState(state_name))
         assert result == expected_icon, f"{state_name} のアイコンが一致しない"
+
+
+def test_level_title_silence_is_lowest_bar() -> None:
+    """無音の入力レベルは最小のバーで表示する。"""
+    assert icons.get_level_title(0.0, 0.0) == icons.ICON_TEXTS["RECORDING"] + icons.LEVEL_BARS[0]
+
+
+def test_level_title_grows_with_rms() -> None:
+    """RMS が大きいほど高いバーで表示する。"""
+    bars = [icons.get_level_title(rms, rms)[-1] for rms in (30.0, 300.0, 3000.0, 30000.0)]
+    assert [icons.LEVEL_BARS.index(bar) for bar in bars] == sorted(
+        icons.LEVEL_BARS.index(bar) for bar in bars
+    )
+    assert len(set(bars)) == 4
+
+
+def test_level_title_marks_clipping() -> None:
+    """ピークがフルスケールに達した場合は音割れの印を付ける。"""
+    assert icons.get_level_title(20000.0, 32767.0).endswith(icons.LEVEL_CLIP)
+    assert not icons.get_level_title(20000.0, 30000.0).endswith(icons.LEVEL_CLIP)
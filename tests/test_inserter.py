@@ -0,0 +1,100 @@
+"""inserter モジュールのテスト。"""
+
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from speakdrop.clock import VirtualClock
+from speakdrop.fake_inserter import FakeClipboardInserter, FakeKeystrokeInserter
+from speakdrop.inserter import PASTE, TYPE, create_inserter, graphemes, tail_edit
+
+
+class TestTailEdit:
+    """tail_edit() のテスト（下書き置き換えの最小編集）。"""
+
+    def test_identical_text_needs_no_edit(self) -> None:
+        """同一テキストは編集不要であること。"""
+        assert tail_edit("こんにちは", "こんにちは") == (0, "")
+
+    def test_appends_only_when_prefix_matches(self) -> None:
+        """下書きが最終結果の接頭辞なら追記のみであること。"""
+        assert tail_edit("こんにちは", "こんにちは。") == (0, "。")
+
+    def test_deletes_after_common_prefix(self) -> None:
+        """共通接頭辞より後ろを削除して打ち直すこと。"""
+        assert tail_edit("今日わ晴れ", "今日は晴れ。") == (3, "は晴れ。")
+
+    def test_replace_with_empty(self) -> None:
+        """空文字への置き換えは全削除であること。"""
+        assert tail_edit("あいう", "") == (3, "")
+
+    def test_counts_backspaces_per_grapheme(self) -> None:
+        """結合文字・絵文字の連結は1文字（バックスペース1回）として数えること。"""
+        assert tail_edit("了解👍🏽", "了解。") == (1, "。")
+        assert tail_edit("家族👨\u200d👩\u200d👧", "家族") == (1, "")
+        assert tail_edit("🇯🇵🇺🇸", "🇯🇵") == (1, "")
+
+    def test_combining_mark_change_retypes_whole_character(self) -> None:
+        """結合文字だけが異なる場合も基底文字ごと打ち直すこと。"""
+        assert tail_edit("cafe\u0301", "cafe") == (1, "e")
+        assert tail_edit("か", "か\u3099") == (1, "か\u3099")
+
+
+class TestGraphemes:
+    """graphemes() のテスト（書記素クラスタへの分割）。"""
+
+    @pytest.mark.parametrize(
+        ("text", "expected"),
+        [
+            ("あいう", ["あ", "い", "う"]),
+            ("e\u0301a", ["e\u0301", "a"]),
+            ("👍🏽x", ["👍🏽", "x"]),
+            ("👨\u200d👩\u200d👧", ["👨\u200d👩\u200d👧"]),
+            ("🇯🇵🇺🇸", ["🇯🇵", "🇺🇸"]),
+            ("☕\ufe0f", ["☕\ufe0f"]),
+            ("ｶﾞ", ["ｶﾞ"]),
+            ("\r\nA", ["\r\n", "A"]),
+            ("", []),
+        ],
+    )
+    def test_clusters(self, text: str, expected: list[str]) -> None:
+        """バックスペース1回で削除される単位に分割すること。"""
+        assert graphemes(text) == expected
+
+
+class TestCreateInserter:
+    """create_inserter() のテスト。"""
+
+    def test_fake_backend(self) -> None:
+        """backend="fake" ではフェイクの挿入バックエンドを返すこと。"""
+        clock = VirtualClock()
+
+        assert isinstance(create_inserter(PASTE, clock, backend="fake"), FakeClipboardInserter)
+        assert isinstance(create_inserter(TYPE, clock, backend="fake"), FakeKeystrokeInserter)
+
+    def test_auto_uses_fake_outside_macos(self) -> None:
+        """macOS 以外では backend="auto" がフェイクを選ぶこと。"""
+        with patch.object(sys, "platform", "linux"):
+            inserter = create_inserter(PASTE, VirtualClock())
+
+        assert isinstance(inserter, FakeClipboardInserter)
+
+    def test_macos_backend(self) -> None:
+        """backend="macos" では ClipboardInserter / KeystrokeInserter を返すこと。"""
+        for name in ("AppKit", "Cocoa", "Quartz", "Quartz.CoreGraphics"):
+            sys.modules.setdefault(name, MagicMock())
+        from speakdrop.clipboard_inserter import ClipboardInserter
+        from speakdrop.keystroke_inserter import KeystrokeInserter
+
+        clock = VirtualClock()
+
+        assert isinstance(create_inserter(PASTE, clock, backend="macos"), ClipboardInserter)
+        assert isinstance(create_inserter(TYPE, clock, backend="macos"), KeystrokeInserter)
+
+    def test_unknown_method_raises(self) -> None:
+        """不明な挿入方法・バックエンドは ValueError になること。"""
+        with pytest.raises(ValueError):
+            create_inserter("drag", VirtualClock())
+        with pytest.raises(ValueError):
+            create_inserter(PASTE, VirtualClock(), backend="windows")
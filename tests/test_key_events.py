@@ -0,0 +1,54 @@
+"""key_events モジュールのテスト。"""
+
+import sys
+from unittest.mock import MagicMock, call, patch
+
+sys.modules.setdefault("Quartz", MagicMock())
+sys.modules.setdefault("Quartz.CoreGraphics", sys.modules["Quartz"])
+
+from speakdrop.key_events import KEY_DELETE, KEY_V, post_backspaces, post_key  # noqa: E402
+
+
+@patch("speakdrop.key_events.CGEventSetFlags")
+@patch("speakdrop.key_events.CGEventPost")
+@patch("speakdrop.key_events.CGEventCreateKeyboardEvent")
+class TestKeyEvents:
+    """post_key() / post_backspaces() のテスト。"""
+
+    def test_post_key_sends_down_and_up(
+        self, mock_create: MagicMock, mock_post: MagicMock, mock_set_flags: MagicMock
+    ) -> None:
+        """キーダウン・キーアップの順に送信し、修飾なしではフラグを設定しないこと。"""
+        post_key(KEY_DELETE)
+
+        assert mock_create.call_args_list == [
+            call(None, KEY_DELETE, True),
+            call(None, KEY_DELETE, False),
+        ]
+        assert mock_post.call_count == 2
+        mock_set_flags.assert_not_called()
+
+    def test_post_key_with_flags(
+        self, mock_create: MagicMock, mock_post: MagicMock, mock_set_flags: MagicMock
+    ) -> None:
+        """修飾キーのフラグをキーダウン・キーアップの両方に設定すること（Cmd+V）。"""
+        post_key(KEY_V, 0x100000)
+
+        assert mock_set_flags.call_args_list == [call(mock_create.return_value, 0x100000)] * 2
+
+    def test_post_backspaces(
+        self, mock_create: MagicMock, mock_post: MagicMock, mock_set_flags: MagicMock
+    ) -> None:
+        """バックスペースを count 回（キーダウン・キーアップの組で）送信すること。"""
+        post_backspaces(3)
+
+        assert [c.args[1] for c in mock_create.call_args_list] == [KEY_DELETE] * 6
+        assert mock_post.call_count == 6
+
+    def test_post_zero_backspaces(
+        self, mock_create: MagicMock, mock_post: MagicMock, mock_set_flags: MagicMock
+    ) -> None:
+        """0 回の場合は何も送信しないこと。"""
+        post_backspaces(0)
+
+        mock_post.assert_not_called()
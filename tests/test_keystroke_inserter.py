@@ -0,0 +1,72 @@
+"""KeystrokeInserter モジュールのテスト。"""
+
+import sys
+from unittest.mock import MagicMock, patch
+
+sys.modules.setdefault("Quartz", MagicMock())
+sys.modules.setdefault("Quartz.CoreGraphics", sys.modules["Quartz"])
+sys.modules.setdefault("AppKit", MagicMock())
+sys.modules.setdefault("Cocoa", MagicMock())
+
+from speakdrop.clock import VirtualClock  # noqa: E402
+from speakdrop.inserter import split_utf16, utf16_length  # noqa: E402
+from speakdrop.keystroke_inserter import KeystrokeInserter  # noqa: E402
+
+
+class TestSplitUtf16:
+    """split_utf16() のテスト。"""
+
+    def test_splits_at_max_units(self) -> None:
+        """UTF-16 のコード単位数が上限以下のチャンクに分割すること。"""
+        assert split_utf16("あいうえおかきくけ", 4) == ["あいうえ", "おかきく", "け"]
+
+    def test_does_not_split_surrogate_pairs(self) -> None:
+        """サロゲートペアの文字はチャンクをまたがないこと。"""
+        chunks = split_utf16("あ😀い", 2)
+
+        assert chunks == ["あ", "😀", "い"]
+        assert all(utf16_length(chunk) <= 2 for chunk in chunks)
+
+    def test_empty_text(self) -> None:
+        """空文字列はチャンクなしになること。"""
+        assert split_utf16("", 20) == []
+
+
+@patch("speakdrop.keystroke_inserter.CGEventPost")
+@patch("speakdrop.keystroke_inserter.CGEventKeyboardSetUnicodeString")
+@patch("speakdrop.keystroke_inserter.CGEventCreateKeyboardEvent")
+class TestKeystrokeInserter:
+    """KeystrokeInserter のテスト。"""
+
+    def test_insert_posts_chunked_unicode_events(
+        self, mock_create: MagicMock, mock_set_string: MagicMock, mock_post: MagicMock
+    ) -> None:
+        """テキストをチャンクごとにキーダウン・キーアップの2イベントで送信すること。"""
+        text = "あ" * (KeystrokeInserter.MAX_CHUNK_UNITS + 5)
+
+        KeystrokeInserter(clock=VirtualClock()).insert(text)
+
+        strings = [c.args[2] for c in mock_set_string.call_args_list]
+        assert strings == ["あ" * 20, "あ" * 20, "あ" * 5, "あ" * 5]
+        assert mock_set_string.call_args_list[0].args[1] == 20
+        assert mock_post.call_count == 4
+
+    def test_insert_waits_between_chunks(
+        self, mock_create: MagicMock, mock_set_string: MagicMock, mock_post: MagicMock
+    ) -> None:
+        """チャンク間で CHUNK_INTERVAL だけ待つこと。"""
+        clock = VirtualClock()
+
+        KeystrokeInserter(clock=clock).insert("あ" * 45)
+
+        assert clock.monotonic() == 2 * KeystrokeInserter.CHUNK_INTERVAL
+
+    def test_replace_sends_backspaces_and_types_suffix(
+        self, mock_create: MagicMock, mock_set_string: MagicMock, mock_post: MagicMock
+    ) -> None:
+        """共通接頭辞より後ろをバックスペースで消して残りを入力すること。"""
+        with patch("speakdrop.keystroke_inserter.post_backspaces") as mock_backspaces:
+            KeystrokeInserter(clock=VirtualClock()).replace("今日わ", "今日は。")
+
+        mock_backspaces.assert_called_once_with(1)
+        assert [c.args[2] for c in mock_set_string.call_args_list] == ["は。", "は。"]
@@ -0,0 +1,122 @@
+"""lazy モジュールのテストと import 時間の回帰テスト。"""
+
+import subprocess
+import sys
+from importlib.machinery import PathFinder
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from speakdrop.lazy import LazyModule, lazy_module, preload
+
+# 起動経路で import してはならない重い依存
+HEAVY_MODULES = ("numpy", "faster_whisper", "ctranslate2", "ollama", "httpx", "sounddevice")
+
+# PyObjC なしで import できる起動経路のモジュール
+HEADLESS_MODULES = (
+    "speakdrop.transcriber",
+    "speakdrop.text_processor",
+    "speakdrop.audio_recorder",
+    "speakdrop.endpoint",
+    "speakdrop.session_replay",
+    "speakdrop.transcription_server",
+)
+
+# import 時間の上限（ミリ秒）。重い依存を読み込まなければ数十ミリ秒で終わる
+HEADLESS_BUDGET_MS = 150
+APP_BUDGET_MS = 500  # rumps・PyObjC を含むメニューバーアプリ全体
+
+
+def _import_profile(*modules: str) -> dict[str, float]:
+    """新しいインタープリタで modules を import し、モジュールごとの累積 import 時間（ms）を返す。
+
+    python -X importtime の出力（import time: self [us] | cumulative | imported package）を
+    解析する。
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {', '.join(modules)}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=Path(__file__).parent.parent,
+    )
+    profile: dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            profile[name.strip()] = int(cumulative) / 1000
+    return profile
+
+
+class TestLazyModule:
+    """LazyModule のテスト。"""
+
+    def test_imports_on_first_attribute_access(self) -> None:
+        """属性への初回アクセスまで import しないこと。"""
+        module = LazyModule("json")
+
+        assert not module.loaded
+        assert module.dumps([1]) == "[1]"
+        assert module.loaded
+
+    def test_returns_loaded_module(self) -> None:
+        """読み込み済みのモジュールはそのまま返すこと。"""
+        assert lazy_module("sys") is sys
+
+    def test_missing_module_error_is_deferred(self) -> None:
+        """存在しないモジュールの ImportError は初回アクセス時に送出されること。"""
+        module = lazy_module("speakdrop_no_such_module")
+
+        with pytest.raises(ImportError):
+            module.anything  # noqa: B018
+
+    def test_patch_overrides_attribute(self) -> None:
+        """unittest.mock.patch で差し替えた属性が実体より優先されること。"""
+        module = LazyModule("json")
+        mock_dumps = MagicMock(return_value="patched")
+
+        with patch.object(module, "dumps", mock_dumps):
+            assert module.dumps([1]) == "patched"
+        assert module.dumps([1]) == "[1]"
+
+    def test_preload_imports_immediately(self) -> None:
+        """preload() で属性へのアクセス前に読み込めること。"""
+        module = LazyModule("json")
+
+        preload(module)
+
+        assert module.loaded
+
+    def test_preload_accepts_loaded_module(self) -> None:
+        """読み込み済みのモジュールを渡しても何もしないこと。"""
+        preload(sys)
+
+
+class TestImportTime:
+    """起動経路の import 時間の回帰テスト。"""
+
+    def test_headless_modules_do_not_import_heavy_dependencies(self) -> None:
+        """起動経路のモジュールが重い依存を import しないこと。"""
+        profile = _import_profile(*HEADLESS_MODULES)
+
+        assert [name for name in HEAVY_MODULES if name in profile] == []
+
+    def test_headless_modules_within_budget(self) -> None:
+        """起動経路のモジュールの import 時間が HEADLESS_BUDGET_MS 以内であること。"""
+        profile = _import_profile(*HEADLESS_MODULES)
+
+        total = sum(profile[name] for name in HEADLESS_MODULES if name in profile)
+        assert total < HEADLESS_BUDGET_MS
+
+    @pytest.mark.skipif(
+        PathFinder.find_spec("rumps") is None, reason="rumps（macOS）がインストールされていない"
+    )
+    def test_app_within_budget(self) -> None:
+        """speakdrop.app の import が重い依存なしで APP_BUDGET_MS 以内に終わること。"""
+        profile = _import_profile("speakdrop.app")
+
+        assert [name for name in HEAVY_MODULES if name in profile] == []
+        assert profile["speakdrop.app"] < APP_BUDGET_MS
@@ -0,0 +1,66 @@
+"""log モジュールのテスト。"""
+
+import logging
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from speakdrop.log import setup_logging
+
+
+@pytest.fixture(autouse=True)
+def _restore_logger() -> Iterator[logging.Logger]:
+    """テストで追加したハンドラーを外し、speakdrop のロガーを元に戻す。"""
+    logger = logging.getLogger("speakdrop")
+    handlers, level = list(logger.handlers), logger.level
+    logger.handlers.clear()
+    yield logger
+    for handler in logger.handlers:
+        handler.close()
+    logger.handlers[:] = handlers
+    logger.setLevel(level)
+
+
+class TestSetupLogging:
+    """setup_logging() のテスト。"""
+
+    def test_tier_changes_are_written_to_file(self, tmp_path: Path) -> None:
+        """品質段階の変更（INFO）がログファイルに書き出されること。"""
+        from speakdrop.slo import TIERS, SloController
+
+        path = tmp_path / "logs" / "speakdrop.log"
+        setup_logging(path)
+
+        SloController(TIERS).observe({"transcribe": 10.0})
+
+        assert "品質段階を full から short_llm に変更しました" in path.read_text(encoding="utf-8")
+
+    def test_debug_is_not_written(self, tmp_path: Path) -> None:
+        """既定では DEBUG のログを書き出さないこと。"""
+        path = tmp_path / "speakdrop.log"
+        setup_logging(path)
+
+        logging.getLogger("speakdrop.slo").debug("詳細")
+
+        assert "詳細" not in path.read_text(encoding="utf-8")
+
+    def test_second_call_does_not_add_handlers(self, tmp_path: Path) -> None:
+        """2回呼んでもハンドラーを重複して追加しないこと。"""
+        setup_logging(tmp_path / "speakdrop.log")
+        count = len(logging.getLogger("speakdrop").handlers)
+
+        setup_logging(tmp_path / "other.log")
+
+        assert len(logging.getLogger("speakdrop").handlers) == count
+
+    def test_unwritable_path_falls_back_to_stderr(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """ログファイルを開けない場合は標準エラー出力にのみ出力すること。"""
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+
+        setup_logging(blocker / "speakdrop.log")
+
+        assert "ログファイルを開けない" in capsys.readouterr().err
@@ -1,16 +1,26 @@
 """tests/test_main.py - __main__.py のテスト。"""
 
+from collections.abc import Iterator
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 from speakdrop.__main__ import main
 
 
+@pytest.fixture(autouse=True)
+def _no_log_file() -> Iterator[MagicMock]:
+    """ユーザーの設定ディレクトリにログファイルを作らない。"""
+    with patch("speakdrop.__main__.setup_logging") as mock_setup:
+        yield mock_setup
+
+
 class TestMain:
     """main() 関数のテスト。"""
 
     def test_main_initializes_speakdrop_app(self) -> None:
         """main() が SpeakDropApp を初期化することを確認する。"""
-        with patch("speakdrop.__main__.SpeakDropApp") as mock_app_class:
+        with patch("speakdrop.app.SpeakDropApp") as mock_app_class:
             mock_app = MagicMock()
             mock_app_class.return_value = mock_app
 
@@ -20,7 +30,7 @@ class TestMain:
 
     def test_main_does_not_call_check_permissions_explicitly(self) -> None:
         """main() が check_permissions() を明示的に呼ばないことを確認する（SpeakDropApp.__init__ 内で処理される）。"""
-        with patch("speakdrop.__main__.SpeakDropApp") as mock_app_class:
+        with patch("speakdrop.app.SpeakDropApp") as mock_app_class:
             mock_app = MagicMock()
             mock_app_class.return_value = mock_app
 
@@ -30,10 +40,30 @@ class TestMain:
 
     def test_main_calls_run(self) -> None:
         """main() が run() を呼ぶことを確認する。"""
-        with patch("speakdrop.__main__.SpeakDropApp") as mock_app_class:
+        with patch("speakdrop.app.SpeakDropApp") as mock_app_class:
             mock_app = MagicMock()
             mock_app_class.return_value = mock_app
 
             main()
 
             mock_app.run.assert_called_once()
+
+    def test_main_dispatches_subcommand(self) -> None:
+        """第1引数がサブコマンドの場合はそのコマンドを実行し、アプリを起動しないことを確認する。"""
+        with (
+            patch("speakdrop.app.SpeakDropApp") as mock_app_class,
+            patch("speakdrop.bench_whisper.main", return_value=0) as mock_bench,
+            pytest.raises(SystemExit) as exc_info,
+        ):
+            main(["bench-whisper", "--dry-run"])
+
+        mock_bench.assert_called_once_with(["--dry-run"])
+        assert exc_info.value.code == 0
+        mock_app_class.assert_not_called()
+
+    def test_main_sets_up_logging(self, _no_log_file: MagicMock) -> None:
+        """アプリの起動前にログ出力を設定することを確認する。"""
+        with patch("speakdrop.app.SpeakDropApp"):
+            main()
+
+        _no_log_file.assert_called_once_with()
@@ -0,0 +1,40 @@
+"""metrics モジュールのテスト。"""
+
+from speakdrop.metrics import RollingStats
+
+
+class TestRollingStats:
+    """RollingStats のテスト。"""
+
+    def test_empty_returns_none(self) -> None:
+        """計測値が無い場合は None を返すこと。"""
+        stats = RollingStats()
+        assert stats.mean() is None
+        assert stats.percentile(95) is None
+        assert len(stats) == 0
+
+    def test_mean_and_percentile(self) -> None:
+        """平均値とパーセンタイルを計算できること。"""
+        stats = RollingStats()
+        for value in [1.0, 2.0, 3.0, 4.0]:
+            stats.add(value)
+
+        assert stats.mean() == 2.5
+        assert stats.percentile(50) == 2.0
+        assert stats.percentile(95) == 4.0
+
+    def test_keeps_only_recent_values(self) -> None:
+        """maxlen を超えた古い値は破棄されること。"""
+        stats = RollingStats(maxlen=2)
+        for value in [10.0, 1.0, 3.0]:
+            stats.add(value)
+
+        assert len(stats) == 2
+        assert stats.mean() == 2.0
+
+    def test_clear(self) -> None:
+        """clear() で全ての値を破棄すること。"""
+        stats = RollingStats()
+        stats.add(1.0)
+        stats.clear()
+        assert stats.mean() is None
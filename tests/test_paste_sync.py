@@ -0,0 +1,99 @@
+"""paste_sync モジュールのテスト。"""
+
+import pytest
+
+from speakdrop.clock import VirtualClock
+from speakdrop.paste_sync import FakePasteboard, PasteSession, PasteSync, RestoreAction
+
+
+class TestPasteSyncWaitForWrite:
+    """書き込みの反映待ちのテスト。"""
+
+    def test_returns_immediately_when_visible(self) -> None:
+        """書き込みが反映済みなら待たずに True を返すこと。"""
+        clock = VirtualClock()
+        pasteboard = FakePasteboard(clock)
+        count = pasteboard.write_text("テスト", lambda: None)
+
+        assert PasteSync(clock).wait_for_write(pasteboard, count)
+        assert clock.monotonic() == 0.0
+
+    def test_gives_up_after_write_timeout(self) -> None:
+        """反映されないまま WRITE_TIMEOUT を過ぎたら False を返すこと。"""
+        clock = VirtualClock()
+        pasteboard = FakePasteboard(clock, write_latency=1.0)
+        count = pasteboard.write_text("テスト", lambda: None)
+
+        assert not PasteSync(clock).wait_for_write(pasteboard, count)
+        assert clock.monotonic() == pytest.approx(
+            PasteSync.WRITE_TIMEOUT, abs=PasteSync.POLL_INTERVAL
+        )
+
+
+class TestPasteSyncPoll:
+    """復元タイミングの判定のテスト。"""
+
+    def test_waits_for_margin_after_read(self) -> None:
+        """読み取りの後 READ_MARGIN が経過するまで待ち、その後復元すること。"""
+        clock = VirtualClock()
+        sync = PasteSync(clock)
+        session = PasteSession("app", change_count=1, pasted_at=0.0, read_at=0.2)
+
+        clock.advance(0.2)
+        assert sync.poll(session, 1) is RestoreAction.WAIT
+        clock.advance(PasteSync.READ_MARGIN)
+        assert sync.poll(session, 1) is RestoreAction.RESTORE
+        assert sync.stats()["app"].read_delay_p95 == pytest.approx(0.2)
+
+    def test_abandons_when_changed_by_other_app(self) -> None:
+        """changeCount が変わっていたら復元を中止すること。"""
+        sync = PasteSync(VirtualClock())
+
+        assert sync.poll(PasteSession("app", change_count=1), 2) is RestoreAction.ABANDON
+
+    def test_restore_timeout_is_learned_per_app(self) -> None:
+        """読み取り遅延を学習したアプリは上限時間が p95 に応じて変わること。"""
+        clock = VirtualClock()
+        sync = PasteSync(clock)
+        for _ in range(3):
+            session = PasteSession("fast", change_count=1, pasted_at=clock.monotonic())
+            session.read_at = clock.monotonic() + 0.05
+            clock.advance(0.05 + PasteSync.READ_MARGIN)
+            assert sync.poll(session, 1) is RestoreAction.RESTORE
+
+        assert sync.restore_timeout("fast") == pytest.approx(0.05 * PasteSync.TIMEOUT_FACTOR)
+        assert sync.restore_timeout("unknown") == PasteSync.DEFAULT_RESTORE_TIMEOUT
+
+    def test_restore_timeout_is_bounded(self) -> None:
+        """学習した上限時間は MIN〜MAX_RESTORE_TIMEOUT に収まること。"""
+        clock = VirtualClock()
+        sync = PasteSync(clock)
+        session = PasteSession("slow", change_count=1, pasted_at=0.0, read_at=5.0)
+        clock.advance(5.0 + PasteSync.READ_MARGIN)
+        sync.poll(session, 1)
+
+        assert sync.restore_timeout("slow") == PasteSync.MAX_RESTORE_TIMEOUT
+
+    def test_counts_timeouts(self) -> None:
+        """読み取りを検出できずに上限時間で復元した回数を数えること。"""
+        clock = VirtualClock()
+        sync = PasteSync(clock)
+        session = PasteSession("app", change_count=1)
+
+        clock.advance(PasteSync.DEFAULT_RESTORE_TIMEOUT)
+
+        assert sync.poll(session, 1) is RestoreAction.RESTORE
+        assert sync.stats()["app"].timeouts == 1
+
+
+class TestFakePasteboardStats:
+    """FakePasteboard の退避の計測値のテスト。"""
+
+    def test_snapshot_records_bytes(self) -> None:
+        """退避した内容のバイト数を記録すること。"""
+        pasteboard = FakePasteboard(VirtualClock(), contents="あいう")
+
+        pasteboard.snapshot()
+
+        assert pasteboard.stats.snapshots == 1
+        assert pasteboard.stats.last_bytes == 9
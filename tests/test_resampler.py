@@ -0,0 +1,72 @@
+"""StreamingResampler モジュールのテスト。"""
+
+import numpy as np
+import pytest
+
+from speakdrop.resampler import StreamingResampler, polyphase_taps
+
+
+def _tone(freq: float, rate: int, seconds: float = 1.0, amplitude: float = 8000.0) -> np.ndarray:
+    t = np.arange(int(rate * seconds)) / rate
+    return (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.int16)
+
+
+def _resample(rate: int, audio: np.ndarray, blocks: int = 1) -> np.ndarray:
+    resampler = StreamingResampler(rate)
+    out = [resampler.process(block) for block in np.array_split(audio, blocks)]
+    return np.concatenate([*out, resampler.flush()])
+
+
+class TestPolyphaseTaps:
+    """フィルタ係数のテスト。"""
+
+    def test_cached_per_ratio(self) -> None:
+        """同じ変換比の係数はキャッシュを共有すること。"""
+        assert polyphase_taps(1, 3)[0] is polyphase_taps(1, 3)[0]
+
+    def test_read_only(self) -> None:
+        """共有する係数は書き換えられないこと。"""
+        phases, _ = polyphase_taps(160, 441)
+        assert phases.shape[0] == 160
+        with pytest.raises(ValueError):
+            phases[0, 0] = 0.0
+
+
+class TestStreamingResampler:
+    """StreamingResampler の変換テスト。"""
+
+    @pytest.mark.parametrize("rate", [48000, 44100, 22050, 96000])
+    def test_output_length(self, rate: int) -> None:
+        """flush() まで含めた出力の長さが入力の長さ × 16000 / rate（切り上げ）であること。"""
+        audio = np.zeros(rate + 7, dtype=np.int16)
+        assert len(_resample(rate, audio)) == -(-(rate + 7) * 16000 // rate)
+
+    def test_same_rate_passthrough(self) -> None:
+        """入力が 16kHz の場合は変換せずにそのまま返すこと。"""
+        audio = _tone(440, 16000)
+        resampler = StreamingResampler(16000)
+
+        assert resampler.passthrough
+        assert resampler.process(audio) is audio
+        assert len(resampler.flush()) == 0
+
+    @pytest.mark.parametrize("rate", [48000, 44100])
+    def test_block_boundaries_do_not_matter(self, rate: int) -> None:
+        """ブロックの区切り方によらず、まとめて変換した場合と同じ結果になること。"""
+        audio = _tone(440, rate)
+
+        assert np.array_equal(_resample(rate, audio, blocks=1), _resample(rate, audio, blocks=97))
+
+    @pytest.mark.parametrize("rate", [48000, 44100])
+    def test_passband_tone_preserved(self, rate: int) -> None:
+        """通過域の音は遅延なく振幅を保って変換されること。"""
+        out = _resample(rate, _tone(440, rate)).astype(np.float64)
+        expected = 8000.0 * np.sin(2 * np.pi * 440 * np.arange(len(out)) / 16000)
+
+        assert np.abs(out[500:-500] - expected[500:-500]).max() < 20
+
+    def test_aliasing_suppressed(self) -> None:
+        """16kHz のナイキスト周波数を超える音は折り返さずに減衰すること。"""
+        out = _resample(48000, _tone(12000, 48000))[500:-500].astype(np.float64)
+
+        assert np.sqrt(np.mean(out**2)) < 8000.0 * 0.01  # -40 dB 以下
@@ -0,0 +1,110 @@
+"""segment_pipeline モジュールのテスト。"""
+
+import threading
+from concurrent.futures import Future
+from unittest.mock import MagicMock
+
+import pytest
+
+from speakdrop.segment_pipeline import InlineExecutor, SegmentPipeline, is_unit_complete
+
+
+class TestIsUnitComplete:
+    """1単位の判定のテスト。"""
+
+    def test_complete_at_unit_chars(self) -> None:
+        """unit_chars 文字に達したら投入すること。"""
+        assert is_unit_complete("あいうえ", 4)
+        assert not is_unit_complete("あいう", 4)
+
+    def test_complete_at_sentence_end(self) -> None:
+        """unit_chars の半分以上で文末記号で終わる場合も投入すること。"""
+        assert is_unit_complete("あい。", 6)
+        assert not is_unit_complete("あ。", 6)
+
+    def test_disabled(self) -> None:
+        """unit_chars が 0 の場合は投入しないこと。"""
+        assert not is_unit_complete("あ" * 100, 0)
+
+
+class TestSegmentPipeline:
+    """SegmentPipeline のテスト。"""
+
+    def test_reassembles_units_in_order(self) -> None:
+        """単位ごとの整形結果を投入順に連結すること。"""
+        pipeline = SegmentPipeline(lambda text: f"[{text}]", unit_chars=2)
+
+        for segment in ("あい", "う", "えお"):
+            pipeline.feed(segment)
+
+        assert pipeline.finish("あいうえお") == "[あい][うえお]"
+
+    def test_processes_while_decoding(self) -> None:
+        """最初の単位の整形が後続セグメントの受け取り前に始まること。"""
+        started = threading.Event()
+
+        def process(text: str) -> str:
+            started.set()
+            return text
+
+        pipeline = SegmentPipeline(process, unit_chars=2)
+        pipeline.feed("あい")
+
+        assert started.wait(1.0)
+        pipeline.feed("うえ")
+        assert pipeline.finish("あいうえ") == "あいうえ"
+
+    def test_processes_unfed_text(self) -> None:
+        """セグメントを通知しない場合は finish() で全文を1単位として整形すること。"""
+        process = MagicMock(side_effect=lambda text: text + "。")
+        pipeline = SegmentPipeline(process, unit_chars=2, executor=InlineExecutor())
+
+        assert pipeline.finish("あいうえお") == "あいうえお。"
+        process.assert_called_once_with("あいうえお")
+
+    def test_restarts_on_mismatch(self) -> None:
+        """受け取ったセグメントが全文と一致しない場合は全文を整形し直すこと。"""
+        process = MagicMock(side_effect=lambda text: text)
+        pipeline = SegmentPipeline(process, unit_chars=2, executor=InlineExecutor())
+
+        pipeline.feed("かき")
+
+        assert pipeline.finish("あいう") == "あいう"
+        assert process.call_args.args == ("あいう",)
+
+    def test_skips_blank_units(self) -> None:
+        """空白だけの単位は整形しないこと。"""
+        process = MagicMock()
+        pipeline = SegmentPipeline(process, unit_chars=2, executor=InlineExecutor())
+
+        assert pipeline.finish("  ") == "  "
+        process.assert_not_called()
+
+    def test_propagates_errors(self) -> None:
+        """整形の例外を finish() で送出すること。"""
+        pipeline = SegmentPipeline(
+            MagicMock(side_effect=RuntimeError("失敗")), unit_chars=2, executor=InlineExecutor()
+        )
+
+        with pytest.raises(RuntimeError):
+            pipeline.finish("あいう")
+
+    def test_submits_through_submit_function(self) -> None:
+        """submit を指定した場合は process の代わりに submit で投入すること（空白の単位は除く）。"""
+        process = MagicMock()
+        submitted: list[str] = []
+
+        def submit(text: str) -> Future[str]:
+            submitted.append(text)
+            future: Future[str] = Future()
+            future.set_result(f"[{text}]")
+            return future
+
+        pipeline = SegmentPipeline(process, unit_chars=2, executor=InlineExecutor(), submit=submit)
+        pipeline.feed("あい")
+
+        assert pipeline.finish("あいうえ") == "[あい][うえ]"
+        blank = SegmentPipeline(process, unit_chars=2, executor=InlineExecutor(), submit=submit)
+        assert blank.finish("  ") == "  "
+        assert submitted == ["あい", "うえ"]
+        process.assert_not_called()
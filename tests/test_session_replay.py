@@ -0,0 +1,72 @@
+"""session_replay モジュールのテスト（セッションファイルの記録と読み込み）。
+
+SpeakDropApp への再生は tests/test_app.py の TestSessionReplay で検証する。
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from speakdrop.clock import VirtualClock
+from speakdrop.session_replay import EventKind, SessionRecorder, load_session
+
+
+class TestSessionRecorder:
+    """SessionRecorder と load_session() のテスト。"""
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        """記録したイベントを時刻・内容とも同じに読み込めること。"""
+        clock = VirtualClock(start=100.0)
+        path = tmp_path / "s.sdsession"
+        recorder = SessionRecorder(path, clock=clock)
+        recorder.record_press()
+        recorder.record_state("RECORDING")
+        clock.advance(0.5)
+        recorder.record_audio(np.arange(160, dtype=np.int16))
+        clock.advance(0.5)
+        recorder.record_release()
+        recorder.close()
+
+        sample_rate, events = load_session(path)
+
+        assert sample_rate == 16000
+        assert [(e.kind, e.time) for e in events] == [
+            (EventKind.PRESS, 0.0),
+            (EventKind.STATE, 0.0),
+            (EventKind.AUDIO, 0.5),
+            (EventKind.RELEASE, 1.0),
+        ]
+        assert events[1].state == "RECORDING"
+        assert events[2].audio is not None
+        np.testing.assert_array_equal(events[2].audio, np.arange(160, dtype=np.int16))
+
+    def test_truncated_record_is_ignored(self, tmp_path: Path) -> None:
+        """書き込み途中のレコードは無視して読み込めること（異常終了時）。"""
+        path = tmp_path / "s.sdsession"
+        recorder = SessionRecorder(path, clock=VirtualClock())
+        recorder.record_press()
+        recorder.record_audio(np.zeros(160, dtype=np.int16))
+        recorder.close()
+        path.write_bytes(path.read_bytes()[:-10])
+
+        _, events = load_session(path)
+
+        assert [e.kind for e in events] == [EventKind.PRESS]
+
+    def test_record_after_close_is_ignored(self, tmp_path: Path) -> None:
+        """close() 後の記録は無視されること（終了処理中のコールバック対策）。"""
+        path = tmp_path / "s.sdsession"
+        recorder = SessionRecorder(path, clock=VirtualClock())
+        recorder.close()
+        recorder.record_press()
+
+        assert load_session(path)[1] == []
+
+    def test_invalid_file_raises(self, tmp_path: Path) -> None:
+        """セッションファイルでない場合は ValueError を送出すること。"""
+        path = tmp_path / "x.sdsession"
+        path.write_bytes(b"not a session")
+
+        with pytest.raises(ValueError):
+            load_session(path)
@@ -0,0 +1,97 @@
+"""slo モジュールのテスト。"""
+
+import logging
+
+import pytest
+
+from speakdrop.clock import VirtualClock
+from speakdrop.slo import TIERS, SloController, available_tiers
+
+
+class TestAvailableTiers:
+    """使用できる品質段階のテスト。"""
+
+    def test_all_tiers_with_fast_model(self) -> None:
+        """高速モデルがあれば全段階を使うこと。"""
+        assert available_tiers(True) == TIERS
+
+    def test_skips_fast_whisper_without_fast_model(self) -> None:
+        """高速モデルが無ければ高速認識の段階を除くこと。"""
+        assert [tier.name for tier in available_tiers(False)] == ["full", "short_llm", "no_llm"]
+
+
+class TestSloController:
+    """SloController のテスト。"""
+
+    def test_starts_at_full(self) -> None:
+        """最初は最高品質の段階であること。"""
+        assert SloController().tier.name == "full"
+
+    def test_steps_down_when_over_budget(self) -> None:
+        """負荷率が STEP_DOWN_RATIO を超えたら1段階下げること。"""
+        controller = SloController()
+
+        tier = controller.observe({"transcribe": 1.0, "postprocess": 2.9})
+
+        assert tier is not None
+        assert tier.name == "short_llm"
+        assert controller.tier == tier
+
+    def test_steps_down_one_tier_at_a_time(self) -> None:
+        """予算超過が続くと1段階ずつ最低の段階まで下げること。"""
+        controller = SloController()
+
+        names = [controller.observe({"transcribe": 9.0}) for _ in range(5)]
+
+        assert [t.name if t else None for t in names] == [
+            "short_llm",
+            "fast_whisper",
+            "no_llm",
+            None,
+            None,
+        ]
+
+    def test_keeps_tier_within_budget(self) -> None:
+        """予算内なら段階を変えないこと。"""
+        controller = SloController()
+
+        assert controller.observe({"transcribe": 3.0, "postprocess": 2.0}) is None
+        assert controller.tier.name == "full"
+
+    def test_steps_up_after_recovery(self) -> None:
+        """変更後 MIN_SAMPLES 件の負荷率が STEP_UP_RATIO 未満なら1段階上げること。"""
+        controller = SloController()
+        controller.observe({"transcribe": 9.0})
+
+        results = [
+            controller.observe({"transcribe": 1.0}) for _ in range(SloController.MIN_SAMPLES)
+        ]
+
+        assert results[:-1] == [None] * (SloController.MIN_SAMPLES - 1)
+        assert results[-1] is not None
+        assert controller.tier.name == "full"
+
+    def test_ignores_unknown_stage(self) -> None:
+        """予算の無い段階の計測値は無視すること。"""
+        controller = SloController()
+
+        assert controller.observe({"insert": 100.0}) is None
+        assert controller.pressure() == (0.0, None)
+
+    def test_records_and_logs_decisions(self, caplog: pytest.LogCaptureFixture) -> None:
+        """段階の変更を理由・時刻とともに記録し、ログに出力すること。"""
+        clock = VirtualClock(start=10.0)
+        controller = SloController(clock=clock)
+
+        with caplog.at_level(logging.INFO, logger="speakdrop.slo"):
+            controller.observe({"postprocess": 3.0})
+
+        decision = controller.decisions[-1]
+        assert (decision.at, decision.from_tier, decision.to_tier) == (10.0, "full", "short_llm")
+        assert "postprocess" in decision.reason
+        assert "short_llm" in caplog.text
+
+    def test_rejects_empty_tiers(self) -> None:
+        """品質段階が空の場合は ValueError を送出すること。"""
+        with pytest.raises(ValueError):
+            SloController(tiers=())
@@ -0,0 +1,166 @@
+"""StateMachine モジュールのテスト。"""
+
+import threading
+import time
+from itertools import pairwise
+
+import pytest
+
+from speakdrop.clock import VirtualClock
+from speakdrop.state_machine import (
+    TRANSITIONS,
+    AppState,
+    InvalidTransitionError,
+    StateMachine,
+)
+
+
+class TestTransitionTable:
+    """遷移表のテスト。"""
+
+    def test_every_state_has_entry(self) -> None:
+        """すべての状態に遷移先が宣言されていること。"""
+        assert set(TRANSITIONS) == set(AppState)
+
+    def test_idle_only_starts_recording(self) -> None:
+        """待機中からは録音にしか遷移できないこと。"""
+        assert TRANSITIONS[AppState.IDLE] == {AppState.RECORDING}
+
+
+class TestStateMachine:
+    """StateMachine の遷移テスト。"""
+
+    def test_transition_succeeds_from_expected_state(self) -> None:
+        """現在の状態が expected であれば遷移すること。"""
+        machine = StateMachine()
+
+        assert machine.transition(AppState.IDLE, AppState.RECORDING) is True
+        assert machine.state is AppState.RECORDING
+
+    def test_transition_rejected_from_other_state(self) -> None:
+        """現在の状態が expected と異なれば遷移せず False を返すこと。"""
+        machine = StateMachine()
+
+        assert machine.transition(AppState.RECORDING, AppState.PROCESSING) is False
+        assert machine.state is AppState.IDLE
+        assert machine.rejected == 1
+
+    def test_undeclared_transition_raises(self) -> None:
+        """遷移表に無い遷移は InvalidTransitionError になり、状態は変わらないこと。"""
+        machine = StateMachine()
+
+        with pytest.raises(InvalidTransitionError):
+            machine.transition(AppState.IDLE, AppState.PROCESSING)
+        assert machine.state is AppState.IDLE
+
+    def test_undeclared_transition_raises_from_other_state(self) -> None:
+        """現在の状態が expected と異なる場合も、遷移表に無い遷移は InvalidTransitionError になること。"""
+        machine = StateMachine()
+
+        with pytest.raises(InvalidTransitionError):
+            machine.transition(AppState.RECORDING, AppState.RECORDING)
+        assert machine.state is AppState.IDLE
+        assert machine.rejected == 0
+
+    def test_set_to_current_state_is_noop(self) -> None:
+        """set() で現在と同じ状態を指定した場合は何もしないこと。"""
+        machine = StateMachine()
+        listener: list[AppState] = []
+        machine.add_listener(lambda source, target: listener.append(target))
+
+        machine.set(AppState.IDLE)
+
+        assert listener == []
+        assert machine.transitions == 0
+
+    def test_listeners_and_event_log(self) -> None:
+        """遷移ごとにリスナーを呼び、時刻付きで記録すること。"""
+        clock = VirtualClock()
+        machine = StateMachine(clock=clock)
+        seen: list[tuple[AppState, AppState]] = []
+        machine.add_listener(lambda source, target: seen.append((source, target)))
+
+        machine.set(AppState.RECORDING)
+        clock.advance(1.0)
+        machine.set(AppState.PROCESSING)
+
+        assert seen == [
+            (AppState.IDLE, AppState.RECORDING),
+            (AppState.RECORDING, AppState.PROCESSING),
+        ]
+        assert [(e.time, e.target) for e in machine.events] == [
+            (0.0, AppState.RECORDING),
+            (1.0, AppState.PROCESSING),
+        ]
+
+    def test_event_log_is_bounded(self) -> None:
+        """記録は log_size 件までに抑えること。"""
+        machine = StateMachine(log_size=4)
+
+        for _ in range(10):
+            machine.set(AppState.RECORDING)
+            machine.set(AppState.IDLE)
+
+        assert len(machine.events) == 4
+        assert machine.transitions == 20
+
+    def test_listener_may_transition(self) -> None:
+        """リスナーの中から遷移してもデッドロックしないこと。"""
+        machine = StateMachine()
+
+        def rearm(source: AppState, target: AppState) -> None:
+            if target is AppState.IDLE:
+                machine.transition(AppState.IDLE, AppState.RECORDING)
+
+        machine.add_listener(rearm)
+        machine.set(AppState.RECORDING)
+        machine.set(AppState.IDLE)
+
+        assert machine.state is AppState.RECORDING
+
+
+class TestStateMachineStress:
+    """複数スレッドからの押下・離放の連打に対するテスト。"""
+
+    THREADS = 8
+    DURATION = 0.5  # 秒
+
+    def test_concurrent_press_release(self) -> None:
+        """同時に遷移しても遷移表と録音の開始・停止の交互性が保たれ、kHz 以上で遷移できること。"""
+        machine = StateMachine(log_size=10_000)
+        recording = threading.Event()  # 録音中（start と stop が交互に呼ばれること）
+        violations: list[str] = []
+
+        def on_change(source: AppState, target: AppState) -> None:
+            # リスナーはロックの下で呼ばれるため、録音の開始・停止と遷移は分離しない
+            if target is AppState.RECORDING:
+                if recording.is_set():
+                    violations.append("二重に録音を開始")
+                recording.set()
+            elif source is AppState.RECORDING:
+                if not recording.is_set():
+                    violations.append("録音していないのに停止")
+                recording.clear()
+
+        machine.add_listener(on_change)
+        deadline = time.perf_counter() + self.DURATION
+
+        def press_release() -> None:
+            while time.perf_counter() < deadline:
+                machine.transition(AppState.IDLE, AppState.RECORDING)  # 押下
+                machine.transition(AppState.RECORDING, AppState.PROCESSING)  # 離放
+                machine.transition(AppState.PROCESSING, AppState.IDLE)  # 処理の完了
+
+        threads = [threading.Thread(target=press_release) for _ in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        events = machine.events
+        assert violations == []
+        assert all(e.target in TRANSITIONS[e.source] for e in events)
+        assert all(a.target is b.source for a, b in pairwise(events))
+        # 他のスレッドに先を越された押下・離放は遷移せず、拒否として数えられている
+        assert machine.rejected > 0
+        assert machine.transitions / self.DURATION >= 1000  # 1kHz 以上
@@ -2,7 +2,7 @@
 
 from unittest.mock import MagicMock, patch
 
-from speakdrop.text_processor import TextProcessor
+from speakdrop.text_processor import TextProcessor, format_batch, split_batch
 
 
 class TestTextProcessorConstants:
@@ -16,6 +16,10 @@ class TestTextProcessorConstants:
         """DEFAULT_MODEL が 'qwen2.5:7b' であること。"""
         assert TextProcessor.DEFAULT_MODEL == "qwen2.5:7b"
 
+    def test_timeout(self) -> None:
+        """TIMEOUT が 5 秒であること（NFR-002: 3秒以内の処理 + 余裕）。"""
+        assert TextProcessor.TIMEOUT == 5.0
+
 
 class TestTextProcessorProcess:
     """TextProcessor.process() のテスト。"""
@@ -36,10 +40,22 @@ class TestTextProcessorProcess:
 
     @patch("speakdrop.text_processor.ollama.Client")
     def test_process_uses_ollama_host(self, mock_client_cls: MagicMock) -> None:
-        """ollama.Client が OLLAMA_HOST を使って初期化されること（NFR-005）。"""
+        """ollama.Client が最初の処理時に OLLAMA_HOST を使って初期化されること（NFR-005）。"""
         mock_client_cls.return_value = MagicMock()
 
-        TextProcessor()
+        processor = TextProcessor()
+        mock_client_cls.assert_not_called()
+        processor.process("テスト")
+        processor.process("テスト")
+
+        mock_client_cls.assert_called_once_with(host=TextProcessor.OLLAMA_HOST, timeout=5.0)
+
+    @patch("speakdrop.text_processor.ollama.Client")
+    def test_warm_up_creates_client(self, mock_client_cls: MagicMock) -> None:
+        """warm_up() で Ollama クライアントを生成し、処理時は使い回すこと。"""
+        processor = TextProcessor()
+        processor.warm_up()
+        processor.process("テスト")
 
         mock_client_cls.assert_called_once_with(host=TextProcessor.OLLAMA_HOST, timeout=5.0)
 
@@ -114,3 +130,68 @@ class TestTextProcessorProcess:
         system_messages = [m for m in messages if m.get("role") == "system"]
         assert len(system_messages) == 1
         assert "句読点" in system_messages[0]["content"]
+
+
+class TestTextProcessorBatch:
+    """TextProcessor.process_batch() と format_batch() / split_batch() のテスト。"""
+
+    def test_split_roundtrip(self) -> None:
+        """format_batch() の形式の応答をテキストごとに分割できること。"""
+        content = format_batch(["今日は晴れ。", "散歩に行く。"])
+        assert split_batch(content, 2) == ["今日は晴れ。", "散歩に行く。"]
+
+    def test_split_rejects_mismatch(self) -> None:
+        """番号の欠落・前置きの説明文・空のテキストは分割失敗とすること。"""
+        assert split_batch("[[1]] あ", 2) is None
+        assert split_batch("整形しました\n[[1]] あ\n[[2]] い", 2) is None
+        assert split_batch("[[1]] あ\n[[2]]", 2) is None
+
+    @patch("speakdrop.text_processor.ollama.Client")
+    def test_batch_in_single_request(self, mock_client_cls: MagicMock) -> None:
+        """複数のテキストを1回のリクエストで整形し、テキストごとに返すこと。"""
+        mock_client = mock_client_cls.return_value
+        mock_client.chat.return_value.message.content = "[[1]] あ。\n[[2]] い。"
+
+        result = TextProcessor().process_batch(["あ", "い"], num_predict=100)
+
+        assert result == ["あ。", "い。"]
+        assert mock_client.chat.call_count == 1
+        kwargs = mock_client.chat.call_args.kwargs
+        assert kwargs["messages"][1]["content"] == "[[1]] あ\n[[2]] い"
+        assert kwargs["options"] == {"num_predict": 200}
+
+    @patch("speakdrop.text_processor.ollama.Client")
+    def test_batch_falls_back_per_item(self, mock_client_cls: MagicMock) -> None:
+        """応答を分割できない場合は1件ずつ整形し直すこと。"""
+        mock_client = mock_client_cls.return_value
+        replies = ["あ。い。", "あ。", "い。"]
+        mock_client.chat.side_effect = lambda **_: MagicMock(
+            message=MagicMock(content=replies.pop(0))
+        )
+
+        assert TextProcessor().process_batch(["あ", "い"]) == ["あ。", "い。"]
+        assert mock_client.chat.call_count == 3
+
+    @patch("speakdrop.text_processor.ollama.Client")
+    def test_batch_returns_input_on_error(self, mock_client_cls: MagicMock) -> None:
+        """Ollama 未起動時は元のテキストをそのまま返すこと（REQ-009）。"""
+        mock_client_cls.return_value.chat.side_effect = ConnectionError("未起動")
+
+        assert TextProcessor().process_batch(["あ", "い"]) == ["あ", "い"]
+
+
+class TestTextProcessorStream:
+    """TextProcessor.stream() のテスト。"""
+
+    @patch("speakdrop.text_processor.ollama.Client")
+    def test_stream_yields_tokens(self, mock_client_cls: MagicMock) -> None:
+        """生成されたトークンを順に返し、空の断片を除くこと。"""
+        chunks = []
+        for content in ["今日", "は", ""]:
+            chunk = MagicMock()
+            chunk.message.content = content
+            chunks.append(chunk)
+        mock_client_cls.return_value.chat.return_value = iter(chunks)
+
+        assert list(TextProcessor().stream("今日は")) == ["今日", "は"]
+        assert mock_client_cls.return_value.chat.call_args.kwargs["stream"] is True
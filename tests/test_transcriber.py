@@ -3,8 +3,9 @@
 from unittest.mock import MagicMock, patch
 
 import numpy as np
+import pytest
 
-from speakdrop.transcriber import Transcriber
+from speakdrop.transcriber import DECODE_PROFILES, Transcriber
 
 
 class TestTranscriberInit:
@@ -25,11 +26,20 @@ class TestTranscriberInit:
         transcriber = Transcriber(model_id="small")
         assert transcriber._model_id == "small"
 
+    @patch("speakdrop.transcriber.faster_whisper.WhisperModel")
+    def test_warm_up_does_not_load_model(self, mock_whisper_model: MagicMock) -> None:
+        """warm_up() は依存の読み込みだけを行い、モデルはロードしないこと（NFR-003）。"""
+        transcriber = Transcriber()
+        transcriber.warm_up()
+
+        mock_whisper_model.assert_not_called()
+        assert transcriber._model is None
+
 
 class TestTranscriberTranscribe:
     """Transcriber.transcribe() のテスト。"""
 
-    @patch("speakdrop.transcriber.WhisperModel")
+    @patch("speakdrop.transcriber.faster_whisper.WhisperModel")
     def test_transcribe_loads_model_on_first_call(self, mock_whisper_model: MagicMock) -> None:
         """transcribe() 初回呼び出し時にモデルをロードすること。"""
         mock_model = MagicMock()
@@ -42,7 +52,7 @@ class TestTranscriberTranscribe:
 
         mock_whisper_model.assert_called_once()
 
-    @patch("speakdrop.transcriber.WhisperModel")
+    @patch("speakdrop.transcriber.faster_whisper.WhisperModel")
     def test_transcribe_does_not_reload_model(self, mock_whisper_model: MagicMock) -> None:
         """transcribe() 2回目以降はモデルをロードしないこと。"""
         mock_model = MagicMock()
@@ -56,7 +66,7 @@ class TestTranscriberTranscribe:
 
         assert mock_whisper_model.call_count == 1
 
-    @patch("speakdrop.transcriber.WhisperModel")
+    @patch("speakdrop.transcriber.faster_whisper.WhisperModel")
     def test_transcribe_returns_string(self, mock_whisper_model: MagicMock) -> None:
         """transcribe() が文字列を返すこと。"""
         mock_segment = MagicMock()
@@ -72,7 +82,7 @@ class TestTranscriberTranscribe:
         assert isinstance(result, str)
         assert result == "こんにちは"
 
-    @patch("speakdrop.transcriber.WhisperModel")
+    @patch("speakdrop.transcriber.faster_whisper.WhisperModel")
     def test_transcribe_joins_multiple_segments(self, mock_whisper_model: MagicMock) -> None:
         """複数セグメントを結合して返すこと。"""
         seg1 = MagicMock()
@@ -89,7 +99,25 @@ class TestTranscriberTranscribe:
 
         assert result == "こんにちは、世界。"
 
-    @patch("speakdrop.transcriber.WhisperModel")
+    @patch("speakdrop.transcriber.faster_whisper.WhisperModel")
+    def test_transcribe_notifies_each_segment(self, mock_whisper_model: MagicMock) -> None:
+        """on_segment を指定するとセグメントの確定ごとに呼ぶこと。"""
+        seg1 = MagicMock()
+        seg1.text = "こんにちは、"
+        seg2 = MagicMock()
+        seg2.text = "世界。"
+        mock_model = MagicMock()
+        mock_model.transcribe.return_value = (iter([seg1, seg2]), MagicMock())
+        mock_whisper_model.return_value = mock_model
+        segments: list[str] = []
+
+        transcriber = Transcriber()
+        result = transcriber.transcribe(np.zeros(16000, dtype=np.int16), on_segment=segments.append)
+
+        assert segments == ["こんにちは、", "世界。"]
+        assert result == "こんにちは、世界。"
+
+    @patch("speakdrop.transcriber.faster_whisper.WhisperModel")
     def test_transcribe_returns_empty_string_for_empty_result(
         self, mock_whisper_model: MagicMock
     ) -> None:
@@ -104,7 +132,7 @@ class TestTranscriberTranscribe:
 
         assert result == ""
 
-    @patch("speakdrop.transcriber.WhisperModel")
+    @patch("speakdrop.transcriber.faster_whisper.WhisperModel")
     def test_transcribe_uses_japanese_language(self, mock_whisper_model: MagicMock) -> None:
         """transcribe() が language='ja' を指定すること。"""
         mock_model = MagicMock()
@@ -122,7 +150,7 @@ class TestTranscriberTranscribe:
 class TestTranscriberReloadModel:
     """Transcriber.reload_model() のテスト。"""
 
-    @patch("speakdrop.transcriber.WhisperModel")
+    @patch("speakdrop.transcriber.faster_whisper.WhisperModel")
     def test_reload_model_changes_model_id(self, mock_whisper_model: MagicMock) -> None:
         """reload_model() がモデルIDを変更すること。"""
         mock_model = MagicMock()
@@ -133,7 +161,7 @@ class TestTranscriberReloadModel:
 
         assert transcriber._model_id == "medium"
 
-    @patch("speakdrop.transcriber.WhisperModel")
+    @patch("speakdrop.transcriber.faster_whisper.WhisperModel")
     def test_reload_model_resets_model_instance(self, mock_whisper_model: MagicMock) -> None:
         """reload_model() が古いモデルインスタンスをリセットすること。"""
         mock_model = MagicMock()
@@ -147,3 +175,192 @@ class TestTranscriberReloadModel:
         assert transcriber._model is not None
         transcriber.reload_model("small")
         assert transcriber._model is None  # リセット済み
+
+
+class TestTranscriberComputeSettings:
+    """推論設定（compute_type / cpu_threads / num_workers）のテスト。"""
+
+    @patch("speakdrop.transcriber.faster_whisper.WhisperModel")
+    def test_default_compute_settings(self, mock_whisper_model: MagicMock) -> None:
+        """デフォルトでは int8 / 既定スレッド数 / 1ワーカーでロードすること。"""
+        mock_whisper_model.return_value.transcribe.return_value = (iter([]), MagicMock())
+
+        Transcriber().transcribe(np.zeros(16000, dtype=np.int16))
+
+        call_kwargs = mock_whisper_model.call_args.kwargs
+        assert call_kwargs["compute_type"] == "int8"
+        assert call_kwargs["cpu_threads"] == 0
+        assert call_kwargs["num_workers"] == 1
+
+    @patch("speakdrop.transcriber.faster_whisper.WhisperModel")
+    def test_custom_compute_settings(self, mock_whisper_model: MagicMock) -> None:
+        """指定した推論設定でモデルをロードすること。"""
+        mock_whisper_model.return_value.transcribe.return_value = (iter([]), MagicMock())
+
+        transcriber = Transcriber(
+            model_id="small", compute_type="float32", cpu_threads=4, num_workers=2
+        )
+        transcriber.transcribe(np.zeros(16000, dtype=np.int16))
+
+        call_kwargs = mock_whisper_model.call_args.kwargs
+        assert call_kwargs["compute_type"] == "float32"
+        assert call_kwargs["cpu_threads"] == 4
+        assert call_kwargs["num_workers"] == 2
+
+
+class TestTranscriberDecodeProfile:
+    """デコードプロファイルのテスト。"""
+
+    @patch("speakdrop.transcriber.faster_whisper.WhisperModel")
+    def test_default_profile_is_balanced(self, mock_whisper_model: MagicMock) -> None:
+        """デフォルトでは balanced プロファイルのパラメータで認識すること。"""
+        mock_model = mock_whisper_model.return_value
+        mock_model.transcribe.return_value = (iter([]), MagicMock())
+
+        Transcriber().transcribe(np.zeros(16000, dtype=np.int16))
+
+        call_kwargs = mock_model.transcribe.call_args.kwargs
+        for key, value in DECODE_PROFILES["balanced"].items():
+            assert call_kwargs[key] == value
+
+    @patch("speakdrop.transcriber.faster_whisper.WhisperModel")
+    def test_set_profile_changes_options(self, mock_whisper_model: MagicMock) -> None:
+        """set_profile() 後はそのプロファイルのパラメータで認識すること。"""
+        mock_model = mock_whisper_model.return_value
+        mock_model.transcribe.return_value = (iter([]), MagicMock())
+
+        transcriber = Transcriber()
+        transcriber.set_profile("fastest")
+        transcriber.transcribe(np.zeros(16000, dtype=np.int16))
+
+        call_kwargs = mock_model.transcribe.call_args.kwargs
+        assert call_kwargs["temperature"] == 0.0
+        assert call_kwargs["without_timestamps"] is True
+        assert call_kwargs["language"] == "ja"
+        mock_whisper_model.assert_called_once()  # モデルは再ロードしない
+
+    @patch("speakdrop.transcriber.faster_whisper.WhisperModel")
+    def test_unknown_profile_falls_back_to_default(self, mock_whisper_model: MagicMock) -> None:
+        """設定ファイルに未知のプロファイルがあっても balanced で認識すること。"""
+        mock_model = mock_whisper_model.return_value
+        mock_model.transcribe.return_value = (iter([]), MagicMock())
+
+        Transcriber(profile="unknown").transcribe(np.zeros(16000, dtype=np.int16))
+
+        assert mock_model.transcribe.call_args.kwargs["beam_size"] == 1
+
+    def test_set_unknown_profile_raises(self) -> None:
+        """未知のプロファイル名は ValueError になること。"""
+        with pytest.raises(ValueError):
+            Transcriber().set_profile("unknown")
+
+
+class TestTranscriberContext:
+    """発話をまたぐ文脈（initial_prompt・hotwords）のテスト。"""
+
+    @patch("speakdrop.transcriber.faster_whisper.WhisperModel")
+    def test_prompt_is_tokenized_capped_and_cached(self, mock_whisper_model: MagicMock) -> None:
+        """prompt をトークン化して末尾 MAX_PROMPT_TOKENS に切り詰め、同じ文脈は再利用すること。"""
+        mock_model = mock_whisper_model.return_value
+        mock_model.transcribe.return_value = (iter([]), MagicMock())
+        mock_model.hf_tokenizer.encode.return_value.ids = list(range(100))
+
+        transcriber = Transcriber()
+        for _ in range(2):
+            transcriber.transcribe(np.zeros(16000, dtype=np.int16), prompt="会議の議事録")
+
+        prompt = mock_model.transcribe.call_args.kwargs["initial_prompt"]
+        assert prompt == list(range(100 - Transcriber.MAX_PROMPT_TOKENS, 100))
+        mock_model.hf_tokenizer.encode.assert_called_once_with(
+            " 会議の議事録", add_special_tokens=False
+        )
+
+    @patch("speakdrop.transcriber.faster_whisper.WhisperModel")
+    def test_no_prompt_by_default(self, mock_whisper_model: MagicMock) -> None:
+        """文脈・hotwords が無い場合は initial_prompt・hotwords を渡さないこと。"""
+        mock_model = mock_whisper_model.return_value
+        mock_model.transcribe.return_value = (iter([]), MagicMock())
+
+        Transcriber().transcribe(np.zeros(16000, dtype=np.int16))
+
+        call_kwargs = mock_model.transcribe.call_args.kwargs
+        assert "initial_prompt" not in call_kwargs
+        assert "hotwords" not in call_kwargs
+
+    @patch("speakdrop.transcriber.faster_whisper.WhisperModel")
+    def test_hotwords(self, mock_whisper_model: MagicMock) -> None:
+        """hotwords を指定した場合は毎回渡すこと。"""
+        mock_model = mock_whisper_model.return_value
+        mock_model.transcribe.return_value = (iter([]), MagicMock())
+
+        Transcriber(hotwords=" SpeakDrop Ollama ").transcribe(np.zeros(16000, dtype=np.int16))
+
+        assert mock_model.transcribe.call_args.kwargs["hotwords"] == "SpeakDrop Ollama"
+
+
+class TestTranscriberRouting:
+    """発話長によるモデル振り分けのテスト。"""
+
+    def test_no_fast_model_always_uses_primary(self) -> None:
+        """高速モデル未設定の場合は常に精度優先モデルを選ぶこと。"""
+        transcriber = Transcriber(model_id="large-v3")
+        assert transcriber.select_model_id(30.0) == "large-v3"
+
+    def test_short_utterance_uses_primary(self) -> None:
+        """route_min_duration 未満の発話は精度優先モデルを選ぶこと。"""
+        transcriber = Transcriber(model_id="large-v3", fast_model_id="small")
+        transcriber._rtf["large-v3"].add(2.0)  # 非常に遅い
+        assert transcriber.select_model_id(2.9) == "large-v3"
+
+    def test_long_utterance_over_budget_uses_fast_model(self) -> None:
+        """予測処理時間が予算を超える長い発話は高速モデルを選ぶこと。"""
+        transcriber = Transcriber(model_id="large-v3", fast_model_id="small", latency_budget=5.0)
+        transcriber._rtf["large-v3"].add(0.6)  # 10秒 → 予測6秒
+        assert transcriber.select_model_id(10.0) == "small"
+
+    def test_long_utterance_within_budget_uses_primary(self) -> None:
+        """予測処理時間が予算内なら長い発話でも精度優先モデルを選ぶこと。"""
+        transcriber = Transcriber(model_id="large-v3", fast_model_id="small", latency_budget=5.0)
+        transcriber._rtf["large-v3"].add(0.4)  # 10秒 → 予測4秒
+        assert transcriber.select_model_id(10.0) == "large-v3"
+
+    def test_without_measurements_uses_primary(self) -> None:
+        """計測値が無い間は精度優先モデルを選ぶこと。"""
+        transcriber = Transcriber(model_id="large-v3", fast_model_id="small")
+        assert transcriber.select_model_id(20.0) == "large-v3"
+
+    @patch("speakdrop.transcriber.faster_whisper.WhisperModel")
+    def test_transcribe_tracks_model_usage(self, mock_whisper_model: MagicMock) -> None:
+        """認識したモデルを統計に記録し、実時間係数を更新すること。"""
+        mock_whisper_model.return_value.transcribe.return_value = (iter([]), MagicMock())
+        transcriber = Transcriber(model_id="large-v3", fast_model_id="small")
+
+        transcriber.transcribe(np.zeros(16000 * 4, dtype=np.int16))
+
+        assert transcriber.last_model_id == "large-v3"
+        assert transcriber.model_usage == {"large-v3": 1}
+        assert len(transcriber._rtf["large-v3"]) == 1
+
+    @patch("speakdrop.transcriber.faster_whisper.WhisperModel")
+    def test_transcribe_with_explicit_model_loads_fast_model(
+        self, mock_whisper_model: MagicMock
+    ) -> None:
+        """model_id を指定した場合はそのモデルをロードして認識すること。"""
+        mock_whisper_model.return_value.transcribe.return_value = (iter([]), MagicMock())
+        transcriber = Transcriber(model_id="large-v3", fast_model_id="small")
+
+        transcriber.transcribe(np.zeros(16000, dtype=np.int16), model_id="small")
+
+        assert mock_whisper_model.call_args.args[0] == "small"
+        assert transcriber._model is None  # 精度優先モデルはロードしない
+        assert transcriber.model_usage == {"small": 1}
+
+    @patch("speakdrop.transcriber.faster_whisper.WhisperModel")
+    def test_reload_model_resets_rtf(self, mock_whisper_model: MagicMock) -> None:
+        """reload_model() で新しいモデルの計測値をリセットすること。"""
+        transcriber = Transcriber(model_id="small", fast_model_id="tiny")
+        transcriber._rtf["large-v3"].add(1.0)
+
+        transcriber.reload_model("large-v3")
+
+        assert transcriber._rtf["large-v3"].mean() is None
@@ -0,0 +1,280 @@
+"""transcription_server モジュールのテスト。"""
+
+import shutil
+import tempfile
+import threading
+from collections.abc import Iterator
+from multiprocessing.connection import Listener
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from speakdrop.transcription_server import (
+    RemoteTranscriber,
+    TranscriptionServer,
+    create_listener,
+    load_authkey,
+)
+
+_listeners: list[Listener] = []
+
+
+@pytest.fixture
+def sock_dir() -> Iterator[Path]:
+    """Unix ドメインソケット用の短いパスの一時ディレクトリ（パス長の上限対策）。"""
+    path = Path(tempfile.mkdtemp(prefix="sd", dir="/tmp"))
+    yield path
+    while _listeners:
+        _listeners.pop().close()
+    shutil.rmtree(path, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def _same_process_shared_memory() -> Iterator[None]:
+    """サーバーとクライアントが同一プロセスのため resource_tracker の登録解除を無効化する。"""
+    with patch("speakdrop.transcription_server.resource_tracker"):
+        yield
+
+
+def _fake_transcriber(received: list[np.ndarray]) -> MagicMock:
+    """受け取った音声を記録して固定テキストを返す Transcriber のモック。"""
+    transcriber = MagicMock()
+    transcriber.last_model_id = "small"
+
+    def transcribe(audio: np.ndarray, **_: Any) -> str:
+        received.append(audio.copy())
+        return "こんにちは"
+
+    transcriber.transcribe.side_effect = transcribe
+    return transcriber
+
+
+def _start_server(sock_dir: Path, transcriber: MagicMock) -> tuple[TranscriptionServer, Any]:
+    """サーバーをスレッドで起動する。"""
+    listener = create_listener(sock_dir / "t.sock", load_authkey(sock_dir / "key"))
+    assert listener is not None
+    _listeners.append(listener)
+    server = TranscriptionServer(transcriber)
+    thread = threading.Thread(target=server.serve_forever, args=(listener,), daemon=True)
+    thread.start()
+    return server, listener
+
+
+class TestLoadAuthkey:
+    """load_authkey() のテスト。"""
+
+    def test_creates_key_with_owner_only_permission(self, tmp_path: Path) -> None:
+        """鍵が無い場合は所有者のみ読み書き可能なファイルに生成すること。"""
+        key_path = tmp_path / "key"
+
+        key = load_authkey(key_path)
+
+        assert len(key) == 32
+        assert key_path.stat().st_mode & 0o777 == 0o600
+
+    def test_reuses_existing_key(self, tmp_path: Path) -> None:
+        """既存の鍵を再利用すること。"""
+        key_path = tmp_path / "key"
+        assert load_authkey(key_path) == load_authkey(key_path)
+
+
+class TestTranscriptionServerHandle:
+    """TranscriptionServer.handle() のテスト。"""
+
+    def test_ping(self) -> None:
+        """ping に ok を返すこと。"""
+        assert TranscriptionServer(MagicMock()).handle({"op": "ping"}) == {"ok": True}
+
+    def test_unknown_op(self) -> None:
+        """未知のリクエストにはエラーを返すこと。"""
+        response = TranscriptionServer(MagicMock()).handle({"op": "unknown"})
+        assert response["ok"] is False
+
+    def test_reload_model(self) -> None:
+        """reload_model を Transcriber に委譲すること。"""
+        transcriber = MagicMock()
+        TranscriptionServer(transcriber).handle({"op": "reload_model", "model_id": "small"})
+        transcriber.reload_model.assert_called_once_with("small")
+
+    def test_error_is_returned(self) -> None:
+        """Transcriber の例外はエラーレスポンスとして返すこと（サーバーは落ちない）。"""
+        transcriber = MagicMock()
+        transcriber.set_profile.side_effect = ValueError("未知のデコードプロファイルです: x")
+
+        response = TranscriptionServer(transcriber).handle({"op": "set_profile", "profile": "x"})
+
+        assert response == {"ok": False, "error": "未知のデコードプロファイルです: x"}
+
+
+class TestCreateListener:
+    """create_listener() のテスト。"""
+
+    def test_removes_stale_socket(self, sock_dir: Path) -> None:
+        """応答しない古いソケットファイルを削除して待ち受けること。"""
+        socket_path = sock_dir / "t.sock"
+        socket_path.touch()
+
+        listener = create_listener(socket_path, b"key")
+
+        assert listener is not None
+        _listeners.append(listener)
+
+    def test_returns_none_when_server_running(self, sock_dir: Path) -> None:
+        """既にサーバーが応答する場合は None を返すこと。"""
+        socket_path = sock_dir / "t.sock"
+        running = Listener(str(socket_path), family="AF_UNIX", authkey=b"key")
+        _listeners.append(running)
+        accept = threading.Thread(target=lambda: running.accept().close(), daemon=True)
+        accept.start()
+
+        assert create_listener(socket_path, b"key") is None
+
+        accept.join(timeout=5)
+
+
+class TestRemoteTranscriber:
+    """RemoteTranscriber のテスト（サーバーを同一プロセスのスレッドで起動）。"""
+
+    def test_transcribe_via_shared_memory(self, sock_dir: Path) -> None:
+        """共有メモリ経由で音声を渡し、認識結果を受け取ること。"""
+        received: list[np.ndarray] = []
+        transcriber = _fake_transcriber(received)
+        _start_server(sock_dir, transcriber)
+        client = RemoteTranscriber(sock_dir / "t.sock", sock_dir / "key")
+        audio = np.arange(1600, dtype=np.int16)
+
+        try:
+            text = client.transcribe(audio, model_id="small")
+            client.transcribe(audio[:800], prompt="前の発話")
+        finally:
+            client.close()
+
+        assert text == "こんにちは"
+        np.testing.assert_array_equal(received[0], audio)
+        np.testing.assert_array_equal(received[1], audio[:800])
+        assert client.model_usage["small"] == 2
+        assert client.last_model_id == "small"
+        # 文脈はサーバー側の Transcriber.transcribe() に渡す
+        assert transcriber.transcribe.call_args.kwargs == {"prompt": "前の発話"}
+
+    def test_server_error_raises(self, sock_dir: Path) -> None:
+        """サーバー側のエラーは RuntimeError として送出すること。"""
+        transcriber = MagicMock()
+        transcriber.transcribe.side_effect = RuntimeError("decode failed")
+        _start_server(sock_dir, transcriber)
+        client = RemoteTranscriber(sock_dir / "t.sock", sock_dir / "key")
+
+        try:
+            with pytest.raises(RuntimeError, match="decode failed"):
+                client.transcribe(np.zeros(160, dtype=np.int16))
+        finally:
+            client.close()
+
+    def test_restarts_server_after_crash(self, sock_dir: Path) -> None:
+        """サーバーが落ちた場合は起動し直してリクエストを再送すること。"""
+        received: list[np.ndarray] = []
+        server, listener = _start_server(sock_dir, _fake_transcriber(received))
+        client = RemoteTranscriber(sock_dir / "t.sock", sock_dir / "key")
+
+        def respawn(*_: Any, **__: Any) -> MagicMock:
+            _start_server(sock_dir, _fake_transcriber(received))
+            return MagicMock()
+
+        try:
+            client.transcribe(np.zeros(160, dtype=np.int16))
+            # サーバーのクラッシュを模擬（接続とソケットを閉じる）
+            server.handle({"op": "shutdown"})
+            listener.close()
+            assert client._conn is not None
+            with patch("speakdrop.transcription_server.subprocess.Popen") as mock_popen:
+                mock_popen.side_effect = respawn
+                client._conn.close()
+                text = client.transcribe(np.ones(160, dtype=np.int16))
+        finally:
+            client.close()
+
+        assert text == "こんにちは"
+        assert client.restart_count == 1
+        mock_popen.assert_called_once()
+        assert mock_popen.call_args.kwargs["start_new_session"] is True
+
+    def test_control_does_not_wait_for_transcription(self, sock_dir: Path) -> None:
+        """認識中の設定変更は認識の完了を待たずに戻り、完了後にサーバーへ送ること。"""
+        started = threading.Event()
+        release = threading.Event()
+        transcriber = MagicMock()
+        transcriber.last_model_id = "small"
+
+        def transcribe(audio: np.ndarray, **_: Any) -> str:
+            started.set()
+            release.wait(5.0)
+            return "こんにちは"
+
+        transcriber.transcribe.side_effect = transcribe
+        _start_server(sock_dir, transcriber)
+        client = RemoteTranscriber(sock_dir / "t.sock", sock_dir / "key")
+        worker = threading.Thread(target=client.transcribe, args=(np.zeros(160, dtype=np.int16),))
+
+        try:
+            worker.start()
+            assert started.wait(5.0)
+            client.set_profile("fastest")
+            client.reload_model("medium")
+            client.reload_model("large-v3")
+            transcriber.set_profile.assert_not_called()
+            release.set()
+            worker.join(5.0)
+        finally:
+            release.set()
+            client.close()
+
+        transcriber.set_profile.assert_called_once_with("fastest")
+        # 認識中に重ねて変更した場合は最新の値だけを送る
+        transcriber.reload_model.assert_called_once_with("large-v3")
+
+    def test_control_is_sent_immediately_when_idle(self, sock_dir: Path) -> None:
+        """接続済みで認識中でなければ設定変更をすぐに送ること。"""
+        transcriber = _fake_transcriber([])
+        _start_server(sock_dir, transcriber)
+        client = RemoteTranscriber(sock_dir / "t.sock", sock_dir / "key")
+
+        try:
+            client.transcribe(np.zeros(160, dtype=np.int16))
+            client.set_profile("accurate")
+        finally:
+            client.close()
+
+        transcriber.set_profile.assert_called_once_with("accurate")
+
+    def test_control_does_not_start_server(self, sock_dir: Path) -> None:
+        """未接続の場合はサーバーを起動せず、次の認識の前に設定変更を送ること。"""
+        transcriber = _fake_transcriber([])
+        client = RemoteTranscriber(sock_dir / "t.sock", sock_dir / "key")
+
+        with patch("speakdrop.transcription_server.subprocess.Popen") as mock_popen:
+            client.reload_model("medium")
+            mock_popen.assert_not_called()
+
+        _start_server(sock_dir, transcriber)
+        try:
+            client.transcribe(np.zeros(160, dtype=np.int16))
+        finally:
+            client.close()
+
+        transcriber.reload_model.assert_called_once_with("medium")
+
+    def test_does_not_respawn_after_connect_timeout(self, sock_dir: Path) -> None:
+        """サーバーの起動を待ち切った場合は起動し直して再送しないこと。"""
+        client = RemoteTranscriber(sock_dir / "t.sock", sock_dir / "key")
+        client.CONNECT_TIMEOUT = 0.2
+
+        with patch("speakdrop.transcription_server.subprocess.Popen") as mock_popen:
+            with pytest.raises(RuntimeError, match="起動できません"):
+                client.transcribe(np.zeros(160, dtype=np.int16))
+        client.close()
+
+        mock_popen.assert_called_once()
+        assert client.restart_count == 0
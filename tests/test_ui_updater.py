@@ -0,0 +1,96 @@
+"""UiUpdater モジュールのテスト。"""
+
+from itertools import pairwise
+from typing import Any
+
+from speakdrop.clock import VirtualClock
+from speakdrop.ui_updater import UiUpdater
+
+
+def _updater(clock: VirtualClock, max_rate: float = 10.0) -> UiUpdater:
+    return UiUpdater(clock.call_later, clock, max_rate=max_rate)
+
+
+class TestUiUpdater:
+    """UiUpdater の集約・頻度制限のテスト。"""
+
+    def test_first_update_is_applied_without_delay(self) -> None:
+        """前回の反映から間隔が空いていれば次のタイマーで反映すること。"""
+        clock = VirtualClock()
+        updater = _updater(clock)
+        applied: list[Any] = []
+
+        updater.publish("level", applied.append, 1)
+        clock.advance(0.0)
+
+        assert applied == [1]
+
+    def test_updates_are_coalesced_to_latest(self) -> None:
+        """反映前に同じ key の更新が続いた場合は最後の更新だけを反映すること。"""
+        clock = VirtualClock()
+        updater = _updater(clock)
+        applied: list[Any] = []
+
+        for value in range(5):
+            updater.publish("level", applied.append, value)
+        clock.run_until_idle()
+
+        assert applied == [4]
+        assert updater.published == 5
+        assert updater.flushes == 1
+
+    def test_flush_rate_is_bounded(self) -> None:
+        """publish() の頻度によらず反映は max_rate 回/秒を超えないこと。"""
+        clock = VirtualClock()
+        updater = _updater(clock, max_rate=10.0)
+        flushed_at: list[float] = []
+
+        for _ in range(1000):  # 1ms ごとに1秒間
+            updater.publish("level", lambda: flushed_at.append(clock.monotonic()))
+            clock.advance(0.001)
+        clock.run_until_idle()
+
+        assert len(flushed_at) <= 11
+        assert all(b - a >= 0.1 - 1e-9 for a, b in pairwise(flushed_at))
+
+    def test_immediate_update_is_not_delayed(self) -> None:
+        """immediate=True の更新は頻度制限を待たずに反映し、待っている更新も一緒に反映すること。"""
+        clock = VirtualClock()
+        updater = _updater(clock, max_rate=1.0)
+        applied: list[Any] = []
+        updater.publish("level", applied.append, "level-1")
+        clock.advance(0.0)
+
+        updater.publish("level", applied.append, "level-2")
+        updater.publish("state", applied.append, "state", immediate=True)
+        clock.advance(0.0)
+
+        assert applied == ["level-1", "level-2", "state"]
+        assert clock.monotonic() == 0.0
+
+    def test_lost_flush_does_not_block_later_updates(self) -> None:
+        """予約した反映が実行されなくても、即時の更新と間隔を過ぎた後の更新は反映すること。"""
+        clock = VirtualClock()
+        lost: list[Any] = []
+        scheduled = [False]
+
+        def call_later(delay: float, callback: Any) -> None:
+            if not scheduled[0]:  # 最初の予約だけ失われる（run loop の無いスレッドからの予約など）
+                scheduled[0] = True
+                lost.append(callback)
+                return
+            clock.call_later(delay, callback)
+
+        updater = UiUpdater(call_later, clock, max_rate=10.0)
+        applied: list[Any] = []
+
+        updater.publish("level", applied.append, "level-1")
+        clock.advance(0.05)
+        updater.publish("state", applied.append, "state", immediate=True)
+        clock.advance(0.0)
+        clock.advance(1.0)
+        updater.publish("level", applied.append, "level-2")
+        clock.run_until_idle()
+
+        assert lost
+        assert applied == ["level-1", "state", "level-2"]